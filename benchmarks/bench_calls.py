@@ -0,0 +1,63 @@
+##############################################################################
+# CloudMage : JinjaUtils Per-Call Overhead Microbenchmark
+# ============================================================================
+# Measures the per-call cost of the JinjaUtils load setter and render method
+# with logging disabled (the default), so that the fixed overhead of the
+# property/log plumbing can be compared between commits.
+#
+# Run: `poetry run python benchmarks/bench_calls.py [--number N]`
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Pip Installed Modules:
+from cloudmage.jinjautils import JinjaUtils
+
+# Import Base Python Modules
+import argparse
+import tempfile
+import timeit
+import os
+
+
+def main(number=20000, repeat=5):
+    """ Per-Call Overhead Benchmark
+
+    Builds a single template directory, then times the load setter and the
+    render method of a non verbose JinjaUtils instance.
+
+    Parameters:
+        number (int): optional [default=20000]
+        repeat (int): optional [default=5]
+
+    Returns:
+        Timing results printed to stdout
+    """
+    with tempfile.TemporaryDirectory() as template_directory:
+        with open(os.path.join(template_directory, 'bench.j2'), 'w') as tpl:
+            tpl.write("hello {{ name }}")
+
+        Jinja = JinjaUtils()
+        Jinja.template_directory = template_directory
+        Jinja.load = 'bench.j2'
+
+        def load():
+            Jinja.load = 'bench.j2'
+
+        def render():
+            Jinja.render(name='bench')
+
+        for label, func in (('load', load), ('render', render)):
+            best = min(timeit.repeat(func, number=number, repeat=repeat))
+            print("{:<8} {:>8.2f} us/call".format(
+                label, best / number * 1e6
+            ))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--number', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    main(number=args.number, repeat=args.repeat)
@@ -0,0 +1,305 @@
+##############################################################################
+# CloudMage : JinjaUtils Benchmark Suite
+# ============================================================================
+# Measures the latency percentiles, throughput and peak memory of the
+# template directory scan, load, render and write operations on synthetic
+# template trees and context payloads generated from a fixed seed, and
+# stores the results as JSON so they can be compared between commits.
+#
+# Run: `poetry run python benchmarks/bench_suite.py [--sizes 1,1000,100000]
+#       [--output results.json] [--compare baseline.json --threshold 0.1]`
+#
+# The compare option exits with status 1 when the p50 latency or the peak
+# memory of a benchmark grew by more than the threshold from the baseline.
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Pip Installed Modules:
+from cloudmage.jinjautils import JinjaUtils
+import jinja2
+
+# Import Package Modules
+from synthetic import (
+    make_context,
+    write_include_chain,
+    write_loop_template,
+    write_template_tree
+)
+
+# Import Base Python Modules
+import subprocess
+import tracemalloc
+import statistics
+import platform
+import argparse
+import datetime
+import tempfile
+import json
+import time
+import sys
+import os
+
+
+def percentile(samples, fraction):
+    """ Return the nearest rank percentile of sorted samples """
+    index = int(round(fraction * (len(samples) - 1)))
+    return samples[index]
+
+
+def measure(func, repeat, warmup=1):
+    """ Benchmark Measure Method
+
+    Calls a function warmup times, then times repeat calls, then measures
+    the peak memory allocated by one more call with tracemalloc, which
+    slows calls down too much to be enabled while timing.
+
+    Parameters:
+        func   (callable): required
+        repeat (int):      required
+        warmup (int):      optional [default=1]
+
+    Returns:
+        dict of the latency percentiles in seconds, the throughput in calls
+        per second and the peak memory in bytes
+    """
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        func()
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    samples.sort()
+    return {
+        'repeat': repeat,
+        'min': samples[0],
+        'p50': percentile(samples, 0.50),
+        'p90': percentile(samples, 0.90),
+        'p99': percentile(samples, 0.99),
+        'max': samples[-1],
+        'mean': statistics.mean(samples),
+        'throughput': len(samples) / sum(samples) if sum(samples) else 0.0,
+        'peak_memory': peak_memory
+    }
+
+
+def scan_benchmarks(directory, sizes, repeat):
+    """ Directory Scan Benchmarks
+
+    Times setting the template_directory of a new object, then listing the
+    available templates, on a generated tree of every size.
+    """
+    results = {}
+    for size in sizes:
+        tree = os.path.join(directory, 'tree{}'.format(size))
+        os.makedirs(tree)
+        write_template_tree(tree, size)
+
+        def scan():
+            Jinja = JinjaUtils()
+            Jinja.template_directory = tree
+            assert len(Jinja.available_templates) == size
+
+        # Large trees take seconds to scan, so they are scanned less often.
+        results['scan/{}'.format(size)] = measure(
+            scan,
+            max(3, min(repeat, repeat * 1000 // max(size, 1)))
+        )
+    return results
+
+
+def template_benchmarks(directory, repeat, items, depth):
+    """ Template Benchmarks
+
+    Times the load, render, render_template and write operations on a
+    small template, a template rendering a large loop and a deep chain of
+    includes.
+    """
+    write_template_tree(directory, 1)
+    templates = {
+        'small': 't0.j2',
+        'loop': write_loop_template(directory),
+        'chain': write_include_chain(directory, depth)
+    }
+    small_context = make_context(10)
+    large_context = make_context(items)
+    output_directory = os.path.join(directory, 'output')
+    os.makedirs(output_directory)
+
+    Jinja = JinjaUtils()
+    Jinja.template_directory = directory
+    results = {}
+    for label, name in sorted(templates.items()):
+        context = large_context if label == 'loop' else small_context
+
+        def load():
+            Jinja.load = name
+
+        def render():
+            Jinja.render(**context)
+
+        def render_template():
+            Jinja.render_template(name, context)
+
+        def write():
+            Jinja.write(output_directory, label + '.txt', backup=False)
+
+        results['load/{}'.format(label)] = measure(load, repeat)
+        Jinja.load = name
+        results['render/{}'.format(label)] = measure(render, repeat)
+        results['render_template/{}'.format(label)] = measure(
+            render_template,
+            repeat
+        )
+        results['write/{}'.format(label)] = measure(write, repeat)
+    return results
+
+
+def git_commit():
+    """ Return the commit of the working tree, or None outside of git """
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, threshold):
+    """ Benchmark Compare Method
+
+    Prints the p50 latency and peak memory of every benchmark against a
+    baseline run.
+
+    Parameters:
+        results   (dict):  required
+        baseline  (dict):  required
+        threshold (float): required, allowed relative growth
+
+    Returns:
+        list of the names of the benchmarks that regressed
+    """
+    regressions = []
+    print("\n{:<28} {:>12} {:>12} {:>8} {:>8}".format(
+        'benchmark', 'base p50 ms', 'p50 ms', 'time', 'memory'
+    ))
+    for name, result in sorted(results['benchmarks'].items()):
+        base = baseline['benchmarks'].get(name)
+        if base is None:
+            continue
+        ratios = []
+        for key in ('p50', 'peak_memory'):
+            ratios.append(result[key] / base[key] if base[key] else 1.0)
+        regressed = any(ratio > 1 + threshold for ratio in ratios)
+        if regressed:
+            regressions.append(name)
+        print("{:<28} {:>12.3f} {:>12.3f} {:>7.2f}x {:>7.2f}x{}".format(
+            name,
+            base['p50'] * 1e3,
+            result['p50'] * 1e3,
+            ratios[0],
+            ratios[1],
+            ' REGRESSION' if regressed else ''
+        ))
+    return regressions
+
+
+def main(sizes, repeat=50, items=10000, depth=50, output=None,
+         baseline=None, threshold=0.1):
+    """ Benchmark Suite
+
+    Generates the synthetic template trees in a temporary directory, runs
+    every benchmark, prints the results, and optionally writes them to a
+    JSON file and compares them with a baseline JSON file.
+
+    Parameters:
+        sizes     (list):  required, template tree sizes to scan
+        repeat    (int):   optional [default=50]
+        items     (int):   optional [default=10000], large loop items
+        depth     (int):   optional [default=50], include chain depth
+        output    (str):   optional [default=None], results JSON path
+        baseline  (str):   optional [default=None], baseline JSON path
+        threshold (float): optional [default=0.1]
+
+    Returns:
+        int exit status, 1 if a benchmark regressed from the baseline
+    """
+    results = {
+        'commit': git_commit(),
+        'date': datetime.datetime.utcnow().isoformat() + 'Z',
+        'python': platform.python_version(),
+        'jinja2': jinja2.__version__,
+        'platform': platform.platform(),
+        'parameters': {
+            'sizes': sizes,
+            'repeat': repeat,
+            'items': items,
+            'depth': depth
+        },
+        'benchmarks': {}
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        results['benchmarks'].update(scan_benchmarks(
+            os.path.join(directory, 'scan'), sizes, repeat
+        ))
+        os.makedirs(os.path.join(directory, 'templates'))
+        results['benchmarks'].update(template_benchmarks(
+            os.path.join(directory, 'templates'), repeat, items, depth
+        ))
+
+    print("{:<28} {:>10} {:>10} {:>10} {:>12} {:>10}".format(
+        'benchmark', 'p50 ms', 'p90 ms', 'p99 ms', 'calls/s', 'peak KiB'
+    ))
+    row = "{:<28} {:>10.3f} {:>10.3f} {:>10.3f} {:>12.1f} {:>10.1f}"
+    for name, result in sorted(results['benchmarks'].items()):
+        print(row.format(
+            name,
+            result['p50'] * 1e3,
+            result['p90'] * 1e3,
+            result['p99'] * 1e3,
+            result['throughput'],
+            result['peak_memory'] / 1024
+        ))
+    if output:
+        with open(output, 'w') as output_file:
+            json.dump(results, output_file, indent=2, sort_keys=True)
+    if baseline:
+        with open(baseline) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), threshold)
+        if regressions:
+            print("\n{} benchmarks regressed by more than {:.0%}: {}".format(
+                len(regressions), threshold, ', '.join(regressions)
+            ))
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', default='1,100,1000,10000')
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--items', type=int, default=10000)
+    parser.add_argument('--depth', type=int, default=50)
+    parser.add_argument('--output')
+    parser.add_argument('--compare')
+    parser.add_argument('--threshold', type=float, default=0.1)
+    args = parser.parse_args()
+    sys.exit(main(
+        [int(size) for size in args.sizes.split(',')],
+        repeat=args.repeat,
+        items=args.items,
+        depth=args.depth,
+        output=args.output,
+        baseline=args.compare,
+        threshold=args.threshold
+    ))
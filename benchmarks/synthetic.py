@@ -0,0 +1,148 @@
+##############################################################################
+# CloudMage : JinjaUtils Benchmark Synthetic Templates
+# ============================================================================
+# Generates reproducible template trees and context payloads for the
+# benchmark suite: trees of 1 to 100k template files, deep include chains
+# and templates rendering large loops.
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Base Python Modules
+import random
+import os
+
+# Template rendering one item of a context payload.
+ITEM_TEMPLATE = (
+    "{{% for item in items %}}"
+    "{{{{ loop.index }}}} {{{{ item.name }}}} {{{{ item.price }}}} "
+    "{{% if item.tags %}}{{{{ item.tags | join(', ') }}}}{{% endif %}}\n"
+    "{{% endfor %}}"
+    "template {index}\n"
+)
+
+# Template rendering a large loop with nested fields and filters.
+LOOP_TEMPLATE = (
+    "{% for item in items %}"
+    "{{ item.id }},{{ item.name | upper }},{{ '%.2f' | format(item.price) }},"
+    "{% for tag in item.tags %}{{ tag }}{% if not loop.last %};{% endif %}"
+    "{% endfor %},{{ item.attributes | to_json }}\n"
+    "{% endfor %}"
+)
+
+
+def template_name(index, fanout=32):
+    """ Return the '/' separated name of the index-th template of a tree
+
+    Templates are spread over nested directories of at most fanout entries,
+    so a tree of 100k templates is 4 levels deep with the default fanout.
+    """
+    parts = []
+    directory = index // fanout
+    while directory:
+        parts.append('d{}'.format(directory % fanout))
+        directory //= fanout
+    return '/'.join(list(reversed(parts)) + ['t{}.j2'.format(index)])
+
+
+def write_template_tree(directory, files, fanout=32):
+    """ Template Tree Generator
+
+    Writes a tree of small templates to a directory.
+
+    Parameters:
+        directory (str): required
+        files     (int): required
+        fanout    (int): optional [default=32]
+
+    Returns:
+        list of the template names
+    """
+    names = []
+    for index in range(files):
+        name = template_name(index, fanout)
+        path = os.path.join(directory, *name.split('/'))
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with open(path, 'w') as template_file:
+            template_file.write(ITEM_TEMPLATE.format(index=index))
+        names.append(name)
+    return names
+
+
+def write_include_chain(directory, depth):
+    """ Include Chain Generator
+
+    Writes templates chain/c0.j2 to chain/c{depth}.j2, each including the
+    next one inside a block of a shared base layout.
+
+    Parameters:
+        directory (str): required
+        depth     (int): required
+
+    Returns:
+        str name of the first template of the chain
+    """
+    chain_directory = os.path.join(directory, 'chain')
+    if not os.path.isdir(chain_directory):
+        os.makedirs(chain_directory)
+    with open(os.path.join(chain_directory, 'layout.j2'), 'w') as layout:
+        layout.write("<{% block body %}{% endblock %}>")
+    for index in range(depth + 1):
+        if index < depth:
+            body = "{{{{ title }}}} {index} {{% include 'chain/c{next}.j2' %}}"
+            body = body.format(index=index, next=index + 1)
+        else:
+            body = "{{ items | length }} items"
+        with open(
+            os.path.join(chain_directory, 'c{}.j2'.format(index)), 'w'
+        ) as template_file:
+            template_file.write(
+                "{% extends 'chain/layout.j2' %}{% block body %}" + body +
+                "{% endblock %}"
+            )
+    return 'chain/c0.j2'
+
+
+def write_loop_template(directory):
+    """ Write the large loop template, returning its name """
+    with open(os.path.join(directory, 'loop.j2'), 'w') as template_file:
+        template_file.write(LOOP_TEMPLATE)
+    return 'loop.j2'
+
+
+def make_context(items, seed=0):
+    """ Context Payload Generator
+
+    Returns a reproducible context with a list of items, each with nested
+    tags and attributes.
+
+    Parameters:
+        items (int): required
+        seed  (int): optional [default=0]
+
+    Returns:
+        dict
+    """
+    generator = random.Random(seed)
+    return {
+        'title': 'Benchmark report',
+        'items': [
+            {
+                'id': index,
+                'name': 'item-{}'.format(index),
+                'price': round(generator.uniform(1, 1000), 2),
+                'tags': [
+                    'tag{}'.format(generator.randrange(100))
+                    for _ in range(generator.randrange(4))
+                ],
+                'attributes': {
+                    'weight': generator.randrange(1000),
+                    'active': generator.random() < 0.5,
+                    'dimensions': [generator.randrange(100) for _ in range(3)]
+                }
+            }
+            for index in range(items)
+        ]
+    }
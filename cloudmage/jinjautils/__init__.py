@@ -1,2 +1,16 @@
 from .jinja import JinjaUtils
+from .cache import TemplateCache, TemplateBytecodeCache, RenderCache
+from .results import RenderResult, WriteResult
+from .aio import AsyncRenderer
+from .manifest import DigestManifest
+from .writer import OutputWriter
+from .backup import BackupPolicy
+from .serializers import JsonSerializer
+from .deps import DependencyGraph
+from .watch import TemplateWatcher
+from .loaders import LayeredLoader
+from .metrics import Metrics
+from .profiler import TemplateProfiler
+from .server import TemplateServer
+from .client import TemplateClient
 name = 'jinjautils'
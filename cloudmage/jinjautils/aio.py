@@ -0,0 +1,343 @@
+##############################################################################
+# CloudMage : Jinja Asyncio Renderer
+# ============================================================================
+# CloudMage Jinja Helper Object Utility/Library
+#   - Asyncio render and write pipeline built on a JinjaUtils object.
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/13/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Pip Installed Modules:
+from jinja2 import Environment, FunctionLoader, Template
+
+# Import Package Modules
+from .results import RenderResult
+from .loaders import create_loader
+
+# Import Base Python Modules
+from functools import partial
+import asyncio
+import inspect
+import os
+
+
+def _load_template_file(template_path):
+    """ Read a template file, reloading it when its mtime changes """
+    template_mtime = os.path.getmtime(template_path)
+    with open(template_path) as template_file:
+        source = template_file.read()
+
+    def uptodate():
+        try:
+            return os.path.getmtime(template_path) == template_mtime
+        except OSError:
+            return False
+
+    return source, template_path, uptodate
+
+
+#####################
+# Class Definition: #
+#####################
+class AsyncRenderer(object):
+    """ CloudMage Asyncio Renderer
+
+    This class renders and writes templates from asyncio code without
+    blocking the event loop. Templates are rendered with Jinja environments
+    created with enable_async, built from the template_directory,
+    trim_blocks, lstrip_blocks and bytecode_cache settings of the wrapped
+    JinjaUtils object, so template variables can be awaitables and async
+    generators. Template loading and file writes (including backups) run in
+    an executor. At most concurrency renders and writes run at once.
+    """
+
+    def __init__(self, jinja_utils, concurrency=16, executor=None):
+        """ AsyncRenderer Class Constructor
+
+        Parameters:
+            jinja_utils (obj): required
+            concurrency (int): optional [default=16]
+            executor    (obj): optional [default=None]
+
+        Attributes:
+            self.jinja_utils   (obj)  : public
+            self.concurrency   (int)  : public
+            self.executor      (obj)  : public
+            self._environments (dict) : private
+            self._semaphore    (obj)  : private
+            self._loop         (obj)  : private
+        """
+        self.jinja_utils = jinja_utils
+        if (
+            isinstance(concurrency, int) and
+            not isinstance(concurrency, bool) and
+            concurrency > 0
+        ):
+            self.concurrency = concurrency
+        else:
+            self.concurrency = 16
+        self.executor = executor
+        self._environments = {}
+        self._semaphore = None
+        self._loop = None
+
+    ############################################
+    # Environment and Concurrency Helpers:     #
+    ############################################
+    def _get_semaphore(self):
+        """ Return the concurrency semaphore for the running event loop """
+        loop = asyncio.get_event_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._loop = loop
+        return self._semaphore
+
+    def _run_in_executor(self, function, *args):
+        """ Run a blocking function in the executor """
+        return asyncio.get_event_loop().run_in_executor(
+            self.executor,
+            function,
+            *args
+        )
+
+    @staticmethod
+    async def _resolve_awaitables(context):
+        """ Await the awaitable values of a context dict in place """
+        awaitable_keys = [
+            key for key, value in context.items() if inspect.isawaitable(value)
+        ]
+        if awaitable_keys:
+            values = await asyncio.gather(*[
+                context[key] for key in awaitable_keys
+            ])
+            context.update(zip(awaitable_keys, values))
+
+    def _get_environment(self, from_file):
+        """ Async Environment Getter
+
+        Returns the async Jinja Environment used for directory or file path
+        templates, matching the current settings of the JinjaUtils object.
+
+        Parameters:
+            from_file (bool): required
+
+        Returns:
+            Jinja Environment object
+        """
+        jinja_utils = self.jinja_utils
+        environment_key = (
+            from_file,
+            None if from_file else tuple(jinja_utils._template_roots),
+            jinja_utils._trim_blocks,
+            jinja_utils._lstrip_blocks,
+            jinja_utils._bytecode_cache,
+            jinja_utils._json_serializer
+        )
+        environment = self._environments.get(environment_key)
+        if environment is None:
+            if from_file:
+                loader = FunctionLoader(_load_template_file)
+            else:
+                loader = create_loader(
+                    jinja_utils._template_roots,
+                    jinja_utils._template_index
+                )
+            environment = Environment(
+                loader=loader,
+                trim_blocks=jinja_utils._trim_blocks,
+                lstrip_blocks=jinja_utils._lstrip_blocks,
+                bytecode_cache=jinja_utils._bytecode_cache,
+                enable_async=True
+            )
+            jinja_utils._json_serializer.install(environment)
+            environment = self._environments.setdefault(
+                environment_key,
+                environment
+            )
+        return environment
+
+    def _load_template(self, template):
+        """ Blocking Template Loader
+
+        Returns the async Jinja Template for a template name in the template
+        directory of the JinjaUtils object, or a template file path.
+
+        Parameters:
+            template (str): required
+
+        Returns:
+            Jinja Template object, or None if the template wasn't found
+        """
+        if os.path.isfile(template) and os.access(template, os.R_OK):
+            return self._get_environment(True).get_template(
+                os.path.abspath(template)
+            )
+        template_index = self.jinja_utils._template_index
+        if template_index is not None and template_index.find(template):
+            return self._get_environment(False).get_template(template)
+        return None
+
+    ############################################
+    # Async Template Methods:                  #
+    ############################################
+    async def get_template(self, template):
+        """ Async Get Template Method
+
+        Returns the async Jinja Template for a template name or file path,
+        loading and compiling it in the executor.
+
+        Parameters:
+            template (str): required
+
+        Returns:
+            Jinja Template object, or None if the template wasn't found
+        """
+        return await self._run_in_executor(self._load_template, template)
+
+    async def render(self, template, context=None, **kwargs):
+        """ Async Render Method
+
+        Renders a template with the Jinja render_async method. The template
+        can be an async Jinja Template object, a template name or a template
+        file path. Template variables are passed as a context dict, keyword
+        arguments, or both. Variables that are awaitables are awaited
+        concurrently before rendering, and async generators and async
+        functions can be used directly in the template.
+
+        Parameters:
+            template (str):  required
+            context  (dict): optional [default=None]
+            **kwargs (dict): optional
+
+        Returns:
+            RenderResult object
+        """
+        template_name = getattr(template, 'name', template)
+        try:
+            async with self._get_semaphore():
+                if not isinstance(template, Template):
+                    template = await self.get_template(template)
+                    if template is None:
+                        return RenderResult(
+                            template_name,
+                            error="Template not found: {}".format(
+                                template_name
+                            )
+                        )
+                template_context = dict(context or {}, **kwargs)
+                await self._resolve_awaitables(template_context)
+                output = await template.render_async(template_context)
+            return RenderResult(template_name, output)
+        except Exception as e:
+            return RenderResult(
+                template_name,
+                error="{}: {}".format(type(e).__name__, e)
+            )
+
+    async def write(
+        self,
+        rendered,
+        output_directory,
+        output_file,
+        backup=True,
+        skip_unchanged=False
+    ):
+        """ Async Write Method
+
+        Writes a RenderResult or rendered string to disk in the executor,
+        using the JinjaUtils write_template method, so output paths are
+        validated, existing files backed up and unchanged files skipped the
+        same way as the write method.
+
+        Parameters:
+            rendered         (obj):  required
+            output_directory (str):  required
+            output_file      (str):  required
+            backup           (bool): optional [default=True]
+            skip_unchanged   (bool): optional [default=False]
+
+        Returns:
+            WriteResult object
+        """
+        async with self._get_semaphore():
+            return await self._run_in_executor(partial(
+                self.jinja_utils.write_template,
+                rendered,
+                output_directory,
+                output_file,
+                backup=backup,
+                skip_unchanged=skip_unchanged
+            ))
+
+    async def render_to_file(
+        self,
+        template,
+        output_directory,
+        output_file,
+        context=None,
+        backup=True
+    ):
+        """ Async Render To File Method
+
+        Renders a template and writes the output to disk.
+
+        Parameters:
+            template         (str):  required
+            output_directory (str):  required
+            output_file      (str):  required
+            context          (dict): optional [default=None]
+            backup           (bool): optional [default=True]
+
+        Returns:
+            tuple of the RenderResult and WriteResult objects
+        """
+        render_result = await self.render(template, context)
+        write_result = await self.write(
+            render_result,
+            output_directory,
+            output_file,
+            backup=backup
+        )
+        return render_result, write_result
+
+    async def render_many(self, template, items, backup=True):
+        """ Async Batch Render Method
+
+        Renders a template for every (context, output_path) pair in items
+        concurrently, bounded by the renderer concurrency. When an
+        output_path is None, the output is only rendered.
+
+        Parameters:
+            template (str):      required
+            items    (iterable): required
+            backup   (bool):     optional [default=True]
+
+        Returns:
+            list of (RenderResult, WriteResult or None) tuples in input order
+        """
+        if not isinstance(template, Template):
+            loaded_template = await self.get_template(template)
+            if loaded_template is not None:
+                template = loaded_template
+
+        async def render_item(context, output_path):
+            render_result = await self.render(template, context)
+            if output_path is None:
+                return render_result, None
+            output_directory, output_file = os.path.split(output_path)
+            write_result = await self.write(
+                render_result,
+                output_directory or os.curdir,
+                output_file,
+                backup=backup
+            )
+            return render_result, write_result
+
+        return await asyncio.gather(*[
+            render_item(context, output_path)
+            for context, output_path in items
+        ])
@@ -0,0 +1,357 @@
+##############################################################################
+# CloudMage : Jinja Output Backup Policy
+# ============================================================================
+# CloudMage Jinja Helper Object Utility/Library
+#   - Backup strategies, rotation and compression of replaced output files.
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/13/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Optional Pip Installed Modules:
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+# Import Base Python Modules
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import threading
+import tempfile
+import shutil
+import gzip
+import re
+import os
+
+# Backup strategies supported by the BackupPolicy.
+BACKUP_COPY = 'copy'
+BACKUP_RENAME = 'rename'
+BACKUP_HARDLINK = 'hardlink'
+BACKUP_STRATEGIES = (BACKUP_COPY, BACKUP_RENAME, BACKUP_HARDLINK)
+
+# Backup compression formats and the extentions they append.
+COMPRESSION_EXTENTIONS = {'gzip': '.gz', 'zstd': '.zst'}
+
+# Matches the timestamp, collision counter and compression extention of a
+# backup file name, following the backed up file name.
+_BACKUP_SUFFIX = re.compile(r'_(\d{8}_\d{6})(?:_(\d+))?\.bak(\.gz|\.zst)?$')
+
+
+def backup_timestamp():
+    """ Return the timestamp used in backup file names """
+    return datetime.now().strftime("%Y%m%d_%H%M%S")
+
+
+def _compress_gzip(source, destination):
+    with open(source, 'rb') as source_file:
+        with gzip.GzipFile(fileobj=destination, mode='wb') as gzip_file:
+            shutil.copyfileobj(source_file, gzip_file)
+
+
+def _compress_zstd(source, destination):
+    with open(source, 'rb') as source_file:
+        zstandard.ZstdCompressor().copy_stream(source_file, destination)
+
+
+_COMPRESSORS = {'gzip': _compress_gzip, 'zstd': _compress_zstd}
+
+
+def compress_file(path, compression):
+    """ Backup File Compressor
+
+    Compresses a file to the file path with the compression extention
+    appended, then removes the uncompressed file. The compressed file is
+    written to a temporary file that is renamed into place. If the
+    uncompressed file was removed while it was being compressed, by backup
+    rotation, the compressed file is removed too.
+
+    Parameters:
+        path        (str): required
+        compression (str): required
+
+    Returns:
+        str path of the compressed file, or None if it was removed
+    """
+    compressed_path = path + COMPRESSION_EXTENTIONS[compression]
+    temp_fd, temp_path = tempfile.mkstemp(
+        prefix=".{}.".format(os.path.basename(compressed_path)),
+        suffix='.tmp',
+        dir=os.path.dirname(os.path.abspath(path))
+    )
+    try:
+        with os.fdopen(temp_fd, 'wb') as temp_file:
+            _COMPRESSORS[compression](path, temp_file)
+        shutil.copymode(path, temp_path)
+        os.replace(temp_path, compressed_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        os.remove(compressed_path)
+        return None
+    return compressed_path
+
+
+#####################
+# Class Definition: #
+#####################
+class BackupPolicy(object):
+    """ CloudMage Output Backup Policy
+
+    This class backs up an existing output file before it is replaced. The
+    backup is named <file>_YYYYMMDD_HMS.bak after the output file without
+    its extention, and a _N counter is added before .bak only when a backup
+    with that name already exists, so backups taken within the same second
+    are never overwritten.
+
+    The strategy controls how the backup is taken: 'copy' copies the output
+    file, while 'rename' and 'hardlink' link the backup name to the output
+    file, which then has to be replaced by a new file instead of being
+    written in place (see replaces_output). With rename, the previous output
+    ends up under the backup name as if it was moved there, but the output
+    file is only replaced once the new output is complete, so it's never
+    missing. Links fall back to a copy on file systems that don't support
+    them. Neither rename nor hardlink read or write the previous output.
+
+    When keep is set, only the newest keep backups of an output file are
+    kept, and older backups are removed after each backup. When compression
+    is set to 'gzip' or 'zstd' (which requires the zstandard package),
+    backups are compressed by a background thread, and the wait method
+    blocks until every pending compression has finished.
+    """
+
+    def __init__(self, strategy=BACKUP_COPY, keep=None, compression=None):
+        """ BackupPolicy Class Constructor
+
+        Parameters:
+            strategy    (str): optional [default='copy']
+            keep        (int): optional [default=None]
+            compression (str): optional [default=None]
+
+        Attributes:
+            self.strategy     (str)  : public
+            self.keep         (int)  : public
+            self.compression  (str)  : public
+            self._executor    (obj)  : private
+            self._pending     (list) : private
+            self._lock        (obj)  : private
+
+        Raises:
+            ValueError if a setting is invalid or zstd isn't available
+        """
+        if strategy not in BACKUP_STRATEGIES:
+            raise ValueError(
+                "strategy expected one of {} but received: {}".format(
+                    BACKUP_STRATEGIES, strategy
+                )
+            )
+        if keep is not None and (
+            not isinstance(keep, int) or isinstance(keep, bool) or keep < 1
+        ):
+            raise ValueError(
+                "keep expected positive int but received: {}".format(keep)
+            )
+        if compression is not None and (
+            compression not in COMPRESSION_EXTENTIONS
+        ):
+            raise ValueError(
+                "compression expected one of {} but received: {}".format(
+                    tuple(COMPRESSION_EXTENTIONS), compression
+                )
+            )
+        if compression == 'zstd' and zstandard is None:
+            raise ValueError(
+                "zstd compression requires the zstandard package"
+            )
+        self.strategy = strategy
+        self.keep = keep
+        self.compression = compression
+        self._executor = None
+        self._pending = []
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        """ Pickle the backup settings only, for process pool workers """
+        return {
+            'strategy': self.strategy,
+            'keep': self.keep,
+            'compression': self.compression
+        }
+
+    def __setstate__(self, state):
+        self.__init__(state['strategy'], state['keep'], state['compression'])
+
+    def __repr__(self):
+        return "BackupPolicy(strategy={!r}, keep={!r}, compression={!r})"\
+            .format(self.strategy, self.keep, self.compression)
+
+    def replaces_output(self, backup_path):
+        """ Return True if the output must be replaced, not written in place
+
+        A renamed or hardlinked backup shares its data with the output file,
+        so writing the output in place would modify the backup too.
+        """
+        return backup_path is not None and self.strategy != BACKUP_COPY
+
+    def _candidates(self, output_path, timestamp):
+        """ Yield the backup file names, adding a _N counter on collision """
+        raw_filename, raw_file_extention = os.path.splitext(output_path)
+        yield "{}_{}.bak".format(raw_filename, timestamp)
+        counter = 1
+        while True:
+            yield "{}_{}_{}.bak".format(raw_filename, timestamp, counter)
+            counter += 1
+
+    def _is_taken(self, backup_path):
+        """ Return True if the backup name, or a compressed copy, exists """
+        return os.path.lexists(backup_path) or any(
+            os.path.lexists(backup_path + extention)
+            for extention in COMPRESSION_EXTENTIONS.values()
+        )
+
+    def _take_backup(self, output_path, backup_path):
+        """ Create the backup file, raising FileExistsError if it exists """
+        if self.strategy != BACKUP_COPY:
+            # The output file is kept until the new output replaces it.
+            try:
+                os.link(output_path, backup_path)
+                return
+            except FileExistsError:
+                raise
+            except OSError:
+                # File systems without hardlinks fall back to a copy.
+                pass
+        with open(output_path, 'rb') as source_file:
+            with open(backup_path, 'xb') as backup_file:
+                shutil.copyfileobj(source_file, backup_file)
+        shutil.copymode(output_path, backup_path)
+
+    def backup(self, output_path, timestamp=None):
+        """ Output File Backup Method
+
+        Backs up an existing output file, removes backups beyond the keep
+        limit, and queues the backup for compression.
+
+        Parameters:
+            output_path (str): required
+            timestamp   (str): optional [default=now]
+
+        Returns:
+            str path of the backup file, or None if the output doesn't exist
+        """
+        if not os.path.exists(output_path):
+            return None
+        if timestamp is None:
+            timestamp = backup_timestamp()
+        for backup_path in self._candidates(output_path, timestamp):
+            if self._is_taken(backup_path):
+                continue
+            try:
+                self._take_backup(output_path, backup_path)
+                break
+            except FileExistsError:
+                continue
+        if self.keep is not None:
+            self.rotate(output_path)
+        if self.compression is not None:
+            self._compress(backup_path)
+        return backup_path
+
+    def backups(self, output_path):
+        """ Backup Listing Method
+
+        Returns the backups of an output file, oldest first.
+
+        Parameters:
+            output_path (str): required
+
+        Returns:
+            list of backup file paths
+        """
+        output_directory, output_file = os.path.split(
+            os.path.abspath(output_path)
+        )
+        raw_filename = os.path.splitext(output_file)[0] + '_'
+        found = []
+        try:
+            directory_entries = os.listdir(output_directory)
+        except OSError:
+            return found
+        for entry in directory_entries:
+            if not entry.startswith(raw_filename):
+                continue
+            match = _BACKUP_SUFFIX.match(entry, len(raw_filename) - 1)
+            if match is None:
+                continue
+            found.append((
+                match.group(1),
+                int(match.group(2) or 0),
+                os.path.join(output_directory, entry)
+            ))
+        found.sort()
+        return [backup_path for timestamp, counter, backup_path in found]
+
+    def rotate(self, output_path):
+        """ Backup Rotation Method
+
+        Removes the oldest backups of an output file beyond the keep limit.
+
+        Parameters:
+            output_path (str): required
+
+        Returns:
+            int number of backups removed
+        """
+        if self.keep is None:
+            return 0
+        removed = 0
+        for backup_path in self.backups(output_path)[:-self.keep]:
+            try:
+                os.remove(backup_path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def _compress(self, backup_path):
+        """ Queue a backup file for background compression """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1)
+            self._pending = [
+                future for future in self._pending if not future.done()
+            ]
+            self._pending.append(self._executor.submit(
+                compress_file,
+                backup_path,
+                self.compression
+            ))
+
+    def wait(self):
+        """ Compression Wait Method
+
+        Blocks until every queued backup compression has finished.
+
+        Returns:
+            list of compressed backup paths, excluding rotated backups
+
+        Raises:
+            The first exception raised by a compression
+        """
+        with self._lock:
+            pending = self._pending
+            self._pending = []
+        return [
+            compressed_path for compressed_path in (
+                future.result() for future in pending
+            ) if compressed_path is not None
+        ]
@@ -0,0 +1,555 @@
+##############################################################################
+# CloudMage : Jinja Template Bundles and Archives
+# ============================================================================
+# CloudMage Jinja Helper Object Utility/Library
+#   - Memory mapped template bundles, and zip and tar template archives.
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/13/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Pip Installed Modules:
+from jinja2.exceptions import TemplateNotFound
+from jinja2.bccache import bc_magic
+
+# Import Package Modules
+from .cache import TemplateBytecodeCache
+
+# Import Base Python Modules
+import threading
+import tempfile
+import tarfile
+import zipfile
+import hashlib
+import marshal
+import struct
+import json
+import mmap
+import abc
+import os
+
+# Bundle header: magic, format version, flags, index offset and length.
+BUNDLE_MAGIC = b'JTBUNDLE'
+BUNDLE_VERSION = 1
+_HEADER = struct.Struct('<8sHHQQ')
+
+# Index entry fields of a bundled template.
+(
+    _SOURCE_OFFSET, _SOURCE_LENGTH, _CHECKSUM, _CODE_OFFSET, _CODE_LENGTH
+) = range(5)
+
+
+def source_checksum(source):
+    """ Return the checksum of an encoded template source """
+    return hashlib.blake2b(source, digest_size=16).hexdigest()
+
+
+def _file_identity(path):
+    """ Return the inode, size and mtime of a file, or None if missing """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+def _read_directory(directory):
+    """ Return the '/' separated names and sources of a directory's files """
+    templates = {}
+    for root, _, files in os.walk(directory):
+        relative_root = os.path.relpath(root, directory)
+        for filename in files:
+            if relative_root == '.':
+                name = filename
+            else:
+                name = '/'.join(relative_root.split(os.sep) + [filename])
+            with open(os.path.join(root, filename), 'rb') as template_file:
+                templates[name] = template_file.read().decode('utf-8')
+    return templates
+
+
+def write_bundle(bundle_path, templates, environment=None):
+    """ Template Bundle Writer
+
+    Writes templates to a single bundle file: the encoded template sources,
+    followed by the code of every template compiled with the given Jinja
+    Environment, and an index of the template names, offsets and source
+    checksums. Templates that fail to compile are bundled without code. The
+    bundle is written to a temporary file renamed into place.
+
+    Parameters:
+        bundle_path (str):         required
+        templates   (dict or str): required, names to sources, or directory
+        environment (obj):         optional [default=None], compiles code
+
+    Returns:
+        int number of bundled templates
+    """
+    if isinstance(templates, str):
+        templates = _read_directory(templates)
+    bundle_path = os.path.abspath(bundle_path)
+    entries = {}
+    bundle_fd, temp_path = tempfile.mkstemp(
+        prefix=os.path.basename(bundle_path),
+        suffix='.tmp',
+        dir=os.path.dirname(bundle_path)
+    )
+    try:
+        with os.fdopen(bundle_fd, 'wb') as bundle_file:
+            bundle_file.write(b'\0' * _HEADER.size)
+            offset = _HEADER.size
+            for name in sorted(templates):
+                source = templates[name].encode('utf-8')
+                bundle_file.write(source)
+                entries[name] = [
+                    offset, len(source), source_checksum(source), -1, 0
+                ]
+                offset += len(source)
+            if environment is not None:
+                for name in sorted(templates):
+                    try:
+                        code = environment.compile(
+                            templates[name],
+                            name,
+                            os.path.join(bundle_path, *name.split('/'))
+                        )
+                    except Exception:
+                        continue
+                    code = marshal.dumps(code)
+                    bundle_file.write(code)
+                    entries[name][_CODE_OFFSET] = offset
+                    entries[name][_CODE_LENGTH] = len(code)
+                    offset += len(code)
+            index = json.dumps({
+                'bytecode_magic': bc_magic.hex(),
+                'environment': None if environment is None else (
+                    TemplateBytecodeCache._get_environment_key(environment)
+                ),
+                'templates': entries
+            }, sort_keys=True).encode('utf-8')
+            bundle_file.write(index)
+            bundle_file.seek(0)
+            bundle_file.write(_HEADER.pack(
+                BUNDLE_MAGIC, BUNDLE_VERSION, 0, offset, len(index)
+            ))
+        os.replace(temp_path, bundle_path)
+    except Exception:
+        os.remove(temp_path)
+        raise
+    return len(entries)
+
+
+def is_bundle(path):
+    """ Return True if the file starts with the bundle magic """
+    try:
+        with open(path, 'rb') as bundle_file:
+            return bundle_file.read(len(BUNDLE_MAGIC)) == BUNDLE_MAGIC
+    except OSError:
+        return False
+
+
+def open_archive(path):
+    """ Template Archive Opener
+
+    Returns a TemplateBundle for a bundle file, or a TemplateArchive for a
+    zip or tar file.
+
+    Parameters:
+        path (str): required
+
+    Returns:
+        TemplateBundle or TemplateArchive object
+
+    Raises:
+        ValueError if the file isn't a bundle, zip or tar file
+    """
+    if is_bundle(path):
+        return TemplateBundle(path)
+    return TemplateArchive(path)
+
+
+#####################
+# Class Definition: #
+#####################
+class _ArchiveIndex(object, metaclass=abc.ABCMeta):
+    """ TemplateIndex interface of an archive, reopened when replaced
+
+    Subclasses open the archive in _open, and close the handles of the
+    archive in _close. Handles are read under the lock, so a refresh in
+    another thread can't close them part way through a read.
+    """
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        self._lock = threading.Lock()
+        self._identity = None
+        self._checksums = {}
+        self._open()
+
+    def __contains__(self, name):
+        return name in self._checksums
+
+    def __len__(self):
+        return len(self._checksums)
+
+    @property
+    def scanned(self):
+        """ Archives are indexed when they are opened """
+        return True
+
+    @abc.abstractmethod
+    def _open(self):
+        """ Open the archive and index its templates """
+
+    def _close(self):
+        """ Close the handles of the archive """
+
+    def close(self):
+        """ Close the archive, which is reopened when it's read again """
+        with self._lock:
+            self._close()
+            self._identity = None
+
+    def names(self):
+        """ Return the sorted template names """
+        return sorted(self._checksums)
+
+    def iter_names(self):
+        """ Yield the sorted template names """
+        for name in self.names():
+            yield name
+
+    def scan(self):
+        """ Reopen the archive if it was replaced, returning its names """
+        self.refresh()
+        return self.names()
+
+    def find(self, name):
+        """ Return True if the archive holds the template name """
+        return name in self._checksums
+
+    def refresh(self, changed=None):
+        """ Archive Refresh Method
+
+        Reopens the archive if the file was replaced since it was opened.
+
+        Parameters:
+            changed (list): optional [default=None], ignored
+
+        Returns:
+            int number of template names added, removed or changed
+        """
+        with self._lock:
+            if _file_identity(self.path) == self._identity:
+                return 0
+            previous = self._checksums
+            self._open()
+            return sum(
+                1 for name in set(previous) | set(self._checksums)
+                if previous.get(name) != self._checksums.get(name)
+            )
+
+    def uptodate(self):
+        """ Archive Up To Date Method
+
+        Returns False once the archive file was replaced, reopening it, so
+        the templates Jinja compiles again are read from the new archive.
+
+        Returns:
+            bool
+        """
+        if _file_identity(self.path) == self._identity:
+            return True
+        try:
+            self.refresh()
+        except (OSError, ValueError):
+            # The archive is kept until it's replaced by a valid one.
+            pass
+        return False
+
+    def checksum(self, name):
+        """ Return the source checksum of a template, or None """
+        return self._checksums.get(name)
+
+    def _get_filename(self, name):
+        return os.path.join(self.path, *name.split('/'))
+
+    def load_code(self, environment, name):
+        """ Return the precompiled code of a template, or None """
+        return None
+
+
+class TemplateBundle(_ArchiveIndex):
+    """ CloudMage Template Bundle
+
+    This class memory maps a template bundle written by write_bundle. The
+    bundle index of template names, offsets and checksums is read when the
+    bundle is opened, and template sources and precompiled code are read
+    from slices of the memory mapped file, without opening or stating any
+    per template file. Precompiled code is used for Environments with the
+    same options as the Environment the bundle was compiled with, on the
+    same Python and Jinja bytecode versions. Replacing the bundle file, for
+    instance with os.replace, is picked up by refresh.
+    """
+
+    def __init__(self, path):
+        """ TemplateBundle Class Constructor
+
+        Parameters:
+            path (str): required
+
+        Attributes:
+            self.path             (str)  : public
+            self.environment_key  (str)  : public
+            self._mmap            (obj)  : private
+            self._templates       (dict) : private
+            self._code_valid      (bool) : private
+            self._checksums       (dict) : private
+            self._identity        (obj)  : private
+            self._lock            (obj)  : private
+
+        Raises:
+            ValueError if the file isn't a valid bundle
+        """
+        self.environment_key = None
+        self._mmap = None
+        self._templates = {}
+        self._code_valid = False
+        super(TemplateBundle, self).__init__(path)
+
+    def _open(self):
+        """ Memory map the bundle file and read its index """
+        with open(self.path, 'rb') as bundle_file:
+            identity = _file_identity(self.path)
+            try:
+                mapped = mmap.mmap(
+                    bundle_file.fileno(), 0, access=mmap.ACCESS_READ
+                )
+            except ValueError:
+                raise ValueError("{} is empty".format(self.path))
+        try:
+            magic, version, _, index_offset, index_length = (
+                _HEADER.unpack_from(mapped)
+            )
+            if magic != BUNDLE_MAGIC or version != BUNDLE_VERSION:
+                raise ValueError
+            index = json.loads(
+                mapped[index_offset:index_offset + index_length].decode(
+                    'utf-8'
+                )
+            )
+            templates = index['templates']
+        except (ValueError, KeyError, struct.error):
+            mapped.close()
+            raise ValueError(
+                "{} isn't a version {} template bundle".format(
+                    self.path, BUNDLE_VERSION
+                )
+            )
+        self._close()
+        self._mmap = mapped
+        self._templates = templates
+        self._checksums = dict(
+            (name, entry[_CHECKSUM]) for name, entry in templates.items()
+        )
+        self.environment_key = index.get('environment')
+        self._code_valid = index.get('bytecode_magic') == bc_magic.hex()
+        self._identity = identity
+
+    def _close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def get_source(self, name):
+        """ Bundled Template Source Method
+
+        Parameters:
+            name (str): required
+
+        Returns:
+            tuple of the source, filename and uptodate function
+        """
+        self.uptodate()
+        with self._lock:
+            entry = self._templates.get(name)
+            if entry is None or self._mmap is None:
+                raise TemplateNotFound(name)
+            offset = entry[_SOURCE_OFFSET]
+            source = self._mmap[offset:offset + entry[_SOURCE_LENGTH]]
+        return source.decode('utf-8'), self._get_filename(name), self.uptodate
+
+    def verify(self, name):
+        """ Return True if a bundled template source matches its checksum """
+        with self._lock:
+            entry = self._templates.get(name)
+            if entry is None or self._mmap is None:
+                return False
+            offset = entry[_SOURCE_OFFSET]
+            source = self._mmap[offset:offset + entry[_SOURCE_LENGTH]]
+        return source_checksum(source) == entry[_CHECKSUM]
+
+    def load_code(self, environment, name):
+        """ Precompiled Code Method
+
+        Returns the precompiled code of a template for an Environment, or
+        None if the template has no code compiled for the Environment
+        options, Python version and Jinja version.
+
+        Parameters:
+            environment (obj): required
+            name        (str): required
+
+        Returns:
+            code object or None
+        """
+        self.uptodate()
+        environment_key = TemplateBytecodeCache._get_environment_key(
+            environment
+        )
+        with self._lock:
+            entry = self._templates.get(name)
+            if (
+                entry is None or entry[_CODE_OFFSET] < 0 or
+                self._mmap is None or not self._code_valid or
+                self.environment_key != environment_key
+            ):
+                return None
+            offset = entry[_CODE_OFFSET]
+            code = self._mmap[offset:offset + entry[_CODE_LENGTH]]
+        try:
+            return marshal.loads(code)
+        except (ValueError, EOFError, TypeError):
+            return None
+
+
+class TemplateArchive(_ArchiveIndex):
+    """ CloudMage Template Archive
+
+    This class serves templates from a zip or tar file without unpacking
+    it. The archive members are indexed when the archive is opened. Zip
+    members are read from the archive on demand, uncompressed tar members
+    are read from slices of the memory mapped archive, and compressed tar
+    archives, which can't be read at random offsets, are decompressed once
+    into memory.
+    """
+
+    def __init__(self, path):
+        """ TemplateArchive Class Constructor
+
+        Parameters:
+            path (str): required
+
+        Attributes:
+            self.path        (str)  : public
+            self._zip        (obj)  : private
+            self._mmap       (obj)  : private
+            self._members    (dict) : private
+            self._checksums  (dict) : private
+            self._identity   (obj)  : private
+            self._lock       (obj)  : private
+
+        Raises:
+            ValueError if the file isn't a zip or tar file
+        """
+        self._zip = None
+        self._mmap = None
+        self._members = {}
+        super(TemplateArchive, self).__init__(path)
+
+    def _open(self):
+        """ Open the archive and index its members """
+        identity = _file_identity(self.path)
+        if zipfile.is_zipfile(self.path):
+            archive = zipfile.ZipFile(self.path)
+            members = dict(
+                (info.filename, info) for info in archive.infolist()
+                if not info.is_dir()
+            )
+            checksums = dict(
+                (name, '{:08x}'.format(info.CRC))
+                for name, info in members.items()
+            )
+            mapped = None
+        elif tarfile.is_tarfile(self.path):
+            mapped, members, checksums = self._open_tar()
+            archive = None
+        else:
+            raise ValueError(
+                "{} isn't a template bundle, zip or tar file".format(
+                    self.path
+                )
+            )
+        self._close()
+        self._zip = archive
+        self._mmap = mapped
+        self._members = members
+        self._checksums = checksums
+        self._identity = identity
+
+    def _close(self):
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def _open_tar(self):
+        """ Index a tar archive, memory mapping it if uncompressed """
+        try:
+            archive = tarfile.open(self.path, 'r:')
+            compressed = False
+        except tarfile.ReadError:
+            archive = tarfile.open(self.path, 'r:*')
+            compressed = True
+        members = {}
+        checksums = {}
+        with archive:
+            for info in archive.getmembers():
+                if not info.isfile():
+                    continue
+                name = info.name
+                if name.startswith('./'):
+                    name = name[2:]
+                if compressed:
+                    members[name] = archive.extractfile(info).read()
+                else:
+                    members[name] = (info.offset_data, info.size)
+                checksums[name] = '{:x}-{:x}-{:x}'.format(
+                    info.chksum, info.size, int(info.mtime)
+                )
+        mapped = None
+        if not compressed and members:
+            with open(self.path, 'rb') as archive_file:
+                mapped = mmap.mmap(
+                    archive_file.fileno(), 0, access=mmap.ACCESS_READ
+                )
+        return mapped, members, checksums
+
+    def get_source(self, name):
+        """ Archived Template Source Method
+
+        Parameters:
+            name (str): required
+
+        Returns:
+            tuple of the source, filename and uptodate function
+        """
+        self.uptodate()
+        with self._lock:
+            member = self._members.get(name)
+            if member is None:
+                raise TemplateNotFound(name)
+            if self._zip is not None:
+                source = self._zip.read(member)
+            elif self._mmap is not None:
+                source = self._mmap[member[0]:member[0] + member[1]]
+            elif isinstance(member, bytes):
+                source = member
+            else:
+                raise TemplateNotFound(name)
+        return source.decode('utf-8'), self._get_filename(name), self.uptodate
@@ -0,0 +1,716 @@
+##############################################################################
+# CloudMage : Jinja Template Caches
+# ============================================================================
+# CloudMage Jinja Helper Object Utility/Library
+#   - In-process and on-disk caches used to avoid re-compiling templates,
+#     and re-rendering templates with the same context.
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/13/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Pip Installed Modules:
+from jinja2.bccache import Bucket, FileSystemBytecodeCache, bc_magic
+from jinja2.exceptions import TemplateNotFound
+from jinja2 import meta
+import jinja2
+
+# Import Base Python Modules
+from collections import OrderedDict
+from weakref import WeakKeyDictionary
+import threading
+import tempfile
+import hashlib
+import marshal
+import pickle
+import json
+import mmap
+import time
+import os
+
+
+#####################
+# Class Definition: #
+#####################
+class TemplateCache(object):
+    """ CloudMage Compiled Template Cache
+
+    This class is a thread safe, size bounded, least recently used cache of
+    compiled Jinja Template objects. JinjaUtils uses it for templates loaded
+    by file path, keyed on the template path, modification time, size and the
+    Jinja Environment the template was compiled by, so that repeated loads of
+    an unchanged file skip reading, parsing and compiling the template source.
+    """
+
+    def __init__(self, max_size=256):
+        """ TemplateCache Class Constructor
+
+        Parameters:
+            max_size (int): optional [default=256]
+
+        Attributes:
+            self._max_size  (int)  : private
+            self._templates (dict) : private
+            self._lock      (obj)  : private
+            self.hits       (int)  : public
+            self.misses     (int)  : public
+        """
+        self._max_size = 256
+        self._templates = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.max_size = max_size
+
+    def __len__(self):
+        """ Return the number of cached templates """
+        return len(self._templates)
+
+    @property
+    def max_size(self):
+        """ Max Size Property Getter
+
+        Returns the maximum number of templates held by the cache.
+        """
+        return self._max_size
+
+    @max_size.setter
+    def max_size(self, max_size):
+        """ Max Size Property Setter
+
+        Sets the maximum number of templates held by the cache, evicting the
+        least recently used templates if the cache is now over size. Values
+        that are not a positive int are ignored.
+        """
+        if (
+            isinstance(max_size, int) and
+            not isinstance(max_size, bool) and
+            max_size > 0
+        ):
+            with self._lock:
+                self._max_size = max_size
+                self._evict()
+
+    def _evict(self):
+        """ Evict least recently used templates until the cache fits """
+        while len(self._templates) > self._max_size:
+            self._templates.popitem(last=False)
+
+    def get(self, key):
+        """ Cache Lookup Method
+
+        Returns the template cached under the given key, marking it as the
+        most recently used entry, or None if the key isn't cached.
+
+        Parameters:
+            key (tuple): required
+
+        Returns:
+            Jinja Template object or None
+        """
+        with self._lock:
+            template = self._templates.get(key)
+            if template is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._templates.move_to_end(key)
+            return template
+
+    def set(self, key, template):
+        """ Cache Store Method
+
+        Stores a compiled template under the given key.
+
+        Parameters:
+            key      (tuple): required
+            template (obj):   required
+        """
+        with self._lock:
+            self._templates[key] = template
+            self._templates.move_to_end(key)
+            self._evict()
+
+    def clear(self):
+        """ Remove all cached templates and reset the hit/miss counters """
+        with self._lock:
+            self._templates.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """ Cache Statistics Method
+
+        Returns:
+            dict with hits, misses, size and max_size of the cache
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._templates),
+                'max_size': self._max_size
+            }
+
+
+class TemplateBytecodeCache(FileSystemBytecodeCache):
+    """ CloudMage Persistent Bytecode Cache
+
+    This class is a Jinja bytecode cache that persists compiled template code
+    in a directory on local disk, so that new worker processes and CLI runs
+    can skip compiling templates that another process already compiled. Cache
+    files are written atomically and are shared safely between processes.
+
+    Jinja rejects cached code whose source checksum no longer matches the
+    template source. Unlike the stock Jinja FileSystemBytecodeCache, the
+    cache key also includes the Environment options that change the compiled
+    code (trim_blocks, lstrip_blocks, delimiters, extensions, etc.), so one
+    cache directory can be shared by environments with different settings.
+    When use_mmap is enabled, cache files are memory mapped and unmarshalled
+    in place instead of being read into memory first.
+    """
+
+    def __init__(
+        self,
+        directory,
+        pattern='__jinjautils_%s.cache',
+        use_mmap=False
+    ):
+        """ TemplateBytecodeCache Class Constructor
+
+        Parameters:
+            directory (str):  required
+            pattern   (str):  optional [default='__jinjautils_%s.cache']
+            use_mmap  (bool): optional [default=False]
+
+        Attributes:
+            self.directory (str)  : public
+            self.pattern   (str)  : public
+            self.use_mmap  (bool) : public
+        """
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        super(TemplateBytecodeCache, self).__init__(directory, pattern)
+        self.use_mmap = bool(use_mmap)
+
+    @staticmethod
+    def _get_environment_key(environment):
+        """ Environment Options Key
+
+        Returns a stable string of the Environment options that affect the
+        code Jinja compiles for a template source.
+
+        Parameters:
+            environment (obj): required
+
+        Returns:
+            str
+        """
+        autoescape = environment.autoescape
+        if not isinstance(autoescape, bool):
+            autoescape = 'select'
+        return repr((
+            environment.block_start_string,
+            environment.block_end_string,
+            environment.variable_start_string,
+            environment.variable_end_string,
+            environment.comment_start_string,
+            environment.comment_end_string,
+            environment.line_statement_prefix,
+            environment.line_comment_prefix,
+            environment.trim_blocks,
+            environment.lstrip_blocks,
+            environment.newline_sequence,
+            environment.keep_trailing_newline,
+            sorted(environment.extensions),
+            environment.optimized,
+            getattr(environment, 'is_async', False),
+            autoescape
+        ))
+
+    def get_bucket(self, environment, name, filename, source):
+        """ Cache Bucket Lookup Method
+
+        Returns a Jinja cache Bucket for the given template, keyed on the
+        template name, filename and the environment compile options.
+
+        Parameters:
+            environment (obj): required
+            name        (str): required
+            filename    (str): required
+            source      (str): required
+
+        Returns:
+            Jinja Bucket object
+        """
+        key = hashlib.sha1("{}|{}".format(
+            self.get_cache_key(name, filename),
+            self._get_environment_key(environment)
+        ).encode('utf-8')).hexdigest()
+        bucket = Bucket(environment, key, self.get_source_checksum(source))
+        self.load_bytecode(bucket)
+        return bucket
+
+    def load_bytecode(self, bucket):
+        """ Load Bytecode Method
+
+        Loads cached code into the bucket, memory mapping the cache file when
+        use_mmap is enabled. Missing, empty or stale cache files leave the
+        bucket empty so that the template is compiled again.
+
+        Parameters:
+            bucket (obj): required
+        """
+        if not self.use_mmap:
+            return super(TemplateBytecodeCache, self).load_bytecode(bucket)
+
+        try:
+            cache_file = open(self._get_cache_filename(bucket), 'rb')
+        except OSError:
+            return
+
+        with cache_file:
+            try:
+                cache_map = mmap.mmap(
+                    cache_file.fileno(), 0, access=mmap.ACCESS_READ
+                )
+            except (ValueError, OSError):
+                return
+            with cache_map:
+                if cache_map.read(len(bc_magic)) != bc_magic:
+                    bucket.reset()
+                    return
+                if pickle.load(cache_map) != bucket.checksum:
+                    bucket.reset()
+                    return
+                code_view = memoryview(cache_map)[cache_map.tell():]
+                try:
+                    bucket.code = marshal.loads(code_view)
+                except (EOFError, ValueError, TypeError):
+                    bucket.reset()
+                finally:
+                    code_view.release()
+
+    def dump_bytecode(self, bucket):
+        """ Dump Bytecode Method
+
+        Writes the bucket code to a temporary file in the cache directory and
+        renames it into place, so other processes never read a partially
+        written cache file. Failures to write the cache are ignored, as the
+        template has already been compiled.
+
+        Parameters:
+            bucket (obj): required
+        """
+        cache_filename = self._get_cache_filename(bucket)
+        try:
+            cache_fd, temp_filename = tempfile.mkstemp(
+                prefix=os.path.basename(cache_filename),
+                suffix='.tmp',
+                dir=self.directory
+            )
+        except OSError:
+            return
+        try:
+            with os.fdopen(cache_fd, 'wb') as cache_file:
+                bucket.write_bytecode(cache_file)
+            os.replace(temp_filename, cache_filename)
+        except OSError:
+            try:
+                os.remove(temp_filename)
+            except OSError:
+                pass
+
+
+class RenderCache(object):
+    """ CloudMage Rendered Output Cache
+
+    This class is a thread safe cache of rendered template output, keyed on
+    a fingerprint of the template and the context it was rendered with, so
+    that rendering the same template with the same context again returns
+    the cached output instead of rendering the template.
+
+    The template fingerprint is a hash of the template name, the Jinja
+    options it was compiled with, and its source along with the source of
+    every template it statically includes, imports or extends. It is
+    computed once per compiled Template object, so a template that is
+    reloaded after its file changed gets a new fingerprint. An included
+    template that changes while the including template is still compiled
+    isn't detected until it is reloaded, which ttl or clear can bound. The
+    context is serialized canonically, with the context names sorted and the
+    types of values and the order of dict items preserved. Contexts holding
+    values other than None, bool, int, float, str, list, tuple and dict
+    can't be fingerprinted, and are rendered without the cache.
+
+    The in-memory tier holds at most max_size outputs, and at most max_bytes
+    characters of output if set, evicting the least recently used outputs
+    first. Outputs older than ttl seconds, if set, are rendered again. When
+    a directory is given, outputs are also stored in files in that
+    directory, which are shared by processes and survive restarts. Templates
+    whose output isn't determined by their context, such as templates that
+    render the current time or random values, must opt out by adding their
+    name or file path to the exclude set.
+    """
+
+    def __init__(
+        self,
+        max_size=1024,
+        max_bytes=None,
+        ttl=None,
+        directory=None,
+        exclude=None
+    ):
+        """ RenderCache Class Constructor
+
+        Parameters:
+            max_size  (int):   optional [default=1024]
+            max_bytes (int):   optional [default=None]
+            ttl       (float): optional [default=None]
+            directory (str):   optional [default=None]
+            exclude   (set):   optional [default=None]
+
+        Attributes:
+            self.max_size      (int)   : public
+            self.max_bytes     (int)   : public
+            self.ttl           (float) : public
+            self.directory     (str)   : public
+            self.exclude       (set)   : public
+            self.hits          (int)   : public
+            self.disk_hits     (int)   : public
+            self.misses        (int)   : public
+            self._outputs      (dict)  : private
+            self._size         (int)   : private
+            self._fingerprints (dict)  : private
+            self._lock         (obj)   : private
+        """
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.directory = directory
+        self.exclude = set(exclude or ())
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._outputs = OrderedDict()
+        self._size = 0
+        self._fingerprints = WeakKeyDictionary()
+        self._lock = threading.Lock()
+        if directory is not None and not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def __len__(self):
+        """ Return the number of outputs held in memory """
+        return len(self._outputs)
+
+    def fingerprint(self, template):
+        """ Template Fingerprint Method
+
+        Returns the fingerprint of a compiled template, or None if the
+        template is excluded from the cache.
+
+        Parameters:
+            template (obj): required
+
+        Returns:
+            str or None
+        """
+        if template.name in self.exclude or template.filename in self.exclude:
+            return None
+        with self._lock:
+            fingerprint = self._fingerprints.get(template)
+        if fingerprint is None:
+            fingerprint = self._get_fingerprint(template)
+            with self._lock:
+                self._fingerprints[template] = fingerprint
+        return fingerprint
+
+    @classmethod
+    def _get_fingerprint(cls, template):
+        """ Hash a template's identity, options and source tree """
+        environment = template.environment
+        template_hash = hashlib.blake2b(digest_size=20)
+        template_hash.update(repr((
+            jinja2.__version__,
+            template.name,
+            template.filename,
+            TemplateBytecodeCache._get_environment_key(environment)
+        )).encode('utf-8'))
+        # File path templates are named after the file, but loaded by path.
+        # The name can resolve to another file, such as a file of the same
+        # name in the working directory, so the source is only hashed when
+        # the loader resolves it to the template's own file.
+        root_names = [
+            name for name in (template.name, template.filename)
+            if name is not None and environment.loader is not None
+        ]
+        pending = []
+        for name in root_names:
+            if cls._hash_source(
+                environment, name, template_hash, pending, template.filename
+            ):
+                break
+        else:
+            # Templates compiled from a string are identified by their code.
+            for render_function in [template.root_render_func] + sorted(
+                template.blocks.values(), key=lambda block: block.__name__
+            ):
+                template_hash.update(marshal.dumps(render_function.__code__))
+
+        seen = set(root_names)
+        while pending:
+            name = pending.pop()
+            if name not in seen:
+                seen.add(name)
+                cls._hash_source(environment, name, template_hash, pending)
+        return template_hash.hexdigest()
+
+    @staticmethod
+    def _hash_source(environment, name, template_hash, pending, filename=None):
+        """ Hash a template source, queueing the templates it references
+
+        Returns:
+            True if the template source was found, and loaded from filename
+            when one is given, False otherwise
+        """
+        try:
+            source, source_filename, _ = environment.loader.get_source(
+                environment, name
+            )
+        except (TemplateNotFound, OSError):
+            return False
+        if filename is not None and source_filename != filename:
+            return False
+        template_hash.update(repr((name, source)).encode('utf-8'))
+        pending.extend(sorted(
+            referenced for referenced in meta.find_referenced_templates(
+                environment.parse(source)
+            ) if referenced is not None
+        ))
+        return True
+
+    @classmethod
+    def _canonical(cls, value):
+        """ Convert a context value to a JSON value preserving its types """
+        if value is None or isinstance(value, (bool, str)):
+            return value
+        if isinstance(value, int):
+            return ['i', str(value)]
+        if isinstance(value, float):
+            return ['f', repr(value)]
+        if isinstance(value, (list, tuple)):
+            return [
+                'l' if isinstance(value, list) else 't',
+                [cls._canonical(item) for item in value]
+            ]
+        if isinstance(value, dict):
+            # Dict order is kept, as templates iterate dicts in that order.
+            return ['d', [
+                [cls._canonical(key), cls._canonical(item)]
+                for key, item in value.items()
+            ]]
+        raise TypeError(
+            "{} context values can't be fingerprinted".format(type(value))
+        )
+
+    @staticmethod
+    def _get_filter_key(environment):
+        """ Return the settings of the Environment's to_json serializer
+
+        The serializer can be replaced on an Environment after its templates
+        are compiled, so its settings are read for every key rather than
+        being part of the cached template fingerprint.
+        """
+        to_json = environment.filters.get('to_json')
+        return repr(getattr(to_json, 'json_serializer', to_json))
+
+    def key(self, template, context):
+        """ Cache Key Method
+
+        Returns the cache key of a template rendered with a context and the
+        to_json serializer settings of its Environment, or None if the
+        template is excluded or the context can't be fingerprinted.
+
+        Parameters:
+            template (obj):  required
+            context  (dict): required
+
+        Returns:
+            str or None
+        """
+        fingerprint = self.fingerprint(template)
+        if fingerprint is None:
+            return None
+        try:
+            # Only the order of the top level context names doesn't matter.
+            canonical_context = json.dumps(
+                sorted(
+                    [name, self._canonical(value)]
+                    for name, value in context.items()
+                ),
+                separators=(',', ':')
+            )
+        except (TypeError, ValueError):
+            return None
+        return hashlib.blake2b(
+            "{}|{}|{}".format(
+                fingerprint,
+                self._get_filter_key(template.environment),
+                canonical_context
+            ).encode('utf-8'),
+            digest_size=20
+        ).hexdigest()
+
+    def _evict(self):
+        """ Evict least recently used outputs until the cache fits """
+        while self._outputs and (
+            len(self._outputs) > self.max_size or
+            (self.max_bytes is not None and self._size > self.max_bytes)
+        ):
+            self._size -= len(self._outputs.popitem(last=False)[1][0])
+
+    def _get_path(self, key):
+        """ Return the disk tier file path of a cache key """
+        return os.path.join(self.directory, "{}.render".format(key))
+
+    def get(self, key):
+        """ Cache Lookup Method
+
+        Returns the output cached under the given key, from memory or the
+        disk tier, or None if the key isn't cached or has expired.
+
+        Parameters:
+            key (str): required
+
+        Returns:
+            str or None
+        """
+        with self._lock:
+            entry = self._outputs.get(key)
+            if entry is not None:
+                if entry[1] is None or entry[1] > time.monotonic():
+                    self.hits += 1
+                    self._outputs.move_to_end(key)
+                    return entry[0]
+                del self._outputs[key]
+                self._size -= len(entry[0])
+        if self.directory is not None:
+            cache_path = self._get_path(key)
+            try:
+                if (
+                    self.ttl is None or
+                    os.path.getmtime(cache_path) + self.ttl > time.time()
+                ):
+                    with open(cache_path, encoding='utf-8') as cache_file:
+                        rendered = cache_file.read()
+                    self._store(key, rendered)
+                    with self._lock:
+                        self.disk_hits += 1
+                    return rendered
+            except (OSError, ValueError):
+                pass
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def _store(self, key, rendered):
+        """ Store an output in the in-memory tier """
+        expires = None
+        if self.ttl is not None:
+            expires = time.monotonic() + self.ttl
+        with self._lock:
+            previous = self._outputs.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous[0])
+            self._outputs[key] = (rendered, expires)
+            self._size += len(rendered)
+            self._evict()
+
+    def set(self, key, rendered):
+        """ Cache Store Method
+
+        Stores a rendered output under the given key, in memory and in the
+        disk tier if a directory is configured. Disk tier files are written
+        atomically, and failures to write them are ignored.
+
+        Parameters:
+            key      (str): required
+            rendered (str): required
+        """
+        self._store(key, rendered)
+        if self.directory is None:
+            return
+        try:
+            cache_fd, temp_path = tempfile.mkstemp(
+                prefix=".{}.".format(key),
+                suffix='.tmp',
+                dir=self.directory
+            )
+        except OSError:
+            return
+        try:
+            with os.fdopen(cache_fd, 'w', encoding='utf-8') as cache_file:
+                cache_file.write(rendered)
+            os.replace(temp_path, self._get_path(key))
+        except OSError:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+    def render(self, template, context):
+        """ Cached Render Method
+
+        Returns the cached output of a template rendered with a context,
+        rendering the template and caching the output on a miss.
+
+        Parameters:
+            template (obj):  required
+            context  (dict): required
+
+        Returns:
+            str
+        """
+        key = self.key(template, context)
+        if key is None:
+            return template.render(**context)
+        rendered = self.get(key)
+        if rendered is None:
+            rendered = template.render(**context)
+            self.set(key, rendered)
+        return rendered
+
+    def clear(self):
+        """ Remove all cached outputs, including the disk tier files """
+        with self._lock:
+            self._outputs.clear()
+            self._size = 0
+            self.hits = 0
+            self.disk_hits = 0
+            self.misses = 0
+        if self.directory is not None:
+            for entry in os.listdir(self.directory):
+                if entry.endswith('.render'):
+                    try:
+                        os.remove(os.path.join(self.directory, entry))
+                    except OSError:
+                        pass
+
+    def stats(self):
+        """ Cache Statistics Method
+
+        Returns:
+            dict with hits, disk_hits, misses, size, bytes and max_size of
+            the cache
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'size': len(self._outputs),
+                'bytes': self._size,
+                'max_size': self.max_size
+            }
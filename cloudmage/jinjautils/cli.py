@@ -0,0 +1,581 @@
+##############################################################################
+# CloudMage : JinjaUtils Command Line Interface
+# ============================================================================
+# CloudMage Jinja Helper Object Utility/Library
+#   - jinjautils command rendering the template, context and output entries
+#     of a JSON, JSON lines or YAML manifest in one process.
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/13/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Optional Pip Installed Modules:
+try:
+    import yaml
+except ImportError:  # pragma: no cover
+    yaml = None
+
+# Import Package Modules
+from .jinja import JinjaUtils
+from .loaders import parse_roots
+from .parallel import render_jobs, render_job_chunk, init_worker
+from .writer import OutputWriter, FSYNC_MODES, FSYNC_NONE
+from .backup import BackupPolicy, backup_timestamp
+from .manifest import WRITTEN, UNCHANGED, SKIPPED
+
+# Import Base Python Modules
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from operator import itemgetter
+from itertools import islice
+import argparse
+import json
+import time
+import sys
+import os
+
+# Manifest formats, and the format of each manifest file extension.
+MANIFEST_FORMATS = ('auto', 'json', 'jsonl', 'yaml')
+MANIFEST_EXTENSIONS = {
+    '.json': 'json',
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+    '.yaml': 'yaml',
+    '.yml': 'yaml'
+}
+
+# Top level keys of a manifest object, and the keys of a manifest entry.
+MANIFEST_KEYS = (
+    'template_directory',
+    'output_directory',
+    'context',
+    'entries'
+)
+ENTRY_KEYS = ('template', 'output', 'context', 'context_file')
+
+
+############################################
+# Manifest Loading:                        #
+############################################
+def _parse_document(text, manifest_format, source):
+    """ Parse a JSON, JSON lines or YAML document """
+    if manifest_format == 'auto':
+        try:
+            return json.loads(text)
+        except ValueError:
+            manifest_format = 'jsonl'
+    if manifest_format == 'json':
+        return json.loads(text)
+    if manifest_format == 'yaml':
+        if yaml is None:
+            raise ValueError(
+                "{} is YAML, which requires the PyYAML package".format(source)
+            )
+        try:
+            return yaml.safe_load(text)
+        except yaml.YAMLError as e:
+            raise ValueError("{}: {}".format(source, e))
+    entries = []
+    for line_number, line in enumerate(text.splitlines(), 1):
+        if line.strip():
+            try:
+                entries.append(json.loads(line))
+            except ValueError as e:
+                raise ValueError("{} line {}: {}".format(
+                    source, line_number, e
+                ))
+    return entries
+
+
+def _read_document(path, manifest_format='auto'):
+    """ Read a JSON, JSON lines or YAML file, or stdin for '-' """
+    if manifest_format == 'auto':
+        manifest_format = MANIFEST_EXTENSIONS.get(
+            os.path.splitext(path)[1].lower(),
+            'auto'
+        )
+    if path == '-':
+        text = sys.stdin.read()
+    else:
+        with open(path) as document_file:
+            text = document_file.read()
+    try:
+        return _parse_document(text, manifest_format, path)
+    except ValueError as e:
+        if str(e).startswith(path):
+            raise
+        raise ValueError("{}: {}".format(path, e))
+
+
+def _resolve_roots(template_directory, base_directory):
+    """ Return the (prefix, path) roots of a manifest template_directory """
+    try:
+        roots = parse_roots(template_directory)
+    except TypeError as e:
+        raise ValueError(str(e))
+    return [
+        (prefix, os.path.join(base_directory, os.path.expanduser(path)))
+        for prefix, path in roots
+    ]
+
+
+def load_manifest(path, manifest_format='auto', output_directory=None):
+    """ Manifest Loader
+
+    Reads a manifest of template, context and output entries. A manifest is
+    a list of entries, or an object with an entries list, and optionally a
+    template_directory (in any form the JinjaUtils template_directory
+    property accepts), an output_directory, and a context shared by every
+    entry. Each entry has a template name or file path, an output path and
+    optionally a context, a context_file holding a JSON or YAML context, or
+    both, merged over the shared context. JSON lines manifests hold one
+    entry per line. Relative template directories and context files are
+    relative to the manifest directory, and relative outputs to the
+    output_directory, which defaults to the current directory.
+
+    Parameters:
+        path             (str): required, '-' for stdin
+        manifest_format  (str): optional [default='auto']
+        output_directory (str): optional [default=None], overrides manifest
+
+    Returns:
+        dict with the template_directory roots (or None), the
+        output_directory and the list of (template, context, output) jobs
+
+    Raises:
+        ValueError if the manifest is invalid, OSError if a file can't be
+        read
+    """
+    if manifest_format not in MANIFEST_FORMATS:
+        raise ValueError("manifest format expected one of {}: {}".format(
+            MANIFEST_FORMATS, manifest_format
+        ))
+    document = _read_document(path, manifest_format)
+    base_directory = os.getcwd() if path == '-' else os.path.dirname(
+        os.path.abspath(path)
+    )
+    if isinstance(document, list):
+        document = {'entries': document}
+    if not isinstance(document, dict):
+        raise ValueError(
+            "{}: manifest expected a list or an object of entries".format(
+                path
+            )
+        )
+    unknown = sorted(set(document) - set(MANIFEST_KEYS))
+    if unknown:
+        raise ValueError("{}: unknown manifest keys: {}".format(
+            path, ', '.join(unknown)
+        ))
+
+    template_directory = document.get('template_directory')
+    if template_directory is not None:
+        template_directory = _resolve_roots(
+            template_directory,
+            base_directory
+        )
+    if output_directory is None:
+        output_directory = document.get('output_directory') or '.'
+        output_directory = os.path.join(base_directory, output_directory)
+    output_directory = os.path.abspath(output_directory)
+    shared_context = document.get('context') or {}
+    entries = document.get('entries') or []
+    if not isinstance(shared_context, dict) or not isinstance(entries, list):
+        raise ValueError(
+            "{}: manifest context expected an object and entries a "
+            "list".format(path)
+        )
+
+    jobs = []
+    context_files = {}
+    for entry_number, entry in enumerate(entries, 1):
+        if (
+            not isinstance(entry, dict) or
+            set(entry) - set(ENTRY_KEYS) or
+            not isinstance(entry.get('template'), str) or
+            not isinstance(entry.get('output'), str) or
+            not isinstance(entry.get('context', {}), dict) or
+            not isinstance(entry.get('context_file', ''), str)
+        ):
+            raise ValueError(
+                "{}: entry {} expected template and output strings, and an "
+                "optional context object and context_file string but "
+                "received: {}".format(path, entry_number, entry)
+            )
+        context = shared_context
+        if 'context_file' in entry:
+            context_path = os.path.join(base_directory, entry['context_file'])
+            file_context = context_files.get(context_path)
+            if file_context is None:
+                file_context = _read_document(context_path)
+                if not isinstance(file_context, dict):
+                    raise ValueError(
+                        "{}: context file expected an object".format(
+                            context_path
+                        )
+                    )
+                context_files[context_path] = file_context
+            context = dict(context, **file_context)
+        if entry.get('context'):
+            context = dict(context, **entry['context'])
+        jobs.append((
+            entry['template'],
+            context,
+            os.path.join(output_directory, entry['output'])
+        ))
+    return {
+        'template_directory': template_directory,
+        'output_directory': output_directory,
+        'jobs': jobs
+    }
+
+
+############################################
+# Manifest Rendering:                      #
+############################################
+def _job_summary(results, start_time, jobs):
+    """ Build the summary of rendered jobs, with per template timings """
+    elapsed = time.perf_counter() - start_time
+    results.sort(key=itemgetter('index'))
+    failed = sum(1 for result in results if not result['success'])
+    summary = {
+        'results': results,
+        'rendered': len(results) - failed,
+        'failed': failed,
+        WRITTEN: 0,
+        UNCHANGED: 0,
+        SKIPPED: 0,
+        'seconds': elapsed,
+        'items_per_second': len(results) / elapsed if elapsed else 0.0,
+        'jobs': jobs,
+        'templates': {}
+    }
+    for result in results:
+        if result['status'] is not None:
+            summary[result['status']] += 1
+        timing = summary['templates'].setdefault(
+            result['template'],
+            {'count': 0, 'seconds': 0.0, 'max': 0.0}
+        )
+        timing['count'] += 1
+        timing['seconds'] += result['seconds']
+        timing['max'] = max(timing['max'], result['seconds'])
+    for timing in summary['templates'].values():
+        timing['mean'] = timing['seconds'] / timing['count']
+    return summary
+
+
+def render_manifest(
+    manifest,
+    jobs=1,
+    chunk_size=None,
+    backup=True,
+    skip_unchanged=False,
+    writer=None,
+    backup_policy=None,
+    trim_blocks=True,
+    lstrip_blocks=True,
+    bytecode_cache=None,
+    progress=None
+):
+    """ Manifest Renderer
+
+    Renders every job of a loaded manifest, building the Jinja Environment
+    once, in this process when jobs is 1, and otherwise across a pool of
+    jobs worker processes that each build their Environment once. Output
+    directories are created as needed. A failed job is recorded in the
+    results and doesn't abort the others.
+
+    Parameters:
+        manifest       (dict): required, from load_manifest
+        jobs           (int):  optional [default=1], 0 for every CPU core
+        chunk_size     (int):  optional [default=None]
+        backup         (bool): optional [default=True]
+        skip_unchanged (bool): optional [default=False]
+        writer         (obj):  optional [default=None], OutputWriter
+        backup_policy  (obj):  optional [default=None], BackupPolicy
+        trim_blocks    (bool): optional [default=True]
+        lstrip_blocks  (bool): optional [default=True]
+        bytecode_cache (str):  optional [default=None], cache directory
+        progress       (func): optional [default=None], called with the
+                               done, total and failed job counts
+
+    Returns:
+        dict with the ordered per job results, rendered and failed counts,
+        written, unchanged and skipped counts, seconds elapsed,
+        items_per_second, jobs and per template count, seconds, mean and
+        max timings
+
+    Raises:
+        ValueError if the template directory can't be used
+    """
+    start_time = time.perf_counter()
+    writer = writer or OutputWriter()
+    backup_policy = backup_policy or BackupPolicy()
+    template_directory = manifest['template_directory']
+    if not jobs:
+        jobs = os.cpu_count() or 1
+
+    Jinja = JinjaUtils()
+    Jinja.trim_blocks = trim_blocks
+    Jinja.lstrip_blocks = lstrip_blocks
+    if bytecode_cache is not None:
+        Jinja.bytecode_cache = bytecode_cache
+    if template_directory is not None:
+        Jinja.template_directory = template_directory
+        if Jinja.template_directory != template_directory:
+            raise ValueError("Invalid template directory: {}".format(
+                template_directory
+            ))
+
+    total = len(manifest['jobs'])
+    for directory in set(
+        os.path.dirname(output) for _, _, output in manifest['jobs']
+    ):
+        os.makedirs(directory, exist_ok=True)
+    if not chunk_size:
+        chunk_size = min(max(total // (jobs * 4), 1), 1000)
+    batch_timestamp = backup_timestamp()
+    job_iterator = enumerate(manifest['jobs'])
+    results = []
+    failed = 0
+
+    def record(chunk_results):
+        nonlocal failed
+        results.extend(chunk_results)
+        failed += sum(1 for result in chunk_results if not result['success'])
+        if progress is not None:
+            progress(len(results), total, failed)
+
+    if jobs == 1:
+        while True:
+            chunk = list(islice(job_iterator, chunk_size))
+            if not chunk:
+                break
+            record(render_jobs(
+                Jinja.get_template,
+                chunk,
+                backup,
+                batch_timestamp,
+                skip_unchanged,
+                writer,
+                backup_policy
+            ))
+        return _job_summary(results, start_time, jobs)
+
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=init_worker,
+        initargs=(
+            template_directory,
+            trim_blocks,
+            lstrip_blocks,
+            bytecode_cache,
+            Jinja.json_serializer
+        )
+    ) as executor:
+        pending = set()
+        while True:
+            # Keep a bounded number of chunks in flight.
+            while len(pending) < jobs * 2:
+                chunk = list(islice(job_iterator, chunk_size))
+                if not chunk:
+                    break
+                pending.add(executor.submit(
+                    render_job_chunk,
+                    chunk,
+                    backup,
+                    batch_timestamp,
+                    skip_unchanged,
+                    writer,
+                    backup_policy
+                ))
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                record(future.result())
+    return _job_summary(results, start_time, jobs)
+
+
+############################################
+# Command Line:                            #
+############################################
+class ProgressPrinter(object):
+    """ Progress callback printing the job counts at most every interval """
+
+    def __init__(self, stream, interval=1.0):
+        self.stream = stream
+        self.interval = interval
+        self._start_time = time.perf_counter()
+        self._printed = None
+
+    def __call__(self, done, total, failed):
+        now = time.perf_counter()
+        if (
+            done < total and self._printed is not None and
+            now - self._printed < self.interval
+        ):
+            return
+        self._printed = now
+        elapsed = now - self._start_time
+        self.stream.write(
+            "jinjautils: {}/{} rendered, {} failed, {:.1f} items/s\n".format(
+                done, total, failed, done / elapsed if elapsed else 0.0
+            )
+        )
+        self.stream.flush()
+
+
+def print_summary(summary, stream, max_errors=20, max_templates=10):
+    """ Print a rendered manifest summary, with timings and failures """
+    total = len(summary['results'])
+    stream.write(
+        "jinjautils: rendered {} of {} output(s) in {:.3f}s ({:.1f} items/s) "
+        "with {} job(s)\n".format(
+            summary['rendered'],
+            total,
+            summary['seconds'],
+            summary['items_per_second'],
+            summary['jobs']
+        )
+    )
+    stream.write("  written {}, unchanged {}, skipped {}, failed {}\n".format(
+        summary[WRITTEN],
+        summary[UNCHANGED],
+        summary[SKIPPED],
+        summary['failed']
+    ))
+    templates = sorted(
+        summary['templates'].items(),
+        key=lambda item: -item[1]['seconds']
+    )
+    if templates:
+        stream.write("  {:>8} {:>10} {:>10} {:>10}  {}\n".format(
+            'count', 'total s', 'mean ms', 'max ms', 'template'
+        ))
+    for template_name, timing in templates[:max_templates]:
+        stream.write("  {:>8} {:>10.3f} {:>10.3f} {:>10.3f}  {}\n".format(
+            timing['count'],
+            timing['seconds'],
+            timing['mean'] * 1e3,
+            timing['max'] * 1e3,
+            template_name
+        ))
+    failures = [
+        result for result in summary['results'] if not result['success']
+    ]
+    for result in failures[:max_errors]:
+        stream.write("  failed: {} ({}): {}\n".format(
+            result['output'], result['template'], result['error']
+        ))
+    if len(failures) > max_errors:
+        stream.write("  ... and {} more failure(s)\n".format(
+            len(failures) - max_errors
+        ))
+
+
+def build_parser():
+    """ Return the jinjautils command argument parser """
+    parser = argparse.ArgumentParser(
+        prog='jinjautils',
+        description=(
+            "Render the template, context and output entries of a JSON, "
+            "JSON lines or YAML manifest."
+        )
+    )
+    parser.add_argument('manifest', help="manifest path, or - for stdin")
+    parser.add_argument(
+        '-t', '--template-directory', action='append',
+        help="template directory, repeat for layered directories, "
+             "overrides the manifest template_directory"
+    )
+    parser.add_argument(
+        '-o', '--output-directory',
+        help="directory of relative outputs, overrides the manifest "
+             "output_directory"
+    )
+    parser.add_argument(
+        '-f', '--format', choices=MANIFEST_FORMATS, default='auto',
+        help="manifest format, detected from the extension by default"
+    )
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=1,
+        help="worker processes, 0 for every CPU core (default 1)"
+    )
+    parser.add_argument('--chunk-size', type=int, default=None)
+    parser.add_argument(
+        '--no-backup', action='store_true',
+        help="overwrite existing outputs without a backup"
+    )
+    parser.add_argument(
+        '--skip-unchanged', action='store_true',
+        help="skip writing outputs that already hold the rendered template"
+    )
+    parser.add_argument(
+        '--atomic', action='store_true',
+        help="write outputs to temporary files renamed into place"
+    )
+    parser.add_argument('--fsync', choices=FSYNC_MODES, default=FSYNC_NONE)
+    parser.add_argument('--no-trim-blocks', action='store_true')
+    parser.add_argument('--no-lstrip-blocks', action='store_true')
+    parser.add_argument(
+        '--bytecode-cache',
+        help="directory of a bytecode cache shared between runs"
+    )
+    parser.add_argument('--max-errors', type=int, default=20)
+    parser.add_argument(
+        '-q', '--quiet', action='store_true',
+        help="don't print progress"
+    )
+    return parser
+
+
+def main(argv=None):
+    """ jinjautils Command Entry Point
+
+    Parameters:
+        argv (list): optional [default=sys.argv[1:]]
+
+    Returns:
+        int exit status, 0 if every output was rendered, 1 if an output
+        failed, 2 if the manifest or the options are invalid
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.jobs < 0:
+        parser.error("--jobs expected a non negative int")
+    try:
+        manifest = load_manifest(
+            args.manifest,
+            args.format,
+            args.output_directory
+        )
+        if args.template_directory:
+            manifest['template_directory'] = _resolve_roots(
+                args.template_directory,
+                os.getcwd()
+            )
+        summary = render_manifest(
+            manifest,
+            jobs=args.jobs,
+            chunk_size=args.chunk_size,
+            backup=not args.no_backup,
+            skip_unchanged=args.skip_unchanged,
+            writer=OutputWriter(args.atomic, args.fsync),
+            trim_blocks=not args.no_trim_blocks,
+            lstrip_blocks=not args.no_lstrip_blocks,
+            bytecode_cache=args.bytecode_cache,
+            progress=None if args.quiet else ProgressPrinter(sys.stderr)
+        )
+    except (OSError, ValueError) as e:
+        sys.stderr.write("jinjautils: error: {}\n".format(e))
+        return 2
+    print_summary(summary, sys.stderr, args.max_errors)
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == '__main__':  # pragma: no cover
+    sys.exit(main())
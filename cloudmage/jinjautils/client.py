@@ -0,0 +1,323 @@
+##############################################################################
+# CloudMage : Jinja Template Server Client
+# ============================================================================
+# CloudMage Jinja Helper Object Utility/Library
+#   - Thin client of the TemplateServer Unix domain socket protocol, with
+#     request pipelining.
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/13/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Package Modules
+from .results import RenderResult, WriteResult
+
+# Import Base Python Modules
+import threading
+import socket
+import json
+import os
+
+# Largest request or response line accepted, in bytes.
+MAX_MESSAGE_SIZE = 64 * 1024 * 1024
+
+
+def encode_message(message):
+    """ Encode a protocol message as a line of compact JSON """
+    return json.dumps(
+        message,
+        separators=(',', ':'),
+        default=str
+    ).encode('utf-8') + b'\n'
+
+
+def decode_message(line):
+    """ Decode a protocol message line
+
+    Raises:
+        ValueError if the line isn't a JSON object
+    """
+    message = json.loads(line.decode('utf-8'))
+    if not isinstance(message, dict):
+        raise ValueError(
+            "message expected JSON object but received: {}".format(
+                type(message).__name__
+            )
+        )
+    return message
+
+
+#####################
+# Class Definition: #
+#####################
+class TemplateClient(object):
+    """ CloudMage Template Server Client
+
+    This class sends render and write requests to a TemplateServer over its
+    Unix domain socket. Requests and responses are JSON objects, one per
+    line, and each request carries an id that its response echoes. The
+    connection is opened on the first request and kept open, so a script
+    pays for the connection once. The pipeline, render_many and write_many
+    methods send a list of requests without waiting for each response,
+    which the server answers in order, so a batch of renders costs one
+    round trip. A client isn't thread safe, each thread should use its own.
+    """
+
+    def __init__(self, socket_path, timeout=None):
+        """ TemplateClient Class Constructor
+
+        Parameters:
+            socket_path (str):   required
+            timeout     (float): optional [default=None], seconds
+
+        Attributes:
+            self.socket_path (str)   : public
+            self.timeout     (float) : public
+            self._socket     (obj)   : private
+            self._reader     (obj)   : private
+            self._next_id    (int)   : private
+        """
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._socket = None
+        self._reader = None
+        self._next_id = 0
+
+    def __repr__(self):
+        return "TemplateClient(socket_path={!r})".format(self.socket_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    ############################################
+    # Connection:                              #
+    ############################################
+    def connect(self):
+        """ Connect to the server, if the client isn't connected yet """
+        if self._socket is None:
+            connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                connection.settimeout(self.timeout)
+                connection.connect(self.socket_path)
+            except OSError:
+                connection.close()
+                raise
+            self._socket = connection
+            self._reader = connection.makefile('rb')
+        return self
+
+    def close(self):
+        """ Close the connection to the server """
+        if self._socket is not None:
+            try:
+                # Wakes up a pipeline sender blocked on the socket.
+                self._socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._reader.close()
+            self._socket.close()
+            self._socket = self._reader = None
+
+    def _read_response(self):
+        """ Read the next response line from the server """
+        line = self._reader.readline(MAX_MESSAGE_SIZE + 1)
+        if not line.endswith(b'\n'):
+            raise ConnectionError(
+                "Connection to {} closed before the response".format(
+                    self.socket_path
+                )
+            )
+        return decode_message(line)
+
+    ############################################
+    # Requests:                                #
+    ############################################
+    def pipeline(self, requests):
+        """ Pipelined Request Method
+
+        Sends a list of request dicts, each with an op and the fields of the
+        operation, without waiting for the responses, and reads the
+        responses in order. Pipelines larger than a socket buffer are sent
+        from a thread while the responses are read, so the client and the
+        server can't both block on a full socket buffer.
+
+        Parameters:
+            requests (list): required
+
+        Returns:
+            list of response dicts, in request order
+
+        Raises:
+            OSError if the server can't be reached
+            ValueError if a response doesn't match its request
+        """
+        self.connect()
+        ids = []
+        payload = []
+        for request in requests:
+            self._next_id += 1
+            ids.append(self._next_id)
+            payload.append(encode_message(dict(request, id=self._next_id)))
+        if not payload:
+            return []
+        payload = b''.join(payload)
+        errors = []
+        sender = None
+        if len(payload) <= 65536:
+            self._socket.sendall(payload)
+        else:
+            def send():
+                try:
+                    self._socket.sendall(payload)
+                except OSError as e:
+                    errors.append(e)
+            sender = threading.Thread(target=send, daemon=True)
+            sender.start()
+        try:
+            responses = []
+            for request_id in ids:
+                response = self._read_response()
+                if response.get('id') != request_id:
+                    raise ValueError(
+                        "Response id {} doesn't match request id {}".format(
+                            response.get('id'), request_id
+                        )
+                    )
+                responses.append(response)
+        except BaseException:
+            # The connection is out of step with its requests.
+            self.close()
+            raise
+        finally:
+            if sender is not None:
+                sender.join()
+        if errors:
+            raise errors[0]
+        return responses
+
+    def request(self, op, **fields):
+        """ Send one request, returning its response dict """
+        return self.pipeline([dict(fields, op=op)])[0]
+
+    def ping(self):
+        """ Return True if the server answered a ping request """
+        return self.request('ping').get('ok') is True
+
+    def stats(self):
+        """ Return the stats snapshot of the server JinjaUtils object """
+        return self.request('stats').get('stats')
+
+    @staticmethod
+    def _render_result(response):
+        """ Return the RenderResult of a render response """
+        return RenderResult(
+            response.get('template'),
+            response.get('output'),
+            response.get('error')
+        )
+
+    @staticmethod
+    def _write_result(response):
+        """ Return the WriteResult of a write response """
+        return WriteResult(
+            response.get('path'),
+            response.get('backup_path'),
+            response.get('error'),
+            response.get('status')
+        )
+
+    def render(self, template, context=None, **kwargs):
+        """ Render Request Method
+
+        Renders a template name in the server template directory, or a
+        template file path, with a context dict, keyword arguments, or both.
+
+        Returns:
+            RenderResult object
+        """
+        if context:
+            kwargs = dict(context, **kwargs)
+        return self._render_result(self.request(
+            'render',
+            template=template,
+            context=kwargs
+        ))
+
+    def render_many(self, requests):
+        """ Render a list of (template, context) pairs in one pipeline
+
+        Returns:
+            list of RenderResult objects, in request order
+        """
+        return [
+            self._render_result(response)
+            for response in self.pipeline([
+                {'op': 'render', 'template': template, 'context': context}
+                for template, context in requests
+            ])
+        ]
+
+    def write(
+        self,
+        template,
+        output_directory,
+        output_file,
+        context=None,
+        backup=True,
+        skip_unchanged=False
+    ):
+        """ Write Request Method
+
+        Renders a template with a context dict and writes the output with
+        the server JinjaUtils write_template method. A relative output
+        directory is made absolute against the client working directory,
+        as the server runs in its own working directory.
+
+        Returns:
+            WriteResult object
+        """
+        if isinstance(output_directory, str):
+            output_directory = os.path.abspath(output_directory)
+        return self._write_result(self.request(
+            'write',
+            template=template,
+            context=context or {},
+            output_directory=output_directory,
+            output_file=output_file,
+            backup=backup,
+            skip_unchanged=skip_unchanged
+        ))
+
+    def write_many(self, requests, backup=True, skip_unchanged=False):
+        """ Write a list of (template, context, output path) in one pipeline
+
+        Relative output paths are made absolute against the client working
+        directory, like the output directory of the write method.
+
+        Returns:
+            list of WriteResult objects, in request order
+        """
+        pipeline = []
+        for template, context, output_path in requests:
+            output_directory, output_file = os.path.split(
+                os.path.abspath(output_path)
+            )
+            pipeline.append({
+                'op': 'write',
+                'template': template,
+                'context': context,
+                'output_directory': output_directory,
+                'output_file': output_file,
+                'backup': backup,
+                'skip_unchanged': skip_unchanged
+            })
+        return [
+            self._write_result(response)
+            for response in self.pipeline(pipeline)
+        ]
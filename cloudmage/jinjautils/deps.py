@@ -0,0 +1,278 @@
+##############################################################################
+# CloudMage : Jinja Template Dependency Graph
+# ============================================================================
+# CloudMage Jinja Helper Object Utility/Library
+#   - Extends, include and import graph of the templates in a directory.
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/13/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Pip Installed Modules:
+from jinja2.exceptions import TemplateNotFound, TemplateSyntaxError
+from jinja2 import meta
+
+# Import Base Python Modules
+import threading
+import tempfile
+import hashlib
+import json
+import os
+
+
+#####################
+# Class Definition: #
+#####################
+class DependencyGraph(object):
+    """ CloudMage Template Dependency Graph
+
+    This class records, for every template of a Jinja Environment loader,
+    the templates it extends, includes or imports, parsed from the template
+    source, along with a digest of the source. Given a set of changed
+    template names, the affected method returns every template whose output
+    may change: the changed templates and every template that depends on
+    them, directly or through other templates.
+
+    Templates that reference a template by a variable, such as
+    {% include partial_name %}, can't be resolved statically, and are
+    considered affected by any change. Templates that fail to parse are
+    treated the same way. The graph can be saved to and loaded from a JSON
+    file, so that the next build can detect the templates whose source
+    changed since the graph was saved.
+    """
+
+    def __init__(self, environment):
+        """ DependencyGraph Class Constructor
+
+        Parameters:
+            environment (obj): required, Jinja Environment with a loader
+
+        Attributes:
+            self.environment  (obj)  : public
+            self._references  (dict) : private
+            self._digests     (dict) : private
+            self._dynamic     (set)  : private
+            self._dependents  (dict) : private
+            self._lock        (obj)  : private
+        """
+        self.environment = environment
+        self._references = {}
+        self._digests = {}
+        self._dynamic = set()
+        self._dependents = None
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        """ Return the number of templates in the graph """
+        return len(self._references)
+
+    def __contains__(self, name):
+        return name in self._references
+
+    def _parse(self, name):
+        """ Template Parser
+
+        Parses a template source for the templates it references.
+
+        Parameters:
+            name (str): required
+
+        Returns:
+            tuple of the source digest, set of referenced names and whether
+            it has dynamic references, or None if the template doesn't exist
+        """
+        try:
+            source = self.environment.loader.get_source(
+                self.environment,
+                name
+            )[0]
+        except TemplateNotFound:
+            return None
+        digest = hashlib.blake2b(
+            source.encode('utf-8'),
+            digest_size=16
+        ).hexdigest()
+        try:
+            referenced = list(meta.find_referenced_templates(
+                self.environment.parse(source)
+            ))
+        except TemplateSyntaxError:
+            return digest, set(), True
+        return (
+            digest,
+            set(reference for reference in referenced if reference),
+            None in referenced
+        )
+
+    def update(self, names):
+        """ Graph Update Method
+
+        Parses the named templates again, adding new templates to the graph
+        and removing templates that no longer exist.
+
+        Parameters:
+            names (iterable): required
+
+        Returns:
+            set of the names whose source changed, was added or was removed
+        """
+        changed = set()
+        for name in names:
+            parsed = self._parse(name)
+            with self._lock:
+                if parsed is None:
+                    if name in self._references:
+                        del self._references[name]
+                        self._digests.pop(name, None)
+                        self._dynamic.discard(name)
+                        changed.add(name)
+                    continue
+                digest, references, dynamic = parsed
+                if self._digests.get(name) != digest:
+                    changed.add(name)
+                self._digests[name] = digest
+                self._references[name] = references
+                if dynamic:
+                    self._dynamic.add(name)
+                else:
+                    self._dynamic.discard(name)
+        if changed:
+            with self._lock:
+                self._dependents = None
+        return changed
+
+    def build(self, names):
+        """ Graph Build Method
+
+        Parses every named template, replacing the graph, and returns the
+        names whose source differs from the graph it replaced.
+
+        Parameters:
+            names (iterable): required
+
+        Returns:
+            set of changed, added and removed template names
+        """
+        names = set(names)
+        with self._lock:
+            removed = set(self._references) - names
+        return self.update(sorted(names | removed))
+
+    def dependencies(self, name):
+        """ Return the templates a template directly references """
+        with self._lock:
+            return set(self._references.get(name, ()))
+
+    def _get_dependents(self):
+        """ Return the reverse graph, building it if the graph changed """
+        with self._lock:
+            if self._dependents is None:
+                dependents = {}
+                for name, references in self._references.items():
+                    for reference in references:
+                        dependents.setdefault(reference, set()).add(name)
+                self._dependents = dependents
+            return self._dependents
+
+    def dependents(self, name):
+        """ Return the templates that directly reference a template """
+        return set(self._get_dependents().get(name, ()))
+
+    def affected(self, changed):
+        """ Affected Templates Method
+
+        Returns the templates whose output may change when the given
+        templates change: the changed templates that are in the graph, the
+        templates with dynamic references, and every template that depends
+        on them, directly or indirectly.
+
+        Parameters:
+            changed (iterable): required
+
+        Returns:
+            set of template names
+        """
+        dependents = self._get_dependents()
+        pending = list(changed)
+        if pending:
+            with self._lock:
+                pending.extend(self._dynamic)
+        affected = set()
+        while pending:
+            name = pending.pop()
+            if name in affected:
+                continue
+            affected.add(name)
+            pending.extend(dependents.get(name, ()))
+        with self._lock:
+            return set(
+                name for name in affected if name in self._references
+            )
+
+    def save(self, path):
+        """ Graph Save Method
+
+        Writes the graph to a JSON file, through a temporary file renamed
+        into place.
+
+        Parameters:
+            path (str): required
+        """
+        with self._lock:
+            graph = {
+                name: [
+                    self._digests[name],
+                    sorted(references),
+                    name in self._dynamic
+                ] for name, references in self._references.items()
+            }
+        graph_fd, temp_path = tempfile.mkstemp(
+            prefix=os.path.basename(path),
+            suffix='.tmp',
+            dir=os.path.dirname(os.path.abspath(path))
+        )
+        try:
+            with os.fdopen(graph_fd, 'w') as graph_file:
+                json.dump(graph, graph_file, sort_keys=True)
+            os.replace(temp_path, path)
+        except Exception:
+            os.remove(temp_path)
+            raise
+
+    def load(self, path):
+        """ Graph Load Method
+
+        Replaces the graph with a graph saved to a JSON file. Missing or
+        invalid files leave the graph empty.
+
+        Parameters:
+            path (str): required
+
+        Returns:
+            True if the graph was loaded, False otherwise
+        """
+        try:
+            with open(path) as graph_file:
+                graph = json.load(graph_file)
+            references = {}
+            digests = {}
+            dynamic = set()
+            for name, (digest, referenced, is_dynamic) in graph.items():
+                digests[name] = digest
+                references[name] = set(referenced)
+                if is_dynamic:
+                    dynamic.add(name)
+        except (OSError, ValueError, TypeError, AttributeError):
+            references, digests, dynamic = {}, {}, set()
+            loaded = False
+        else:
+            loaded = True
+        with self._lock:
+            self._references = references
+            self._digests = digests
+            self._dynamic = dynamic
+            self._dependents = None
+        return loaded
@@ -0,0 +1,164 @@
+##############################################################################
+# CloudMage : Jinja Environment Pool
+# ============================================================================
+# CloudMage Jinja Helper Object Utility/Library
+#   - Jinja Environments sharing one loader, keyed by their options.
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/13/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Pip Installed Modules:
+from jinja2 import Environment
+
+# Import Base Python Modules
+from collections import OrderedDict
+import threading
+import time
+
+
+#####################
+# Class Definition: #
+#####################
+class MeteredEnvironment(Environment):
+    """ CloudMage Metered Jinja Environment
+
+    This Jinja Environment records the time spent compiling template source
+    in the compile histogram of its metrics, when a Metrics object is set.
+    Templates loaded from the bytecode cache or a template bundle aren't
+    compiled, and aren't recorded.
+    """
+
+    metrics = None
+
+    def compile(self, *args, **kwargs):
+        """ Compile template source, recording the compile duration """
+        metrics = self.metrics
+        if metrics is None:
+            return super(MeteredEnvironment, self).compile(*args, **kwargs)
+        start_time = time.perf_counter()
+        try:
+            return super(MeteredEnvironment, self).compile(*args, **kwargs)
+        finally:
+            metrics.observe('compile', time.perf_counter() - start_time)
+
+
+class EnvironmentPool(object):
+    """ CloudMage Jinja Environment Pool
+
+    This class holds the Jinja Environments created for one template loader,
+    keyed by the Environment options they were created with, such as
+    trim_blocks and lstrip_blocks. Every Environment shares the loader,
+    bytecode cache and to_json filter serializer of the pool, and keeps its
+    own cache of compiled templates, so switching back to options that were
+    used before is a dict lookup that reuses the templates already compiled
+    with them. At most max_size Environments are kept, the least recently
+    used Environment being discarded first. Template compilation is
+    recorded in the pool metrics, if a Metrics object is set.
+    """
+
+    def __init__(
+        self,
+        loader,
+        bytecode_cache=None,
+        json_serializer=None,
+        max_size=8,
+        metrics=None
+    ):
+        """ EnvironmentPool Class Constructor
+
+        Parameters:
+            loader          (obj): required
+            bytecode_cache  (obj): optional [default=None]
+            json_serializer (obj): optional [default=None]
+            max_size        (int): optional [default=8]
+            metrics         (obj): optional [default=None]
+
+        Attributes:
+            self.loader           (obj)  : public
+            self.max_size         (int)  : public
+            self._bytecode_cache  (obj)  : private
+            self._json_serializer (obj)  : private
+            self._metrics         (obj)  : private
+            self._environments    (dict) : private
+            self._lock            (obj)  : private
+        """
+        self.loader = loader
+        self.max_size = max_size
+        self._bytecode_cache = bytecode_cache
+        self._json_serializer = json_serializer
+        self._metrics = metrics
+        self._environments = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """ Return the number of pooled Environments """
+        return len(self._environments)
+
+    def __contains__(self, environment):
+        """ Return True if the Environment belongs to this pool """
+        with self._lock:
+            return any(
+                pooled is environment
+                for pooled in self._environments.values()
+            )
+
+    def get(self, **options):
+        """ Environment Lookup Method
+
+        Returns the Environment created with the given Environment options,
+        creating it on first use.
+
+        Parameters:
+            **options (dict): optional, hashable Environment arguments
+
+        Returns:
+            Jinja Environment object
+        """
+        key = tuple(sorted(options.items()))
+        with self._lock:
+            environment = self._environments.get(key)
+            if environment is not None:
+                self._environments.move_to_end(key)
+                return environment
+            environment = MeteredEnvironment(
+                loader=self.loader,
+                bytecode_cache=self._bytecode_cache,
+                **options
+            )
+            environment.metrics = self._metrics
+            if self._json_serializer is not None:
+                self._json_serializer.install(environment)
+            self._environments[key] = environment
+            while len(self._environments) > self.max_size:
+                self._environments.popitem(last=False)
+            return environment
+
+    def environments(self):
+        """ Return a list of the pooled Environments """
+        with self._lock:
+            return list(self._environments.values())
+
+    def set_bytecode_cache(self, bytecode_cache):
+        """ Use a bytecode cache in every pooled and future Environment """
+        with self._lock:
+            self._bytecode_cache = bytecode_cache
+            for environment in self._environments.values():
+                environment.bytecode_cache = bytecode_cache
+
+    def set_json_serializer(self, json_serializer):
+        """ Use a to_json serializer in every pooled and future Environment """
+        with self._lock:
+            self._json_serializer = json_serializer
+            for environment in self._environments.values():
+                json_serializer.install(environment)
+
+    def set_metrics(self, metrics):
+        """ Record compilation in every pooled and future Environment """
+        with self._lock:
+            self._metrics = metrics
+            for environment in self._environments.values():
+                environment.metrics = metrics
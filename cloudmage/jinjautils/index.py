@@ -0,0 +1,555 @@
+##############################################################################
+# CloudMage : Jinja Template Index
+# ============================================================================
+# CloudMage Jinja Helper Object Utility/Library
+#   - In-memory index of the templates found in a template directory.
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/13/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Pip Installed Modules:
+from jinja2.exceptions import TemplateNotFound
+from jinja2.loaders import split_template_path
+
+# Import Package Modules
+from .bundle import open_archive
+
+# Import Base Python Modules
+import threading
+import time
+import os
+
+# Directories modified this close to the time they were scanned are rescanned
+# on the next refresh, as filesystems with coarse mtime resolution may not
+# change the directory mtime for an entry added in the same tick.
+RACY_MTIME_WINDOW_NS = 2 * 10 ** 9
+
+
+def _time_ns():
+    """ Return the current time in ns (time.time_ns is Python 3.7+) """
+    return int(time.time() * 10 ** 9)
+
+
+#####################
+# Class Definition: #
+#####################
+class TemplateIndex(object):
+    """ CloudMage Template Index
+
+    This class keeps an in-memory set of the template names found under a
+    template directory, using the same naming rules as the Jinja
+    FileSystemLoader list_templates method ('/' separated paths relative to
+    the directory). Once the directory has been scanned, checking whether a
+    template exists is a hash lookup instead of a walk of the directory tree.
+
+    The index records the mtime and entries of every directory it scanned,
+    so a refresh only re-lists the directories whose mtime changed. The
+    index can also be updated for individual names when a change
+    notification is received, and can be built lazily through iter_names.
+    Scans, refreshes and name lookups hold the index lock, so a template
+    directory watcher thread can refresh the index while it's being read.
+    """
+
+    def __init__(self, searchpath, followlinks=False):
+        """ TemplateIndex Class Constructor
+
+        Parameters:
+            searchpath  (str):  required
+            followlinks (bool): optional [default=False]
+
+        Attributes:
+            self.searchpath   (str)  : public
+            self.followlinks  (bool) : public
+            self._names       (set)  : private
+            self._sorted      (list) : private
+            self._directories (dict) : private
+            self._scanned     (bool) : private
+            self._lock        (obj)  : private
+        """
+        self.searchpath = searchpath
+        self.followlinks = followlinks
+        self._names = set()
+        self._sorted = None
+        self._directories = {}
+        self._scanned = False
+        self._lock = threading.RLock()
+
+    def __contains__(self, name):
+        """ Return True if the template name is in the index """
+        return name in self._names
+
+    def __len__(self):
+        """ Return the number of indexed templates """
+        return len(self._names)
+
+    @property
+    def scanned(self):
+        """ Return True once the whole template directory has been scanned """
+        return self._scanned
+
+    ############################################
+    # Directory Scanning:                      #
+    ############################################
+    def _get_path(self, name):
+        """ Return the filesystem path of a '/' separated template name """
+        if not name:
+            return self.searchpath
+        return os.path.join(self.searchpath, *name.split('/'))
+
+    @staticmethod
+    def _join(directory, name):
+        """ Join a '/' separated directory name and an entry name """
+        if directory:
+            return "{}/{}".format(directory, name)
+        return name
+
+    def _scan_directory(self, directory):
+        """ Single Directory Scanner
+
+        Lists the entries of one directory and records its mtime, files and
+        sub directories. The mtime is read before listing, so a change made
+        while listing leaves a stale mtime that triggers another rescan.
+
+        Parameters:
+            directory (str): required
+
+        Returns:
+            tuple of the set of file names and set of sub directory names
+        """
+        path = self._get_path(directory)
+        files = set()
+        subdirectories = set()
+        try:
+            mtime = os.stat(path).st_mtime_ns
+            entries = os.scandir(path)
+        except OSError:
+            self._directories.pop(directory, None)
+            return files, subdirectories
+
+        with entries:
+            for entry in entries:
+                try:
+                    is_directory = entry.is_dir()
+                except OSError:
+                    is_directory = False
+                if is_directory:
+                    if self.followlinks or not entry.is_symlink():
+                        subdirectories.add(entry.name)
+                else:
+                    files.add(entry.name)
+        self._directories[directory] = (
+            mtime, _time_ns(), files, subdirectories
+        )
+        return files, subdirectories
+
+    def _walk(self, directory=''):
+        """ Template Directory Walker
+
+        Scans the given directory and everything below it, yielding the '/'
+        separated names of all files relative to the searchpath.
+
+        Parameters:
+            directory (str): optional [default='']
+
+        Returns:
+            Generator of template names
+        """
+        pending = [directory]
+        while pending:
+            directory = pending.pop()
+            files, subdirectories = self._scan_directory(directory)
+            for name in files:
+                yield self._join(directory, name)
+            for name in subdirectories:
+                pending.append(self._join(directory, name))
+
+    def _add(self, name):
+        """ Add a name to the index, returning 1 if it was not indexed """
+        if name in self._names:
+            return 0
+        self._names.add(name)
+        self._sorted = None
+        return 1
+
+    def _discard(self, name):
+        """ Remove a name from the index, returning 1 if it was indexed """
+        if name not in self._names:
+            return 0
+        self._names.discard(name)
+        self._sorted = None
+        return 1
+
+    def _drop_directory(self, directory):
+        """ Remove a directory and everything indexed below it """
+        updated = 0
+        record = self._directories.pop(directory, None)
+        if record is not None:
+            for name in record[2]:
+                updated += self._discard(self._join(directory, name))
+            for name in record[3]:
+                updated += self._drop_directory(self._join(directory, name))
+        return updated
+
+    def _refresh_directories(self):
+        """ Incremental Refresh
+
+        Re-lists only the scanned directories whose mtime changed (or was
+        recorded too close to the time it was scanned), applying the added
+        and removed files and sub directories to the index.
+
+        Returns:
+            int number of indexed template names added or removed
+        """
+        updated = 0
+        for directory in list(self._directories):
+            record = self._directories.get(directory)
+            if record is None:
+                continue
+            mtime, scanned_ns, files, subdirectories = record
+            try:
+                current_mtime = os.stat(self._get_path(directory)).st_mtime_ns
+            except OSError:
+                updated += self._drop_directory(directory)
+                continue
+            if (
+                current_mtime == mtime and
+                scanned_ns - mtime > RACY_MTIME_WINDOW_NS
+            ):
+                continue
+
+            new_files, new_subdirectories = self._scan_directory(directory)
+            for name in files - new_files:
+                updated += self._discard(self._join(directory, name))
+            for name in new_files - files:
+                updated += self._add(self._join(directory, name))
+            for name in subdirectories - new_subdirectories:
+                updated += self._drop_directory(self._join(directory, name))
+            for name in new_subdirectories - subdirectories:
+                for template in self._walk(self._join(directory, name)):
+                    updated += self._add(template)
+        return updated
+
+    ############################################
+    # Public Index Methods:                    #
+    ############################################
+    def scan(self):
+        """ Full Index Scan Method
+
+        Walks the whole template directory and replaces the indexed names.
+
+        Returns:
+            list of the sorted template names
+        """
+        with self._lock:
+            self._directories = {}
+            self._names = set(self._walk())
+            self._sorted = None
+            self._scanned = True
+            return self.names()
+
+    def iter_names(self):
+        """ Lazy Template Names Generator
+
+        Yields the indexed template names. If the template directory hasn't
+        been scanned yet, the names are yielded (unsorted) while the directory
+        is being walked, and the index is marked as scanned once the walk
+        completes.
+
+        Returns:
+            Generator of template names
+        """
+        if self._scanned:
+            for name in self.names():
+                yield name
+            return
+
+        with self._lock:
+            self._directories = {}
+        walker = self._walk()
+        found_names = set()
+        while True:
+            # The lock isn't held while the caller handles a name.
+            with self._lock:
+                name = next(walker, None)
+                if name is None:
+                    break
+                found_names.add(name)
+                self._add(name)
+            yield name
+        # Drop names found by lookups before the walk that no longer exist.
+        with self._lock:
+            self._names = found_names
+            self._sorted = None
+            self._scanned = True
+
+    def names(self):
+        """ Template Names Method
+
+        Returns:
+            list of the sorted template names
+        """
+        with self._lock:
+            if self._sorted is None:
+                self._sorted = sorted(self._names)
+            return list(self._sorted)
+
+    def find(self, name):
+        """ Template Lookup Method
+
+        Returns True if the template name is indexed. Names that are not
+        indexed fall back to a single stat of the expected template path, so
+        templates added since the last scan are still found and added to the
+        index without walking the directory.
+
+        Parameters:
+            name (str): required
+
+        Returns:
+            bool
+        """
+        if name in self._names:
+            return True
+        self.refresh([name])
+        return name in self._names
+
+    def refresh(self, changed=None):
+        """ Index Refresh Method
+
+        When no changed names are given, the index is refreshed by
+        re-listing only the directories whose mtime changed since they were
+        scanned, or fully scanned if it hasn't been scanned yet. Otherwise
+        only the given template names are checked, adding those that now
+        exist and removing those that no longer exist.
+
+        Parameters:
+            changed (list): optional [default=None]
+
+        Returns:
+            int number of indexed template names added or removed
+        """
+        with self._lock:
+            if changed is None:
+                if not self._scanned:
+                    previous_names = self._names
+                    self.scan()
+                    return len(previous_names ^ self._names)
+                return self._refresh_directories()
+            return self._refresh_names(changed)
+
+    def _refresh_names(self, changed):
+        """ Add the changed names that exist and remove the others """
+        updated = 0
+        for name in changed:
+            try:
+                split_template_path(name)
+            except TemplateNotFound:
+                continue
+            directory, _, filename = name.rpartition('/')
+            record = self._directories.get(directory)
+            if os.path.isfile(self._get_path(name)):
+                updated += self._add(name)
+                if record is not None:
+                    record[2].add(filename)
+            else:
+                updated += self._discard(name)
+                if record is not None:
+                    record[2].discard(filename)
+        return updated
+
+
+#####################
+# Class Definition: #
+#####################
+class LayeredIndex(object):
+    """ CloudMage Layered Template Index
+
+    This class indexes several template directories, or roots, searched in
+    order like the Jinja ChoiceLoader, so a template in an earlier root
+    overrides a template with the same name in a later root. Each root can
+    be mounted under a prefix, like the Jinja PrefixLoader, in which case
+    its templates are named 'prefix/name'. Every directory root has its own
+    TemplateIndex, and roots that are template bundle, zip or tar files are
+    indexed by their TemplateBundle or TemplateArchive. The names listed by
+    the index are the merged, de-duplicated names of all the roots.
+
+    The root a template name resolves to is memoized, so looking up a
+    template found in a later root doesn't check the earlier roots again.
+    A template added to an earlier root after a name was resolved only
+    overrides it once the name is refreshed.
+    """
+
+    def __init__(self, roots, followlinks=False):
+        """ LayeredIndex Class Constructor
+
+        Parameters:
+            roots       (list): required, (prefix, searchpath) pairs
+            followlinks (bool): optional [default=False]
+
+        Raises:
+            ValueError if a root is a file that isn't a template bundle, zip
+            or tar file
+
+        Attributes:
+            self.roots       (list) : public
+            self.followlinks (bool) : public
+            self._indexes    (list) : private
+            self._resolved   (dict) : private
+        """
+        self.roots = [(prefix, searchpath) for prefix, searchpath in roots]
+        self.followlinks = followlinks
+        self._indexes = [
+            open_archive(searchpath) if os.path.isfile(searchpath) else
+            TemplateIndex(searchpath, followlinks)
+            for _, searchpath in self.roots
+        ]
+        self._resolved = {}
+
+    def __contains__(self, name):
+        """ Return True if the template name is in the index of a root """
+        return any(
+            relative_name in self._indexes[position]
+            for position, relative_name in self._candidates(name)
+        )
+
+    def __len__(self):
+        """ Return the number of indexed template names """
+        return len(self.names())
+
+    @property
+    def scanned(self):
+        """ Return True once every root has been scanned """
+        return all(index.scanned for index in self._indexes)
+
+    def _candidates(self, name):
+        """ Yield the roots that may hold a template name, in order
+
+        Returns:
+            Generator of (root position, name relative to the root) tuples
+        """
+        for position, (prefix, _) in enumerate(self.roots):
+            if not prefix:
+                yield position, name
+            elif name.startswith(prefix + '/'):
+                yield position, name[len(prefix) + 1:]
+
+    @staticmethod
+    def _join(prefix, name):
+        """ Return the name of a template of a root mounted under prefix """
+        if prefix:
+            return "{}/{}".format(prefix, name)
+        return name
+
+    def resolve(self, name):
+        """ Template Name Resolver
+
+        Returns the root that holds a template name, checking the roots in
+        order and memoizing the result.
+
+        Parameters:
+            name (str): required
+
+        Returns:
+            tuple of the root position and the name relative to the root, or
+            None if no root holds the template
+        """
+        resolved = self._resolved.get(name)
+        if resolved is not None and resolved[1] in self._indexes[resolved[0]]:
+            return resolved
+        for position, relative_name in self._candidates(name):
+            if self._indexes[position].find(relative_name):
+                resolved = self._resolved[name] = (position, relative_name)
+                return resolved
+        self._resolved.pop(name, None)
+        return None
+
+    def get_archive(self, position):
+        """ Return the archive of a root, or None for a directory root """
+        index = self._indexes[position]
+        if isinstance(index, TemplateIndex):
+            return None
+        return index
+
+    def get_path(self, name):
+        """ Return the filesystem path of a template, or None if not found """
+        resolved = self.resolve(name)
+        if resolved is None:
+            return None
+        position, relative_name = resolved
+        return os.path.join(
+            self.roots[position][1],
+            *relative_name.split('/')
+        )
+
+    def find(self, name):
+        """ Return True if a root holds the template name """
+        return self.resolve(name) is not None
+
+    def scan(self):
+        """ Full Index Scan Method
+
+        Walks every root and replaces the indexed names.
+
+        Returns:
+            list of the sorted, de-duplicated template names
+        """
+        for index in self._indexes:
+            index.scan()
+        self._resolved = {}
+        return self.names()
+
+    def iter_names(self):
+        """ Lazy Template Names Generator
+
+        Yields the de-duplicated template names of every root, in root
+        order, walking the roots that haven't been scanned yet.
+
+        Returns:
+            Generator of template names
+        """
+        found_names = set()
+        for (prefix, _), index in zip(self.roots, self._indexes):
+            for name in index.iter_names():
+                name = self._join(prefix, name)
+                if name not in found_names:
+                    found_names.add(name)
+                    yield name
+
+    def names(self):
+        """ Template Names Method
+
+        Returns:
+            list of the sorted, de-duplicated template names
+        """
+        names = set()
+        for (prefix, _), index in zip(self.roots, self._indexes):
+            names.update(self._join(prefix, name) for name in index.names())
+        return sorted(names)
+
+    def refresh(self, changed=None):
+        """ Index Refresh Method
+
+        Refreshes the index of every root, re-listing only the directories
+        whose mtime changed, or, when changed template names are given,
+        checking only those names in every root that may hold them. The
+        memoized resolution of the refreshed names is discarded.
+
+        Parameters:
+            changed (list): optional [default=None]
+
+        Returns:
+            int number of template names added to or removed from a root
+        """
+        if changed is None:
+            self._resolved = {}
+            return sum(index.refresh() for index in self._indexes)
+
+        updated = 0
+        for name in changed:
+            self._resolved.pop(name, None)
+            for position, relative_name in self._candidates(name):
+                updated += self._indexes[position].refresh([relative_name])
+        return updated
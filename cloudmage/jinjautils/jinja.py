@@ -12,17 +12,71 @@
 # Imports:    #
 ###############
 # Import Pip Installed Modules:
-from jinja2 import Template, Environment, FileSystemLoader
+from jinja2 import Template, FunctionLoader
+from jinja2.bccache import BytecodeCache
+
+# Import Package Modules
+from .index import TemplateIndex
+from .loaders import LayeredLoader, create_loader, parse_roots
+from .parallel import (
+    render_item,
+    render_chunk,
+    failed_chunk,
+    init_worker,
+    _read_template_file
+)
+from .results import RenderResult, WriteResult
+from .writer import OutputWriter, FSYNC_MODES, FSYNC_BATCH
+from .backup import BackupPolicy, BACKUP_STRATEGIES, backup_timestamp
+from .serializers import JsonSerializer
+from .metrics import Metrics, prometheus_text
+from .profiler import TemplateProfiler
+from .environments import EnvironmentPool
+from .deps import DependencyGraph
+from .watch import TemplateWatcher
+from .bundle import write_bundle
+from .manifest import (
+    DigestManifest,
+    WRITTEN,
+    UNCHANGED,
+    SKIPPED,
+    encode_output,
+    output_status,
+    write_output
+)
+from .cache import (
+    TemplateCache,
+    TemplateBytecodeCache,
+    RenderCache
+)
 
 # Import Base Python Modules
+from concurrent.futures import (
+    ProcessPoolExecutor,
+    FIRST_COMPLETED,
+    Future,
+    wait
+)
+from operator import itemgetter
+from itertools import islice
+from functools import partial
 from datetime import datetime
-import inspect
+import threading
+import logging
+import weakref
 import ntpath
-import shutil
-import json
+import io
+import time
 import sys
 import os
 
+# Logging levels of the log method log types, other types log as debug.
+_LOG_LEVELS = {
+    'error': logging.ERROR,
+    'warning': logging.WARNING,
+    'info': logging.INFO
+}
+
 
 #####################
 # Class Definition: #
@@ -37,43 +91,92 @@ class JinjaUtils(object):
     class.
     """
 
-    def __init__(self, verbose=False, log=None):
+    def __init__(self, verbose=False, log=None, template_cache=None):
         """ JinjaHelper Class Constructor
 
         Parameters:
-            verbose (bool): optional [default=False]
-            log     (obj):  optional [default=None]
+            verbose        (bool): optional [default=False]
+            log            (obj):  optional [default=None]
+            template_cache (obj):  optional [default=None]
 
         Attributes:
             self._verbose             (bool) : private
             self._log                 (obj)  : private
             self._log_context         (str)  : private
+            self._muted_log_types     (set)  : private
             self._trim_blocks         (bool) : private
             self._lstrip_blocks       (bool) : private
+            self._lazy_discovery      (bool) : private
             self._template_directory  (str)  : private
+            self._template_roots      (list) : private
             self._available_templates (list) : private
+            self._template_index      (obj)  : private
+            self._dependency_graph    (obj)  : private
+            self._watchers            (list) : private
+            self._watch_lock          (obj)  : private
             self._loaded_template     (obj)  : private
             self._rendered_template   (obj)  : private
             self._jinja_loader        (obj)  : private
             self._jinja_tpl_library   (str)  : private
             self._output_directory    (str)  : private
             self._output_file         (str)  : private
+            self._template_cache      (obj)  : private
+            self._render_cache        (obj)  : private
+            self._json_serializer     (obj)  : private
+            self._bytecode_cache      (obj)  : private
+            self._environment_pool    (obj)  : private
+            self._file_environments   (obj)  : private
+            self._manifest            (obj)  : private
+            self._write_status        (str)  : private
+            self._writer              (obj)  : private
+            self._backup_policy       (obj)  : private
+            self._metrics             (obj)  : private
+            self._profiler            (obj)  : private
 
         Properties:
             self.trim_blocks         (bool) : public
             self.lstrip_blocks       (bool) : public
+            self.lazy_discovery      (bool) : public
             self.verbose             (bool) : public
             self.template_directory  (str)  : public
             self.available_templates (str)  : public
+            self.dependency_graph    (obj)  : public
             self.load                (str)  : public
             self.rendered:           (str)  : public
+            self.template_cache      (obj)  : public
+            self.render_cache        (obj)  : public
+            self.json_serializer     (obj)  : public
+            self.bytecode_cache      (obj)  : public
+            self.manifest            (obj)  : public
+            self.write_status        (str)  : public
+            self.atomic_write        (bool) : public
+            self.fsync               (str)  : public
+            self.backup_policy       (obj)  : public
+            self.metrics             (obj)  : public
+            self.profiler            (obj)  : public
 
         Methods:
             self._exception_handler
+            self._set_log_levels
             self.log
+            self.refresh_templates
+            self.iter_templates
+            self.affected_templates
+            self.bundle_templates
+            self.watch
+            self.unwatch
             self.load
             self.render
+            self.render_batch
+            self.render_parallel
             self.write
+            self.stream
+            self.sync
+            self.get_template
+            self.render_template
+            self.write_template
+            self.stats
+            self.prometheus_metrics
         """
 
         # Class Public Properties and Attributes ######
@@ -94,13 +197,20 @@ class JinjaUtils(object):
         else:
             self._log = None
         self._log_context = "CLS->JinjaUtils"
+        self._set_log_levels()
 
         # Class Private Properties and Attributes ######
         # Getter and Setter propert vars
         self._trim_blocks = True
         self._lstrip_blocks = True
+        self._lazy_discovery = False
         self._template_directory = None
+        self._template_roots = []
         self._available_templates = []
+        self._template_index = None
+        self._dependency_graph = None
+        self._watchers = []
+        self._watch_lock = threading.Lock()
         self._loaded_template = None
         self._rendered_template = None
 
@@ -111,6 +221,47 @@ class JinjaUtils(object):
         self._output_directory = None
         self._output_file = None
 
+        # Compiled template cache used by file path template loads, owned by
+        # this object unless a TemplateCache object is passed in.
+        if isinstance(template_cache, TemplateCache):
+            self._template_cache = template_cache
+        else:
+            self._template_cache = TemplateCache()
+
+        # JSON encoder used by the to_json template filter.
+        self._json_serializer = JsonSerializer()
+
+        # Optional persistent bytecode cache, and the pools of Jinja
+        # Environments, keyed by their Jinja options, used to compile
+        # template directory and file path templates.
+        self._bytecode_cache = None
+        self._environment_pool = None
+        self._file_environments = EnvironmentPool(
+            FunctionLoader(_read_template_file),
+            json_serializer=self._json_serializer
+        )
+
+        # Optional cache of rendered output, keyed by template and context.
+        self._render_cache = None
+
+        # Optional output digest manifest used by skip_unchanged writes, and
+        # the status of the last write call.
+        self._manifest = None
+        self._write_status = None
+
+        # Writer used for all output files, controlling atomic replacement
+        # and fsync behavior, and the policy used to backup existing files.
+        self._writer = OutputWriter()
+        self._backup_policy = BackupPolicy()
+
+        # Optional operation metrics, only recorded when a Metrics object is
+        # set, so that disabled metrics cost a None check per operation.
+        self._metrics = None
+
+        # Optional render profiler, attributing render time and output to
+        # template source lines.
+        self._profiler = None
+
     ############################################
     # Class Exception Handler:                 #
     ############################################
@@ -134,11 +285,26 @@ class JinjaUtils(object):
             f"{sys.exc_info()[2].tb_lineno}: -> {str(exception_object)}"
         )
         self.log(this_exception_msg, 'error', caller_function)
+        if self._metrics is not None:
+            self._metrics.increment('errors')
 
     ############################################
     # Class Logger:                            #
     ############################################
-    def log(self, log_msg, log_type, log_id):
+    def _set_log_levels(self):
+        """ Class Log Level Resolver
+
+        Pre-computes the set of log types that can never be emitted with the
+        current log object and verbose settings, so that the log method can
+        discard them with a single membership test. Without a log object and
+        with verbose disabled, only error messages are published.
+        """
+        if self._log is None and not self._verbose:
+            self._muted_log_types = frozenset(('debug', 'info', 'warning'))
+        else:
+            self._muted_log_types = frozenset()
+
+    def log(self, log_msg, log_type, log_id, *log_args):
         """ Class Log Handler
 
         Provides the logging for this class. If the class caller instantiates
@@ -146,44 +312,68 @@ class JinjaUtils(object):
         log to stdout/stderr or to a provided log object if one was passed
         during object instantiation.
 
+        Any additional positional log_args are applied to log_msg with
+        str.format, but only when the message will actually be published,
+        so callers on hot paths don't pay for formatting discarded messages.
+        Log objects with an isEnabledFor method, such as logging.Logger
+        objects, are asked whether they publish the message level first.
+
         Parameters:
             log_msg  (str):  required
             log_type (str):  required
             log_id   (str):  required
+            log_args (obj):  optional
 
         Returns:
             Log Stream
         """
         # Define this methods identity for functional logging:
-        __id = inspect.stack()[0][3]
+        __id = 'log'
         try:
+            # Discard messages that can't be published before doing any work.
+            if log_type in self._muted_log_types:
+                return
+
             # Internal method variable assignments:
-            this_log_msg_caller = f"{self._log_context}.{log_id}"
+            this_log_type = log_type.lower()
 
-            # Set the log message offset based on the message type:
-            # [debug=3, info=4, warning=1, error=3]
-            this_log_msg_offset = 3
-            if log_type.lower() == 'info':
-                this_log_msg_offset = 4
-            elif log_type.lower() == 'warning':
-                this_log_msg_offset = 1
+            # Discard messages below the level of the log object.
+            is_enabled_for = getattr(self._log, 'isEnabledFor', None)
+            if is_enabled_for is not None and not is_enabled_for(
+                _LOG_LEVELS.get(this_log_type, logging.DEBUG)
+            ):
+                return
+            this_log_msg_caller = f"{self._log_context}.{log_id}"
 
             # If a valid log object was passed into the class constructor,
             # publish the log to the log object:
             if self._log is not None:
                 # Set the log message prefix
+                if log_args:
+                    log_msg = log_msg.format(*log_args)
                 this_log_message = f"{this_log_msg_caller}: -> {log_msg}"
-                if log_type.lower() == 'error':
+                if this_log_type == 'error':
                     self._log.error(this_log_message)
-                elif log_type.lower() == 'warning':
+                elif this_log_type == 'warning':
                     self._log.warning(this_log_message)
-                elif log_type.lower() == 'info':
+                elif this_log_type == 'info':
                     self._log.info(this_log_message)
                 else:
                     self._log.debug(this_log_message)
             # If no valid log object was passed into the class constructor,
             # write the message to stdout, stderr:
-            else:
+            elif this_log_type == 'error' or self._verbose:
+                if log_args:
+                    log_msg = log_msg.format(*log_args)
+
+                # Set the log message offset based on the message type:
+                # [debug=3, info=4, warning=1, error=3]
+                this_log_msg_offset = 3
+                if this_log_type == 'info':
+                    this_log_msg_offset = 4
+                elif this_log_type == 'warning':
+                    this_log_msg_offset = 1
+
                 this_log_message = "{}    {}{}{}: -> {}".format(
                     datetime.now(),
                     log_type.upper(),
@@ -191,11 +381,10 @@ class JinjaUtils(object):
                     this_log_msg_caller,
                     log_msg
                 )
-                if log_type.lower() == 'error':
+                if this_log_type == 'error':
                     print(this_log_message, file=sys.stderr)
                 else:
-                    if self._verbose:
-                        print(this_log_message, file=sys.stdout)
+                    print(this_log_message, file=sys.stdout)
         except Exception as e:
             self._exception_handler(__id, e)
 
@@ -210,8 +399,8 @@ class JinjaUtils(object):
         This method will return the verbose setting.
         """
         # Define this methods identity for functional logging:
-        __id = inspect.stack()[0][3]
-        self.log(f"{__id} property requested.", 'info', __id)
+        __id = 'verbose'
+        self.log("verbose property requested.", 'info', __id)
         return self._verbose
 
     @verbose.setter
@@ -223,22 +412,25 @@ class JinjaUtils(object):
         bool value is provided.
         """
         # Define this methods identity for functional logging:
-        __id = inspect.stack()[0][3]
-        self.log(f"{__id} property update requested.", 'info', __id)
+        __id = 'verbose'
+        self.log("verbose property update requested.", 'info', __id)
 
         if verbose is not None and isinstance(verbose, bool):
             self._verbose = verbose
+            self._set_log_levels()
             self.log(
-                f"Updated {__id} property with value: {self._verbose}",
+                "Updated verbose property with value: {}",
                 'info',
-                __id
+                __id,
+                self._verbose
             )
         else:
             self.log(
-                f"{__id} property argument expected type bool "
-                f"but received type: {type(verbose)}",
+                "verbose property argument expected type bool "
+                "but received type: {}",
                 'error',
-                __id
+                __id,
+                type(verbose)
             )
 
     ############################################
@@ -251,8 +443,8 @@ class JinjaUtils(object):
         Getter method for Jinja trim_blocks property.
         This method returns the current trim_blocks setting value."""
         # Define this methods identity for functional logging:
-        __id = inspect.stack()[0][3]
-        self.log(f"{__id} property requested.", 'info', __id)
+        __id = 'trim_blocks'
+        self.log("trim_blocks property requested.", 'info', __id)
         return self._trim_blocks
 
     @trim_blocks.setter
@@ -264,8 +456,8 @@ class JinjaUtils(object):
         as a valid value for the property.
         """
         # Define this methods identity for functional logging:
-        __id = inspect.stack()[0][3]
-        self.log(f"{__id} property update requested.", 'info', __id)
+        __id = 'trim_blocks'
+        self.log("trim_blocks property update requested.", 'info', __id)
 
         # if the passed value is a valid bool value then set the value.
         if (
@@ -274,21 +466,18 @@ class JinjaUtils(object):
         ):
             self._trim_blocks = trim_blocks_setting
             self.log(
-                "Updated {} property with value: {}".format(
-                    __id,
-                    self._trim_blocks
-                ),
+                "Updated trim_blocks property with value: {}",
                 'info',
-                __id
+                __id,
+                self._trim_blocks
             )
+            self._apply_environment_options(__id)
         else:
             self.log(
-                "{} argument expected bool but received type: {}".format(
-                    __id,
-                    type(trim_blocks_setting)
-                ),
+                "trim_blocks argument expected bool but received type: {}",
                 'error',
-                __id
+                __id,
+                type(trim_blocks_setting)
             )
 
     @property
@@ -299,8 +488,8 @@ class JinjaUtils(object):
         This method returns the current lstrip_blocks setting value.
         """
         # Define this methods identity for functional logging:
-        __id = inspect.stack()[0][3]
-        self.log(f"{__id} property requested.", 'info', __id)
+        __id = 'lstrip_blocks'
+        self.log("lstrip_blocks property requested.", 'info', __id)
         return self._lstrip_blocks
 
     @lstrip_blocks.setter
@@ -312,8 +501,8 @@ class JinjaUtils(object):
         for the lstrip_blocks property.
         """
         # Define this methods identity for functional logging:
-        __id = inspect.stack()[0][3]
-        self.log(f"{__id} property update requested.", 'info', __id)
+        __id = 'lstrip_blocks'
+        self.log("lstrip_blocks property update requested.", 'info', __id)
 
         # if the passed value is a valid bool value then set the value.
         if (
@@ -322,21 +511,65 @@ class JinjaUtils(object):
         ):
             self._lstrip_blocks = lstrip_blocks_setting
             self.log(
-                "Updated {} property with value: {}".format(
-                    __id,
-                    self._lstrip_blocks
-                ),
+                "Updated lstrip_blocks property with value: {}",
                 'info',
-                __id
+                __id,
+                self._lstrip_blocks
             )
+            self._apply_environment_options(__id)
         else:
             self.log(
-                "{} argument expected bool but received type: {}".format(
-                    __id,
-                    type(lstrip_blocks_setting)
-                ),
+                "lstrip_blocks argument expected bool but received type: {}",
                 'error',
-                __id
+                __id,
+                type(lstrip_blocks_setting)
+            )
+
+    @property
+    def lazy_discovery(self):
+        """ Lazy Discovery Property Getter
+
+        Getter method for the lazy_discovery property.
+        This method returns the current lazy_discovery setting value.
+        """
+        # Define this methods identity for functional logging:
+        __id = 'lazy_discovery'
+        self.log("lazy_discovery property requested.", 'info', __id)
+        return self._lazy_discovery
+
+    @lazy_discovery.setter
+    def lazy_discovery(self, lazy_discovery_setting=False):
+        """ Lazy Discovery Property Setter
+
+        Setter method for the lazy_discovery property. When enabled, setting
+        the template_directory no longer scans the directory, the scan is
+        deferred until available_templates is first requested. Templates can
+        still be loaded by name without the directory being scanned.
+        This method will only take a value of true or false as a valid value
+        for the lazy_discovery property.
+        """
+        # Define this methods identity for functional logging:
+        __id = 'lazy_discovery'
+        self.log("lazy_discovery property update requested.", 'info', __id)
+
+        # if the passed value is a valid bool value then set the value.
+        if (
+            lazy_discovery_setting is not None and
+            isinstance(lazy_discovery_setting, bool)
+        ):
+            self._lazy_discovery = lazy_discovery_setting
+            self.log(
+                "Updated lazy_discovery property with value: {}",
+                'info',
+                __id,
+                self._lazy_discovery
+            )
+        else:
+            self.log(
+                "lazy_discovery argument expected bool but received type: {}",
+                'error',
+                __id,
+                type(lazy_discovery_setting)
             )
 
     ############################################
@@ -350,8 +583,8 @@ class JinjaUtils(object):
         template directory and return it back to the method caller.
         """
         # Define this methods identity for functional logging:
-        __id = inspect.stack()[0][3]
-        self.log(f"{__id} property requested.", 'info', __id)
+        __id = 'template_directory'
+        self.log("template_directory property requested.", 'info', __id)
         if self._template_directory is None:
             return "A template directory has not yet been configured."
         else:
@@ -365,11 +598,24 @@ class JinjaUtils(object):
         property. The available_templates property is a list of all templates
         available in the configured template_directory. The template_directory
         setter method constructs the list of template files when a
-        template_directory is updated.
+        template_directory is updated, or if lazy_discovery is enabled, the
+        list is constructed the first time this property is requested.
         """
         # Define this methods identity for functional logging:
-        __id = inspect.stack()[0][3]
+        __id = 'available_templates'
         self.log("Call to retrieve available_templates", 'info', __id)
+        if (
+            self._template_index is not None and
+            not self._template_index.scanned
+        ):
+            self._available_templates = self._scan_templates()
+            self.log(
+                "Discovered {} template(s) in: {}",
+                'debug',
+                __id,
+                len(self._available_templates),
+                self._template_directory
+            )
         if (
             self._available_templates is not None and
             isinstance(self._available_templates, list)
@@ -386,65 +632,104 @@ class JinjaUtils(object):
         and use that location to set the object template_directory property.
         Once validated this method will call the load method to load the
         template directory and populate the available_templates list property.
+        A list of directory paths can be given instead, searched in order so
+        templates in the first directories override templates with the same
+        name in the following directories, with (prefix, path) pairs, or a
+        dict of prefixes to paths, for directories whose templates are named
+        'prefix/name'.
         """
         # Define this methods identity for functional logging:
-        __id = inspect.stack()[0][3]
-        self.log(f"{__id} property update requested.", 'info', __id)
+        __id = 'template_directory'
+        self.log("template_directory property update requested.", 'info', __id)
 
         try:
             # Set template directory
             if (
                 template_directory_path is not None and
-                isinstance(template_directory_path, str)
+                isinstance(template_directory_path, (str, list, tuple, dict))
             ):
-                if (
-                    os.path.exists(template_directory_path) and
-                    os.access(template_directory_path, os.R_OK)
+                try:
+                    template_roots = parse_roots(template_directory_path)
+                except TypeError as e:
+                    self.log(str(e), 'error', __id)
+                    self.log("Aborting property update...", 'error', __id)
+                    return
+                if all(
+                    os.path.exists(path) and os.access(path, os.R_OK)
+                    for _, path in template_roots
                 ):
+                    # Reuse the Environments of unchanged directories.
+                    if (
+                        self._environment_pool is None or
+                        template_roots != self._template_roots
+                    ):
+                        try:
+                            jinja_loader = create_loader(template_roots)
+                        except ValueError as e:
+                            self.log(str(e), 'error', __id)
+                            self.log(
+                                "Aborting property update...",
+                                'error',
+                                __id
+                            )
+                            return
+                        self._jinja_loader = jinja_loader
+                        self._environment_pool = EnvironmentPool(
+                            self._jinja_loader,
+                            self._bytecode_cache,
+                            self._json_serializer,
+                            metrics=self._metrics
+                        )
+                        self._dependency_graph = None
+                        self.unwatch()
                     # Set the template_directory property.
                     self._template_directory = template_directory_path
+                    self._template_roots = template_roots
                     self.log(
-                        "Template directory path set to: {}".format(
-                            self._template_directory
-                        ),
+                        "Template directory path set to: {}",
                         'debug',
-                        __id
-                    )
-                    # Load the templates into Jinja
-                    self._jinja_loader = FileSystemLoader(
+                        __id,
                         self._template_directory
                     )
-                    self._jinja_tpl_library = Environment(
-                        loader=self._jinja_loader,
-                        trim_blocks=self._trim_blocks,
-                        lstrip_blocks=self._lstrip_blocks
+                    # Load the templates into Jinja
+                    self._jinja_tpl_library = self._environment_pool.get(
+                        **self._environment_options()
                     )
-                    self._jinja_tpl_library.filters['to_json'] = json.dumps
                     self.log(
-                        "Jinja successfully loaded: {}".format(
-                            self._template_directory
-                        ),
+                        "Jinja successfully loaded: {}",
                         'debug',
-                        __id
+                        __id,
+                        self._template_directory
                     )
                     self.log(
                         "Added to_json filter to Jinja Environment object.",
                         'debug',
                         __id
                     )
-                    # Set Jinja template library
-                    template_list = self._jinja_tpl_library.list_templates()
+                    # Index the templates in the template library
+                    if isinstance(self._jinja_loader, LayeredLoader):
+                        self._template_index = self._jinja_loader.index
+                    else:
+                        self._template_index = TemplateIndex(
+                            template_roots[0][1]
+                        )
+                    if self._lazy_discovery:
+                        self.log(
+                            "Template discovery deferred until requested.",
+                            'debug',
+                            __id
+                        )
+                        return
+                    template_list = self._scan_templates()
 
                     # Set available_templates property
                     if isinstance(template_list, list) and template_list:
                         self._available_templates = template_list
                         self.log(
-                            "Updated {} property with: {}".format(
-                                __id,
-                                self._available_templates
-                            ),
+                            "Updated template_directory property with: {}",
                             'debug',
-                            __id
+                            __id,
+                            self._available_templates
                         )
                 else:
                     self.log(
@@ -459,16 +744,426 @@ class JinjaUtils(object):
                     )
             else:
                 self.log(
-                    "Provided path expected type str but received: {}".format(
-                        type(template_directory_path)
-                    ),
+                    "Provided path expected type str but received: {}",
                     'error',
-                    __id
+                    __id,
+                    type(template_directory_path)
                 )
                 self.log("Aborting property update...", 'error', __id)
         except Exception as e:  # pragma: no cover
             self._exception_handler(__id, e)  # pragma: no cover
 
+    def _scan_templates(self):
+        """ Template Discovery
+
+        Scans the template index, recording the scan duration in the
+        discover histogram when metrics are enabled.
+
+        Returns:
+            list of the template names
+        """
+        metrics = self._metrics
+        if metrics is None:
+            return self._template_index.scan()
+        start_time = time.perf_counter()
+        try:
+            return self._template_index.scan()
+        finally:
+            metrics.observe('discover', time.perf_counter() - start_time)
+
+    def refresh_templates(self, changed=None):
+        """ Refresh Template Index Method
+
+        Class method that updates the index of templates available in the
+        configured template directory. Without arguments only the
+        directories whose modification time changed since they were last
+        scanned are listed again (or the whole template directory is scanned
+        if it hasn't been scanned yet). When a list of changed template names
+        is provided, for instance from a file change notification, only those
+        names are checked and added to or removed from the index.
+
+        Parameters:
+            changed (list): optional [default=None]
+
+        Returns:
+            True if the index was refreshed, False otherwise
+        """
+        # Define this methods identity for functional logging:
+        __id = 'refresh_templates'
+        self.log("refresh_templates called.", 'info', __id)
+
+        try:
+            if self._template_index is None:
+                self.log(
+                    "No template directory configured, Aborting refresh!",
+                    'error',
+                    __id
+                )
+                return False
+            if changed is not None and isinstance(changed, str):
+                changed = [changed]
+            # Serialized with the index updates of template watchers.
+            with self._watch_lock:
+                updated = self._template_index.refresh(changed)
+                self._available_templates = self._template_index.names()
+            self.log(
+                "Template index refreshed, {} template(s) updated.",
+                'debug',
+                __id,
+                updated
+            )
+            return True
+        except Exception as e:
+            self._exception_handler(__id, e)
+            return False
+
+    def iter_templates(self):
+        """ Iterate Templates Method
+
+        Class generator method that yields the names of the templates
+        available in the configured template directory. If the directory
+        hasn't been scanned yet, names are yielded as the directory is being
+        walked, so callers looking for the first matching template don't
+        have to wait for the whole directory tree to be scanned.
+
+        Returns:
+            Generator of template names
+        """
+        # Define this methods identity for functional logging:
+        __id = 'iter_templates'
+        self.log("iter_templates called.", 'info', __id)
+
+        if self._template_index is None:
+            self.log(
+                "No template directory configured, Aborting iteration!",
+                'error',
+                __id
+            )
+            return
+        for template_name in self._template_index.iter_names():
+            yield template_name
+        self._available_templates = self._template_index.names()
+
+    @property
+    def dependency_graph(self):
+        """ Dependency Graph Property Getter
+
+        Returns the DependencyGraph of the templates in the configured
+        template directory, recording the templates each template extends,
+        includes or imports. The graph is created empty on first request,
+        and is populated by the affected_templates method, or by loading a
+        graph saved by a previous build with its load method.
+        """
+        # Define this methods identity for functional logging:
+        __id = 'dependency_graph'
+        self.log("dependency_graph property requested.", 'info', __id)
+        if self._environment_pool is None:
+            self.log(
+                "No template directory configured, no graph available!",
+                'error',
+                __id
+            )
+            return None
+        if self._dependency_graph is None:
+            self._dependency_graph = DependencyGraph(self._jinja_tpl_library)
+        return self._dependency_graph
+
+    def affected_templates(self, changed=None):
+        """ Affected Templates Method
+
+        Class method that returns the templates in the configured template
+        directory whose output may change when the given templates change,
+        the changed templates and every template that extends, includes or
+        imports them, directly or through other templates. Templates that
+        reference a template through a variable are always included.
+        Without arguments the source of every template is checked against
+        the dependency graph, so after loading a graph saved by a previous
+        build, only the templates affected by the changes made since then
+        are returned, and every template is returned when the graph is
+        empty.
+
+        Parameters:
+            changed (list): optional [default=None]
+
+        Returns:
+            list of the sorted affected template names
+        """
+        # Define this methods identity for functional logging:
+        __id = 'affected_templates'
+        self.log("affected_templates called.", 'info', __id)
+
+        try:
+            graph = self.dependency_graph
+            if graph is None:
+                return []
+            if not self._template_index.scanned:
+                self._available_templates = self._scan_templates()
+            names = self._template_index.names()
+            if changed is None:
+                changed = graph.build(names)
+            else:
+                if isinstance(changed, str):
+                    changed = [changed]
+                if not len(graph):
+                    graph.build(names)
+                changed = set(changed) | graph.update(changed)
+            affected = sorted(graph.affected(changed))
+            self.log(
+                "{} changed template(s) affect {} template(s).",
+                'debug',
+                __id,
+                len(changed),
+                len(affected)
+            )
+            return affected
+        except Exception as e:
+            self._exception_handler(__id, e)
+            return []
+
+    ############################################
+    # Template Bundles:                        #
+    ############################################
+    def bundle_templates(self, bundle_path):
+        """ Bundle Templates Method
+
+        Class method that writes every template available in the configured
+        template directory to a single template bundle file, with the code
+        of each template precompiled with the current Jinja options. The
+        bundle can then be set as the template_directory, or as one of the
+        template directories, to load the templates from one memory mapped
+        file instead of a directory tree, using the precompiled code while
+        the Jinja options match those the bundle was written with.
+
+        Parameters:
+            bundle_path (str): required
+
+        Returns:
+            int number of bundled templates, or None if bundling failed
+        """
+        # Define this methods identity for functional logging:
+        __id = 'bundle_templates'
+        self.log("bundle_templates called.", 'info', __id)
+
+        try:
+            if self._template_index is None:
+                self.log(
+                    "No template directory configured, Aborting bundle!",
+                    'error',
+                    __id
+                )
+                return None
+            if not self._template_index.scanned:
+                self._available_templates = self._scan_templates()
+            environment = self._jinja_tpl_library
+            templates = dict(
+                (name, environment.loader.get_source(environment, name)[0])
+                for name in self._template_index.names()
+            )
+            bundled = write_bundle(bundle_path, templates, environment)
+            self.log(
+                "Bundled {} template(s) to: {}",
+                'debug',
+                __id,
+                bundled,
+                bundle_path
+            )
+            return bundled
+        except Exception as e:
+            self._exception_handler(__id, e)
+            return None
+
+    ############################################
+    # Template Directory Watcher:              #
+    ############################################
+    def watch(self, callback=None, debounce=0.2, interval=1.0, backend='auto'):
+        """ Watch Template Directory Method
+
+        Class method that watches the configured template directory, or
+        every template directory when several are configured, from a
+        background thread, using inotify on Linux and polling the directory
+        every interval seconds otherwise. When templates are added, edited
+        or removed, the template index is updated for the changed names
+        only, and the compiled templates affected by the change, the changed
+        templates and every template that extends, includes or imports them,
+        are evicted from the template directory Environments, so they are
+        compiled again from the new source on their next load. A loaded
+        template that is affected is reloaded. Changes are debounced, so a
+        burst of saves is applied once no change was seen for debounce
+        seconds. The optional callback is then called, from the watcher
+        thread, with the sorted list of affected template names, for
+        instance to render the outputs of those templates again.
+
+        Parameters:
+            callback (func):  optional [default=None]
+            debounce (float): optional [default=0.2]
+            interval (float): optional [default=1.0]
+            backend  (str):   optional [default='auto']
+
+        Returns:
+            True if the template directory is being watched, False otherwise
+        """
+        # Define this methods identity for functional logging:
+        __id = 'watch'
+        self.log("watch called.", 'info', __id)
+
+        try:
+            if self._template_index is None:
+                self.log(
+                    "No template directory configured, Aborting watch!",
+                    'error',
+                    __id
+                )
+                return False
+            if callback is not None and not callable(callback):
+                self.log(
+                    "callback expected callable but received type: {}",
+                    'error',
+                    __id,
+                    type(callback)
+                )
+                return False
+            self.unwatch()
+            # Record the template sources and references before watching,
+            # so later changes can be resolved to their dependents.
+            if not len(self.dependency_graph):
+                self.affected_templates()
+            for prefix, path in self._template_roots:
+                # Template bundles and archives are replaced, not edited.
+                if not os.path.isdir(path):
+                    continue
+                watcher = TemplateWatcher(
+                    path,
+                    partial(self._apply_template_changes, callback, prefix),
+                    debounce,
+                    interval,
+                    backend
+                )
+                self._watchers.append(watcher.start())
+                self.log(
+                    "Watching {} for template changes using {}.",
+                    'debug',
+                    __id,
+                    path,
+                    watcher.backend
+                )
+            return True
+        except ValueError as e:
+            self.log(str(e), 'error', __id)
+            return False
+        except Exception as e:
+            self._exception_handler(__id, e)
+            return False
+
+    def unwatch(self):
+        """ Stop Watching Template Directory Method
+
+        Class method that stops the template directory watcher started by
+        the watch method.
+
+        Returns:
+            True if a watcher was stopped, False otherwise
+        """
+        # Define this methods identity for functional logging:
+        __id = 'unwatch'
+        self.log("unwatch called.", 'info', __id)
+
+        watchers, self._watchers = self._watchers, []
+        for watcher in watchers:
+            watcher.stop()
+            self.log(
+                "Stopped watching {} for template changes.",
+                'debug',
+                __id,
+                watcher.directory
+            )
+        return bool(watchers)
+
+    def _apply_template_changes(self, callback, prefix, changed):
+        """ Template Change Handler
+
+        Called by a template directory watcher with the changed template
+        names, or None if the whole directory must be checked again.
+
+        Parameters:
+            callback (func): required
+            prefix   (str):  required
+            changed  (set):  required
+        """
+        # Define this methods identity for functional logging:
+        __id = 'watch'
+
+        try:
+            if changed is not None:
+                changed = sorted(
+                    "{}/{}".format(prefix, name) if prefix else name
+                    for name in changed
+                )
+            with self._watch_lock:
+                affected = self._update_templates(changed)
+            self.log(
+                "Template changes applied, {} template(s) affected: {}",
+                'debug',
+                __id,
+                len(affected),
+                affected
+            )
+            if callback is not None and affected:
+                callback(affected)
+        except Exception as e:
+            self._exception_handler(__id, e)
+
+    def _update_templates(self, changed):
+        """ Template Update Method
+
+        Updates the template index and dependency graph for the changed
+        template names, or every template if changed is None, and evicts
+        the affected compiled templates.
+
+        Parameters:
+            changed (list): required
+
+        Returns:
+            list of the sorted affected template names
+        """
+        self._template_index.refresh(changed)
+        self._available_templates = self._template_index.names()
+        affected = self.affected_templates(changed)
+        self._evict_templates(affected)
+        return affected
+
+    def _evict_templates(self, template_names):
+        """ Template Eviction Method
+
+        Removes the named templates from the compiled template caches of
+        the template directory Environments, and reloads the loaded
+        template if it is one of them.
+
+        Parameters:
+            template_names (list): required
+        """
+        template_names = set(template_names)
+        if not template_names or self._environment_pool is None:
+            return
+        for environment in self._environment_pool.environments():
+            if environment.cache is None:
+                continue
+            loader_ref = weakref.ref(environment.loader)
+            for template_name in template_names:
+                try:
+                    del environment.cache[(loader_ref, template_name)]
+                except KeyError:
+                    pass
+        loaded_template = self._loaded_template
+        if (
+            loaded_template is not None and
+            loaded_template.name in template_names and
+            loaded_template.environment in self._environment_pool and
+            loaded_template.name in self._template_index
+        ):
+            self._loaded_template = loaded_template.environment.get_template(
+                loaded_template.name
+            )
+
     ############################################
     # Jinja Template Getter/Setter:            #
     ############################################
@@ -480,8 +1175,8 @@ class JinjaUtils(object):
         self._loaded_template back to the caller
         """
         # Define this methods identity for functional logging:
-        __id = inspect.stack()[0][3]
-        self.log(f"{__id} property requested.", 'info', __id)
+        __id = 'load'
+        self.log("load property requested.", 'info', __id)
 
         # Return the loaded template name.
         if (
@@ -507,100 +1202,830 @@ class JinjaUtils(object):
         self._loaded_template = None
         try:
             # Define this methods identity for functional logging:
-            __id = inspect.stack()[0][3]
-            self.log(f"{__id} property update requested.", 'info', __id)
+            __id = 'load'
+            self.log("load property update requested.", 'info', __id)
 
-            # Check the value passed to determine what type
-            # of template was passed.
-            if os.path.isfile(template) and os.access(template, os.R_OK):
-                self._loaded_template = Template(open(template).read())
-                self.log(
-                    "Loaded template file from path: {}".format(
-                        self._loaded_template
-                    ),
-                    'info',
-                    __id
-                )
-                if not self._loaded_template.name:
-                    self._loaded_template.name = os.path.basename(template)
+            # Resolve the template name or file path to a Jinja Template.
+            self._loaded_template = self._resolve_template(template, __id)
+            if self._loaded_template is not None:
                 self.log(
-                    "Loaded template name set to: {}".format(
-                        self._loaded_template.name
-                    ),
+                    "Loaded template name set to: {}",
                     'debug',
-                    __id
+                    __id,
+                    self._loaded_template.name
                 )
-            else:
-                if isinstance(template, str):
-                    for tpl in self._jinja_tpl_library.list_templates():
-                        if template == tpl:
-                            self._loaded_template = \
-                                self._jinja_tpl_library.get_template(
-                                    template
-                                )
-                            self.log(
-                                "Loaded template file from: {}".format(
-                                    self._loaded_template
-                                ),
-                                'info',
-                                __id
-                            )
-                    if (
-                        self._loaded_template is None
-                    ):
-                        self.log(
-                            "Requested template not found in: {}".format(
-                                self._template_directory
-                            ),
-                            'warning',
-                            __id
-                        )
-                else:
-                    self.log(
-                        "{} expected str template but received: {}".format(
-                            __id,
-                            type(template)
-                        ),
-                        'error',
-                        __id
-                    )
         except Exception as e:
             self._exception_handler(__id, e)
 
-    @property
-    def rendered(self):
-        """ Rendered Template Property Getter
+    def _resolve_template(self, template, log_id):
+        """ Template Resolver
 
-        Class method that will return the currently rendered version
-        of the currently loaded template.
-        """
-        # Define this methods identity for functional logging:
-        __id = inspect.stack()[0][3]
-        self.log(f"{__id} property requested.", 'info', __id)
+        Returns the Jinja Template for a template, which can be:
 
-        # Return the rendered template value.
-        if self._rendered_template is not None:
-            return self._rendered_template
-        else:
-            return "No template has been rendered!"
+        * The name of a template in the configured template_directory
+        * A file path to a valid jinja file on the filesystem
 
-    def render(self, **kwargs):
-        """ Render Template Method
+        This method doesn't update any object attribute, so it can be called
+        from several threads sharing the same object. The resolution time is
+        recorded in the load histogram when metrics are enabled.
 
-        Class method that will render the template loaded in the objects
+        Parameters:
+            template (str): required
+            log_id   (str): required
+
+        Returns:
+            Jinja Template object, or None if the template wasn't found
+        """
+        metrics = self._metrics
+        if metrics is None:
+            return self._find_template(template, log_id)
+        start_time = time.perf_counter()
+        try:
+            return self._find_template(template, log_id)
+        finally:
+            metrics.observe('load', time.perf_counter() - start_time)
+
+    def _find_template(self, template, log_id):
+        """ Template Finder
+
+        Returns the Jinja Template for a template file path, or a template
+        name in the configured template_directory.
+
+        Parameters:
+            template (str): required
+            log_id   (str): required
+
+        Returns:
+            Jinja Template object, or None if the template wasn't found
+        """
+        # Check the value passed to determine what type
+        # of template was passed.
+        if os.path.isfile(template) and os.access(template, os.R_OK):
+            loaded_template = self._load_template_file(template, log_id)
+            self.log(
+                "Loaded template file from path: {}",
+                'info',
+                log_id,
+                loaded_template
+            )
+            return loaded_template
+
+        if not isinstance(template, str):
+            self.log(
+                "load expected str template but received: {}",
+                'error',
+                log_id,
+                type(template)
+            )
+            return None
+
+        environment = self._jinja_tpl_library
+        template_index = self._template_index
+        if template_index is not None and template_index.find(template):
+            loaded_template = environment.get_template(template)
+            self.log(
+                "Loaded template file from: {}",
+                'info',
+                log_id,
+                loaded_template
+            )
+            return loaded_template
+
+        self.log(
+            "Requested template not found in: {}",
+            'warning',
+            log_id,
+            self._template_directory
+        )
+        return None
+
+    def _load_template_file(self, template_path, log_id):
+        """ Template File Loader
+
+        Returns the compiled Template for a template file path, using the
+        compiled template cache so that an unchanged file compiled by the
+        same Jinja Environment is only read, parsed and compiled once.
+        Templates are bound to the Environment that compiled them, with its
+        filters and options, so a TemplateCache shared by several objects
+        never returns a template compiled by another object.
+
+        Parameters:
+            template_path (str):  required
+            log_id        (str):  required
+
+        Returns:
+            Jinja Template object
+        """
+        template_stat = os.stat(template_path)
+        file_environment = self._get_file_environment()
+        # Cached templates keep their Environment alive, so its id is unique.
+        template_key = (
+            os.path.abspath(template_path),
+            template_stat.st_mtime_ns,
+            template_stat.st_size,
+            id(file_environment)
+        )
+        template = self._template_cache.get(template_key)
+        if template is not None:
+            self.log(
+                "Template cache hit for: {}",
+                'debug',
+                log_id,
+                template_path
+            )
+            return template
+
+        # Compile through the file Environment loader, which consults the
+        # bytecode cache (if one is configured) before compiling the source.
+        template = file_environment.loader.load(
+            file_environment,
+            template_key[0],
+            file_environment.make_globals(None)
+        )
+        template.name = os.path.basename(template_path)
+        self._template_cache.set(template_key, template)
+        return template
+
+    def _get_file_environment(self):
+        """ File Template Environment Getter
+
+        Returns the Jinja Environment used to compile file path templates for
+        the current trim_blocks and lstrip_blocks settings, creating it on
+        first use.
+
+        Returns:
+            Jinja Environment object
+        """
+        return self._file_environments.get(**self._environment_options())
+
+    def _environment_options(self):
+        """ Return the Jinja Environment options of the current settings """
+        return {
+            'trim_blocks': self._trim_blocks,
+            'lstrip_blocks': self._lstrip_blocks
+        }
+
+    def _apply_environment_options(self, log_id):
+        """ Environment Options Update
+
+        Switches the template directory Environment to the pooled Environment
+        for the current Jinja options, and loads the loaded template again
+        with them. Templates already compiled with the same options are
+        reused.
+
+        Parameters:
+            log_id (str): required
+        """
+        try:
+            if self._environment_pool is not None:
+                self._jinja_tpl_library = self._environment_pool.get(
+                    **self._environment_options()
+                )
+            loaded_template = self._loaded_template
+            if not isinstance(loaded_template, Template):
+                return
+            if loaded_template.environment in self._file_environments:
+                self._loaded_template = self._load_template_file(
+                    loaded_template.filename,
+                    log_id
+                )
+            elif (
+                self._environment_pool is not None and
+                loaded_template.environment in self._environment_pool
+            ):
+                self._loaded_template = self._jinja_tpl_library.get_template(
+                    loaded_template.name
+                )
+            else:
+                return
+            self.log(
+                "Reloaded {} with the updated Jinja options.",
+                'debug',
+                log_id,
+                self._loaded_template
+            )
+        except Exception as e:
+            self._exception_handler(log_id, e)
+
+    ############################################
+    # Jinja Bytecode Cache Getter/Setter:      #
+    ############################################
+    @property
+    def bytecode_cache(self):
+        """ Bytecode Cache Property Getter
+
+        Returns the Jinja bytecode cache object used when compiling directory
+        and file path templates, or None if bytecode caching is disabled.
+        """
+        # Define this methods identity for functional logging:
+        __id = 'bytecode_cache'
+        self.log("bytecode_cache property requested.", 'info', __id)
+        return self._bytecode_cache
+
+    @bytecode_cache.setter
+    def bytecode_cache(self, bytecode_cache):
+        """ Bytecode Cache Property Setter
+
+        Setter method that enables a persistent bytecode cache shared across
+        processes. The value can be a directory path, in which case a
+        TemplateBytecodeCache is created for that directory, any Jinja
+        BytecodeCache object, or None to disable bytecode caching. The cache
+        is applied to the current template directory Environment and to file
+        path template loads.
+        """
+        # Define this methods identity for functional logging:
+        __id = 'bytecode_cache'
+        self.log("bytecode_cache property update requested.", 'info', __id)
+
+        try:
+            if isinstance(bytecode_cache, str):
+                bytecode_cache = TemplateBytecodeCache(bytecode_cache)
+            if (
+                bytecode_cache is not None and
+                not isinstance(bytecode_cache, BytecodeCache)
+            ):
+                self.log(
+                    "bytecode_cache expected str path or BytecodeCache "
+                    "but received type: {}",
+                    'error',
+                    __id,
+                    type(bytecode_cache)
+                )
+                return
+
+            self._bytecode_cache = bytecode_cache
+            if self._environment_pool is not None:
+                self._environment_pool.set_bytecode_cache(bytecode_cache)
+            self._file_environments.set_bytecode_cache(bytecode_cache)
+            self.log(
+                "Updated bytecode_cache property with value: {}",
+                'info',
+                __id,
+                self._bytecode_cache
+            )
+        except Exception as e:
+            self._exception_handler(__id, e)
+
+    @property
+    def template_cache(self):
+        """ Template Cache Property Getter
+
+        Returns the TemplateCache object used by this instance to cache
+        compiled file path templates. Its max_size can be adjusted and its
+        stats() method reports the cache hits and misses.
+        """
+        # Define this methods identity for functional logging:
+        __id = 'template_cache'
+        self.log("template_cache property requested.", 'info', __id)
+        return self._template_cache
+
+    ############################################
+    # Render Output Cache Getter/Setter:       #
+    ############################################
+    @property
+    def render_cache(self):
+        """ Render Cache Property Getter
+
+        Returns the RenderCache used by the render and render_template
+        methods, or None if rendered output caching is disabled.
+        """
+        # Define this methods identity for functional logging:
+        __id = 'render_cache'
+        self.log("render_cache property requested.", 'info', __id)
+        return self._render_cache
+
+    @render_cache.setter
+    def render_cache(self, render_cache):
+        """ Render Cache Property Setter
+
+        Setter method that enables caching of rendered output keyed by the
+        template and the render context. The value can be a RenderCache
+        object, True for an in-memory RenderCache with the default settings,
+        a directory path for a RenderCache with a disk tier in that
+        directory, or None to disable rendered output caching.
+        """
+        # Define this methods identity for functional logging:
+        __id = 'render_cache'
+        self.log("render_cache property update requested.", 'info', __id)
+
+        try:
+            if render_cache is True:
+                render_cache = RenderCache()
+            elif isinstance(render_cache, str):
+                render_cache = RenderCache(directory=render_cache)
+            if render_cache is None or isinstance(render_cache, RenderCache):
+                self._render_cache = render_cache
+                self.log(
+                    "Updated render_cache property with value: {}",
+                    'info',
+                    __id,
+                    self._render_cache
+                )
+            else:
+                self.log(
+                    "render_cache expected RenderCache, True or str path "
+                    "but received type: {}",
+                    'error',
+                    __id,
+                    type(render_cache)
+                )
+        except Exception as e:
+            self._exception_handler(__id, e)
+
+    ############################################
+    # JSON Serializer Getter/Setter:           #
+    ############################################
+    @property
+    def json_serializer(self):
+        """ JSON Serializer Property Getter
+
+        Returns the JsonSerializer used by the to_json template filter.
+        """
+        # Define this methods identity for functional logging:
+        __id = 'json_serializer'
+        self.log("json_serializer property requested.", 'info', __id)
+        return self._json_serializer
+
+    @json_serializer.setter
+    def json_serializer(self, json_serializer):
+        """ JSON Serializer Property Setter
+
+        Setter method that sets the JSON encoder used by the to_json template
+        filter. The value can be a JsonSerializer object, a backend name
+        (json, orjson, rapidjson, ujson or auto for the fastest installed
+        backend) to use with the default options, or None to restore the
+        standard library encoder. The filter is updated on the Jinja
+        Environments already created.
+        """
+        # Define this methods identity for functional logging:
+        __id = 'json_serializer'
+        self.log("json_serializer property update requested.", 'info', __id)
+
+        try:
+            if json_serializer is None:
+                json_serializer = JsonSerializer()
+            elif isinstance(json_serializer, str):
+                try:
+                    json_serializer = JsonSerializer(json_serializer)
+                except ValueError as e:
+                    self.log("{}", 'error', __id, e)
+                    return
+            if not isinstance(json_serializer, JsonSerializer):
+                self.log(
+                    "json_serializer expected JsonSerializer or str backend "
+                    "but received type: {}",
+                    'error',
+                    __id,
+                    type(json_serializer)
+                )
+                return
+
+            json_serializer.metrics = self._metrics
+            self._json_serializer = json_serializer
+            if self._environment_pool is not None:
+                self._environment_pool.set_json_serializer(json_serializer)
+            self._file_environments.set_json_serializer(json_serializer)
+            self.log(
+                "Updated json_serializer property with value: {}",
+                'info',
+                __id,
+                self._json_serializer
+            )
+        except Exception as e:
+            self._exception_handler(__id, e)
+
+    ############################################
+    # Output Manifest Getter/Setter:           #
+    ############################################
+    @property
+    def manifest(self):
+        """ Manifest Property Getter
+
+        Returns the DigestManifest used by skip_unchanged writes, or None if
+        no manifest is configured.
+        """
+        # Define this methods identity for functional logging:
+        __id = 'manifest'
+        self.log("manifest property requested.", 'info', __id)
+        return self._manifest
+
+    @manifest.setter
+    def manifest(self, manifest):
+        """ Manifest Property Setter
+
+        Sets the output digest manifest used by skip_unchanged writes. The
+        value can be the path of a JSON manifest file, which is loaded if it
+        exists, a DigestManifest object, or None to disable the manifest.
+        """
+        # Define this methods identity for functional logging:
+        __id = 'manifest'
+        self.log("manifest property update requested.", 'info', __id)
+
+        try:
+            if isinstance(manifest, str):
+                manifest = DigestManifest(manifest)
+            if manifest is None or isinstance(manifest, DigestManifest):
+                self._manifest = manifest
+                self.log(
+                    "Updated manifest property with value: {}",
+                    'info',
+                    __id,
+                    self._manifest
+                )
+            else:
+                self.log(
+                    "manifest expected str path or DigestManifest but "
+                    "received type: {}",
+                    'error',
+                    __id,
+                    type(manifest)
+                )
+        except Exception as e:
+            self._exception_handler(__id, e)
+
+    @property
+    def write_status(self):
+        """ Write Status Property Getter
+
+        Returns the status of the last write call, written, unchanged or
+        skipped, or None if the last write failed or write wasn't called.
+        """
+        # Define this methods identity for functional logging:
+        __id = 'write_status'
+        self.log("write_status property requested.", 'info', __id)
+        return self._write_status
+
+    ############################################
+    # Output Durability Getters and Setters:   #
+    ############################################
+    @property
+    def atomic_write(self):
+        """ Atomic Write Property Getter
+
+        Getter method for the atomic_write property.
+        This method returns the current atomic_write setting value.
+        """
+        # Define this methods identity for functional logging:
+        __id = 'atomic_write'
+        self.log("atomic_write property requested.", 'info', __id)
+        return self._writer.atomic
+
+    @atomic_write.setter
+    def atomic_write(self, atomic_write_setting=False):
+        """ Atomic Write Property Setter
+
+        Setter method for the atomic_write property. When enabled, output
+        files are written to a temporary file in the output directory that
+        is then renamed over the output file, so readers never see a
+        partially written file, and a failed write or stream leaves the
+        previous file untouched.
+        This method will only take a value of true or false as a valid value
+        for the atomic_write property.
+        """
+        # Define this methods identity for functional logging:
+        __id = 'atomic_write'
+        self.log("atomic_write property update requested.", 'info', __id)
+
+        # if the passed value is a valid bool value then set the value.
+        if (
+            atomic_write_setting is not None and
+            isinstance(atomic_write_setting, bool)
+        ):
+            self._writer.atomic = atomic_write_setting
+            self.log(
+                "Updated atomic_write property with value: {}",
+                'info',
+                __id,
+                self._writer.atomic
+            )
+        else:
+            self.log(
+                "atomic_write argument expected bool but received type: {}",
+                'error',
+                __id,
+                type(atomic_write_setting)
+            )
+
+    @property
+    def fsync(self):
+        """ Fsync Property Getter
+
+        Getter method for the fsync property.
+        This method returns the current fsync mode.
+        """
+        # Define this methods identity for functional logging:
+        __id = 'fsync'
+        self.log("fsync property requested.", 'info', __id)
+        return self._writer.fsync
+
+    @fsync.setter
+    def fsync(self, fsync_mode='none'):
+        """ Fsync Property Setter
+
+        Setter method for the fsync property, which controls when output
+        files are flushed to disk:
+
+        * none: flushing is left to the operating system
+        * always: every output file and its directory are fsynced
+        * batch: every output file is fsynced, and the directory fsyncs are
+          deferred until the sync method is called, or the end of a batch
+          render, so each directory is only fsynced once
+        """
+        # Define this methods identity for functional logging:
+        __id = 'fsync'
+        self.log("fsync property update requested.", 'info', __id)
+
+        if fsync_mode in FSYNC_MODES:
+            if self._writer.fsync == FSYNC_BATCH and fsync_mode != FSYNC_BATCH:
+                self._writer.sync()
+            self._writer.fsync = fsync_mode
+            self.log(
+                "Updated fsync property with value: {}",
+                'info',
+                __id,
+                self._writer.fsync
+            )
+        else:
+            self.log(
+                "fsync expected one of {} but received: {}",
+                'error',
+                __id,
+                FSYNC_MODES,
+                fsync_mode
+            )
+
+    def sync(self):
+        """ Sync Output Directories Method
+
+        Class method that fsyncs every output directory written to since the
+        last sync when the fsync mode is batch, once per directory.
+
+        Returns:
+            int number of directories synced
+        """
+        # Define this methods identity for functional logging:
+        __id = 'sync'
+        self.log("sync called.", 'info', __id)
+        synced = self._writer.sync()
+        self.log("{} output director(ies) synced.", 'debug', __id, synced)
+        return synced
+
+    ############################################
+    # Output Backup Getters and Setters:       #
+    ############################################
+    @property
+    def backup_policy(self):
+        """ Backup Policy Property Getter
+
+        Returns the BackupPolicy used to backup existing output files.
+        """
+        # Define this methods identity for functional logging:
+        __id = 'backup_policy'
+        self.log("backup_policy property requested.", 'info', __id)
+        return self._backup_policy
+
+    @backup_policy.setter
+    def backup_policy(self, backup_policy):
+        """ Backup Policy Property Setter
+
+        Sets the policy used to backup existing output files. The value can
+        be a BackupPolicy object, the name of a backup strategy (copy, rename
+        or hardlink) to use with no rotation or compression, or None to
+        restore the default copy policy. Pending backup compressions of the
+        previous policy are waited for.
+        """
+        # Define this methods identity for functional logging:
+        __id = 'backup_policy'
+        self.log("backup_policy property update requested.", 'info', __id)
+
+        try:
+            if backup_policy is None:
+                backup_policy = BackupPolicy()
+            elif isinstance(backup_policy, str):
+                if backup_policy not in BACKUP_STRATEGIES:
+                    self.log(
+                        "backup_policy expected one of {} but received: {}",
+                        'error',
+                        __id,
+                        BACKUP_STRATEGIES,
+                        backup_policy
+                    )
+                    return
+                backup_policy = BackupPolicy(backup_policy)
+            if isinstance(backup_policy, BackupPolicy):
+                self._backup_policy.wait()
+                self._backup_policy = backup_policy
+                self.log(
+                    "Updated backup_policy property with value: {}",
+                    'info',
+                    __id,
+                    self._backup_policy
+                )
+            else:
+                self.log(
+                    "backup_policy expected BackupPolicy or str strategy but "
+                    "received type: {}",
+                    'error',
+                    __id,
+                    type(backup_policy)
+                )
+        except Exception as e:
+            self._exception_handler(__id, e)
+
+    ############################################
+    # Operation Metrics Getter/Setter:         #
+    ############################################
+    @property
+    def metrics(self):
+        """ Metrics Property Getter
+
+        Returns the Metrics object recording the operation metrics of this
+        instance, or None if metrics are disabled.
+        """
+        # Define this methods identity for functional logging:
+        __id = 'metrics'
+        self.log("metrics property requested.", 'info', __id)
+        return self._metrics
+
+    @metrics.setter
+    def metrics(self, metrics):
+        """ Metrics Property Setter
+
+        Setter method that enables the operation metrics: the duration of
+        template discovery, load, compile, render, to_json filter, write,
+        stream and backup operations, the bytes written and the errors. The
+        value can be a Metrics object, which can be shared by several
+        instances, True for a new Metrics object, a callable for a new
+        Metrics object calling it with every metric update, or None to
+        disable metrics.
+        """
+        # Define this methods identity for functional logging:
+        __id = 'metrics'
+        self.log("metrics property update requested.", 'info', __id)
+
+        try:
+            if metrics is True:
+                metrics = Metrics()
+            elif callable(metrics) and not isinstance(metrics, Metrics):
+                metrics = Metrics(callback=metrics)
+            if metrics is not None and not isinstance(metrics, Metrics):
+                self.log(
+                    "metrics expected Metrics, True or callable but "
+                    "received type: {}",
+                    'error',
+                    __id,
+                    type(metrics)
+                )
+                return
+
+            self._metrics = metrics
+            self._json_serializer.metrics = metrics
+            if self._environment_pool is not None:
+                self._environment_pool.set_metrics(metrics)
+            self._file_environments.set_metrics(metrics)
+            self.log(
+                "Updated metrics property with value: {}",
+                'info',
+                __id,
+                self._metrics
+            )
+        except Exception as e:
+            self._exception_handler(__id, e)
+
+    def stats(self):
+        """ Statistics Method
+
+        Class method that returns a snapshot of the operation metrics, if
+        enabled, and of the template and render caches with their hit rates.
+        Histograms report the count, sum, mean, min, max and cumulative
+        buckets of the recorded durations in seconds.
+
+        Returns:
+            dict with enabled, counters, histograms and caches
+        """
+        # Define this methods identity for functional logging:
+        __id = 'stats'
+        self.log("stats requested.", 'info', __id)
+
+        if self._metrics is not None:
+            stats = self._metrics.stats()
+        else:
+            stats = {'counters': {}, 'histograms': {}}
+        stats['enabled'] = self._metrics is not None
+        caches = {'template_cache': self._template_cache.stats()}
+        if self._render_cache is not None:
+            caches['render_cache'] = self._render_cache.stats()
+        for cache_stats in caches.values():
+            hits = cache_stats['hits'] + cache_stats.get('disk_hits', 0)
+            lookups = hits + cache_stats['misses']
+            cache_stats['hit_rate'] = hits / lookups if lookups else 0.0
+        stats['caches'] = caches
+        return stats
+
+    def prometheus_metrics(self, namespace='jinjautils'):
+        """ Prometheus Metrics Method
+
+        Class method that returns the stats snapshot in the Prometheus text
+        exposition format, for a metrics endpoint or a node exporter
+        textfile collector.
+
+        Parameters:
+            namespace (str): optional [default='jinjautils']
+
+        Returns:
+            str
+        """
+        return prometheus_text(self.stats(), namespace)
+
+    ############################################
+    # Template Profiler Getter/Setter:         #
+    ############################################
+    @property
+    def profiler(self):
+        """ Profiler Property Getter
+
+        Returns the TemplateProfiler profiling the render and
+        render_template methods, or None if profiling is disabled.
+        """
+        # Define this methods identity for functional logging:
+        __id = 'profiler'
+        self.log("profiler property requested.", 'info', __id)
+        return self._profiler
+
+    @profiler.setter
+    def profiler(self, profiler):
+        """ Profiler Property Setter
+
+        Setter method that enables the render profiling mode. While a
+        profiler is set, the render and render_template methods trace the
+        compiled template code, bypassing the render cache, and attribute
+        render time and output bytes to the template source lines, blocks,
+        macros and included templates, reported by the profiler report,
+        stats, blocks and folded methods. The value can be a
+        TemplateProfiler object, True for a new TemplateProfiler, or None
+        to disable profiling.
+        """
+        # Define this methods identity for functional logging:
+        __id = 'profiler'
+        self.log("profiler property update requested.", 'info', __id)
+
+        try:
+            if profiler is True:
+                profiler = TemplateProfiler()
+            if profiler is None or isinstance(profiler, TemplateProfiler):
+                self._profiler = profiler
+                self.log(
+                    "Updated profiler property with value: {}",
+                    'info',
+                    __id,
+                    self._profiler
+                )
+            else:
+                self.log(
+                    "profiler expected TemplateProfiler or True but "
+                    "received type: {}",
+                    'error',
+                    __id,
+                    type(profiler)
+                )
+        except Exception as e:
+            self._exception_handler(__id, e)
+
+    @property
+    def rendered(self):
+        """ Rendered Template Property Getter
+
+        Class method that will return the currently rendered version
+        of the currently loaded template.
+        """
+        # Define this methods identity for functional logging:
+        __id = 'rendered'
+        self.log("rendered property requested.", 'info', __id)
+
+        # Return the rendered template value.
+        if self._rendered_template is not None:
+            return self._rendered_template
+        else:
+            return "No template has been rendered!"
+
+    def render(self, **kwargs):
+        """ Render Template Method
+
+        Class method that will render the template loaded in the objects
         self._loaded_template property. This method will accept multiple
         dictionary objects as an input provided that they were provided
         in the format of keyword = dictionary where keyword is the variable
         in the Jinja template that will map to the dictionary object being
-        passed.
+        passed. If a render_cache is configured, the cached output is used
+        when the template was already rendered with the same kwargs.
         """
         # Reinitialize the rendered property
         self._rendered_template = None
         try:
             # Define this methods identity for functional logging:
-            __id = inspect.stack()[0][3]
+            __id = 'render'
             self.log(
-                "{} of loaded template requested.".format(__id),
+                "render of loaded template requested.",
                 'info',
                 __id
             )
@@ -609,184 +2034,944 @@ class JinjaUtils(object):
                 hasattr(self._loaded_template, 'render')
             ):
                 # Render the template passing in the kwargs input.
-                self._rendered_template = \
-                    self._loaded_template.render(**kwargs)
+                self._rendered_template = self._render_output(
+                    self._loaded_template,
+                    kwargs
+                )
                 self.log(
-                    "{} rendered successfully!".format(
-                        self._loaded_template
-                    ),
+                    "{} rendered successfully!",
                     'info',
-                    __id
+                    __id,
+                    self._loaded_template
                 )
             else:
                 self.log(
-                    "No template loaded, Aborting render!",
+                    "No template loaded, Aborting render!",
+                    'error',
+                    __id
+                )
+        except Exception as e:
+            self._exception_handler(__id, e)
+
+    def _render_output(self, template, context):
+        """ Template Output Renderer
+
+        Renders a template with a context dict for the render and
+        render_template methods, with the profiler if one is set, and
+        otherwise through the render cache if one is configured. The render
+        duration is recorded when metrics are enabled.
+
+        Parameters:
+            template (obj):  required
+            context  (dict): required
+
+        Returns:
+            str rendered output
+        """
+        metrics = self._metrics
+        if metrics is not None:
+            start_time = time.perf_counter()
+        if self._profiler is not None:
+            output = self._profiler.render(template, context)
+        elif self._render_cache is not None:
+            output = self._render_cache.render(template, context)
+        else:
+            output = template.render(context)
+        if metrics is not None:
+            metrics.observe('render', time.perf_counter() - start_time)
+        return output
+
+    def render_batch(self, items, backup=True, skip_unchanged=False):
+        """ Batch Render Template Method
+
+        Class method that will render the loaded template once for every
+        (context, output_path) pair in the provided iterable, writing each
+        rendered template to its output path. Items are rendered in a tight
+        loop without the per call logging and validation of the render and
+        write methods. A failed item is recorded in the results and doesn't
+        abort the batch. When an output_path is None, the rendered template
+        is returned in the item result instead of being written to disk.
+        Existing output files are backed up when backup is enabled. When
+        skip_unchanged is enabled, output files that already hold the
+        rendered template are neither backed up nor written, and the
+        manifest, if one is configured, is consulted and saved.
+
+        Parameters:
+            items          (iterable): required
+            backup         (bool):     optional [default=True]
+            skip_unchanged (bool):     optional [default=False]
+
+        Returns:
+            dict with the per item results, rendered and failed counts,
+            written, unchanged and skipped counts, seconds elapsed and
+            items_per_second, or False if no template is loaded
+        """
+        # Define this methods identity for functional logging:
+        __id = 'render_batch'
+        self.log("render_batch of loaded template requested.", 'info', __id)
+
+        if not isinstance(self._loaded_template, Template):
+            self.log(
+                "No template loaded, Aborting batch render!",
+                'error',
+                __id
+            )
+            return False
+        if not isinstance(backup, bool):
+            self.log(
+                "Backup expected bool value but received type: {}",
+                'warning',
+                __id,
+                type(backup)
+            )
+            backup = True
+
+        template_render = self._loaded_template.render
+        batch_timestamp = backup_timestamp()
+        results = []
+        failed = 0
+        start_time = time.perf_counter()
+
+        skip_unchanged = skip_unchanged is True
+        manifest = self._manifest if skip_unchanged else None
+        for item_index, item in enumerate(items):
+            result = render_item(
+                template_render,
+                item_index,
+                item,
+                backup,
+                batch_timestamp,
+                skip_unchanged,
+                manifest,
+                self._writer,
+                self._backup_policy
+            )
+            if not result['success']:
+                failed += 1
+                self.log(
+                    "Batch item {} failed with: {}",
                     'error',
-                    __id
+                    __id,
+                    item_index,
+                    result['error']
                 )
-        except Exception as e:
-            self._exception_handler(__id, e)
+            results.append(result)
+
+        if manifest is not None:
+            manifest.save()
+        self._writer.sync()
+        self._backup_policy.wait()
+        return self._batch_summary(results, failed, start_time, __id)
+
+    def render_parallel(
+        self,
+        items,
+        jobs=None,
+        chunk_size=None,
+        ordered=True,
+        backup=True,
+        skip_unchanged=False
+    ):
+        """ Parallel Batch Render Template Method
+
+        Class method that will render the loaded template for every
+        (context, output_path) pair in the provided iterable, like the
+        render_batch method, spreading the items across a pool of worker
+        processes so rendering can use every CPU core. Each worker builds its
+        Jinja Environment from the template_directory, trim_blocks,
+        lstrip_blocks and bytecode_cache settings once and reuses it. Items
+        are sent to the workers in chunks of chunk_size items. The results
+        are returned in input order, or in the order they completed if
+        ordered is False. Contexts must be picklable: every item of a chunk
+        that can't be sent to a worker, or whose worker died, is reported as
+        failed with the exception. When skip_unchanged is
+        enabled, the workers compare the rendered template with the existing
+        output files, the manifest isn't used.
+
+        Parameters:
+            items          (iterable): required
+            jobs           (int):      optional [default=os.cpu_count()]
+            chunk_size     (int):      optional [default=None]
+            ordered        (bool):     optional [default=True]
+            backup         (bool):     optional [default=True]
+            skip_unchanged (bool):     optional [default=False]
+
+        Returns:
+            dict with the per item results, rendered and failed counts,
+            written, unchanged and skipped counts, seconds elapsed,
+            items_per_second and jobs, or False if no template is loaded
+        """
+        # Define this methods identity for functional logging:
+        __id = 'render_parallel'
+        self.log("render_parallel of loaded template requested.", 'info', __id)
+
+        if not isinstance(self._loaded_template, Template):
+            self.log(
+                "No template loaded, Aborting parallel render!",
+                'error',
+                __id
+            )
+            return False
+        if not isinstance(backup, bool):
+            self.log(
+                "Backup expected bool value but received type: {}",
+                'warning',
+                __id,
+                type(backup)
+            )
+            backup = True
+        if not self._is_positive_int(jobs):
+            jobs = os.cpu_count() or 1
+        if not self._is_positive_int(chunk_size):
+            if hasattr(items, '__len__'):
+                chunk_size = min(max(len(items) // (jobs * 4), 1), 1000)
+            else:
+                chunk_size = 100
+
+        # Workers rebuild the Environment the loaded template came from.
+        from_file = (
+            self._jinja_tpl_library is None or
+            self._loaded_template.environment is not self._jinja_tpl_library
+        )
+        if from_file:
+            template_name = self._loaded_template.filename
+        else:
+            template_name = self._loaded_template.name
+        bytecode_directory = None
+        if isinstance(self._bytecode_cache, TemplateBytecodeCache):
+            bytecode_directory = self._bytecode_cache.directory
+        self.log(
+            "Rendering {} with {} worker(s) and chunk_size {}",
+            'debug',
+            __id,
+            template_name,
+            jobs,
+            chunk_size
+        )
+
+        batch_timestamp = backup_timestamp()
+        results = []
+        failed = 0
+        start_time = time.perf_counter()
+        item_iterator = enumerate(items)
+        # Chunks in flight, by their future.
+        pending = {}
+
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=init_worker,
+            initargs=(
+                self._template_directory,
+                self._trim_blocks,
+                self._lstrip_blocks,
+                bytecode_directory,
+                self._json_serializer
+            )
+        ) as executor:
+            while True:
+                # Keep a bounded number of chunks in flight.
+                while len(pending) < jobs * 2:
+                    chunk = list(islice(item_iterator, chunk_size))
+                    if not chunk:
+                        break
+                    try:
+                        future = executor.submit(
+                            render_chunk,
+                            template_name,
+                            from_file,
+                            chunk,
+                            backup,
+                            batch_timestamp,
+                            skip_unchanged is True,
+                            self._writer,
+                            self._backup_policy
+                        )
+                    except Exception as e:
+                        # A broken pool doesn't accept new chunks.
+                        future = Future()
+                        future.set_exception(e)
+                    pending[future] = chunk
+                if not pending:
+                    break
+                done = wait(pending, return_when=FIRST_COMPLETED).done
+                for future in done:
+                    chunk = pending.pop(future)
+                    try:
+                        chunk_results = future.result()
+                    except Exception as e:
+                        # Unpicklable items or a worker that died, such as
+                        # a BrokenProcessPool, fail the items of the chunk.
+                        chunk_results = failed_chunk(chunk, e)
+                    for result in chunk_results:
+                        if not result['success']:
+                            failed += 1
+                            self.log(
+                                "Batch item {} failed with: {}",
+                                'error',
+                                __id,
+                                result['index'],
+                                result['error']
+                            )
+                        results.append(result)
+
+        if ordered:
+            results.sort(key=itemgetter('index'))
+        summary = self._batch_summary(results, failed, start_time, __id)
+        summary['jobs'] = jobs
+        return summary
+
+    @staticmethod
+    def _is_positive_int(value):
+        """ Return True if the value is a positive int, excluding bools """
+        return (
+            isinstance(value, int) and
+            not isinstance(value, bool) and
+            value > 0
+        )
+
+    def _batch_summary(self, results, failed, start_time, log_id):
+        """ Batch Render Summary
+
+        Builds and logs the summary returned by the batch render methods.
 
-    def write(self, output_directory, output_file, backup=True):
+        Parameters:
+            results    (list):  required
+            failed     (int):   required
+            start_time (float): required
+            log_id     (str):   required
+
+        Returns:
+            dict with the per item results, rendered and failed counts,
+            written, unchanged and skipped counts, seconds elapsed and
+            items_per_second
+        """
+        elapsed = time.perf_counter() - start_time
+        summary = {
+            'results': results,
+            'rendered': len(results) - failed,
+            'failed': failed,
+            WRITTEN: 0,
+            UNCHANGED: 0,
+            SKIPPED: 0,
+            'seconds': elapsed,
+            'items_per_second': len(results) / elapsed if elapsed else 0.0
+        }
+        for result in results:
+            if result['status'] is not None:
+                summary[result['status']] += 1
+        self.log(
+            "Batch rendered {} of {} item(s) in {:.3f}s ({:.1f} items/s)",
+            'info',
+            log_id,
+            summary['rendered'],
+            len(results),
+            elapsed,
+            summary['items_per_second']
+        )
+        return summary
+
+    def write(
+        self,
+        output_directory,
+        output_file,
+        backup=True,
+        skip_unchanged=False
+    ):
         """ Write Rendered Template Method
 
         Class method that will write the rendered jinja template that
         is currently loaded in memory to disk in the specified
-        directory/path location.
+        directory/path location. When skip_unchanged is enabled, the write
+        and the backup are skipped if the existing output file already holds
+        the rendered template, and the write_status property reports whether
+        the file was written, unchanged or skipped.
         """
+        self._write_status = None
         try:
             # Define this methods identity for functional logging:
-            __id = inspect.stack()[0][3]
+            __id = 'write'
             self.log(
-                "{} called on rendered template requested.".format(__id),
+                "write called on rendered template requested.",
                 'info',
                 __id
             )
 
             # Set local method variables
-            if isinstance(backup, bool):
-                self.__backup = backup
-            else:
+            self._set_backup(backup, __id)
+
+            # Set the Output Directory and perform directory validation checks
+            if not self._set_output_path(output_directory, output_file, __id):
+                return False
+            write_output_file = os.path.join(
+                self._output_directory,
+                self._output_file
+            )
+
+            # Check for rendered output before touching the output file.
+            if self.rendered == "No template has been rendered!":
                 self.log(
-                    "Backup expected bool value but received type: {}".format(
-                        type(backup)
-                    ),
+                    "Render method not called or failed to render.",
                     'warning',
                     __id
                 )
                 self.log(
-                    "Setting backup to default setting...",
+                    "No rendered template available for write request!",
                     'warning',
                     __id
                 )
-                self.__backup = True
+                return False
+
+            # Skip the write and backup if the output file is unchanged.
+            encoded_output = None
+            if skip_unchanged is True:
+                encoded_output = encode_output(self._rendered_template)
+                unchanged_status = output_status(
+                    write_output_file,
+                    encoded_output,
+                    self._manifest
+                )
+                if unchanged_status is not None:
+                    self._write_status = unchanged_status
+                    self.log(
+                        "{} is {}, skipping write!",
+                        'info',
+                        __id,
+                        write_output_file,
+                        unchanged_status
+                    )
+                    return True
+
+            # Check if file back up is enabled and if so backup the file.
+            replace = self._backup_policy.replaces_output(
+                self._backup_output_file(__id)
+            )
+
+            # Write the output file.
             self.log(
-                    "Backup setting has been set to: {}.".format(
-                        self.__backup
-                    ),
-                    'info',
+                "Writing rendered template to output file: {}",
+                "debug",
+                __id,
+                write_output_file
+            )
+            self._write_output_file(
+                write_output_file,
+                self._rendered_template,
+                encoded_output,
+                replace
+            )
+            self._write_status = WRITTEN
+            self.log(
+                "{} written successfully!",
+                "info",
+                __id,
+                write_output_file
+            )
+            return True
+        except Exception as e:  # pragma: no cover
+            self._exception_handler(__id, e)  # pragma: no cover
+
+    def stream(
+        self,
+        output_directory,
+        output_file,
+        backup=True,
+        buffer_size=None,
+        **kwargs
+    ):
+        """ Stream Template Method
+
+        Class method that will render the loaded template straight to disk
+        in the specified directory/path location. The template is rendered
+        with the Jinja generate method and each chunk is written to the
+        output file as it is produced, so the full output is never held in
+        memory. Existing output files are backed up the same way as the
+        write method. The rendered property isn't updated.
+
+        Parameters:
+            output_directory (str):  required
+            output_file      (str):  required
+            backup           (bool): optional [default=True]
+            buffer_size      (int):  optional [default=io.DEFAULT_BUFFER_SIZE]
+            **kwargs         (dict): optional
+
+        Returns:
+            True if the template was streamed to disk, False otherwise
+        """
+        # Define this methods identity for functional logging:
+        __id = 'stream'
+        try:
+            self.log(
+                "stream of loaded template requested.",
+                'info',
+                __id
+            )
+            if not isinstance(self._loaded_template, Template):
+                self.log(
+                    "No template loaded, Aborting stream!",
+                    'error',
                     __id
                 )
+                return False
 
-            # Set the Output Directory and perform directory validation checks
-            if (
-                isinstance(output_directory, str) and
-                os.path.exists(output_directory) and
-                not os.path.isfile(output_directory)
+            # Validate the output buffer size.
+            if buffer_size is None:
+                buffer_size = io.DEFAULT_BUFFER_SIZE
+            elif (
+                not isinstance(buffer_size, int) or
+                isinstance(buffer_size, bool) or
+                buffer_size < 1
             ):
-                self._output_directory = output_directory
                 self.log(
-                    "Output directory has been set to: {}!".format(
-                        self._output_directory
-                    ),
-                    'debug',
-                    __id
+                    "buffer_size expected positive int but received: {}",
+                    'warning',
+                    __id,
+                    buffer_size
                 )
-                # Set the Output file and perform validation checks
-                if isinstance(output_file, str):
-                    head, tail = ntpath.split(output_file)
-                    if tail or ntpath.basename(head) is not None:
-                        self._output_file = tail or ntpath.basename(head)
-                        self.log(
-                            "Output file has been set to: {}!".format(
-                                self._output_file
-                            ),
-                            'debug',
-                            __id
-                        )
-                else:
-                    self.log(
-                        "Output expected str filename but received {}".format(
-                            type(output_file)
-                        ),
-                        'error',
-                        __id
-                    )
-                    return False
-            else:
                 self.log(
-                    "Invalid output directory specified in {} call".format(
-                        __id
-                    ),
-                    'error',
+                    "Setting buffer_size to default setting...",
+                    'warning',
                     __id
                 )
-                return False
+                buffer_size = io.DEFAULT_BUFFER_SIZE
 
-            # Check if file back up is enabled and if so backup the file.
-            if os.path.exists(os.path.join(
-                self._output_directory,
-                self._output_file
-            )):
-                # If backup enabled, make a backup of the file.
-                if self.__backup:
-                    # Separate the filename from the file extention
-                    raw_filename, raw_file_extention = os.path.splitext(
-                        self._output_file
-                    )
-                    backup_timestamp = datetime.now().strftime(
-                        "%Y%m%d_%H%M%S"
-                    )
-                    source_filename = os.path.join(
-                        self._output_directory,
-                        self._output_file
-                    )
-                    backup_filename = os.path.join(
-                        self._output_directory,
-                        "{}_{}.bak".format(
-                            raw_filename, backup_timestamp
-                        )
-                    )
-                    shutil.copy(source_filename, backup_filename)
-                    self.log(
-                        "{} backed up to: {}".format(
-                            self._output_file,
-                            backup_filename
-                        ),
-                        "info",
-                        __id
-                    )
-                else:
-                    self.log(
-                        "File backup is disabled, overwritting: {}!".format(
-                            self._output_file
-                        ),
-                        "warning",
-                        __id
-                    )
-            # Write the output file.
-            write_output_file = os.path.join(
+            # Validate the output location.
+            self._set_backup(backup, __id)
+            if not self._set_output_path(output_directory, output_file, __id):
+                return False
+            stream_output_file = os.path.join(
                 self._output_directory,
                 self._output_file
             )
+            # An output file that is backed up is replaced by a temporary
+            # file once the stream is complete, so a failed render leaves
+            # the output file and no backup behind.
+            replace = self.__backup and os.path.exists(stream_output_file)
+            if not replace:
+                self._backup_output_file(__id)
+
+            # Stream the rendered template chunks to the output file.
             self.log(
-                "Writing rendered template to output file: {}".format(
-                    write_output_file
-                ),
+                "Streaming rendered template to output file: {}",
                 "debug",
-                __id
+                __id,
+                stream_output_file
             )
-            if self.rendered == "No template has been rendered!":
-                self.log(
-                    "Render method not called or failed to render.",
-                    'warning',
-                    __id
+            metrics = self._metrics
+            if metrics is not None:
+                start_time = time.perf_counter()
+            with self._writer.open(
+                stream_output_file,
+                buffering=buffer_size,
+                replace=replace
+            ) as output:
+                output.writelines(self._loaded_template.generate(**kwargs))
+                if replace:
+                    # Backup the existing output now the stream succeeded.
+                    self._backup_output_file(__id)
+            if metrics is not None:
+                metrics.observe('stream', time.perf_counter() - start_time)
+                metrics.increment(
+                    'bytes_written',
+                    os.path.getsize(stream_output_file)
                 )
+            self.log(
+                "{} streamed successfully!",
+                "info",
+                __id,
+                stream_output_file
+            )
+            return True
+        except Exception as e:
+            self._exception_handler(__id, e)
+            return False
+
+    ############################################
+    # Re-entrant Template Methods:             #
+    ############################################
+    def get_template(self, template):
+        """ Get Template Method
+
+        Class method that returns the Jinja Template for a template name in
+        the configured template directory, or a template file path, without
+        updating the loaded template. Like all of the re-entrant methods,
+        it doesn't update any object attribute, so one object, and the
+        Jinja Environment it holds, can be shared by many threads.
+
+        Parameters:
+            template (str): required
+
+        Returns:
+            Jinja Template object, or None if the template wasn't found
+        """
+        # Define this methods identity for functional logging:
+        __id = 'get_template'
+        try:
+            return self._resolve_template(template, __id)
+        except Exception as e:
+            self._exception_handler(__id, e)
+            return None
+
+    def render_template(self, template, context=None, **kwargs):
+        """ Render Template Method
+
+        Class method that renders a template, without loading it as the
+        object loaded template or storing the output in the rendered
+        property. The template can be a Jinja Template object, a template
+        name in the configured template directory, or a template file path.
+        Template variables are passed as a context dict, keyword arguments,
+        or both. Output is cached by the render_cache, if one is configured.
+
+        Parameters:
+            template (str):  required
+            context  (dict): optional [default=None]
+            **kwargs (dict): optional
+
+        Returns:
+            RenderResult object
+        """
+        # Define this methods identity for functional logging:
+        __id = 'render_template'
+        template_name = getattr(template, 'name', template)
+        try:
+            if not isinstance(template, Template):
+                template = self._resolve_template(template, __id)
+                if template is None:
+                    return RenderResult(
+                        template_name,
+                        error="Template not found: {}".format(template_name)
+                    )
+            if context:
+                kwargs = dict(context, **kwargs)
+            output = self._render_output(template, kwargs)
+            self.log(
+                "{} rendered successfully!",
+                'debug',
+                __id,
+                template_name
+            )
+            return RenderResult(template_name, output)
+        except Exception as e:
+            self._exception_handler(__id, e)
+            return RenderResult(
+                template_name,
+                error="{}: {}".format(type(e).__name__, e)
+            )
+
+    def write_template(
+        self,
+        rendered,
+        output_directory,
+        output_file,
+        backup=True,
+        skip_unchanged=False
+    ):
+        """ Write Template Method
+
+        Class method that writes a rendered template to disk, given a
+        RenderResult from render_template or a rendered string, without
+        updating the output directory and output file attributes. Output
+        paths are validated, existing files are backed up, and unchanged
+        files are skipped when skip_unchanged is enabled, the same way as the
+        write method.
+
+        Parameters:
+            rendered         (obj):  required
+            output_directory (str):  required
+            output_file      (str):  required
+            backup           (bool): optional [default=True]
+            skip_unchanged   (bool): optional [default=False]
+
+        Returns:
+            WriteResult object
+        """
+        # Define this methods identity for functional logging:
+        __id = 'write_template'
+        try:
+            if isinstance(rendered, RenderResult):
+                if not rendered.success:
+                    return WriteResult(error=(
+                        "No rendered template available for write request!"
+                    ))
+                rendered = rendered.output
+            if not isinstance(rendered, str):
                 self.log(
-                    "No rendered template available for write request!",
-                    'warning',
-                    __id
+                    "Rendered template expected str but received: {}",
+                    'error',
+                    __id,
+                    type(rendered)
                 )
-                return False
-            else:
-                output = open(write_output_file, "w")
-                output.write(self._rendered_template)
-                output.close()
+                return WriteResult(error=(
+                    "Rendered template expected str but received: {}".format(
+                        type(rendered)
+                    )
+                ))
+
+            backup = self._get_backup(backup, __id)
+            output_path = self._get_output_path(
+                output_directory,
+                output_file,
+                __id
+            )
+            if output_path is None:
+                return WriteResult(error="Invalid output path specified!")
+            output_path = os.path.join(*output_path)
+            encoded_output = None
+            if skip_unchanged is True:
+                encoded_output = encode_output(rendered)
+                unchanged_status = output_status(
+                    output_path,
+                    encoded_output,
+                    self._manifest
+                )
+                if unchanged_status is not None:
+                    self.log(
+                        "{} is {}, skipping write!",
+                        'info',
+                        __id,
+                        output_path,
+                        unchanged_status
+                    )
+                    return WriteResult(output_path, status=unchanged_status)
+
+            backup_path = self._backup_file(output_path, backup, __id)
+            replace = self._backup_policy.replaces_output(backup_path)
+            self._write_output_file(
+                output_path,
+                rendered,
+                encoded_output,
+                replace
+            )
+            self.log(
+                "{} written successfully!",
+                "info",
+                __id,
+                output_path
+            )
+            return WriteResult(output_path, backup_path, status=WRITTEN)
+        except Exception as e:
+            self._exception_handler(__id, e)
+            return WriteResult(error="{}: {}".format(type(e).__name__, e))
+
+    ############################################
+    # Output File Helpers:                     #
+    ############################################
+    def _set_backup(self, backup, log_id):
+        """ Output File Backup Setting
+
+        Validates the backup argument of the write and stream methods and
+        stores it on the object.
+
+        Parameters:
+            backup (bool): required
+            log_id (str):  required
+        """
+        self.__backup = self._get_backup(backup, log_id)
+
+    def _get_backup(self, backup, log_id):
+        """ Output File Backup Validation
+
+        Validates a backup argument, falling back to enabled backups if the
+        value isn't a bool.
+
+        Parameters:
+            backup (bool): required
+            log_id (str):  required
+
+        Returns:
+            bool
+        """
+        if not isinstance(backup, bool):
+            self.log(
+                "Backup expected bool value but received type: {}",
+                'warning',
+                log_id,
+                type(backup)
+            )
+            self.log(
+                "Setting backup to default setting...",
+                'warning',
+                log_id
+            )
+            backup = True
+        self.log(
+            "Backup setting has been set to: {}.",
+            'info',
+            log_id,
+            backup
+        )
+        return backup
+
+    def _set_output_path(self, output_directory, output_file, log_id):
+        """ Output Path Setting
+
+        Validates the output directory and file name of the write and stream
+        methods and sets the output directory and output file attributes.
+
+        Parameters:
+            output_directory (str): required
+            output_file      (str): required
+            log_id           (str): required
+
+        Returns:
+            True if the output path is valid, False otherwise
+        """
+        if self._is_output_directory(output_directory):
+            self._output_directory = output_directory
+        output_path = self._get_output_path(
+            output_directory,
+            output_file,
+            log_id
+        )
+        if output_path is None:
+            return False
+        self._output_directory, self._output_file = output_path
+        return True
+
+    @staticmethod
+    def _is_output_directory(output_directory):
+        """ Return True if the output directory is an existing directory """
+        return (
+            isinstance(output_directory, str) and
+            os.path.exists(output_directory) and
+            not os.path.isfile(output_directory)
+        )
+
+    def _get_output_path(self, output_directory, output_file, log_id):
+        """ Output Path Validation
+
+        Validates an output directory and file name. The output directory
+        must be an existing directory, and any path in the output file name
+        is stripped.
+
+        Parameters:
+            output_directory (str): required
+            output_file      (str): required
+            log_id           (str): required
+
+        Returns:
+            tuple of the output directory and file name, or None if invalid
+        """
+        if self._is_output_directory(output_directory):
+            self.log(
+                "Output directory has been set to: {}!",
+                'debug',
+                log_id,
+                output_directory
+            )
+            # Set the Output file and perform validation checks
+            if isinstance(output_file, str):
+                head, tail = ntpath.split(output_file)
+                output_file = tail or ntpath.basename(head)
                 self.log(
-                    "{} written successfully!".format(write_output_file),
-                    "info",
-                    __id
+                    "Output file has been set to: {}!",
+                    'debug',
+                    log_id,
+                    output_file
                 )
-                return True
-        except Exception as e:  # pragma: no cover
-            self._exception_handler(__id, e)  # pragma: no cover
+                return output_directory, output_file
+            self.log(
+                "Output expected str filename but received {}",
+                'error',
+                log_id,
+                type(output_file)
+            )
+            return None
+        self.log(
+            "Invalid output directory specified in write call",
+            'error',
+            log_id
+        )
+        return None
+
+    def _write_output_file(self, output_path, rendered, encoded_output,
+                           replace):
+        """ Output File Write
+
+        Writes rendered output with the output writer, through the manifest
+        when the output was already encoded for a skip_unchanged check. The
+        write duration and bytes written are recorded when metrics are
+        enabled.
+
+        Parameters:
+            output_path    (str):   required
+            rendered       (str):   required
+            encoded_output (bytes): required, None if not encoded
+            replace        (bool):  required
+        """
+        metrics = self._metrics
+        if metrics is not None:
+            start_time = time.perf_counter()
+        if encoded_output is not None:
+            write_output(
+                output_path,
+                encoded_output,
+                self._manifest,
+                self._writer,
+                replace
+            )
+        else:
+            self._writer.write(output_path, rendered, replace)
+        if metrics is not None:
+            metrics.observe('write', time.perf_counter() - start_time)
+            if encoded_output is None:
+                encoded_output = encode_output(rendered)
+            metrics.increment('bytes_written', len(encoded_output))
+
+    def _backup_output_file(self, log_id):
+        """ Output File Backup
+
+        Backs up the existing output file of the write and stream methods if
+        backups are enabled.
+
+        Parameters:
+            log_id (str): required
+
+        Returns:
+            str path of the backup file, or None if no backup was made
+        """
+        return self._backup_file(
+            os.path.join(self._output_directory, self._output_file),
+            self.__backup,
+            log_id
+        )
+
+    def _backup_file(self, output_path, backup, log_id):
+        """ File Backup
+
+        Backs up an existing file to a timestamped .bak file in the same
+        directory with the backup policy if backups are enabled.
+
+        Parameters:
+            output_path (str):  required
+            backup      (bool): required
+            log_id      (str):  required
+
+        Returns:
+            str path of the backup file, or None if no backup was made
+        """
+        if not os.path.exists(output_path):
+            return None
+        output_file = os.path.basename(output_path)
+        # If backup enabled, make a backup of the file.
+        if backup:
+            metrics = self._metrics
+            if metrics is not None:
+                start_time = time.perf_counter()
+            backup_filename = self._backup_policy.backup(output_path)
+            if metrics is not None:
+                metrics.observe('backup', time.perf_counter() - start_time)
+            self.log(
+                "{} backed up to: {}",
+                "info",
+                log_id,
+                output_file,
+                backup_filename
+            )
+            return backup_filename
+        self.log(
+            "File backup is disabled, overwritting: {}!",
+            "warning",
+            log_id,
+            output_file
+        )
+        return None
@@ -0,0 +1,193 @@
+##############################################################################
+# CloudMage : Jinja Template Loaders
+# ============================================================================
+# CloudMage Jinja Helper Object Utility/Library
+#   - Template loaders for one or several layered template directories.
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/13/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Pip Installed Modules:
+from jinja2 import BaseLoader, FileSystemLoader
+from jinja2.exceptions import TemplateNotFound
+
+# Import Package Modules
+from .index import LayeredIndex
+
+# Import Base Python Modules
+import os
+
+
+def parse_roots(template_directory):
+    """ Template Roots Parser
+
+    Returns the ordered (prefix, path) roots of a template_directory value,
+    which can be a directory path, a list of directory paths searched in
+    order, with (prefix, path) pairs for directories mounted under a prefix,
+    or a dict of prefixes to a directory path or a list of directory paths.
+    An empty prefix mounts a directory without prefix.
+
+    Parameters:
+        template_directory (str, list or dict): required
+
+    Returns:
+        list of (prefix, path) tuples
+
+    Raises:
+        TypeError if the value or one of its entries has an invalid type
+    """
+    if isinstance(template_directory, str):
+        return [('', template_directory)]
+    if isinstance(template_directory, dict):
+        entries = []
+        for prefix, paths in template_directory.items():
+            if isinstance(paths, str):
+                paths = [paths]
+            if not isinstance(paths, (list, tuple)):
+                raise TypeError(
+                    "template_directory prefix {} expected str or list of "
+                    "paths but received type: {}".format(prefix, type(paths))
+                )
+            entries.extend((prefix, path) for path in paths)
+    elif isinstance(template_directory, (list, tuple)):
+        entries = list(template_directory)
+    else:
+        raise TypeError(
+            "template_directory expected str, list or dict but received "
+            "type: {}".format(type(template_directory))
+        )
+    roots = []
+    for entry in entries:
+        root = ('', entry) if isinstance(entry, str) else entry
+        if (
+            not isinstance(root, (list, tuple)) or len(root) != 2 or
+            not isinstance(root[0], str) or not isinstance(root[1], str)
+        ):
+            raise TypeError(
+                "template_directory expected path or (prefix, path) entries "
+                "but received: {}".format(entry)
+            )
+        roots.append((root[0].strip('/'), root[1]))
+    if not roots:
+        raise TypeError("template_directory expected at least one path")
+    return roots
+
+
+def create_loader(roots, index=None):
+    """ Template Loader Factory
+
+    Returns a Jinja FileSystemLoader for a single directory without prefix,
+    and a LayeredLoader otherwise, including for a single template bundle,
+    zip or tar file.
+
+    Parameters:
+        roots (list): required, (prefix, path) pairs
+        index (obj):  optional [default=None], LayeredIndex to share
+
+    Returns:
+        Jinja loader object
+    """
+    if (
+        len(roots) == 1 and not roots[0][0] and
+        not os.path.isfile(roots[0][1])
+    ):
+        return FileSystemLoader(roots[0][1])
+    if not isinstance(index, LayeredIndex) or index.roots != list(roots):
+        index = None
+    return LayeredLoader(roots, index=index)
+
+
+#####################
+# Class Definition: #
+#####################
+class LayeredLoader(BaseLoader):
+    """ CloudMage Layered Template Loader
+
+    This Jinja loader loads templates from an ordered list of template
+    directories, the first directory holding a template name providing it,
+    with directories optionally mounted under a prefix. Template names are
+    resolved through a LayeredIndex, which memoizes the directory each name
+    was found in, so loading a template doesn't check every directory.
+
+    Template bundle, zip and tar files can be used in place of directories,
+    their templates being read from the archive without unpacking it. The
+    precompiled code of a template bundle is used for Environments with the
+    options the bundle was compiled with, unless this loader is wrapped by
+    another loader, which only calls get_source.
+    """
+
+    def __init__(self, roots, encoding='utf-8', followlinks=False, index=None):
+        """ LayeredLoader Class Constructor
+
+        Parameters:
+            roots       (list): required, (prefix, path) pairs
+            encoding    (str):  optional [default='utf-8']
+            followlinks (bool): optional [default=False]
+            index       (obj):  optional [default=None]
+
+        Attributes:
+            self.roots    (list) : public
+            self.encoding (str)  : public
+            self.index    (obj)  : public
+        """
+        if index is None:
+            index = LayeredIndex(roots, followlinks)
+        self.index = index
+        self.roots = index.roots
+        self.encoding = encoding
+
+    def get_source(self, environment, template):
+        """ Return the source, path and uptodate function of a template """
+        # A resolved file removed since it was indexed is refreshed, and the
+        # name resolved again, once per root.
+        for _ in self.roots:
+            resolved = self.index.resolve(template)
+            if resolved is None:
+                break
+            archive = self.index.get_archive(resolved[0])
+            if archive is not None:
+                return archive.get_source(resolved[1])
+            path = self.index.get_path(template)
+            try:
+                with open(path, 'rb') as template_file:
+                    source = template_file.read().decode(self.encoding)
+                mtime = os.path.getmtime(path)
+            except FileNotFoundError:
+                self.index.refresh([template])
+                continue
+
+            def uptodate():
+                try:
+                    return os.path.getmtime(path) == mtime
+                except OSError:
+                    return False
+
+            return source, os.path.normpath(path), uptodate
+        raise TemplateNotFound(template)
+
+    def load(self, environment, name, globals=None):
+        """ Load a template, from precompiled bundle code if available """
+        resolved = self.index.resolve(name)
+        if resolved is not None:
+            archive = self.index.get_archive(resolved[0])
+            code = None
+            if archive is not None:
+                code = archive.load_code(environment, resolved[1])
+            if code is not None:
+                return environment.template_class.from_code(
+                    environment,
+                    code,
+                    {} if globals is None else globals,
+                    archive.uptodate
+                )
+        return super(LayeredLoader, self).load(environment, name, globals)
+
+    def list_templates(self):
+        """ Return the sorted names of the templates of every directory """
+        if not self.index.scanned:
+            return self.index.scan()
+        return self.index.names()
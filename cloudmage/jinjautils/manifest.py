@@ -0,0 +1,237 @@
+##############################################################################
+# CloudMage : Jinja Output Digest Manifest
+# ============================================================================
+# CloudMage Jinja Helper Object Utility/Library
+#   - Detects rendered output that is unchanged from the existing file.
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/13/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Base Python Modules
+import threading
+import tempfile
+import hashlib
+import locale
+import json
+import os
+
+# Write statuses reported when skip_unchanged is enabled.
+WRITTEN = 'written'
+UNCHANGED = 'unchanged'
+SKIPPED = 'skipped'
+
+# Size of the blocks compared when reading an existing output file.
+COMPARE_BLOCK_SIZE = 1024 * 1024
+
+
+############################################
+# Output Comparison Functions:             #
+############################################
+def encode_output(rendered):
+    """ Rendered Output Encoder
+
+    Encodes rendered output to the bytes a text mode write would produce,
+    using the preferred locale encoding and platform line separator.
+
+    Parameters:
+        rendered (str): required
+
+    Returns:
+        bytes
+    """
+    if os.linesep != '\n':  # pragma: no cover
+        rendered = rendered.replace('\n', os.linesep)
+    return rendered.encode(locale.getpreferredencoding(False))
+
+
+def output_digest(encoded):
+    """ Return the hex digest of encoded output """
+    return hashlib.blake2b(encoded, digest_size=20).hexdigest()
+
+
+def file_matches(output_path, encoded):
+    """ Output File Comparison
+
+    Returns True if the file holds exactly the encoded output. The file size
+    is compared first, so changed output of a different size is detected
+    without reading the file, otherwise the file is compared in blocks.
+
+    Parameters:
+        output_path (str):   required
+        encoded     (bytes): required
+
+    Returns:
+        bool
+    """
+    try:
+        if os.path.getsize(output_path) != len(encoded):
+            return False
+        encoded_view = memoryview(encoded)
+        with open(output_path, 'rb') as output_file:
+            offset = 0
+            while True:
+                block = output_file.read(COMPARE_BLOCK_SIZE)
+                if not block:
+                    return offset == len(encoded)
+                if block != encoded_view[offset:offset + len(block)]:
+                    return False
+                offset += len(block)
+    except OSError:
+        return False
+
+
+def output_status(output_path, encoded, manifest=None):
+    """ Unchanged Output Check
+
+    Returns SKIPPED if the manifest records the digest of the encoded output
+    for the output path and the file is untouched since it was recorded,
+    UNCHANGED if the existing file holds the encoded output, or None if the
+    output needs to be written.
+
+    Parameters:
+        output_path (str):   required
+        encoded     (bytes): required
+        manifest    (obj):   optional [default=None]
+
+    Returns:
+        str status or None
+    """
+    if manifest is not None and manifest.matches(output_path, encoded):
+        return SKIPPED
+    if file_matches(output_path, encoded):
+        if manifest is not None:
+            manifest.update(output_path, encoded)
+        return UNCHANGED
+    return None
+
+
+def write_output(
+    output_path,
+    encoded,
+    manifest=None,
+    writer=None,
+    replace=False
+):
+    """ Write encoded output and record it in the manifest """
+    if writer is not None:
+        writer.write(output_path, encoded, replace)
+    else:
+        with open(output_path, 'wb') as output_file:
+            output_file.write(encoded)
+    if manifest is not None:
+        manifest.update(output_path, encoded)
+
+
+#####################
+# Class Definition: #
+#####################
+class DigestManifest(object):
+    """ CloudMage Output Digest Manifest
+
+    This class records the digest, size and modification time of every
+    output file written (or found unchanged) with skip_unchanged enabled.
+    When the next render produces the same digest for a file whose size and
+    modification time still match the manifest, the write is skipped without
+    reading the existing file. The manifest is persisted as a JSON file when
+    a path is given, and must be saved with the save method.
+    """
+
+    def __init__(self, path=None):
+        """ DigestManifest Class Constructor
+
+        Parameters:
+            path (str): optional [default=None]
+
+        Attributes:
+            self.path     (str)  : public
+            self._entries (dict) : private
+            self._dirty   (bool) : private
+            self._lock    (obj)  : private
+        """
+        self.path = path
+        self._entries = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        if path is not None and os.path.isfile(path):
+            try:
+                with open(path) as manifest_file:
+                    entries = json.load(manifest_file)
+                if isinstance(entries, dict):
+                    self._entries = entries
+            except (OSError, ValueError):
+                self._entries = {}
+
+    def __len__(self):
+        """ Return the number of recorded output files """
+        return len(self._entries)
+
+    def matches(self, output_path, encoded):
+        """ Manifest Match Method
+
+        Returns True if the manifest records the digest of the encoded output
+        for the output path, and the file size and modification time still
+        match the recorded values.
+
+        Parameters:
+            output_path (str):   required
+            encoded     (bytes): required
+
+        Returns:
+            bool
+        """
+        entry = self._entries.get(os.path.abspath(output_path))
+        if entry is None or entry[1] != len(encoded):
+            return False
+        try:
+            output_stat = os.stat(output_path)
+        except OSError:
+            return False
+        return (
+            output_stat.st_size == entry[1] and
+            output_stat.st_mtime_ns == entry[2] and
+            output_digest(encoded) == entry[0]
+        )
+
+    def update(self, output_path, encoded):
+        """ Record the digest and current stat of an output file """
+        output_stat = os.stat(output_path)
+        with self._lock:
+            self._entries[os.path.abspath(output_path)] = [
+                output_digest(encoded),
+                output_stat.st_size,
+                output_stat.st_mtime_ns
+            ]
+            self._dirty = True
+
+    def save(self):
+        """ Manifest Save Method
+
+        Writes the manifest to its path, if it has one and changed since it
+        was loaded or saved. The manifest is written to a temporary file
+        that is renamed into place.
+
+        Returns:
+            True if the manifest was written, False otherwise
+        """
+        if self.path is None or not self._dirty:
+            return False
+        with self._lock:
+            manifest_directory = os.path.dirname(os.path.abspath(self.path))
+            manifest_fd, temp_path = tempfile.mkstemp(
+                prefix=os.path.basename(self.path),
+                suffix='.tmp',
+                dir=manifest_directory
+            )
+            try:
+                with os.fdopen(manifest_fd, 'w') as manifest_file:
+                    json.dump(self._entries, manifest_file)
+                os.replace(temp_path, self.path)
+            except Exception:
+                os.remove(temp_path)
+                raise
+            self._dirty = False
+        return True
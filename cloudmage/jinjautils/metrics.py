@@ -0,0 +1,257 @@
+##############################################################################
+# CloudMage : Jinja Operation Metrics
+# ============================================================================
+# CloudMage Jinja Helper Object Utility/Library
+#   - Counters and duration histograms of template operations, with a
+#     Prometheus text format export.
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/13/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Base Python Modules
+from contextlib import contextmanager
+from bisect import bisect_left
+import threading
+import time
+import re
+
+# Default histogram bucket upper bounds, in seconds.
+DEFAULT_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+# Cache statistics exported as Prometheus counters, the others are gauges.
+CACHE_COUNTERS = ('hits', 'disk_hits', 'misses')
+
+
+def _metric_name(*parts):
+    """ Return a Prometheus metric name made of the given parts """
+    return re.sub(r'[^a-zA-Z0-9_:]', '_', '_'.join(
+        part for part in parts if part
+    ))
+
+
+def _format_value(value):
+    """ Return a Prometheus sample value """
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def prometheus_text(stats, namespace='jinjautils'):
+    """ Prometheus Text Format Exporter
+
+    Formats a JinjaUtils or Metrics stats snapshot in the Prometheus text
+    exposition format. Histograms are exported as {name}_seconds histograms,
+    counters as {name}_total counters, and cache statistics as
+    {cache}_{stat} counters and gauges.
+
+    Parameters:
+        stats     (dict): required
+        namespace (str):  optional [default='jinjautils']
+
+    Returns:
+        str
+    """
+    lines = []
+    for name, histogram in sorted(stats.get('histograms', {}).items()):
+        metric = _metric_name(namespace, name, 'seconds')
+        lines.append("# TYPE {} histogram".format(metric))
+        for bound, count in histogram['buckets']:
+            lines.append('{}_bucket{{le="{}"}} {}'.format(
+                metric,
+                '+Inf' if bound is None else _format_value(bound),
+                count
+            ))
+        lines.append("{}_sum {}".format(
+            metric, _format_value(histogram['sum'])
+        ))
+        lines.append("{}_count {}".format(metric, histogram['count']))
+    for name, value in sorted(stats.get('counters', {}).items()):
+        metric = _metric_name(namespace, name, 'total')
+        lines.append("# TYPE {} counter".format(metric))
+        lines.append("{} {}".format(metric, _format_value(value)))
+    for cache, cache_stats in sorted(stats.get('caches', {}).items()):
+        for stat, value in sorted(cache_stats.items()):
+            if not isinstance(value, (int, float)):
+                continue
+            counter = stat in CACHE_COUNTERS
+            metric = _metric_name(
+                namespace, cache, stat, 'total' if counter else ''
+            )
+            lines.append("# TYPE {} {}".format(
+                metric, 'counter' if counter else 'gauge'
+            ))
+            lines.append("{} {}".format(metric, _format_value(value)))
+    return '\n'.join(lines) + '\n' if lines else ''
+
+
+#####################
+# Class Definition: #
+#####################
+class Metrics(object):
+    """ CloudMage Operation Metrics
+
+    This class records named counters and duration histograms for the
+    template operations of JinjaUtils objects: template discovery, load,
+    compile, render, to_json, write and backup durations, and the bytes
+    written. The stats method returns a snapshot of every metric, which can
+    be formatted in the Prometheus text format with the prometheus method.
+
+    An optional callback is called with the metric type ('counter' or
+    'histogram'), the metric name and the value of every update, to forward
+    metrics to another system such as statsd. Exceptions raised by the
+    callback are counted in the callback_errors counter instead of failing
+    the instrumented operation.
+
+    JinjaUtils only records metrics while a Metrics object is set on its
+    metrics property, so disabled metrics cost a single None check per
+    operation.
+    """
+
+    def __init__(self, callback=None, buckets=DEFAULT_BUCKETS):
+        """ Metrics Class Constructor
+
+        Parameters:
+            callback (func):  optional [default=None]
+            buckets  (tuple): optional [default=DEFAULT_BUCKETS], seconds
+
+        Attributes:
+            self.callback    (func)  : public
+            self.buckets     (tuple) : public
+            self._counters   (dict)  : private
+            self._histograms (dict)  : private
+            self._lock       (obj)   : private
+
+        Raises:
+            TypeError if the callback isn't callable
+            ValueError if the buckets aren't positive numbers
+        """
+        if callback is not None and not callable(callback):
+            raise TypeError(
+                "callback expected callable but received type: {}".format(
+                    type(callback)
+                )
+            )
+        if not buckets or not all(
+            isinstance(bound, (int, float)) and
+            not isinstance(bound, bool) and bound > 0
+            for bound in buckets
+        ):
+            raise ValueError(
+                "buckets expected positive numbers but received: {}".format(
+                    buckets
+                )
+            )
+        self.callback = callback
+        self.buckets = tuple(sorted(set(buckets)))
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return "Metrics(callback={!r}, buckets={!r})".format(
+            self.callback, self.buckets
+        )
+
+    def _notify(self, metric_type, name, value):
+        """ Call the callback with a metric update """
+        try:
+            self.callback(metric_type, name, value)
+        except Exception:
+            with self._lock:
+                self._counters['callback_errors'] = \
+                    self._counters.get('callback_errors', 0) + 1
+
+    def increment(self, name, value=1):
+        """ Counter Increment Method
+
+        Parameters:
+            name  (str): required
+            value (int): optional [default=1]
+        """
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+        if self.callback is not None:
+            self._notify('counter', name, value)
+
+    def observe(self, name, seconds):
+        """ Histogram Observe Method
+
+        Records a duration in the named histogram.
+
+        Parameters:
+            name    (str):   required
+            seconds (float): required
+        """
+        bucket = bisect_left(self.buckets, seconds)
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = [
+                    0, 0.0, seconds, seconds, [0] * (len(self.buckets) + 1)
+                ]
+            histogram[0] += 1
+            histogram[1] += seconds
+            if seconds < histogram[2]:
+                histogram[2] = seconds
+            if seconds > histogram[3]:
+                histogram[3] = seconds
+            histogram[4][bucket] += 1
+        if self.callback is not None:
+            self._notify('histogram', name, seconds)
+
+    @contextmanager
+    def timer(self, name):
+        """ Record the duration of a with block in the named histogram """
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start_time)
+
+    def stats(self):
+        """ Metrics Snapshot Method
+
+        Returns:
+            dict with the counters, and the count, sum, mean, min, max and
+            cumulative (upper bound, count) buckets of every histogram, the
+            last bucket having a None upper bound
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {}
+            for name, histogram in self._histograms.items():
+                count, total, minimum, maximum, bucket_counts = histogram
+                cumulative = 0
+                buckets = []
+                for bound, bucket_count in zip(
+                    self.buckets + (None,),
+                    bucket_counts
+                ):
+                    cumulative += bucket_count
+                    buckets.append((bound, cumulative))
+                histograms[name] = {
+                    'count': count,
+                    'sum': total,
+                    'mean': total / count,
+                    'min': minimum,
+                    'max': maximum,
+                    'buckets': buckets
+                }
+        return {'counters': counters, 'histograms': histograms}
+
+    def prometheus(self, namespace='jinjautils'):
+        """ Return the metrics in the Prometheus text format """
+        return prometheus_text(self.stats(), namespace)
+
+    def reset(self):
+        """ Reset every counter and histogram """
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
@@ -0,0 +1,398 @@
+##############################################################################
+# CloudMage : Jinja Parallel Rendering
+# ============================================================================
+# CloudMage Jinja Helper Object Utility/Library
+#   - Batch item rendering and process pool worker functions.
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/13/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Pip Installed Modules:
+from jinja2 import Environment, FunctionLoader
+from jinja2.exceptions import TemplateNotFound
+
+# Import Package Modules
+from .cache import TemplateBytecodeCache
+from .manifest import WRITTEN, encode_output, output_status, write_output
+from .writer import OutputWriter
+from .backup import BackupPolicy
+from .serializers import default_json_serializer
+from .loaders import create_loader, parse_roots
+
+# Import Base Python Modules
+import time
+import os
+
+# Per process worker state, set by the process pool initializer.
+_worker_settings = None
+_worker_environments = {}
+
+# Writer and backup policy used when batch items are rendered without an
+# OutputWriter or BackupPolicy.
+_default_writer = OutputWriter()
+_default_backup_policy = BackupPolicy()
+
+
+############################################
+# Batch Item Rendering:                    #
+############################################
+def render_item(
+    template_render,
+    item_index,
+    item,
+    backup,
+    backup_timestamp,
+    skip_unchanged=False,
+    manifest=None,
+    writer=None,
+    backup_policy=None
+):
+    """ Batch Item Renderer
+
+    Renders a single (context, output_path) batch item with the given
+    template render function, writing the result to the output path, or
+    returning it in the result if the output path is None. Existing output
+    files are backed up with the given BackupPolicy (or copied, if no policy
+    is given) when backup is enabled. When skip_unchanged is
+    enabled, output files that already hold the rendered template are
+    neither backed up nor written. Output files are written with the given
+    OutputWriter, or opened and written in place if no writer is given.
+    Exceptions are recorded in the returned result instead of being raised.
+
+    Parameters:
+        template_render  (func):  required
+        item_index       (int):   required
+        item             (tuple): required
+        backup           (bool):  required
+        backup_timestamp (str):   required
+        skip_unchanged   (bool):  optional [default=False]
+        manifest         (obj):   optional [default=None]
+        writer           (obj):   optional [default=None]
+        backup_policy    (obj):   optional [default=None]
+
+    Returns:
+        dict with the item index, output, success, status and error
+    """
+    result = {
+        'index': item_index,
+        'output': None,
+        'success': False,
+        'status': None,
+        'error': None
+    }
+    try:
+        context, output_path = item
+        result['output'] = output_path
+        rendered_template = template_render(context)
+        if output_path is None:
+            result['rendered'] = rendered_template
+        else:
+            encoded_output = None
+            if skip_unchanged:
+                encoded_output = encode_output(rendered_template)
+                result['status'] = output_status(
+                    output_path,
+                    encoded_output,
+                    manifest
+                )
+                if result['status'] is not None:
+                    result['success'] = True
+                    return result
+            replace = False
+            if backup:
+                backup_policy = backup_policy or _default_backup_policy
+                replace = backup_policy.replaces_output(
+                    backup_policy.backup(output_path, backup_timestamp)
+                )
+            writer = writer or _default_writer
+            if encoded_output is not None:
+                write_output(
+                    output_path,
+                    encoded_output,
+                    manifest,
+                    writer,
+                    replace
+                )
+            else:
+                writer.write(output_path, rendered_template, replace)
+            result['status'] = WRITTEN
+        result['success'] = True
+    except Exception as e:
+        result['error'] = "{}: {}".format(type(e).__name__, e)
+    return result
+
+
+############################################
+# Process Pool Workers:                    #
+############################################
+def _read_template_file(template_path):
+    """ Template File Reader
+
+    Jinja FunctionLoader load function used to read file path templates,
+    by JinjaUtils and its worker Environments. Staleness is handled by the
+    JinjaUtils template cache key, so the returned template is always
+    considered up to date.
+
+    Parameters:
+        template_path (str): required
+
+    Returns:
+        tuple of the template source, filename and uptodate function
+    """
+    with open(template_path) as template_file:
+        return template_file.read(), template_path, None
+
+
+def init_worker(
+    template_directory,
+    trim_blocks,
+    lstrip_blocks,
+    bytecode_directory=None,
+    json_serializer=None
+):
+    """ Process Pool Worker Initializer
+
+    Records the JinjaUtils settings the worker Environments are built from.
+    Environments are built on first use and reused for every chunk the
+    worker renders, so each template is loaded and compiled once per worker
+    (or loaded from the bytecode cache directory, if one is configured).
+
+    Parameters:
+        template_directory (str):  required, or list or dict of roots
+        trim_blocks        (bool): required
+        lstrip_blocks      (bool): required
+        bytecode_directory (str):  optional [default=None]
+        json_serializer    (obj):  optional [default=None]
+    """
+    global _worker_settings
+    _worker_settings = (
+        template_directory,
+        trim_blocks,
+        lstrip_blocks,
+        bytecode_directory,
+        json_serializer or default_json_serializer
+    )
+    _worker_environments.clear()
+
+
+def _get_worker_environment(from_file):
+    """ Return the worker Environment for directory or file path templates """
+    environment = _worker_environments.get(from_file)
+    if environment is None:
+        (
+            template_directory,
+            trim_blocks,
+            lstrip_blocks,
+            bytecode_directory,
+            json_serializer
+        ) = _worker_settings
+        if from_file:
+            loader = FunctionLoader(_read_template_file)
+        else:
+            loader = create_loader(parse_roots(template_directory))
+        bytecode_cache = None
+        if bytecode_directory is not None:
+            bytecode_cache = TemplateBytecodeCache(bytecode_directory)
+        environment = Environment(
+            loader=loader,
+            trim_blocks=trim_blocks,
+            lstrip_blocks=lstrip_blocks,
+            bytecode_cache=bytecode_cache
+        )
+        json_serializer.install(environment)
+        _worker_environments[from_file] = environment
+    return environment
+
+
+def failed_chunk(chunk, exception):
+    """ Chunk Failure Results
+
+    Returns the failed results of every item of a chunk that couldn't be
+    rendered, because its template couldn't be loaded or the chunk couldn't
+    be sent to, rendered by or returned from a worker process.
+
+    Parameters:
+        chunk     (list): required, (item_index, item) batch items
+        exception (obj):  required
+
+    Returns:
+        list of batch item result dicts
+    """
+    error = "{}: {}".format(type(exception).__name__, exception)
+    return [{
+        'index': item_index,
+        'output': None,
+        'success': False,
+        'status': None,
+        'error': error
+    } for item_index, item in chunk]
+
+
+def render_chunk(
+    template_name,
+    from_file,
+    chunk,
+    backup,
+    backup_timestamp,
+    skip_unchanged=False,
+    writer=None,
+    backup_policy=None
+):
+    """ Process Pool Chunk Renderer
+
+    Renders a chunk of (item_index, item) batch items in a worker process.
+    Directory fsyncs batched by the writer are flushed, and backup
+    compressions are waited for, once the chunk has been rendered.
+
+    Parameters:
+        template_name    (str):  required
+        from_file        (bool): required
+        chunk            (list): required
+        backup           (bool): required
+        backup_timestamp (str):  required
+        skip_unchanged   (bool): optional [default=False]
+        writer           (obj):  optional [default=None]
+        backup_policy    (obj):  optional [default=None]
+
+    Returns:
+        list of batch item result dicts
+    """
+    try:
+        template_render = _get_worker_environment(
+            from_file
+        ).get_template(template_name).render
+    except Exception as e:
+        return failed_chunk(chunk, e)
+    results = [
+        render_item(
+            template_render,
+            item_index,
+            item,
+            backup,
+            backup_timestamp,
+            skip_unchanged,
+            writer=writer,
+            backup_policy=backup_policy
+        ) for item_index, item in chunk
+    ]
+    if writer is not None:
+        writer.sync()
+    if backup_policy is not None:
+        backup_policy.wait()
+    return results
+
+
+############################################
+# Template Job Rendering:                  #
+############################################
+def render_jobs(
+    get_template,
+    chunk,
+    backup,
+    backup_timestamp,
+    skip_unchanged=False,
+    writer=None,
+    backup_policy=None
+):
+    """ Template Job Renderer
+
+    Renders a chunk of (item_index, (template_name, context, output_path))
+    jobs, each job naming its own template, looked up with the get_template
+    function, which returns a Jinja Template or None if the template isn't
+    found. Each job is rendered and written like a batch item, and its
+    result also records the template name and the seconds the job took.
+    Directory fsyncs batched by the writer are flushed, and backup
+    compressions are waited for, once the chunk has been rendered.
+
+    Parameters:
+        get_template     (func): required
+        chunk            (list): required
+        backup           (bool): required
+        backup_timestamp (str):  required
+        skip_unchanged   (bool): optional [default=False]
+        writer           (obj):  optional [default=None]
+        backup_policy    (obj):  optional [default=None]
+
+    Returns:
+        list of batch item result dicts
+    """
+    results = []
+    for item_index, (template_name, context, output_path) in chunk:
+        start_time = time.perf_counter()
+        try:
+            template = get_template(template_name)
+            if template is None:
+                raise TemplateNotFound(template_name)
+        except Exception as e:
+            result = {
+                'index': item_index,
+                'output': output_path,
+                'success': False,
+                'status': None,
+                'error': "{}: {}".format(type(e).__name__, e)
+            }
+        else:
+            result = render_item(
+                template.render,
+                item_index,
+                (context, output_path),
+                backup,
+                backup_timestamp,
+                skip_unchanged,
+                writer=writer,
+                backup_policy=backup_policy
+            )
+        result['template'] = template_name
+        result['seconds'] = time.perf_counter() - start_time
+        results.append(result)
+    if writer is not None:
+        writer.sync()
+    if backup_policy is not None:
+        backup_policy.wait()
+    return results
+
+
+def _get_worker_template(template_name):
+    """ Return the worker Template for a template file path or name """
+    from_file = os.path.isfile(template_name)
+    return _get_worker_environment(from_file).get_template(template_name)
+
+
+def render_job_chunk(
+    chunk,
+    backup,
+    backup_timestamp,
+    skip_unchanged=False,
+    writer=None,
+    backup_policy=None
+):
+    """ Process Pool Job Chunk Renderer
+
+    Renders a chunk of template jobs in a worker process with render_jobs,
+    resolving template file paths and template directory names with the
+    worker Environments.
+
+    Parameters:
+        chunk            (list): required
+        backup           (bool): required
+        backup_timestamp (str):  required
+        skip_unchanged   (bool): optional [default=False]
+        writer           (obj):  optional [default=None]
+        backup_policy    (obj):  optional [default=None]
+
+    Returns:
+        list of batch item result dicts
+    """
+    return render_jobs(
+        _get_worker_template,
+        chunk,
+        backup,
+        backup_timestamp,
+        skip_unchanged,
+        writer,
+        backup_policy
+    )
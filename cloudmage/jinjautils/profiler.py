@@ -0,0 +1,384 @@
+##############################################################################
+# CloudMage : Jinja Template Profiler
+# ============================================================================
+# CloudMage Jinja Helper Object Utility/Library
+#   - Render profiler attributing time and output to template source lines,
+#     blocks, macros and included templates.
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/13/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Base Python Modules
+from contextlib import contextmanager
+from inspect import CO_GENERATOR
+import threading
+import time
+import sys
+import os
+
+
+#####################
+# Class Definition: #
+#####################
+class TemplateProfiler(object):
+    """ CloudMage Template Render Profiler
+
+    This class profiles template renders with a Python trace function that
+    only follows the frames of compiled Jinja templates, and maps every
+    executed line of compiled code back to its template source line with
+    the Jinja debug line information. The time between two traced events
+    is attributed to the template line that was executing, along with the
+    time spent in the filters, tests and functions it called, and the
+    output yielded by a template frame is attributed to the line that
+    yielded it. Output returned by a macro is attributed to the line that
+    called it.
+
+    Time is also recorded per stack of template functions (the root of a
+    template, its blocks, its macros, and included templates), which the
+    blocks method aggregates into self and total time per function, and
+    the folded method exports in the folded stack format read by
+    flamegraph.pl, speedscope and inferno. Tracing slows rendering down,
+    so times are best compared with each other rather than with
+    unprofiled renders. Only the thread calling start is profiled.
+    """
+
+    def __init__(self):
+        """ TemplateProfiler Class Constructor
+
+        Attributes:
+            self.renders    (int)  : public
+            self._lines     (dict) : private
+            self._stacks    (dict) : private
+            self._sources   (dict) : private
+            self._line_maps (dict) : private
+            self._local     (obj)  : private
+            self._lock      (obj)  : private
+        """
+        self.renders = 0
+        self._lines = {}
+        self._stacks = {}
+        self._sources = {}
+        self._line_maps = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return "TemplateProfiler(renders={})".format(self.renders)
+
+    ############################################
+    # Tracing:                                 #
+    ############################################
+    def start(self):
+        """ Start profiling the calling thread, nested calls are counted """
+        state = self._local
+        if getattr(state, 'depth', 0):
+            state.depth += 1
+            return
+        state.depth = 1
+        state.stack = []
+        state.lines = {}
+        state.stacks = {}
+        state.forward = None
+        state.previous_trace = sys.gettrace()
+        state.last = time.perf_counter()
+        sys.settrace(self._trace)
+
+    def stop(self):
+        """ Stop profiling the calling thread, merging its measurements """
+        state = self._local
+        if not getattr(state, 'depth', 0):
+            return
+        state.depth -= 1
+        if state.depth:
+            return
+        sys.settrace(state.previous_trace)
+        with self._lock:
+            self.renders += 1
+            for key, (seconds, hits, size) in state.lines.items():
+                totals = self._lines.setdefault(key, [0.0, 0, 0])
+                totals[0] += seconds
+                totals[1] += hits
+                totals[2] += size
+            for key, (seconds, size) in state.stacks.items():
+                totals = self._stacks.setdefault(key, [0.0, 0])
+                totals[0] += seconds
+                totals[1] += size
+        state.stack = state.lines = state.stacks = state.forward = None
+        state.previous_trace = None
+
+    @contextmanager
+    def profile(self):
+        """ Profile the renders of the calling thread within a with block """
+        self.start()
+        try:
+            yield self
+        finally:
+            self.stop()
+
+    def render(self, template, context=None):
+        """ Render a Jinja Template with a context dict, profiling it """
+        with self.profile():
+            return template.render(context or {})
+
+    def _template_line(self, template, code, lineno):
+        """ Return the template source line of a compiled code line """
+        key = (code, lineno)
+        line = self._line_maps.get(key)
+        if line is None:
+            line = self._line_maps[key] = \
+                template.get_corresponding_lineno(lineno)
+        return line
+
+    def _charge(self, state):
+        """ Attribute the time since the last event to the current line """
+        now = time.perf_counter()
+        if state.stack:
+            entry = state.stack[-1]
+            elapsed = now - state.last
+            line_stats = state.lines.get(entry[3])
+            if line_stats is None:
+                line_stats = state.lines[entry[3]] = [0.0, 0, 0]
+            line_stats[0] += elapsed
+            stack_key = (entry[2], entry[3])
+            stack_stats = state.stacks.get(stack_key)
+            if stack_stats is None:
+                stack_stats = state.stacks[stack_key] = [0.0, 0]
+            stack_stats[0] += elapsed
+
+    def _trace(self, frame, event, arg):
+        """ Global trace function, following compiled template frames """
+        template = frame.f_globals.get('__jinja_template__')
+        if template is None:
+            return None
+        state = self._local
+        if getattr(state, 'stack', None) is None:
+            return None
+        self._charge(state)
+        code = frame.f_code
+        template_name = template.name or template.filename or '<template>'
+        function = code.co_name
+        if function != 'root' and not function.startswith('block_'):
+            function = "{}@{}".format(function, self._template_line(
+                template, code, code.co_firstlineno
+            ))
+        label = "{}:{}".format(template_name, function)
+        frames = state.stack[-1][2] if state.stack else ()
+        state.stack.append([
+            frame,
+            template,
+            frames + (label,),
+            (template_name, self._template_line(
+                template, code, frame.f_lineno
+            ))
+        ])
+        if template_name not in self._sources:
+            self._sources[template_name] = template
+        state.last = time.perf_counter()
+        return self._trace_frame
+
+    def _trace_frame(self, frame, event, arg):
+        """ Local trace function of a compiled template frame """
+        state = self._local
+        if getattr(state, 'stack', None) is None:
+            return None
+        if event == 'line':
+            self._charge(state)
+            entry = state.stack[-1]
+            entry[3] = (entry[3][0], self._template_line(
+                entry[1], frame.f_code, frame.f_lineno
+            ))
+            line_stats = state.lines.get(entry[3])
+            if line_stats is None:
+                line_stats = state.lines[entry[3]] = [0.0, 0, 0]
+            line_stats[1] += 1
+        elif event == 'return':
+            self._charge(state)
+            entry = state.stack.pop()
+            if (
+                isinstance(arg, str) and
+                frame.f_code.co_flags & CO_GENERATOR
+            ):
+                self._record_output(state, entry, arg)
+        else:
+            return self._trace_frame
+        state.last = time.perf_counter()
+        return self._trace_frame
+
+    def _record_output(self, state, entry, output):
+        """ Attribute yielded output, once, to the line that produced it """
+        forward = state.forward
+        parent = state.stack[-1][0] if state.stack else None
+        if (
+            forward is not None and forward[0] is output and
+            forward[1] is entry[0]
+        ):
+            # Output of a block or include passed on by its caller.
+            state.forward = (output, parent) if parent is not None else None
+            return
+        state.forward = (output, parent) if parent is not None else None
+        size = len(output.encode('utf-8'))
+        state.lines[entry[3]][2] += size
+        state.stacks[(entry[2], entry[3])][1] += size
+
+    ############################################
+    # Reports:                                 #
+    ############################################
+    def _source_line(self, template_name, line):
+        """ Return a template source line, or an empty string """
+        template = self._sources.get(template_name)
+        if template is None or not template.filename:
+            return ''
+        filename = template.filename
+        try:
+            if os.path.isfile(filename):
+                with open(filename) as template_file:
+                    source = template_file.read()
+            else:
+                environment = template.environment
+                source = environment.loader.get_source(
+                    environment,
+                    template_name
+                )[0]
+        except Exception:
+            return ''
+        lines = source.splitlines()
+        return lines[line - 1].strip() if 0 < line <= len(lines) else ''
+
+    def stats(self):
+        """ Line Statistics Method
+
+        Returns:
+            list of dicts with the template, line, seconds, hits, bytes and
+            source of every profiled template line, slowest first
+        """
+        with self._lock:
+            lines = [
+                (key, list(totals)) for key, totals in self._lines.items()
+            ]
+        lines.sort(key=lambda item: (-item[1][0], item[0]))
+        return [
+            {
+                'template': template_name,
+                'line': line,
+                'seconds': seconds,
+                'hits': hits,
+                'bytes': size,
+                'source': self._source_line(template_name, line)
+            }
+            for (template_name, line), (seconds, hits, size) in lines
+        ]
+
+    def blocks(self):
+        """ Block Statistics Method
+
+        Returns:
+            list of dicts with the template function (root, block, macro),
+            its self and total seconds and the bytes it output, slowest
+            first
+        """
+        with self._lock:
+            stacks = [
+                (key, list(totals)) for key, totals in self._stacks.items()
+            ]
+        functions = {}
+        for (frames, _), (seconds, size) in stacks:
+            for label in set(frames):
+                function_stats = functions.setdefault(label, [0.0, 0.0, 0])
+                function_stats[1] += seconds
+            function_stats = functions[frames[-1]]
+            function_stats[0] += seconds
+            function_stats[2] += size
+        blocks = [
+            {
+                'function': label,
+                'self_seconds': self_seconds,
+                'total_seconds': total_seconds,
+                'bytes': size
+            }
+            for label, (self_seconds, total_seconds, size) in functions.items()
+        ]
+        blocks.sort(
+            key=lambda block: (-block['total_seconds'], block['function'])
+        )
+        return blocks
+
+    def report(self, limit=20):
+        """ Profile Report Method
+
+        Returns a text report of the slowest template lines and functions.
+
+        Parameters:
+            limit (int): optional [default=20], None for every line
+
+        Returns:
+            str
+        """
+        lines = self.stats()
+        total = sum(line['seconds'] for line in lines) or 1.0
+        report = [
+            "Template profile of {} render(s)".format(self.renders),
+            "",
+            "{:>10} {:>6} {:>8} {:>10}  {}".format(
+                'ms', '%', 'hits', 'bytes', 'template:line  source'
+            )
+        ]
+        for line in lines[:limit]:
+            report.append("{:>10.3f} {:>6.1f} {:>8} {:>10}  {}:{}  {}".format(
+                line['seconds'] * 1e3,
+                line['seconds'] / total * 100,
+                line['hits'],
+                line['bytes'],
+                line['template'],
+                line['line'],
+                line['source']
+            ).rstrip())
+        report.extend(["", "{:>10} {:>10} {:>10}  {}".format(
+            'total ms', 'self ms', 'bytes', 'function'
+        )])
+        for block in self.blocks()[:limit]:
+            report.append("{:>10.3f} {:>10.3f} {:>10}  {}".format(
+                block['total_seconds'] * 1e3,
+                block['self_seconds'] * 1e3,
+                block['bytes'],
+                block['function']
+            ))
+        return '\n'.join(report) + '\n'
+
+    def folded(self):
+        """ Folded Stacks Export Method
+
+        Returns the profile in the folded stack format, one line per stack
+        of template functions ending with the template line, followed by
+        its time in microseconds.
+
+        Returns:
+            str
+        """
+        with self._lock:
+            stacks = [
+                (key, totals[0]) for key, totals in self._stacks.items()
+            ]
+        folded = []
+        for (frames, (template_name, line)), seconds in sorted(stacks):
+            microseconds = int(round(seconds * 1e6))
+            if microseconds:
+                folded.append("{};{}:{} {}".format(
+                    ';'.join(frames), template_name, line, microseconds
+                ))
+        return '\n'.join(folded) + '\n' if folded else ''
+
+    def write_folded(self, path):
+        """ Write the folded stacks export to a file """
+        with open(path, 'w') as folded_file:
+            folded_file.write(self.folded())
+
+    def reset(self):
+        """ Discard every measurement """
+        with self._lock:
+            self.renders = 0
+            self._lines.clear()
+            self._stacks.clear()
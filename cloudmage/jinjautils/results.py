@@ -0,0 +1,101 @@
+##############################################################################
+# CloudMage : Jinja Result Objects
+# ============================================================================
+# CloudMage Jinja Helper Object Utility/Library
+#   - Value objects returned by the re-entrant JinjaUtils methods.
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/13/2020
+# License: GNU GPLv3
+##############################################################################
+
+
+#####################
+# Class Definition: #
+#####################
+class RenderResult(object):
+    """ CloudMage Render Result
+
+    Value object returned by JinjaUtils.render_template, holding the name of
+    the rendered template and either the rendered output or the error that
+    stopped the template from rendering. A RenderResult is truthy when the
+    template rendered successfully.
+    """
+
+    __slots__ = ('template', 'output', 'error')
+
+    def __init__(self, template, output=None, error=None):
+        """ RenderResult Class Constructor
+
+        Parameters:
+            template (str): required
+            output   (str): optional [default=None]
+            error    (str): optional [default=None]
+
+        Attributes:
+            self.template (str) : public
+            self.output   (str) : public
+            self.error    (str) : public
+        """
+        self.template = template
+        self.output = output
+        self.error = error
+
+    @property
+    def success(self):
+        """ Return True if the template rendered without error """
+        return self.error is None and self.output is not None
+
+    def __bool__(self):
+        return self.success
+
+    def __repr__(self):
+        return "RenderResult(template={!r}, success={!r}, error={!r})".format(
+            self.template, self.success, self.error
+        )
+
+
+class WriteResult(object):
+    """ CloudMage Write Result
+
+    Value object returned by JinjaUtils.write_template, holding the path the
+    output was written to, the path of the backup taken of an existing
+    output file (if any), the write status (written, or unchanged/skipped
+    when skip_unchanged found the output file unchanged), and the error that
+    stopped the write (if any). A WriteResult is truthy when the output was
+    written successfully or was already up to date.
+    """
+
+    __slots__ = ('path', 'backup_path', 'error', 'status')
+
+    def __init__(self, path=None, backup_path=None, error=None, status=None):
+        """ WriteResult Class Constructor
+
+        Parameters:
+            path        (str): optional [default=None]
+            backup_path (str): optional [default=None]
+            error       (str): optional [default=None]
+            status      (str): optional [default=None]
+
+        Attributes:
+            self.path        (str) : public
+            self.backup_path (str) : public
+            self.error       (str) : public
+            self.status      (str) : public
+        """
+        self.path = path
+        self.backup_path = backup_path
+        self.error = error
+        self.status = status
+
+    @property
+    def success(self):
+        """ Return True if the output was written without error """
+        return self.error is None and self.path is not None
+
+    def __bool__(self):
+        return self.success
+
+    def __repr__(self):
+        return (
+            "WriteResult(path={!r}, status={!r}, success={!r}, error={!r})"
+        ).format(self.path, self.status, self.success, self.error)
@@ -0,0 +1,270 @@
+##############################################################################
+# CloudMage : Jinja JSON Serializers
+# ============================================================================
+# CloudMage Jinja Helper Object Utility/Library
+#   - Pluggable JSON encoder backends for the to_json template filter.
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/13/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Pip Installed Modules:
+import jinja2
+
+# Import Optional Pip Installed Modules:
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+try:
+    import rapidjson
+except ImportError:  # pragma: no cover
+    rapidjson = None
+try:
+    import ujson
+except ImportError:  # pragma: no cover
+    ujson = None
+
+# Import Base Python Modules
+from weakref import WeakKeyDictionary
+import threading
+import time
+import json
+
+# Jinja 3 renamed contextfilter to pass_context.
+pass_context = getattr(jinja2, 'pass_context', None) or getattr(
+    jinja2, 'contextfilter'
+)
+
+# JSON encoder backends, fastest first.
+JSON_BACKENDS = ('orjson', 'rapidjson', 'ujson', 'json')
+
+# Errors raised by encoders for values they can't serialize.
+_ENCODE_ERRORS = (TypeError, ValueError, OverflowError)
+
+
+def available_backends():
+    """ Return the installed JSON encoder backends, fastest first """
+    modules = {
+        'orjson': orjson,
+        'rapidjson': rapidjson,
+        'ujson': ujson,
+        'json': json
+    }
+    return [backend for backend in JSON_BACKENDS if modules[backend]]
+
+
+#####################
+# Class Definition: #
+#####################
+class JsonSerializer(object):
+    """ CloudMage JSON Serializer
+
+    This class encodes values to JSON for the to_json template filter. The
+    backend can be 'json' (the standard library encoder, the default),
+    'orjson', 'rapidjson' or 'ujson' when installed, or 'auto' to use the
+    fastest installed backend that supports the indent setting. Backends
+    other than json produce compact output (no spaces after separators),
+    and values a backend can't encode are encoded by the standard library
+    encoder instead. Passing keyword arguments to the filter, such as
+    to_json(indent=2), always uses the standard library encoder with them.
+
+    When memoize is enabled, the filter caches the encoding of each list,
+    tuple and dict object for the duration of one render, so an object
+    encoded repeatedly inside a loop is only encoded once. Objects are
+    cached by identity, so memoize is disabled by default and should only
+    be enabled for templates that don't modify an object between encodings
+    of it within one render.
+
+    When a Metrics object is set on the metrics attribute, the duration of
+    every to_json filter call is recorded in its to_json histogram.
+    """
+
+    def __init__(
+        self,
+        backend='json',
+        sort_keys=False,
+        indent=None,
+        memoize=False
+    ):
+        """ JsonSerializer Class Constructor
+
+        Parameters:
+            backend   (str):  optional [default='json']
+            sort_keys (bool): optional [default=False]
+            indent    (int):  optional [default=None]
+            memoize   (bool): optional [default=False]
+
+        Attributes:
+            self.backend   (str)  : public
+            self.sort_keys (bool) : public
+            self.indent    (int)  : public
+            self.memoize   (bool) : public
+            self.metrics   (obj)  : public
+            self._encode   (func) : private
+            self._memos    (dict) : private
+            self._lock     (obj)  : private
+
+        Raises:
+            ValueError if the backend isn't installed, or doesn't support
+            the indent setting
+        """
+        if indent is not None and (
+            not isinstance(indent, int) or isinstance(indent, bool) or
+            indent < 0
+        ):
+            raise ValueError(
+                "indent expected non negative int but received: {}".format(
+                    indent
+                )
+            )
+        self.sort_keys = bool(sort_keys)
+        self.indent = indent
+        self.memoize = bool(memoize)
+        self.metrics = None
+        if backend == 'auto':
+            backend = next(
+                candidate for candidate in available_backends()
+                if self._supports_indent(candidate, indent)
+            )
+        if backend not in JSON_BACKENDS:
+            raise ValueError(
+                "backend expected one of {} but received: {}".format(
+                    JSON_BACKENDS + ('auto',), backend
+                )
+            )
+        if backend not in available_backends():
+            raise ValueError(
+                "{} backend requires the {} package".format(
+                    backend, 'python-rapidjson'
+                    if backend == 'rapidjson' else backend
+                )
+            )
+        if not self._supports_indent(backend, indent):
+            raise ValueError(
+                "{} backend doesn't support indent: {}".format(
+                    backend, indent
+                )
+            )
+        self.backend = backend
+        self._encode = getattr(self, '_encode_{}'.format(backend))
+        self._memos = WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        """ Pickle the serializer settings only, for process pool workers """
+        return {
+            'backend': self.backend,
+            'sort_keys': self.sort_keys,
+            'indent': self.indent,
+            'memoize': self.memoize
+        }
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def __repr__(self):
+        return (
+            "{}(backend={!r}, sort_keys={!r}, indent={!r}, "
+            "memoize={!r})".format(
+                type(self).__name__, self.backend, self.sort_keys,
+                self.indent, self.memoize
+            )
+        )
+
+    @staticmethod
+    def _supports_indent(backend, indent):
+        """ Return True if the backend can produce the indent setting """
+        return indent is None or backend != 'orjson' or indent == 2
+
+    def _encode_json(self, value):
+        return json.dumps(value, sort_keys=self.sort_keys, indent=self.indent)
+
+    def _encode_orjson(self, value):
+        option = 0
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if self.indent is not None:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(value, option=option).decode('utf-8')
+
+    def _encode_rapidjson(self, value):
+        return rapidjson.dumps(
+            value,
+            sort_keys=self.sort_keys,
+            indent=self.indent
+        )
+
+    def _encode_ujson(self, value):
+        return ujson.dumps(
+            value,
+            sort_keys=self.sort_keys,
+            indent=self.indent or 0,
+            escape_forward_slashes=False
+        )
+
+    def dumps(self, value, **kwargs):
+        """ JSON Encode Method
+
+        Encodes a value to a JSON string with the configured backend.
+
+        Parameters:
+            value    (obj):  required
+            **kwargs (dict): optional, json.dumps arguments
+
+        Returns:
+            str
+        """
+        if kwargs:
+            return json.dumps(value, **kwargs)
+        try:
+            return self._encode(value)
+        except _ENCODE_ERRORS:
+            if self.backend == 'json':
+                raise
+            return self._encode_json(value)
+
+    def _memo_dumps(self, context, value, **kwargs):
+        """ Encode a value, memoized per render context """
+        if (
+            kwargs or not self.memoize or
+            not isinstance(value, (dict, list, tuple))
+        ):
+            return self.dumps(value, **kwargs)
+        with self._lock:
+            memo = self._memos.get(context)
+            if memo is None:
+                memo = self._memos[context] = {}
+        # The value is kept with its encoding, so its id can't be reused.
+        entry = memo.get(id(value))
+        if entry is None or entry[0] is not value:
+            entry = memo[id(value)] = (value, self.dumps(value))
+        return entry[1]
+
+    @property
+    def filter(self):
+        """ Return the to_json Jinja filter function for this serializer """
+        def to_json(context, value, **kwargs):
+            metrics = self.metrics
+            if metrics is None:
+                return self._memo_dumps(context, value, **kwargs)
+            start_time = time.perf_counter()
+            try:
+                return self._memo_dumps(context, value, **kwargs)
+            finally:
+                metrics.observe('to_json', time.perf_counter() - start_time)
+        # Lets caches of rendered output tell the serializer settings apart.
+        to_json.json_serializer = self
+        return pass_context(to_json)
+
+    def install(self, environment):
+        """ Register the to_json filter on a Jinja Environment """
+        environment.filters['to_json'] = self.filter
+        return environment
+
+
+# Serializer used by Environments created without a JsonSerializer.
+default_json_serializer = JsonSerializer()
@@ -0,0 +1,439 @@
+##############################################################################
+# CloudMage : Jinja Template Server
+# ============================================================================
+# CloudMage Jinja Helper Object Utility/Library
+#   - Render server keeping a JinjaUtils object and its compiled templates
+#     resident, answering render and write requests on a Unix domain socket.
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/13/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Package Modules
+from .jinja import JinjaUtils
+from .client import MAX_MESSAGE_SIZE, encode_message, decode_message
+
+# Import Base Python Modules
+import socketserver
+import threading
+import argparse
+import signal
+import tempfile
+import socket
+import errno
+import stat
+import sys
+import os
+
+# Bytes read from a connection at once.
+RECEIVE_SIZE = 256 * 1024
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+    """ Connection handler passing connections to the TemplateServer """
+
+    def handle(self):
+        self.server.template_server.serve_connection(self.request)
+
+
+#####################
+# Class Definition: #
+#####################
+class TemplateServer(object):
+    """ CloudMage Template Server
+
+    This class keeps a configured JinjaUtils object resident, with its
+    Jinja Environment, compiled template cache and optional render cache,
+    and answers render and write requests on a Unix domain socket, so
+    scripts rendering templates don't pay for the interpreter start up,
+    the template directory scan and the template compilation on every run.
+
+    Requests and responses are JSON objects, one per line. A request has an
+    op ('render', 'write', 'stats' or 'ping') and an optional id, which is
+    echoed in its response along with ok and error fields. A client can send
+    many requests without waiting for their responses: each connection is
+    answered in request order, and the responses to every request read at
+    once are sent back together. Connections are served by their own
+    thread, with the re-entrant JinjaUtils render_template and
+    write_template methods.
+
+        {"id": 1, "op": "render", "template": "name.j2", "context": {}}
+        {"id": 1, "ok": true, "template": "name.j2", "output": "...",
+         "error": null}
+
+    Write requests render a template and write it with an output_directory,
+    output_file, and optional backup and skip_unchanged fields, and are
+    answered with the path, backup_path and status of the write. The socket
+    is only accessible to its owner by default, as requests can write to
+    any path the server can write to.
+    """
+
+    def __init__(self, jinja_utils, socket_path, mode=0o600):
+        """ TemplateServer Class Constructor
+
+        Parameters:
+            jinja_utils (obj): required
+            socket_path (str): required
+            mode        (int): optional [default=0o600], socket permissions
+
+        Attributes:
+            self.jinja_utils (obj)  : public
+            self.socket_path (str)  : public
+            self.mode        (int)  : public
+            self._operations (dict) : private
+            self._server     (obj)  : private
+            self._thread     (obj)  : private
+            self._serving    (bool) : private
+        """
+        self.jinja_utils = jinja_utils
+        self.socket_path = socket_path
+        self.mode = mode
+        self._operations = {
+            'ping': self._ping,
+            'render': self._render,
+            'write': self._write,
+            'stats': self._stats
+        }
+        self._server = None
+        self._thread = None
+        self._serving = False
+
+    def __repr__(self):
+        return "TemplateServer(socket_path={!r})".format(self.socket_path)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    ############################################
+    # Request Handling:                        #
+    ############################################
+    def _ping(self, request):
+        return {'ok': True}
+
+    def _stats(self, request):
+        return {'ok': True, 'stats': self.jinja_utils.stats()}
+
+    def _render_request(self, request):
+        """ Render the template of a render or write request """
+        template = request.get('template')
+        context = request.get('context') or {}
+        if not isinstance(template, str):
+            raise TypeError(
+                "template expected str but received type: {}".format(
+                    type(template).__name__
+                )
+            )
+        if not isinstance(context, dict):
+            raise TypeError(
+                "context expected object but received type: {}".format(
+                    type(context).__name__
+                )
+            )
+        return self.jinja_utils.render_template(template, context)
+
+    def _render(self, request):
+        rendered = self._render_request(request)
+        return {
+            'ok': rendered.success,
+            'template': rendered.template,
+            'output': rendered.output,
+            'error': rendered.error
+        }
+
+    def _write(self, request):
+        rendered = self._render_request(request)
+        if not rendered.success:
+            return {
+                'ok': False,
+                'template': rendered.template,
+                'error': rendered.error
+            }
+        written = self.jinja_utils.write_template(
+            rendered,
+            request.get('output_directory'),
+            request.get('output_file'),
+            backup=request.get('backup', True),
+            skip_unchanged=request.get('skip_unchanged', False)
+        )
+        return {
+            'ok': written.success,
+            'template': rendered.template,
+            'path': written.path,
+            'backup_path': written.backup_path,
+            'status': written.status,
+            'error': written.error
+        }
+
+    def handle(self, request):
+        """ Request Handler Method
+
+        Parameters:
+            request (dict): required
+
+        Returns:
+            response dict
+        """
+        response = {'id': request.get('id')}
+        operation = self._operations.get(request.get('op'))
+        try:
+            if operation is None:
+                raise ValueError("op expected one of {}: {}".format(
+                    tuple(sorted(self._operations)), request.get('op')
+                ))
+            response.update(operation(request))
+        except Exception as e:
+            response.update(
+                ok=False,
+                error="{}: {}".format(type(e).__name__, e)
+            )
+        return response
+
+    def handle_line(self, line):
+        """ Return the encoded response to an encoded request line """
+        try:
+            request = decode_message(line)
+        except ValueError as e:
+            return encode_message({
+                'id': None,
+                'ok': False,
+                'error': "Invalid request: {}".format(e)
+            })
+        return encode_message(self.handle(request))
+
+    def serve_connection(self, connection):
+        """ Connection Server Method
+
+        Answers the request lines of a connection until it's closed. The
+        requests of every read are answered with a single send, so
+        pipelined requests share their system calls.
+
+        Parameters:
+            connection (obj): required, connected socket
+        """
+        buffer = bytearray()
+        try:
+            while True:
+                data = connection.recv(RECEIVE_SIZE)
+                if not data:
+                    return
+                buffer += data
+                if b'\n' not in data:
+                    if len(buffer) > MAX_MESSAGE_SIZE:
+                        connection.sendall(encode_message({
+                            'id': None,
+                            'ok': False,
+                            'error': "Request larger than {} bytes".format(
+                                MAX_MESSAGE_SIZE
+                            )
+                        }))
+                        return
+                    continue
+                end = buffer.rindex(b'\n') + 1
+                lines = bytes(buffer[:end]).split(b'\n')
+                del buffer[:end]
+                connection.sendall(b''.join(
+                    self.handle_line(line) for line in lines if line.strip()
+                ))
+        except OSError:
+            # The client went away.
+            return
+
+    ############################################
+    # Server Lifecycle:                        #
+    ############################################
+    def _remove_stale_socket(self):
+        """ Remove the socket file left behind by a server that exited """
+        try:
+            mode = os.stat(self.socket_path).st_mode
+        except FileNotFoundError:
+            return
+        if not stat.S_ISSOCK(mode):
+            raise OSError(
+                errno.EEXIST,
+                "Socket path exists and isn't a socket",
+                self.socket_path
+            )
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.socket_path)
+        except OSError:
+            os.unlink(self.socket_path)
+        else:
+            raise OSError(
+                errno.EADDRINUSE,
+                "A server is already listening on",
+                self.socket_path
+            )
+        finally:
+            probe.close()
+
+    def bind(self):
+        """ Bind the server socket, if it isn't bound yet
+
+        Raises:
+            OSError if the socket path is in use or can't be bound
+        """
+        if self._server is None:
+            if not hasattr(socketserver, 'ThreadingUnixStreamServer'):
+                raise OSError(  # pragma: no cover
+                    errno.EAFNOSUPPORT,
+                    "Unix domain sockets aren't supported on this platform"
+                )
+            self._remove_stale_socket()
+            # The socket is bound in a private directory, where no other
+            # user can connect to it, and only linked to the socket path
+            # once its permissions are set. The process umask is left alone,
+            # as changing it would affect the files of other threads. Unlike
+            # a rename, the link fails if another server took the path.
+            private_directory = tempfile.mkdtemp(
+                prefix='.jinjautils-',
+                dir=os.path.dirname(os.path.abspath(self.socket_path))
+            )
+            bind_path = os.path.join(private_directory, 's')
+            try:
+                server = socketserver.ThreadingUnixStreamServer(
+                    bind_path,
+                    _RequestHandler
+                )
+                try:
+                    os.chmod(bind_path, self.mode)
+                    os.link(bind_path, self.socket_path)
+                except OSError:
+                    server.server_close()
+                    raise
+            finally:
+                if os.path.lexists(bind_path):
+                    os.unlink(bind_path)
+                os.rmdir(private_directory)
+            server.daemon_threads = True
+            server.template_server = self
+            self._server = server
+        return self
+
+    def serve_forever(self, poll_interval=0.5):
+        """ Bind the socket and serve requests until close is called """
+        self.bind()
+        self._serving = True
+        try:
+            self._server.serve_forever(poll_interval)
+        finally:
+            self._serving = False
+
+    def start(self):
+        """ Bind the socket and serve requests from a background thread """
+        self.bind()
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self.serve_forever,
+                daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def close(self):
+        """ Stop serving, close the socket and remove the socket file """
+        server = self._server
+        if server is None:
+            return
+        if self._thread is not None:
+            server.shutdown()
+            self._thread.join()
+            self._thread = None
+        server.server_close()
+        self._server = None
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+
+############################################
+# Command Line:                            #
+############################################
+def build_parser():
+    """ Return the jinjautils-server command argument parser """
+    parser = argparse.ArgumentParser(
+        prog='jinjautils-server',
+        description=(
+            "Serve template render and write requests on a Unix domain "
+            "socket."
+        )
+    )
+    parser.add_argument('socket', help="Unix domain socket path")
+    parser.add_argument(
+        '-t', '--template-directory', action='append',
+        help="template directory, repeat for layered directories"
+    )
+    parser.add_argument(
+        '--bytecode-cache',
+        help="directory of a bytecode cache shared between runs"
+    )
+    parser.add_argument(
+        '--render-cache', action='store_true',
+        help="cache rendered output by template and context"
+    )
+    parser.add_argument('--no-trim-blocks', action='store_true')
+    parser.add_argument('--no-lstrip-blocks', action='store_true')
+    parser.add_argument(
+        '-v', '--verbose', action='store_true',
+        help="log every request"
+    )
+    return parser
+
+
+def main(argv=None):
+    """ jinjautils-server Command Entry Point
+
+    Parameters:
+        argv (list): optional [default=sys.argv[1:]]
+
+    Returns:
+        int exit status, 0 when the server is stopped by SIGINT or SIGTERM,
+        2 if the server can't be started
+    """
+    args = build_parser().parse_args(argv)
+    Jinja = JinjaUtils(verbose=args.verbose)
+    Jinja.trim_blocks = not args.no_trim_blocks
+    Jinja.lstrip_blocks = not args.no_lstrip_blocks
+    if args.bytecode_cache:
+        Jinja.bytecode_cache = args.bytecode_cache
+    if args.render_cache:
+        Jinja.render_cache = True
+    try:
+        if args.template_directory:
+            template_directory = [
+                os.path.abspath(path) for path in args.template_directory
+            ]
+            Jinja.template_directory = template_directory
+            if Jinja.template_directory != template_directory:
+                raise ValueError("Invalid template directory: {}".format(
+                    ', '.join(template_directory)
+                ))
+        Server = TemplateServer(Jinja, args.socket).bind()
+    except (OSError, ValueError) as e:
+        sys.stderr.write("jinjautils-server: error: {}\n".format(e))
+        return 2
+
+    def stop(signal_number, frame):
+        sys.exit(0)
+
+    signal.signal(signal.SIGTERM, stop)
+    sys.stderr.write("jinjautils-server: serving on {}\n".format(args.socket))
+    sys.stderr.flush()
+    try:
+        Server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        Server.close()
+    return 0
+
+
+if __name__ == '__main__':  # pragma: no cover
+    sys.exit(main())
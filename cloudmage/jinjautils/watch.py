@@ -0,0 +1,462 @@
+##############################################################################
+# CloudMage : Jinja Template Directory Watcher
+# ============================================================================
+# CloudMage Jinja Helper Object Utility/Library
+#   - inotify or polling based change notifications for a template directory.
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/13/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Base Python Modules
+import ctypes.util
+import threading
+import ctypes
+import select
+import struct
+import errno
+import time
+import sys
+import os
+
+# Watcher backends, preferred first.
+WATCH_BACKENDS = ('inotify', 'poll')
+
+# inotify event masks, from <sys/inotify.h>.
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = (
+    IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE |
+    IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+)
+
+# struct inotify_event header: wd, mask, cookie and name length.
+_EVENT = struct.Struct('iIII')
+
+# A burst of changes is reported at the latest after this many debounce
+# periods, so a file written continuously doesn't hold back notifications.
+MAX_DEBOUNCE_PERIODS = 10
+
+
+def _load_libc():
+    """ Return the C library if it provides inotify, None otherwise """
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(
+            ctypes.util.find_library('c') or 'libc.so.6',
+            use_errno=True
+        )
+    except OSError:  # pragma: no cover
+        return None
+    if not hasattr(libc, 'inotify_init1'):  # pragma: no cover
+        return None
+    libc.inotify_add_watch.argtypes = [
+        ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32
+    ]
+    libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+    return libc
+
+
+_libc = _load_libc()
+
+
+def inotify_available():
+    """ Return True if the inotify backend can be used on this platform """
+    return _libc is not None
+
+
+def _join(directory, name):
+    """ Join a '/' separated directory name and an entry name """
+    if directory:
+        return "{}/{}".format(directory, name)
+    return name
+
+
+def _walk(searchpath, directory, followlinks):
+    """ Yield the '/' separated directory and file entries below directory
+
+    Returns:
+        Generator of (name, is_directory, os.DirEntry) tuples
+    """
+    pending = [directory]
+    while pending:
+        directory = pending.pop()
+        path = os.path.join(searchpath, *directory.split('/'))
+        try:
+            entries = os.scandir(path)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                name = _join(directory, entry.name)
+                try:
+                    is_directory = entry.is_dir() and (
+                        followlinks or not entry.is_symlink()
+                    )
+                except OSError:
+                    is_directory = False
+                if is_directory:
+                    pending.append(name)
+                yield name, is_directory, entry
+
+
+class _InotifyBackend(object):
+    """ inotify watches on every directory of the template directory """
+
+    name = 'inotify'
+
+    def __init__(self, directory, followlinks, stop_event):
+        self.directory = directory
+        self._followlinks = followlinks
+        self._watches = {}
+        self._fd = _libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        try:
+            self._add_tree('')
+        except Exception:
+            os.close(self._fd)
+            raise
+
+    def _add_watch(self, directory):
+        """ Watch one directory, returning False if it no longer exists """
+        path = os.path.join(self.directory, *directory.split('/'))
+        wd = _libc.inotify_add_watch(
+            self._fd,
+            os.fsencode(path),
+            _WATCH_MASK
+        )
+        if wd < 0:
+            error = ctypes.get_errno()
+            if error in (errno.ENOENT, errno.ENOTDIR):
+                return False
+            raise OSError(error, os.strerror(error), path)
+        self._watches[wd] = directory
+        return True
+
+    def _add_tree(self, directory):
+        """ Watch a directory and its sub directories
+
+        Returns:
+            set of the file names found in them
+        """
+        if not self._add_watch(directory):
+            return set()
+        files = set()
+        for name, is_directory, _ in _walk(
+            self.directory, directory, self._followlinks
+        ):
+            if is_directory:
+                self._add_watch(name)
+            else:
+                files.add(name)
+        return files
+
+    def _remove_tree(self, directory):
+        """ Stop watching a directory moved out of its watched location """
+        prefix = directory + '/'
+        for wd, watched in list(self._watches.items()):
+            if watched == directory or watched.startswith(prefix):
+                del self._watches[wd]
+                _libc.inotify_rm_watch(self._fd, wd)
+
+    def read(self, timeout):
+        """ Wait up to timeout seconds for changes
+
+        Returns:
+            set of the changed file names, or None if the changes are
+            unknown and the directory must be rescanned
+        """
+        if not select.select([self._fd], [], [], timeout)[0]:
+            return set()
+        try:
+            data = os.read(self._fd, 65536)
+        except BlockingIOError:  # pragma: no cover
+            return set()
+        changed = set()
+        rescan = False
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                rescan = True
+                continue
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            directory = self._watches.get(wd)
+            if directory is None:
+                continue
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                # The template directory itself was removed or renamed.
+                rescan = rescan or directory == ''
+                continue
+            name = _join(directory, name)
+            if not mask & IN_ISDIR:
+                changed.add(name)
+            elif mask & (IN_CREATE | IN_MOVED_TO):
+                try:
+                    changed |= self._add_tree(name)
+                except OSError:
+                    rescan = True
+            elif mask & IN_MOVED_FROM:
+                # The names of the files moved away aren't known.
+                self._remove_tree(name)
+                rescan = True
+        return None if rescan else changed
+
+    def close(self):
+        os.close(self._fd)
+
+
+class _PollingBackend(object):
+    """ Periodic comparison of the file stats in the template directory """
+
+    name = 'poll'
+
+    def __init__(self, directory, followlinks, stop_event):
+        self.directory = directory
+        self._followlinks = followlinks
+        self._stop_event = stop_event
+        self._snapshot = self._take_snapshot()
+
+    def _take_snapshot(self):
+        """ Return the mtime, size and inode of every file, by name """
+        snapshot = {}
+        for name, is_directory, entry in _walk(
+            self.directory, '', self._followlinks
+        ):
+            if is_directory:
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            snapshot[name] = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        return snapshot
+
+    def read(self, timeout):
+        """ Wait timeout seconds, then return the changed file names """
+        if self._stop_event.wait(timeout):
+            return set()
+        snapshot = self._take_snapshot()
+        previous = self._snapshot
+        self._snapshot = snapshot
+        return set(
+            name for name in set(snapshot) | set(previous)
+            if snapshot.get(name) != previous.get(name)
+        )
+
+    def close(self):
+        pass
+
+
+#####################
+# Class Definition: #
+#####################
+class TemplateWatcher(object):
+    """ CloudMage Template Directory Watcher
+
+    This class watches a template directory from a background thread and
+    calls a callback with the set of '/' separated names of the files that
+    were created, modified, moved or deleted. The inotify backend is used
+    on Linux, and the directory is polled every interval seconds otherwise,
+    or when inotify watches can't be created. Changes are debounced: once a
+    change is seen, the callback is only called when no other change was
+    seen for debounce seconds (and at the latest after MAX_DEBOUNCE_PERIODS
+    debounce periods), so the bursts of writes and renames of an editor
+    save are reported once. The callback receives None instead of a set
+    when the changed names are unknown, after an inotify queue overflow or
+    a directory moved out of the template directory, in which case the
+    directory has to be rescanned.
+    """
+
+    def __init__(
+        self,
+        directory,
+        callback,
+        debounce=0.2,
+        interval=1.0,
+        backend='auto',
+        followlinks=False
+    ):
+        """ TemplateWatcher Class Constructor
+
+        Parameters:
+            directory   (str):   required
+            callback    (func):  required
+            debounce    (float): optional [default=0.2]
+            interval    (float): optional [default=1.0]
+            backend     (str):   optional [default='auto']
+            followlinks (bool):  optional [default=False]
+
+        Attributes:
+            self.directory   (str)   : public
+            self.callback    (func)  : public
+            self.debounce    (float) : public
+            self.interval    (float) : public
+            self.backend     (str)   : public
+            self.followlinks (bool)  : public
+            self.last_error  (obj)   : public
+            self._backend    (obj)   : private
+            self._thread     (obj)   : private
+            self._stop_event (obj)   : private
+
+        Raises:
+            ValueError if the directory doesn't exist, or an argument is
+            invalid
+        """
+        if not isinstance(directory, str) or not os.path.isdir(directory):
+            raise ValueError(
+                "directory expected existing directory path but received: "
+                "{}".format(directory)
+            )
+        if not callable(callback):
+            raise ValueError(
+                "callback expected callable but received type: {}".format(
+                    type(callback)
+                )
+            )
+        for setting, value in (('debounce', debounce), ('interval', interval)):
+            if (
+                not isinstance(value, (int, float)) or
+                isinstance(value, bool) or value < 0
+            ):
+                raise ValueError(
+                    "{} expected non negative number but received: {}".format(
+                        setting, value
+                    )
+                )
+        if backend == 'auto':
+            backend = 'inotify' if inotify_available() else 'poll'
+        if backend not in WATCH_BACKENDS:
+            raise ValueError(
+                "backend expected one of {} but received: {}".format(
+                    WATCH_BACKENDS + ('auto',), backend
+                )
+            )
+        if backend == 'inotify' and not inotify_available():
+            raise ValueError("inotify backend isn't available on this system")
+        self.directory = directory
+        self.callback = callback
+        self.debounce = debounce
+        self.interval = interval
+        self.backend = backend
+        self.followlinks = bool(followlinks)
+        self.last_error = None
+        self._backend = None
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    def __repr__(self):
+        return "TemplateWatcher(directory={!r}, backend={!r})".format(
+            self.directory, self.backend
+        )
+
+    @property
+    def running(self):
+        """ Return True while the watcher thread is running """
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """ Watcher Start Method
+
+        Starts watching the directory. Changes made once this method
+        returned are reported. If inotify watches can't be created, for
+        instance when the inotify watch limit is reached, the directory is
+        polled instead.
+
+        Returns:
+            self
+        """
+        if self.running:
+            return self
+        self._stop_event.clear()
+        backend_class = _InotifyBackend
+        if self.backend == 'poll':
+            backend_class = _PollingBackend
+        try:
+            self._backend = backend_class(
+                self.directory,
+                self.followlinks,
+                self._stop_event
+            )
+        except OSError:
+            self.backend = 'poll'
+            self._backend = _PollingBackend(
+                self.directory,
+                self.followlinks,
+                self._stop_event
+            )
+        self._thread = threading.Thread(
+            target=self._run,
+            name='TemplateWatcher',
+            daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        """ Watcher Stop Method
+
+        Stops the watcher thread, without reporting pending changes.
+
+        Parameters:
+            timeout (float): optional [default=None]
+        """
+        self._stop_event.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+        self._thread = None
+
+    def _read(self, timeout):
+        """ Wait for changes, then collect the changes that follow them """
+        changed = self._backend.read(timeout)
+        if changed is not None and not changed:
+            return changed
+        deadline = time.monotonic() + self.debounce * MAX_DEBOUNCE_PERIODS
+        while not self._stop_event.is_set() and time.monotonic() < deadline:
+            more = self._backend.read(self.debounce)
+            if more is not None and not more:
+                break
+            if changed is not None:
+                changed = None if more is None else changed | more
+        return changed
+
+    def _run(self):
+        """ Watcher thread loop """
+        try:
+            while not self._stop_event.is_set():
+                try:
+                    changed = self._read(self.interval)
+                    if self._stop_event.is_set():
+                        break
+                    if changed is None or changed:
+                        self.callback(changed)
+                except Exception as e:
+                    self.last_error = e
+                    self._stop_event.wait(self.interval)
+        finally:
+            self._backend.close()
@@ -0,0 +1,232 @@
+##############################################################################
+# CloudMage : Jinja Output Writer
+# ============================================================================
+# CloudMage Jinja Helper Object Utility/Library
+#   - Atomic and fsync controlled output file writes.
+# Author: Richard Nason rnason@cloudmage.io
+# Project Start: 2/13/2020
+# License: GNU GPLv3
+##############################################################################
+
+###############
+# Imports:    #
+###############
+# Import Base Python Modules
+from contextlib import contextmanager
+import threading
+import tempfile
+import os
+
+# fsync modes supported by the OutputWriter.
+FSYNC_NONE = 'none'
+FSYNC_ALWAYS = 'always'
+FSYNC_BATCH = 'batch'
+FSYNC_MODES = (FSYNC_NONE, FSYNC_ALWAYS, FSYNC_BATCH)
+
+# Serializes the os.umask fallback of get_umask.
+_UMASK_LOCK = threading.Lock()
+
+
+def get_umask():
+    """ Process umask
+
+    Returns the current process umask, applied to the permissions of new
+    atomically written files. The umask is read from /proc/self/status
+    where available, as os.umask can only read it by setting it, which
+    briefly changes the permissions of files created by other threads.
+
+    Returns:
+        int umask
+    """
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('Umask:'):
+                    return int(line.split()[1], 8)
+    except (OSError, ValueError, IndexError):
+        pass
+    with _UMASK_LOCK:
+        umask = os.umask(0o077)
+        os.umask(umask)
+    return umask
+
+
+def fsync_directory(directory):
+    """ Directory fsync
+
+    Flushes a directory entry to disk, making files created or renamed in
+    the directory durable. Platforms that can't open directories (Windows)
+    are skipped.
+
+    Parameters:
+        directory (str): required
+
+    Returns:
+        True if the directory was synced, False otherwise
+    """
+    try:
+        directory_fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return False
+    try:
+        os.fsync(directory_fd)
+        return True
+    except OSError:
+        return False
+    finally:
+        os.close(directory_fd)
+
+
+#####################
+# Class Definition: #
+#####################
+class OutputWriter(object):
+    """ CloudMage Output Writer
+
+    This class writes rendered output files. By default, output files are
+    opened and written in place. When atomic is enabled, the output is
+    written to a temporary file in the destination directory which is then
+    renamed over the destination with os.replace, so readers only ever see
+    the previous or the complete new file, and a failed write leaves the
+    previous file untouched.
+
+    The fsync mode controls durability: 'none' leaves flushing to the
+    operating system, 'always' fsyncs every file and its directory, and
+    'batch' fsyncs every file but defers the directory fsyncs until sync is
+    called, so a bulk job writing thousands of files into a directory pays
+    for a single directory fsync.
+    """
+
+    def __init__(self, atomic=False, fsync=FSYNC_NONE):
+        """ OutputWriter Class Constructor
+
+        Parameters:
+            atomic (bool): optional [default=False]
+            fsync  (str):  optional [default='none']
+
+        Attributes:
+            self.atomic               (bool) : public
+            self.fsync                (str)  : public
+            self._pending_directories (set)  : private
+            self._lock                (obj)  : private
+        """
+        self.atomic = bool(atomic)
+        self.fsync = fsync if fsync in FSYNC_MODES else FSYNC_NONE
+        self._pending_directories = set()
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        """ Pickle the write settings only, for process pool workers """
+        return {'atomic': self.atomic, 'fsync': self.fsync}
+
+    def __setstate__(self, state):
+        self.__init__(state['atomic'], state['fsync'])
+
+    @property
+    def pending(self):
+        """ Return the number of directories awaiting a batched fsync """
+        return len(self._pending_directories)
+
+    def _sync_directory(self, directory):
+        """ fsync a directory now, or defer it in batch mode """
+        if self.fsync == FSYNC_ALWAYS:
+            fsync_directory(directory)
+        elif self.fsync == FSYNC_BATCH:
+            with self._lock:
+                self._pending_directories.add(directory)
+
+    def _get_mode(self, output_path):
+        """ Return the permissions a newly written output file should get """
+        try:
+            return os.stat(output_path).st_mode & 0o7777
+        except OSError:
+            return 0o666 & ~get_umask()
+
+    @contextmanager
+    def open(self, output_path, binary=False, buffering=-1, replace=False):
+        """ Output File Context Manager
+
+        Yields a file object to write the output to. When atomic is enabled,
+        or replace is True, the file is a temporary file that replaces the
+        output file when the block exits without an exception, and is
+        removed otherwise. Replace is used when the output file is
+        hardlinked to a backup, which must not be written in place.
+
+        Parameters:
+            output_path (str):  required
+            binary      (bool): optional [default=False]
+            buffering   (int):  optional [default=-1]
+            replace     (bool): optional [default=False]
+
+        Returns:
+            Context manager yielding a file object
+        """
+        file_mode = 'wb' if binary else 'w'
+        output_directory = os.path.dirname(os.path.abspath(output_path))
+        if not (self.atomic or replace):
+            with open(output_path, file_mode, buffering=buffering) as output:
+                yield output
+                if self.fsync != FSYNC_NONE:
+                    output.flush()
+                    os.fsync(output.fileno())
+            if self.fsync != FSYNC_NONE:
+                self._sync_directory(output_directory)
+            return
+
+        file_permissions = self._get_mode(output_path)
+        temp_fd, temp_path = tempfile.mkstemp(
+            prefix=".{}.".format(os.path.basename(output_path)),
+            suffix='.tmp',
+            dir=output_directory
+        )
+        try:
+            with os.fdopen(temp_fd, file_mode, buffering=buffering) as output:
+                yield output
+                output.flush()
+                if self.fsync != FSYNC_NONE:
+                    os.fsync(output.fileno())
+            os.chmod(temp_path, file_permissions)
+            os.replace(temp_path, output_path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+        if self.fsync != FSYNC_NONE:
+            self._sync_directory(output_directory)
+
+    def write(self, output_path, data, replace=False):
+        """ Output Write Method
+
+        Writes str or bytes data to the output path.
+
+        Parameters:
+            output_path (str):       required
+            data        (str/bytes): required
+            replace     (bool):      optional [default=False]
+        """
+        with self.open(
+            output_path,
+            binary=isinstance(data, bytes),
+            replace=replace
+        ) as output:
+            output.write(data)
+
+    def sync(self):
+        """ Batched Directory Sync Method
+
+        fsyncs every directory written to since the last sync in batch
+        mode, once per directory.
+
+        Returns:
+            int number of directories synced
+        """
+        with self._lock:
+            pending_directories = self._pending_directories
+            self._pending_directories = set()
+        synced = 0
+        for directory in sorted(pending_directories):
+            if fsync_directory(directory):
+                synced += 1
+        return synced
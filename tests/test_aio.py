@@ -0,0 +1,165 @@
+# Run PyTest:
+# `poetry run pytest tests -v`
+# Run single test file instead of entire test suite:
+# `poetry run pytest tests/test_aio.py -v`
+################
+# Imports:     #
+################
+
+# Pip Installed Imports:
+from cloudmage.jinjautils import JinjaUtils, AsyncRenderer
+
+# Base Python Module Imports:
+import asyncio
+import os
+
+
+######################################
+# Define Test Helpers:               #
+######################################
+def run(coroutine):
+    """ Run a coroutine on a new event loop """
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def write_template(template_directory, name, source):
+    """ Write a template file and return its path """
+    template_path = os.path.join(template_directory, name)
+    with open(template_path, "w") as template_file:
+        template_file.write(source)
+    return template_path
+
+
+######################################
+# Test AsyncRenderer:                #
+######################################
+def test_async_render_context(tmp_path):
+    """ AsyncRenderer Async Context Test
+
+    This test will render a directory template with an awaitable value, an
+    async generator and an async function in the template context.
+
+    Expected Result:
+      Async values are resolved during the render and the JinjaUtils
+      settings and filters are applied.
+    """
+    template_directory = str(tmp_path)
+    write_template(
+        template_directory,
+        'async.j2',
+        "{% if true %}\n{{ value }}:{% for i in items %}{{ i }}{% endfor %}:"
+        "{{ double(2) }}:{{ data | to_json }}\n{% endif %}"
+    )
+    Jinja = JinjaUtils()
+    Jinja.template_directory = template_directory
+    Renderer = AsyncRenderer(Jinja)
+
+    async def value():
+        return 'awaited'
+
+    async def items():
+        for index in range(3):
+            yield index
+
+    async def double(number):
+        return number * 2
+
+    result = run(Renderer.render(
+        'async.j2',
+        {'value': value(), 'items': items()},
+        double=double,
+        data={'a': 1}
+    ))
+    assert(result)
+    assert(result.template == 'async.j2')
+    assert(result.output == 'awaited:012:4:{"a": 1}\n')
+
+    # Missing templates are returned as failed results.
+    missing_result = run(Renderer.render('missing.j2'))
+    assert(not missing_result)
+    assert(missing_result.error == "Template not found: missing.j2")
+
+
+def test_async_render_many(tmp_path):
+    """ AsyncRenderer Concurrent Render and Write Test
+
+    This test will render and write a batch of items concurrently with a
+    concurrency limit of 3, including an existing output file and an item
+    that isn't written.
+
+    Expected Result:
+      Results are returned in input order, no more than 3 renders run at
+      once, and existing files are backed up.
+    """
+    template_directory = os.path.join(str(tmp_path), 'templates')
+    output_directory = os.path.join(str(tmp_path), 'output')
+    os.mkdir(template_directory)
+    os.mkdir(output_directory)
+    write_template(
+        template_directory,
+        'many.j2',
+        "{{ name }}{{ track() }}"
+    )
+    write_template(output_directory, '0.txt', "existing")
+
+    Jinja = JinjaUtils()
+    Jinja.template_directory = template_directory
+    Renderer = AsyncRenderer(Jinja, concurrency=3)
+    running = []
+    max_running = []
+
+    async def track():
+        running.append(1)
+        max_running.append(len(running))
+        await asyncio.sleep(0.01)
+        running.pop()
+        return ''
+
+    items = [
+        ({'name': index, 'track': track},
+         os.path.join(output_directory, "{}.txt".format(index)))
+        for index in range(10)
+    ]
+    items.append(({'name': 'memory', 'track': track}, None))
+    results = run(Renderer.render_many('many.j2', items))
+
+    assert(len(results) == 11)
+    assert(max(max_running) == 3)
+    for index, (render_result, write_result) in enumerate(results[:10]):
+        assert(render_result.output == str(index))
+        assert(write_result)
+        with open(write_result.path) as output:
+            assert(output.read() == str(index))
+    assert(results[0][1].backup_path is not None)
+    assert(results[10][0].output == 'memory' and results[10][1] is None)
+
+
+def test_async_render_file_template(tmp_path):
+    """ AsyncRenderer File Path Template Test
+
+    This test will render a template file path to disk, modify the file and
+    render it again.
+
+    Expected Result:
+      The updated template file is reloaded and rendered.
+    """
+    template_path = write_template(str(tmp_path), 'file.j2', "one {{ x }}")
+    Renderer = AsyncRenderer(JinjaUtils(), concurrency=0)
+    assert(Renderer.concurrency == 16)
+
+    render_result, write_result = run(Renderer.render_to_file(
+        template_path, str(tmp_path), 'file.txt', {'x': 1}
+    ))
+    assert(render_result.output == "one 1")
+    assert(write_result and write_result.backup_path is None)
+
+    write_template(str(tmp_path), 'file.j2', "two {{ x }}")
+    template_stat = os.stat(template_path)
+    os.utime(template_path, (
+        template_stat.st_atime, template_stat.st_mtime + 10
+    ))
+    assert(run(Renderer.render(template_path, x=2)).output == "two 2")
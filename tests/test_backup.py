@@ -0,0 +1,125 @@
+# Run PyTest:
+# `poetry run pytest tests -v`
+# Run single test file instead of entire test suite:
+# `poetry run pytest tests/test_backup.py -v`
+################
+# Imports:     #
+################
+
+# Pip Installed Imports:
+from cloudmage.jinjautils.backup import BackupPolicy, compress_file
+from cloudmage.jinjautils.writer import OutputWriter
+
+# Base Python Module Imports:
+import pickle
+import pytest
+import gzip
+import os
+
+
+def _write(path, content):
+    with open(path, "w") as output:
+        output.write(content)
+
+
+def _read(path):
+    with open(path) as output:
+        return output.read()
+
+
+######################################
+# Test BackupPolicy:                 #
+######################################
+def test_backup_policy_strategies(tmp_path):
+    """ BackupPolicy Strategy Test
+
+    This test will backup an output file several times within the same
+    second with the copy, rename and hardlink strategies.
+
+    Expected Result:
+      Backups never overwrite each other, and renamed and hardlinked backups
+      keep the previous output once the output file is replaced, the output
+      file being kept until then.
+    """
+    output_path = os.path.join(str(tmp_path), 'report.yaml')
+    assert(BackupPolicy().backup(output_path) is None)
+
+    _write(output_path, "v1")
+    Copy = BackupPolicy()
+    first = Copy.backup(output_path, '20200213_120000')
+    second = Copy.backup(output_path, '20200213_120000')
+    assert(os.path.basename(first) == 'report_20200213_120000.bak')
+    assert(os.path.basename(second) == 'report_20200213_120000_1.bak')
+    assert(_read(first) == _read(second) == _read(output_path) == "v1")
+
+    Rename = BackupPolicy('rename')
+    third = Rename.backup(output_path, '20200213_120000')
+    assert(os.path.basename(third) == 'report_20200213_120000_2.bak')
+    assert(os.path.samefile(third, output_path))
+    assert(Rename.replaces_output(third))
+    OutputWriter().write(output_path, "v2", Rename.replaces_output(third))
+    assert(_read(third) == "v1" and _read(output_path) == "v2")
+
+    Hardlink = BackupPolicy('hardlink')
+    fourth = Hardlink.backup(output_path, '20200213_120001')
+    assert(os.path.samefile(fourth, output_path))
+    assert(Hardlink.replaces_output(fourth))
+    assert(not Copy.replaces_output(first))
+    OutputWriter().write(output_path, "v3", Hardlink.replaces_output(fourth))
+    assert(_read(fourth) == "v2" and _read(output_path) == "v3")
+    assert(Copy.backups(output_path) == [first, second, third, fourth])
+
+    with pytest.raises(ValueError):
+        BackupPolicy('move')
+    with pytest.raises(ValueError):
+        BackupPolicy(keep=0)
+    with pytest.raises(ValueError):
+        BackupPolicy(compression='bz2')
+
+
+def test_backup_policy_rotation(tmp_path, monkeypatch):
+    """ BackupPolicy Rotation and Compression Test
+
+    This test will backup an output file with a keep limit and gzip
+    compression, then compress a backup that is rotated away while it is
+    being compressed.
+
+    Expected Result:
+      Only the newest backups are kept, backups are compressed in the
+      background, and rotated backups leave no compressed file behind.
+    """
+    output_path = os.path.join(str(tmp_path), 'report.yaml')
+    other_path = os.path.join(str(tmp_path), 'report_other.yaml')
+    _write(other_path, "other")
+    BackupPolicy().backup(other_path, '20200213_120000')
+
+    Policy = BackupPolicy('rename', keep=2, compression='gzip')
+    for index in range(4):
+        _write(output_path, "v{}".format(index))
+        Policy.backup(output_path, '20200213_12000{}'.format(index))
+        Policy.wait()
+    backups = Policy.backups(output_path)
+    assert([os.path.basename(path) for path in backups] == [
+        'report_20200213_120002.bak.gz', 'report_20200213_120003.bak.gz'
+    ])
+    with gzip.open(backups[-1], 'rt') as backup_file:
+        assert(backup_file.read() == "v3")
+    assert(len(Policy.backups(other_path)) == 1)
+
+    # A backup removed by rotation during compression leaves nothing behind.
+    backup_path = os.path.join(str(tmp_path), 'report_20200213_120004.bak')
+    _write(backup_path, "v4")
+    original_remove = os.remove
+
+    def rotate_during_compression(path):
+        monkeypatch.setattr(os, 'remove', original_remove)
+        original_remove(path)
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(os, 'remove', rotate_during_compression)
+    assert(compress_file(backup_path, 'gzip') is None)
+    assert(not os.path.exists(backup_path + '.gz'))
+
+    Copy = pickle.loads(pickle.dumps(Policy))
+    assert(Copy.strategy == 'rename' and Copy.keep == 2)
+    assert(Copy.compression == 'gzip' and Copy.wait() == [])
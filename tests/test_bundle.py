@@ -0,0 +1,163 @@
+# Run PyTest:
+# `poetry run pytest tests -v`
+# Run single test file instead of entire test suite:
+# `poetry run pytest tests/test_bundle.py -v`
+################
+# Imports:     #
+################
+
+# Pip Installed Imports:
+from cloudmage.jinjautils.bundle import (
+    TemplateBundle,
+    TemplateArchive,
+    open_archive,
+    write_bundle
+)
+from cloudmage.jinjautils.loaders import LayeredLoader
+from jinja2 import Environment, TemplateNotFound
+
+# Base Python Module Imports:
+import tarfile
+import zipfile
+import pytest
+import os
+
+TEMPLATES = {
+    'page.j2': "{% extends 'base/layout.j2' %}{% block body %}"
+               "{{ name }}{% endblock %}",
+    'base/layout.j2': "<{% block body %}{% endblock %}>",
+    'broken.j2': "{% if %}"
+}
+
+
+######################################
+# Test TemplateBundle:               #
+######################################
+def test_template_bundle(tmp_path, monkeypatch):
+    """ TemplateBundle Precompiled Code Test
+
+    This test will bundle templates with precompiled code, load them with
+    the same Jinja options without compiling them, load them with other
+    options, then replace the bundle.
+
+    Expected Result:
+      Matching Environments use the precompiled code, other Environments
+      compile the bundled sources, and a replaced bundle is reopened when
+      its templates are loaded again.
+    """
+    bundle_path = os.path.join(str(tmp_path), 'templates.jtb')
+    environment = Environment(trim_blocks=True)
+    assert(write_bundle(bundle_path, TEMPLATES, environment) == 3)
+    assert(os.listdir(str(tmp_path)) == ['templates.jtb'])
+
+    Bundle = open_archive(bundle_path)
+    assert(isinstance(Bundle, TemplateBundle))
+    assert(Bundle.names() == ['base/layout.j2', 'broken.j2', 'page.j2'])
+    assert('page.j2' in Bundle and len(Bundle) == 3)
+    source, filename, uptodate = Bundle.get_source('base/layout.j2')
+    assert(source == TEMPLATES['base/layout.j2'] and uptodate())
+    assert(filename == os.path.join(bundle_path, 'base', 'layout.j2'))
+    assert(Bundle.verify('page.j2') and not Bundle.verify('missing.j2'))
+    assert(Bundle.load_code(environment, 'page.j2') is not None)
+    assert(Bundle.load_code(environment, 'broken.j2') is None)
+    assert(Bundle.load_code(Environment(), 'page.j2') is None)
+    with pytest.raises(TemplateNotFound):
+        Bundle.get_source('missing.j2')
+
+    Loader = LayeredLoader([('', bundle_path)])
+
+    def compile_template(*args, **kwargs):
+        raise AssertionError("compiled")
+
+    monkeypatch.setattr(Environment, 'compile', compile_template)
+    bundled_environment = Environment(loader=Loader, trim_blocks=True)
+    assert(bundled_environment.get_template('page.j2').render(
+        name="bundle"
+    ) == "<bundle>")
+    monkeypatch.undo()
+    assert(Environment(loader=Loader).get_template('page.j2').render(
+        name="compiled"
+    ) == "<compiled>")
+
+    # A replaced bundle is reopened by the uptodate check of the templates
+    # loaded from it, closing the previous mapping.
+    templates = dict(TEMPLATES, **{'page.j2': "{{ name }}!"})
+    del templates['broken.j2']
+    previous = Bundle._mmap
+    write_bundle(bundle_path, templates)
+    assert(not uptodate() and previous.closed)
+    assert(uptodate() and Bundle.refresh() == 0)
+    assert(Bundle.get_source('page.j2')[0] == "{{ name }}!")
+    assert(bundled_environment.get_template('page.j2').render(
+        name="new"
+    ) == "new!")
+    assert(Loader.index.refresh() == 0)
+    assert(Loader.list_templates() == ['base/layout.j2', 'page.j2'])
+    Bundle.close()
+    assert(not Bundle.verify('page.j2'))
+    assert(Bundle.get_source('page.j2')[0] == "{{ name }}!")
+
+
+######################################
+# Test TemplateArchive:              #
+######################################
+@pytest.mark.parametrize('archive_name', ['t.zip', 't.tar', 't.tar.gz'])
+def test_template_archive(tmp_path, archive_name):
+    """ TemplateArchive Zip and Tar Test
+
+    This test will load templates from zip, tar and compressed tar files.
+
+    Expected Result:
+      Archive members are served as templates without unpacking the
+      archive, and replacing the archive closes the handles of the
+      previous archive.
+    """
+    archive_path = os.path.join(str(tmp_path), archive_name)
+    source_directory = os.path.join(str(tmp_path), 'source')
+    for name, source in TEMPLATES.items():
+        source_path = os.path.join(source_directory, *name.split('/'))
+        if not os.path.isdir(os.path.dirname(source_path)):
+            os.makedirs(os.path.dirname(source_path))
+        with open(source_path, 'w') as source_file:
+            source_file.write(source)
+
+    def write_archive(path, names):
+        if archive_name.endswith('.zip'):
+            with zipfile.ZipFile(path, 'w') as archive:
+                for name in names:
+                    archive.write(os.path.join(source_directory, name), name)
+        else:
+            mode = 'w:gz' if archive_name.endswith('.gz') else 'w'
+            with tarfile.open(path, mode) as archive:
+                for name in names:
+                    archive.add(os.path.join(source_directory, name), name)
+
+    write_archive(archive_path, ['page.j2', 'base/layout.j2'])
+
+    Archive = open_archive(archive_path)
+    assert(isinstance(Archive, TemplateArchive))
+    assert(Archive.names() == ['base/layout.j2', 'page.j2'])
+    assert(Archive.get_source('page.j2')[0] == TEMPLATES['page.j2'])
+    assert(Archive.load_code(Environment(), 'page.j2') is None)
+    environment = Environment(loader=LayeredLoader([('', archive_path)]))
+    assert(environment.get_template('page.j2').render(name="x") == "<x>")
+
+    # Replacing the archive closes the previous zip file or memory map.
+    previous = Archive._zip or Archive._mmap
+    replacement_path = archive_path + '.new'
+    write_archive(replacement_path, TEMPLATES)
+    os.replace(replacement_path, archive_path)
+    assert(Archive.refresh() == 1)
+    assert(Archive.names() == sorted(TEMPLATES))
+    if archive_name.endswith('.zip'):
+        assert(previous.fp is None)
+    elif previous is not None:
+        assert(previous.closed)
+    Archive.close()
+    assert(Archive._zip is None and Archive._mmap is None)
+    assert(Archive.refresh() == 0)
+    assert(Archive.get_source('broken.j2')[0] == TEMPLATES['broken.j2'])
+    Archive.close()
+
+    with pytest.raises(ValueError):
+        open_archive(os.path.join(source_directory, 'page.j2'))
@@ -0,0 +1,271 @@
+# Run PyTest:
+# `poetry run pytest tests -v`
+# Run single test file instead of entire test suite:
+# `poetry run pytest tests/test_cache.py -v`
+################
+# Imports:     #
+################
+
+# Pip Installed Imports:
+from cloudmage.jinjautils import JinjaUtils
+from cloudmage.jinjautils.cache import (
+    TemplateCache,
+    TemplateBytecodeCache,
+    RenderCache
+)
+from jinja2 import Environment, FileSystemLoader
+
+# Base Python Module Imports:
+import time
+import os
+
+
+######################################
+# Test TemplateCache:                #
+######################################
+def test_template_cache_hit_miss():
+    """ TemplateCache Hit/Miss Counter Test
+
+    This test will store a value in a new TemplateCache and look up both a
+    cached and an uncached key.
+
+    Expected Result:
+      Cached key is returned and counted as a hit, uncached key returns None
+      and is counted as a miss.
+    """
+    Cache = TemplateCache()
+    assert(len(Cache) == 0)
+
+    Cache.set(('a',), 'template_a')
+    assert(Cache.get(('a',)) == 'template_a')
+    assert(Cache.get(('b',)) is None)
+    assert(Cache.stats() == {
+        'hits': 1, 'misses': 1, 'size': 1, 'max_size': 256
+    })
+
+    # Clearing the cache also resets the counters.
+    Cache.clear()
+    assert(len(Cache) == 0)
+    assert(Cache.hits == 0 and Cache.misses == 0)
+
+
+def test_template_cache_lru_eviction():
+    """ TemplateCache LRU Eviction Test
+
+    This test will fill a TemplateCache past its max_size, after touching
+    the oldest entry so that it becomes the most recently used.
+
+    Expected Result:
+      The least recently used entry is evicted, the touched entry remains.
+    """
+    Cache = TemplateCache(max_size=2)
+    Cache.set('a', 1)
+    Cache.set('b', 2)
+    assert(Cache.get('a') == 1)
+    Cache.set('c', 3)
+    assert(len(Cache) == 2)
+    assert(Cache.get('b') is None)
+    assert(Cache.get('a') == 1)
+    assert(Cache.get('c') == 3)
+
+    # Shrinking max_size evicts down to the new size.
+    Cache.max_size = 1
+    assert(len(Cache) == 1)
+    assert(Cache.get('c') == 3)
+
+
+def test_template_cache_max_size_invalid():
+    """ TemplateCache Invalid Max Size Test
+
+    This test will attempt to set invalid max_size values.
+
+    Expected Result:
+      Invalid values are ignored and the default max_size is kept.
+    """
+    Cache = TemplateCache(max_size=0)
+    assert(Cache.max_size == 256)
+    Cache.max_size = "42"
+    Cache.max_size = True
+    Cache.max_size = -1
+    assert(Cache.max_size == 256)
+
+
+######################################
+# Test TemplateBytecodeCache:        #
+######################################
+def test_bytecode_cache_shared_across_instances(tmp_path, monkeypatch):
+    """ TemplateBytecodeCache Cross Instance Test
+
+    This test will compile a file path template with one JinjaUtils object
+    that uses a bytecode cache directory, then load the same template with a
+    fresh JinjaUtils object and template cache, simulating a new worker.
+
+    Expected Result:
+      The second object loads the compiled code from the bytecode cache
+      without compiling the template source again.
+    """
+    template_filename = os.path.join(str(tmp_path), 'bcc_tpl.j2')
+    with open(template_filename, "w") as template_file:
+        template_file.write("hello {{ world }}")
+    cache_directory = os.path.join(str(tmp_path), 'bcc')
+
+    # Compile the template once, populating the bytecode cache directory.
+    Jinja = JinjaUtils(template_cache=TemplateCache())
+    Jinja.bytecode_cache = cache_directory
+    assert(isinstance(Jinja.bytecode_cache, TemplateBytecodeCache))
+    Jinja.load = template_filename
+    assert(len(os.listdir(cache_directory)) == 1)
+
+    # Count compiles performed by a fresh, memory mapped worker instance.
+    compiles = []
+    original_compile = Environment.compile
+
+    def counting_compile(self, *args, **kwargs):
+        compiles.append(args)
+        return original_compile(self, *args, **kwargs)
+
+    monkeypatch.setattr(Environment, 'compile', counting_compile)
+    Worker = JinjaUtils(template_cache=TemplateCache())
+    Worker.bytecode_cache = TemplateBytecodeCache(
+        cache_directory,
+        use_mmap=True
+    )
+    Worker.load = template_filename
+    Worker.render(world="PyTest")
+    assert(Worker.rendered == "hello PyTest")
+    assert(not compiles)
+
+
+def test_bytecode_cache_keyed_by_options(tmp_path):
+    """ TemplateBytecodeCache Environment Options Key Test
+
+    This test will compile the same directory template with trim_blocks
+    enabled and disabled, sharing one bytecode cache directory.
+
+    Expected Result:
+      Each option set gets its own cache entry and renders correctly.
+    """
+    template_directory = os.path.join(str(tmp_path), 'templates')
+    os.mkdir(template_directory)
+    with open(os.path.join(template_directory, 'trim.j2'), "w") as tpl:
+        tpl.write("{% if true %}\nvalue\n{% endif %}\n")
+    cache_directory = os.path.join(str(tmp_path), 'bcc')
+    rendered = []
+
+    for trim_blocks in (True, False):
+        Jinja = JinjaUtils()
+        Jinja.bytecode_cache = cache_directory
+        Jinja.trim_blocks = trim_blocks
+        Jinja.template_directory = template_directory
+        Jinja.load = 'trim.j2'
+        Jinja.render()
+        rendered.append(Jinja.rendered)
+
+    assert(rendered == ["value\n", "\nvalue\n"])
+    assert(len(os.listdir(cache_directory)) == 2)
+
+
+def test_bytecode_cache_invalid(capsys):
+    """ JinjaUtils Bytecode Cache Invalid Value Test
+
+    This test will set the bytecode_cache property to an invalid value.
+
+    Expected Result:
+      Invalid value is ignored, bytecode caching stays disabled.
+    """
+    Jinja = JinjaUtils()
+    Jinja.bytecode_cache = 42
+    assert(Jinja.bytecode_cache is None)
+
+    out, err = capsys.readouterr()
+    assert "ERROR   CLS->JinjaUtils.bytecode_cache: \
+-> bytecode_cache expected str path or BytecodeCache" in err
+
+
+######################################
+# Test RenderCache:                  #
+######################################
+def test_render_cache_keys(tmp_path):
+    """ RenderCache Key Test
+
+    This test will render directory templates through a RenderCache with
+    equal, differently typed and unserializable contexts, change an included
+    template, and exclude a template from the cache.
+
+    Expected Result:
+      Equal contexts are cache hits, contexts that only differ in value
+      types or dict order get different keys, unserializable contexts and
+      excluded templates aren't cached, and changed includes change the key.
+    """
+    template_directory = str(tmp_path)
+    with open(os.path.join(template_directory, 'page.j2'), "w") as tpl:
+        tpl.write("{% include 'header.j2' %}{{ value }}")
+    with open(os.path.join(template_directory, 'header.j2'), "w") as tpl:
+        tpl.write("v1:")
+
+    environment = Environment(loader=FileSystemLoader(template_directory))
+    template = environment.get_template('page.j2')
+    Cache = RenderCache()
+    context = {'value': [1, {'b': 2, 'a': 1.0}], 'other': None}
+    assert(Cache.render(template, context) == "v1:[1, {'b': 2, 'a': 1.0}]")
+    assert(Cache.render(template, dict(reversed(list(context.items())))) ==
+           "v1:[1, {'b': 2, 'a': 1.0}]")
+    assert(Cache.render(template, {'value': [1, {'a': 1.0, 'b': 2}]}) ==
+           "v1:[1, {'a': 1.0, 'b': 2}]")
+    assert(Cache.stats()['hits'] == 1 and len(Cache) == 2)
+
+    keys = set(
+        Cache.key(template, {'value': value}) for value in (
+            1, 1.0, True, '1', [1], (1,), {1: 1}, {'1': 1}
+        )
+    )
+    assert(len(keys) == 8)
+    assert(Cache.key(template, {'value': object()}) is None)
+
+    # A new Template object picks up the changed include.
+    with open(os.path.join(template_directory, 'header.j2'), "w") as tpl:
+        tpl.write("v2:")
+    changed = Environment(
+        loader=FileSystemLoader(template_directory)
+    ).get_template('page.j2')
+    assert(Cache.key(changed, {}) != Cache.key(template, {}))
+    assert(Cache.render(changed, {'value': 1}) == "v2:1")
+
+    Cache.exclude.add('page.j2')
+    assert(Cache.key(template, {'value': 1}) is None)
+
+
+def test_render_cache_eviction(tmp_path):
+    """ RenderCache Eviction and Disk Tier Test
+
+    This test will store outputs in a RenderCache with size, byte and TTL
+    limits and a disk tier directory.
+
+    Expected Result:
+      Least recently used outputs are evicted from memory, expired outputs
+      are missed, and evicted outputs are read back from the disk tier.
+    """
+    Cache = RenderCache(max_size=2, max_bytes=10)
+    Cache.set('a', "aaaa")
+    Cache.set('b', "bbbb")
+    assert(Cache.get('a') == "aaaa")
+    Cache.set('c', "cccc")
+    assert(Cache.get('b') is None and len(Cache) == 2)
+    Cache.set('d', "dddddddd")
+    assert(len(Cache) == 1 and Cache.stats()['bytes'] == 8)
+
+    Cache = RenderCache(ttl=0.05)
+    Cache.set('a', "aaaa")
+    assert(Cache.get('a') == "aaaa")
+    time.sleep(0.1)
+    assert(Cache.get('a') is None and len(Cache) == 0)
+
+    cache_directory = os.path.join(str(tmp_path), 'renders')
+    Cache = RenderCache(max_size=1, directory=cache_directory)
+    Cache.set('a', "aaaa")
+    Cache.set('b', "bbbb")
+    assert(len(Cache) == 1)
+    assert(RenderCache(directory=cache_directory).get('a') == "aaaa")
+    assert(Cache.get('a') == "aaaa" and Cache.stats()['disk_hits'] == 1)
+    Cache.clear()
+    assert(os.listdir(cache_directory) == [] and Cache.get('a') is None)
@@ -0,0 +1,227 @@
+# Run PyTest:
+# `poetry run pytest tests -v`
+# Run single test file instead of entire test suite:
+# `poetry run pytest tests/test_cli.py -v`
+################
+# Imports:     #
+################
+import pytest
+import json
+import os
+
+# Pip Installed Imports:
+from cloudmage.jinjautils.cli import load_manifest, render_manifest, main
+
+
+def write_file(path, content):
+    """ Write a test file, creating its directory """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as test_file:
+        test_file.write(content)
+
+
+@pytest.fixture
+def project(tmp_path):
+    """ Project directory with templates and a shared context file """
+    directory = str(tmp_path)
+    write_file(
+        os.path.join(directory, 'templates', 'hello.j2'),
+        "Hello {{ name }} from {{ team }}"
+    )
+    write_file(
+        os.path.join(directory, 'templates', 'list.j2'),
+        "{% for item in items %}{{ item }},{% endfor %}"
+    )
+    write_file(
+        os.path.join(directory, 'context.json'),
+        json.dumps({'items': [1, 2, 3]})
+    )
+    return directory
+
+
+def read_file(path):
+    """ Return the content of a test file """
+    with open(path) as test_file:
+        return test_file.read()
+
+
+######################################
+# Test Manifest Loading:             #
+######################################
+def test_load_manifest(project):
+    """ Manifest Loading Test
+
+    This test will load the same manifest as JSON, JSON lines and YAML.
+
+    Expected Result:
+      The template directory and context files are resolved relative to the
+      manifest, outputs relative to the output directory, entry contexts are
+      merged over the shared context, and invalid manifests raise
+      ValueError.
+    """
+    manifest = {
+        'template_directory': 'templates',
+        'output_directory': 'output',
+        'context': {'team': 'CloudMage', 'name': 'shared'},
+        'entries': [
+            {'template': 'hello.j2', 'output': 'a.txt',
+             'context': {'name': 'Rich'}},
+            {'template': 'list.j2', 'output': 'sub/b.txt',
+             'context_file': 'context.json'}
+        ]
+    }
+    json_path = os.path.join(project, 'manifest.json')
+    write_file(json_path, json.dumps(manifest))
+    loaded = load_manifest(json_path)
+    assert(loaded['template_directory'] == [
+        ('', os.path.join(project, 'templates'))
+    ])
+    assert(loaded['output_directory'] == os.path.join(project, 'output'))
+    assert(loaded['jobs'] == [
+        (
+            'hello.j2',
+            {'team': 'CloudMage', 'name': 'Rich'},
+            os.path.join(project, 'output', 'a.txt')
+        ),
+        (
+            'list.j2',
+            {'team': 'CloudMage', 'name': 'shared', 'items': [1, 2, 3]},
+            os.path.join(project, 'output', 'sub/b.txt')
+        )
+    ])
+
+    # JSON lines manifests hold one entry per line.
+    jsonl_path = os.path.join(project, 'manifest.jsonl')
+    write_file(jsonl_path, '\n'.join(
+        json.dumps(entry) for entry in manifest['entries']
+    ) + '\n\n')
+    loaded = load_manifest(jsonl_path, output_directory='elsewhere')
+    assert(loaded['template_directory'] is None)
+    assert(loaded['jobs'][0] == (
+        'hello.j2',
+        {'name': 'Rich'},
+        os.path.join(os.path.abspath('elsewhere'), 'a.txt')
+    ))
+
+    yaml = pytest.importorskip('yaml')
+    yaml_path = os.path.join(project, 'manifest.yml')
+    write_file(yaml_path, yaml.safe_dump(manifest))
+    assert(load_manifest(yaml_path) == load_manifest(json_path))
+
+    for invalid in (
+        '{"entries": [{"template": "hello.j2"}]}',
+        '{"entries": [], "unknown": 1}',
+        '"manifest"',
+        '{"entries": [1, 2]}\n{'
+    ):
+        write_file(json_path, invalid)
+        with pytest.raises(ValueError):
+            load_manifest(json_path, 'auto')
+    with pytest.raises(ValueError):
+        load_manifest(json_path, 'xml')
+
+
+######################################
+# Test Manifest Rendering:           #
+######################################
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_render_manifest(project, jobs):
+    """ Manifest Rendering Test
+
+    This test will render a manifest with a missing template in this
+    process and with a pool of worker processes.
+
+    Expected Result:
+      Every other output is written, the missing template is reported as a
+      failure in order, progress is reported, and the summary holds the
+      counts and per template timings.
+    """
+    entries = [
+        {'template': 'hello.j2', 'output': 'hello{}.txt'.format(index),
+         'context': {'name': index}}
+        for index in range(10)
+    ]
+    entries.insert(3, {'template': 'missing.j2', 'output': 'missing.txt'})
+    manifest_path = os.path.join(project, 'manifest.json')
+    write_file(manifest_path, json.dumps({
+        'template_directory': 'templates',
+        'output_directory': 'output',
+        'context': {'team': 'CloudMage'},
+        'entries': entries
+    }))
+    progress = []
+    summary = render_manifest(
+        load_manifest(manifest_path),
+        jobs=jobs,
+        chunk_size=4,
+        progress=lambda *counts: progress.append(counts)
+    )
+    assert(summary['rendered'] == 10 and summary['failed'] == 1)
+    assert(summary['written'] == 10 and summary['jobs'] == jobs)
+    assert(progress[-1] == (11, 11, 1))
+    assert([result['index'] for result in summary['results']] == list(
+        range(11)
+    ))
+    assert(not summary['results'][3]['success'])
+    assert('TemplateNotFound' in summary['results'][3]['error'])
+    assert(summary['templates']['hello.j2']['count'] == 10)
+    assert(read_file(os.path.join(project, 'output', 'hello9.txt')) == (
+        "Hello 9 from CloudMage"
+    ))
+    assert(not os.path.exists(os.path.join(project, 'output', 'missing.txt')))
+
+
+######################################
+# Test Command Line:                 #
+######################################
+def test_main(project, capsys):
+    """ Command Line Test
+
+    This test will run the jinjautils command on a JSON lines manifest.
+
+    Expected Result:
+      The command exits with 0 when every output is rendered, 1 when an
+      output failed, 2 when the manifest is invalid, and prints a summary
+      of the timings and failures.
+    """
+    manifest_path = os.path.join(project, 'manifest.jsonl')
+    output_directory = os.path.join(project, 'output')
+    write_file(manifest_path, '\n'.join(json.dumps(entry) for entry in [
+        {'template': 'hello.j2', 'output': 'hello.txt',
+         'context': {'name': 'Rich', 'team': 'CloudMage'}},
+        {'template': 'list.j2', 'output': 'list.txt',
+         'context_file': 'context.json'}
+    ]))
+    argv = [
+        manifest_path,
+        '-t', os.path.join(project, 'templates'),
+        '-o', output_directory,
+        '--quiet'
+    ]
+    assert(main(argv) == 0)
+    err = capsys.readouterr().err
+    assert("rendered 2 of 2 output(s)" in err)
+    assert("written 2, unchanged 0, skipped 0, failed 0" in err)
+    assert("hello.j2" in err and "list.j2" in err)
+    assert(read_file(os.path.join(output_directory, 'list.txt')) == "1,2,3,")
+
+    # Unchanged outputs are skipped, progress goes to stderr.
+    assert(main(argv[:-1] + ['--skip-unchanged', '--no-backup']) == 0)
+    err = capsys.readouterr().err
+    assert("jinjautils: 2/2 rendered, 0 failed" in err)
+    assert("written 0, unchanged 2" in err)
+    assert(sorted(os.listdir(output_directory)) == ['hello.txt', 'list.txt'])
+
+    write_file(manifest_path, json.dumps(
+        {'template': 'missing.j2', 'output': 'missing.txt'}
+    ) + '\n')
+    assert(main(argv) == 1)
+    err = capsys.readouterr().err
+    assert("failed: {} (missing.j2): TemplateNotFound".format(
+        os.path.join(output_directory, 'missing.txt')
+    ) in err)
+
+    write_file(manifest_path, '{"template": 1}\n')
+    assert(main(argv) == 2)
+    assert("jinjautils: error:" in capsys.readouterr().err)
+    assert(main([os.path.join(project, 'none.json')]) == 2)
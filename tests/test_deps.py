@@ -0,0 +1,101 @@
+# Run PyTest:
+# `poetry run pytest tests -v`
+# Run single test file instead of entire test suite:
+# `poetry run pytest tests/test_deps.py -v`
+################
+# Imports:     #
+################
+
+# Pip Installed Imports:
+from cloudmage.jinjautils.deps import DependencyGraph
+from jinja2 import Environment, DictLoader
+
+# Base Python Module Imports:
+import os
+
+
+def _environment():
+    return Environment(loader=DictLoader({
+        'base.j2': "{% block body %}{% endblock %}",
+        'macros.j2': "{% macro row(x) %}{{ x }}{% endmacro %}",
+        'partial.j2': "{% import 'macros.j2' as m %}{{ m.row(1) }}",
+        'page.j2': "{% extends 'base.j2' %}{% block body %}"
+                   "{% include 'partial.j2' %}{% endblock %}",
+        'other.j2': "{% include ['missing.j2', 'partial.j2'] %}",
+        'plain.j2': "plain",
+        'dynamic.j2': "{% include name %}",
+        'wrapper.j2': "{% include 'dynamic.j2' %}",
+        'broken.j2': "{% if %}"
+    }))
+
+
+######################################
+# Test DependencyGraph:              #
+######################################
+def test_dependency_graph_affected():
+    """ DependencyGraph Affected Templates Test
+
+    This test will build the graph of templates that extend, include and
+    import each other, including dynamic includes and a template that
+    fails to parse.
+
+    Expected Result:
+      A change affects the changed template, its direct and indirect
+      dependents, and the templates with dynamic references and their
+      dependents.
+    """
+    Graph = DependencyGraph(_environment())
+    names = Graph.environment.loader.list_templates()
+    assert(Graph.build(names) == set(names))
+    assert(len(Graph) == len(names) and 'page.j2' in Graph)
+    assert(Graph.dependencies('page.j2') == {'base.j2', 'partial.j2'})
+    assert(Graph.dependencies('other.j2') == {'missing.j2', 'partial.j2'})
+    assert(Graph.dependents('partial.j2') == {'page.j2', 'other.j2'})
+
+    dynamic = {'dynamic.j2', 'wrapper.j2', 'broken.j2'}
+    assert(Graph.affected(['macros.j2']) == dynamic | {
+        'macros.j2', 'partial.j2', 'page.j2', 'other.j2'
+    })
+    assert(Graph.affected(['base.j2']) == dynamic | {'base.j2', 'page.j2'})
+    assert(Graph.affected(['missing.j2']) == dynamic | {'other.j2'})
+    assert(Graph.affected([]) == set())
+    assert(Graph.build(names) == set())
+
+
+def test_dependency_graph_save_load(tmp_path):
+    """ DependencyGraph Save and Load Test
+
+    This test will save a graph, change, add and remove templates, and
+    rebuild the graph loaded from the saved file.
+
+    Expected Result:
+      Only the templates changed since the graph was saved, and their
+      dependents, are reported, and invalid graph files are ignored.
+    """
+    graph_path = os.path.join(str(tmp_path), 'graph.json')
+    environment = _environment()
+    Graph = DependencyGraph(environment)
+    Graph.build(environment.loader.list_templates())
+    Graph.save(graph_path)
+    assert(os.listdir(str(tmp_path)) == ['graph.json'])
+
+    templates = environment.loader.mapping
+    templates['macros.j2'] = "{% macro row(x) %}[{{ x }}]{% endmacro %}"
+    templates['new.j2'] = "new"
+    del templates['broken.j2']
+    del templates['plain.j2']
+
+    Loaded = DependencyGraph(environment)
+    assert(Loaded.load(graph_path) and len(Loaded) == len(Graph))
+    changed = Loaded.build(environment.loader.list_templates())
+    assert(changed == {'macros.j2', 'new.j2', 'broken.j2', 'plain.j2'})
+    assert(Loaded.affected(changed) == {
+        'macros.j2', 'partial.j2', 'page.j2', 'other.j2', 'new.j2',
+        'dynamic.j2', 'wrapper.j2'
+    })
+    assert('plain.j2' not in Loaded)
+
+    with open(graph_path, 'w') as graph_file:
+        graph_file.write("{not json")
+    assert(not Loaded.load(graph_path) and len(Loaded) == 0)
+    assert(not Loaded.load(os.path.join(str(tmp_path), 'missing.json')))
@@ -0,0 +1,48 @@
+# Run PyTest:
+# `poetry run pytest tests -v`
+# Run single test file instead of entire test suite:
+# `poetry run pytest tests/test_environments.py -v`
+################
+# Imports:     #
+################
+
+# Pip Installed Imports:
+from cloudmage.jinjautils.environments import EnvironmentPool
+from cloudmage.jinjautils.serializers import JsonSerializer
+from jinja2 import DictLoader
+
+
+######################################
+# Test EnvironmentPool:              #
+######################################
+def test_environment_pool():
+    """ EnvironmentPool Lookup and Eviction Test
+
+    This test will get Environments for several option sets from a pool
+    limited to two Environments.
+
+    Expected Result:
+      The same options return the same Environment sharing the pool loader
+      and serializer, and the least recently used Environment is evicted.
+    """
+    loader = DictLoader({'data.j2': "{{ data|to_json }}"})
+    Pool = EnvironmentPool(
+        loader,
+        json_serializer=JsonSerializer(),
+        max_size=2
+    )
+    trimmed = Pool.get(trim_blocks=True, lstrip_blocks=True)
+    assert(Pool.get(lstrip_blocks=True, trim_blocks=True) is trimmed)
+    assert(trimmed.loader is loader and trimmed.trim_blocks)
+    assert(trimmed.get_template('data.j2').render(data=[1]) == "[1]")
+
+    untrimmed = Pool.get(trim_blocks=False, lstrip_blocks=False)
+    assert(untrimmed is not trimmed and not untrimmed.trim_blocks)
+    assert(trimmed in Pool and len(Pool) == 2)
+    Pool.get(trim_blocks=True, lstrip_blocks=False)
+    assert(trimmed not in Pool and untrimmed in Pool and len(Pool) == 2)
+
+    Pool.set_json_serializer(JsonSerializer(sort_keys=True))
+    assert(untrimmed.get_template('data.j2').render(
+        data={'b': 1, 'a': 2}
+    ) == '{"a": 2, "b": 1}')
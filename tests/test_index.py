@@ -0,0 +1,254 @@
+# Run PyTest:
+# `poetry run pytest tests -v`
+# Run single test file instead of entire test suite:
+# `poetry run pytest tests/test_index.py -v`
+################
+# Imports:     #
+################
+
+# Pip Installed Imports:
+from cloudmage.jinjautils.index import TemplateIndex, LayeredIndex
+from jinja2 import FileSystemLoader
+
+# Base Python Module Imports:
+import threading
+import os
+
+
+######################################
+# Define Test Helpers:               #
+######################################
+def write_templates(template_directory, names):
+    """ Write an empty template file for each '/' separated name """
+    for name in names:
+        template_path = os.path.join(template_directory, *name.split('/'))
+        if not os.path.isdir(os.path.dirname(template_path)):
+            os.makedirs(os.path.dirname(template_path))
+        with open(template_path, "w") as template_file:
+            template_file.write(name)
+
+
+######################################
+# Test TemplateIndex:                #
+######################################
+def test_template_index_scan(tmp_path):
+    """ TemplateIndex Scan Test
+
+    This test will scan a nested template directory and compare the result
+    with the Jinja FileSystemLoader list_templates output.
+
+    Expected Result:
+      The index lists the same templates as the Jinja loader.
+    """
+    template_directory = str(tmp_path)
+    write_templates(template_directory, [
+        'base.j2', 'partials/header.j2', 'partials/deep/footer.j2'
+    ])
+    os.mkdir(os.path.join(template_directory, 'empty'))
+
+    Index = TemplateIndex(template_directory)
+    assert(Index.scan() == FileSystemLoader(
+        template_directory
+    ).list_templates())
+    assert(len(Index) == 3)
+    assert('partials/deep/footer.j2' in Index)
+    assert('partials' not in Index)
+
+
+def test_template_index_refresh(tmp_path):
+    """ TemplateIndex Refresh Test
+
+    This test will add and remove templates after the initial scan and
+    refresh the index by name and with a full rescan.
+
+    Expected Result:
+      Named refreshes only update the given names, a full rescan picks up
+      every change, and names escaping the directory are ignored.
+    """
+    template_directory = str(tmp_path)
+    write_templates(template_directory, ['a.j2', 'b.j2'])
+    Index = TemplateIndex(template_directory)
+    Index.scan()
+
+    # Add one template and remove another, then refresh by name.
+    write_templates(template_directory, ['c.j2', 'sub/d.j2'])
+    os.remove(os.path.join(template_directory, 'a.j2'))
+    assert(Index.refresh(['a.j2', 'c.j2', '../a.j2']) == 2)
+    assert(Index.names() == ['b.j2', 'c.j2'])
+
+    # find falls back to a single path check for unindexed names.
+    assert(Index.find('sub/d.j2'))
+    assert(not Index.find('missing.j2'))
+    assert(not Index.find('../b.j2'))
+
+    # A full rescan reports the number of names added or removed.
+    write_templates(template_directory, ['e.j2'])
+    assert(Index.refresh() == 1)
+    assert(Index.names() == ['b.j2', 'c.j2', 'e.j2', 'sub/d.j2'])
+
+
+def test_template_index_incremental_refresh(tmp_path, monkeypatch):
+    """ TemplateIndex Incremental Refresh Test
+
+    This test will change the contents of one sub directory after the
+    initial scan, and refresh the index without naming the changed
+    templates.
+
+    Expected Result:
+      Only the changed directory is listed again, added and removed
+      templates and directories are applied to the index.
+    """
+    template_directory = str(tmp_path)
+    write_templates(template_directory, [
+        'base.j2', 'one/a.j2', 'two/b.j2', 'two/old/c.j2'
+    ])
+    old_mtime = os.stat(template_directory).st_mtime - 60
+
+    def age_directories():
+        """ Move directory mtimes out of the racy mtime window """
+        for root, directories, files in os.walk(template_directory):
+            os.utime(root, (old_mtime, old_mtime))
+
+    age_directories()
+    Index = TemplateIndex(template_directory)
+    Index.scan()
+
+    # Nothing changed, so no directory is listed again.
+    scanned = []
+    original_scan_directory = TemplateIndex._scan_directory
+
+    def counting_scan_directory(self, directory):
+        scanned.append(directory)
+        return original_scan_directory(self, directory)
+
+    monkeypatch.setattr(
+        TemplateIndex, '_scan_directory', counting_scan_directory
+    )
+    assert(Index.refresh() == 0)
+    assert(scanned == [])
+
+    # Change the contents of one directory only.
+    write_templates(template_directory, ['two/d.j2', 'two/new/e.j2'])
+    os.remove(os.path.join(template_directory, 'two', 'old', 'c.j2'))
+    os.rmdir(os.path.join(template_directory, 'two', 'old'))
+    assert(Index.refresh() == 3)
+    assert(sorted(scanned) == ['two', 'two/new'])
+    assert(Index.names() == [
+        'base.j2', 'one/a.j2', 'two/b.j2', 'two/d.j2', 'two/new/e.j2'
+    ])
+
+
+def test_template_index_iter_names(tmp_path):
+    """ TemplateIndex Lazy Iteration Test
+
+    This test will iterate the names of an unscanned index, stopping part
+    way through, then iterate it to completion.
+
+    Expected Result:
+      The index is only marked as scanned once the walk completes, and
+      yields the same names as a full scan.
+    """
+    template_directory = str(tmp_path)
+    write_templates(template_directory, ['a.j2', 'b.j2', 'sub/c.j2'])
+    Index = TemplateIndex(template_directory)
+
+    first_name = next(Index.iter_names())
+    assert(first_name in ['a.j2', 'b.j2', 'sub/c.j2'])
+    assert(not Index.scanned)
+
+    assert(sorted(Index.iter_names()) == ['a.j2', 'b.j2', 'sub/c.j2'])
+    assert(Index.scanned)
+    assert(list(Index.iter_names()) == Index.names())
+
+
+def test_template_index_threads(tmp_path):
+    """ TemplateIndex Thread Safety Test
+
+    This test will refresh an index from another thread, as a template
+    directory watcher does, while the index lock is held and while a lazy
+    iteration of the index is suspended.
+
+    Expected Result:
+      Refreshes wait for the lock, so names are never changed while they
+      are being read, and suspended iterations don't hold the lock.
+    """
+    template_directory = str(tmp_path)
+    write_templates(template_directory, ['a.j2'])
+    Index = TemplateIndex(template_directory)
+    Index.scan()
+    write_templates(template_directory, ['b.j2'])
+
+    watcher = threading.Thread(target=Index.refresh, args=(['b.j2'],))
+    with Index._lock:
+        watcher.start()
+        watcher.join(0.2)
+        assert(watcher.is_alive())
+        assert(Index.names() == ['a.j2'])
+    watcher.join(10)
+    assert(not watcher.is_alive())
+    assert(Index.names() == ['a.j2', 'b.j2'])
+
+    Index = TemplateIndex(template_directory)
+    names = Index.iter_names()
+    next(names)
+    watcher = threading.Thread(target=Index.refresh, args=(['c.j2'],))
+    watcher.start()
+    watcher.join(10)
+    assert(not watcher.is_alive())
+    list(names)
+    assert(Index.scanned and Index.names() == ['a.j2', 'b.j2'])
+
+
+######################################
+# Test LayeredIndex:                 #
+######################################
+def test_layered_index(tmp_path, monkeypatch):
+    """ LayeredIndex Resolution Test
+
+    This test will index an override directory, a base directory and a
+    directory mounted under a prefix, then resolve names, add an override
+    and remove a base template.
+
+    Expected Result:
+      Names resolve to the first directory holding them, resolution is
+      memoized, and the merged names are de-duplicated.
+    """
+    override_directory = os.path.join(str(tmp_path), 'override')
+    base_directory = os.path.join(str(tmp_path), 'base')
+    team_directory = os.path.join(str(tmp_path), 'team')
+    write_templates(override_directory, ['page.j2'])
+    write_templates(base_directory, ['page.j2', 'partials/row.j2'])
+    write_templates(team_directory, ['page.j2'])
+
+    Index = LayeredIndex([
+        ('', override_directory),
+        ('', base_directory),
+        ('team', team_directory)
+    ])
+    assert(not Index.scanned and 'page.j2' not in Index)
+    assert(Index.scan() == ['page.j2', 'partials/row.j2', 'team/page.j2'])
+    assert(Index.scanned and len(Index) == 3 and 'team/page.j2' in Index)
+    assert(Index.resolve('page.j2') == (0, 'page.j2'))
+    assert(Index.resolve('team/page.j2') == (2, 'page.j2'))
+    assert(Index.get_path('partials/row.j2') == os.path.join(
+        base_directory, 'partials', 'row.j2'
+    ))
+    assert(Index.resolve('missing.j2') is None)
+
+    # Memoized names don't check the earlier directories again.
+    def isfile(path):
+        raise AssertionError(path)
+
+    monkeypatch.setattr(os.path, 'isfile', isfile)
+    assert(Index.resolve('partials/row.j2') == (1, 'partials/row.j2'))
+    monkeypatch.undo()
+
+    write_templates(override_directory, ['partials/row.j2'])
+    assert(Index.resolve('partials/row.j2') == (1, 'partials/row.j2'))
+    assert(Index.refresh(['partials/row.j2']) == 1)
+    assert(Index.resolve('partials/row.j2') == (0, 'partials/row.j2'))
+
+    os.remove(os.path.join(base_directory, 'page.j2'))
+    os.remove(os.path.join(override_directory, 'page.j2'))
+    assert(Index.refresh() == 2)
+    assert(list(Index.iter_names()) == ['partials/row.j2', 'team/page.j2'])
@@ -13,10 +13,12 @@
 ################
 
 # Pip Installed Imports:
-from cloudmage.jinjautils import JinjaUtils
+from cloudmage.jinjautils import JinjaUtils, BackupPolicy, JsonSerializer
 
 # Base Python Module Imports:
+import logging
 import pytest
+import queue
 import os
 import shutil
 import sys
@@ -416,6 +418,39 @@ def test_logs_logger_object(capsys):
     )
 
 
+def test_logs_logger_level(caplog):
+    """ JinjaUtils Class Logger Level Test
+
+    This test will log messages of every type to a logging.Logger object
+    that only publishes warnings and errors.
+
+    Expected Result:
+      Debug and info messages are discarded without formatting their
+      arguments, warnings and errors are formatted and published.
+    """
+    class Argument(object):
+        """Count the times the argument is formatted"""
+        formatted = 0
+
+        def __format__(self, format_spec):
+            Argument.formatted += 1
+            return "argument"
+
+    Logger = logging.getLogger('cloudmage.jinjautils.test')
+    Logger.setLevel(logging.WARNING)
+    Jinja = JinjaUtils(verbose=True, log=Logger)
+    caplog.clear()
+    with caplog.at_level(logging.DEBUG):
+        for log_type in ('debug', 'info', 'warning', 'error'):
+            Jinja.log("Pytest {} test", log_type, 'test_log', Argument())
+    assert(Argument.formatted == 2)
+    assert([record.levelname for record in caplog.records] == [
+        'WARNING', 'ERROR'
+    ])
+    assert(caplog.records[0].getMessage() == "CLS->JinjaUtils.test_log: \
+-> Pytest argument test")
+
+
 def test_logs_invalid_object(capsys):
     """ JinjaUtils Class Invalid Log Object Test
 
@@ -453,6 +488,59 @@ def test_logs_invalid_object(capsys):
 -> Pytest error log write test" in err
 
 
+def test_logs_deferred_formatting(capsys):
+    """ JinjaUtils Class Deferred Log Formatting Test
+
+    This test will test that log arguments are only formatted into the log
+    message when the message is actually published. Info messages are muted
+    while verbose is disabled, error messages are always published, and
+    enabling verbose via the property setter un-mutes the info messages.
+
+    Expected Result:
+      Muted messages never format their arguments, published messages do.
+    """
+    # Create an object that counts how many times it has been formatted.
+    class FormatCounter(object):
+        """Test Format Counter Object"""
+
+        def __init__(self):
+            """Class Constructor"""
+            self.count = 0
+
+        def __format__(self, format_spec):
+            """Count Format Calls"""
+            self.count += 1
+            return "counted"
+
+    Counter = FormatCounter()
+
+    # Instantiate a JinjaUtils object with verbose disabled.
+    Jinja = JinjaUtils()
+    assert(not Jinja._verbose)
+
+    # Muted info message should not format its arguments.
+    Jinja.log("Pytest deferred {}", 'info', 'test_log', Counter)
+    assert(Counter.count == 0)
+
+    # Error messages are always published.
+    Jinja.log("Pytest deferred {}", 'error', 'test_log', Counter)
+    assert(Counter.count == 1)
+
+    # Enabling verbose through the setter publishes info messages.
+    Jinja.verbose = True
+    Jinja.log("Pytest deferred {}", 'info', 'test_log', Counter)
+    assert(Counter.count == 2)
+
+    # Capture stdout, stderr to test log messages
+    out, err = capsys.readouterr()
+    # sys.stdout.write(out)
+    # sys.stderr.write(err)
+    assert "ERROR   CLS->JinjaUtils.test_log: \
+-> Pytest deferred counted" in err
+    assert "INFO    CLS->JinjaUtils.test_log: \
+-> Pytest deferred counted" in out
+
+
 ######################################
 # Test trim_blocks property methods: #
 ######################################
@@ -975,6 +1063,122 @@ def test_load_template(capsys):
 -> Loaded template file from:" in out
 
 
+def test_load_template_index(tmp_path, monkeypatch):
+    """ JinjaUtils Class Load Template Index Test
+
+    This test will load templates from a template directory while the Jinja
+    Environment list_templates method is disabled, add a template after the
+    directory was set, and refresh the template index.
+
+    Expected Result:
+      Templates are resolved from the template index without listing the
+      template directory, new templates are still found by name, and
+      refresh_templates updates the available_templates list.
+    """
+    # Import the Jinja Environment to disable list_templates.
+    from jinja2 import Environment
+
+    template_directory = str(tmp_path)
+    with open(os.path.join(template_directory, 'a.j2'), "w") as tpl:
+        tpl.write("a")
+
+    Jinja = JinjaUtils()
+    Jinja.template_directory = template_directory
+    assert(Jinja.available_templates == ['a.j2'])
+
+    def list_templates(self, *args, **kwargs):
+        raise AssertionError("list_templates called")
+
+    monkeypatch.setattr(Environment, 'list_templates', list_templates)
+    Jinja.load = 'a.j2'
+    assert(Jinja.load == 'a.j2')
+
+    # A template added after the directory was set is still found by name.
+    with open(os.path.join(template_directory, 'b.j2'), "w") as tpl:
+        tpl.write("b")
+    Jinja.load = 'b.j2'
+    assert(Jinja.load == 'b.j2')
+
+    # Refresh the index after removing a template.
+    os.remove(os.path.join(template_directory, 'a.j2'))
+    assert(Jinja.refresh_templates('a.j2'))
+    assert(Jinja.available_templates == ['b.j2'])
+    assert(Jinja.refresh_templates())
+    assert(Jinja.available_templates == ['b.j2'])
+
+
+def test_refresh_templates_no_directory(capsys):
+    """ JinjaUtils Class Refresh Templates No Directory Test
+
+    This test will call refresh_templates before a template directory has
+    been configured.
+
+    Expected Result:
+      The refresh is aborted and an error is logged.
+    """
+    Jinja = JinjaUtils()
+    assert(not Jinja.refresh_templates())
+
+    out, err = capsys.readouterr()
+    assert "ERROR   CLS->JinjaUtils.refresh_templates: \
+-> No template directory configured, Aborting refresh!" in err
+
+
+def test_lazy_discovery(tmp_path, monkeypatch, capsys):
+    """ JinjaUtils Class Lazy Template Discovery Test
+
+    This test will enable lazy_discovery, set a template directory and load
+    a template by name before the available_templates property is requested.
+
+    Expected Result:
+      The template directory is only scanned when available_templates is
+      first requested or iter_templates is iterated, invalid settings are
+      ignored.
+    """
+    from cloudmage.jinjautils.index import TemplateIndex
+
+    template_directory = str(tmp_path)
+    for template_name in ('a.j2', 'b.j2'):
+        with open(os.path.join(template_directory, template_name), "w") as tpl:
+            tpl.write(template_name)
+
+    scans = []
+    original_scan = TemplateIndex.scan
+
+    def counting_scan(self):
+        scans.append(self.searchpath)
+        return original_scan(self)
+
+    monkeypatch.setattr(TemplateIndex, 'scan', counting_scan)
+
+    Jinja = JinjaUtils()
+    assert(not Jinja.lazy_discovery)
+    Jinja.lazy_discovery = "True"
+    assert(not Jinja.lazy_discovery)
+    Jinja.lazy_discovery = True
+    assert(Jinja.lazy_discovery)
+
+    Jinja.template_directory = template_directory
+    Jinja.load = 'b.j2'
+    assert(Jinja.load == 'b.j2')
+    assert(scans == [])
+
+    assert(Jinja.available_templates == ['a.j2', 'b.j2'])
+    assert(Jinja.available_templates == ['a.j2', 'b.j2'])
+    assert(len(scans) == 1)
+
+    # iter_templates walks an unscanned directory as names are consumed.
+    Jinja.template_directory = template_directory
+    assert(sorted(Jinja.iter_templates()) == ['a.j2', 'b.j2'])
+    assert(len(scans) == 1)
+
+    out, err = capsys.readouterr()
+    assert "ERROR   CLS->JinjaUtils.lazy_discovery: \
+-> lazy_discovery argument expected bool but received type: \
+<class 'str'>" in err
+    assert(list(JinjaUtils().iter_templates()) == [])
+
+
 def test_load_template_invalid_template(capsys):
     """ JinjaUtils Class Load Invalid Template Method Test
 
@@ -1084,6 +1288,82 @@ been configured.')
     ) in out
 
 
+def test_load_template_file_cache(tmp_path):
+    """ JinjaUtils Class Load Template File Cache Test
+
+    This test will load the same template file path twice using a private
+    TemplateCache, then modify the file and load it a third time.
+
+    Expected Result:
+      The second load is served from the compiled template cache, the
+      modified file is recompiled and renders the updated source.
+    """
+    # Import the TemplateCache class to provide an isolated cache.
+    from cloudmage.jinjautils.cache import TemplateCache
+
+    jinja_test_template_filename = os.path.join(
+        str(tmp_path),
+        'test_cache_tpl.j2'
+    )
+    with open(jinja_test_template_filename, "w") as template_file:
+        template_file.write("hello {{ world }}")
+
+    # Instantiate a JinjaUtils object with a private template cache.
+    Cache = TemplateCache()
+    Jinja = JinjaUtils(template_cache=Cache)
+    assert(Jinja.template_cache is Cache)
+
+    # Load the template twice, the second load should be a cache hit.
+    Jinja.load = jinja_test_template_filename
+    first_template = Jinja._loaded_template
+    Jinja.load = jinja_test_template_filename
+    assert(Jinja._loaded_template is first_template)
+    assert(Jinja.load == 'test_cache_tpl.j2')
+    assert(Cache.stats()['hits'] == 1)
+    assert(Cache.stats()['misses'] == 1)
+
+    # Rewrite the template with a new mtime and size, then reload it.
+    with open(jinja_test_template_filename, "w") as template_file:
+        template_file.write("goodbye {{ world }}")
+    os.utime(jinja_test_template_filename, (0, 0))
+    Jinja.load = jinja_test_template_filename
+    assert(Jinja._loaded_template is not first_template)
+    Jinja.render(world="PyTest")
+    assert(Jinja.rendered == "goodbye PyTest")
+    assert(Cache.stats()['misses'] == 2)
+
+
+def test_load_template_file_cache_instances(tmp_path):
+    """ JinjaUtils Class Load Template File Cache Instances Test
+
+    This test will render the same template file path with two objects
+    using different to_json filter settings, with their default template
+    caches and with a TemplateCache shared by both.
+
+    Expected Result:
+      Each object renders the template with its own to_json filter.
+    """
+    from cloudmage.jinjautils.cache import TemplateCache
+
+    template_filename = os.path.join(str(tmp_path), 'json_tpl.j2')
+    with open(template_filename, "w") as template_file:
+        template_file.write("{{ data|to_json }}")
+    data = {'b': 1, 'a': 2}
+
+    for shared_cache in (None, TemplateCache()):
+        Unsorted = JinjaUtils(template_cache=shared_cache)
+        Sorted = JinjaUtils(template_cache=shared_cache)
+        Sorted.json_serializer = JsonSerializer(sort_keys=True)
+        assert(Unsorted.template_cache is not Sorted.template_cache or
+               shared_cache is not None)
+        assert(Unsorted.render_template(
+            template_filename, data=data
+        ).output == '{"b": 1, "a": 2}')
+        assert(Sorted.render_template(
+            template_filename, data=data
+        ).output == '{"a": 2, "b": 1}')
+
+
 def test_load_template_invalid_type(capsys):
     """ JinjaUtils Class Load Invalid Type Method Test
 
@@ -2046,3 +2326,955 @@ def test_write_backup_invalid(capsys):
     assert "written successfully!" in out
     assert(backup_file)
     assert(write_template)
+
+
+def test_stream(tmp_path, capsys):
+    """ JinjaUtils Class Jinja Stream Method Test
+
+    This test will stream a large template output to disk twice, the second
+    time with an invalid buffer_size, while tracing memory allocations.
+
+    Expected Result:
+      The output file is written without materializing the rendered output,
+      the existing file is backed up on the second pass, and the rendered
+      property is left untouched.
+    """
+    import tracemalloc
+
+    output_directory = str(tmp_path)
+    template_filename = os.path.join(output_directory, 'stream.j2')
+    with open(template_filename, "w") as tpl:
+        tpl.write(
+            "{% for i in range(lines) %}{{ line }} {{ i }}\n{% endfor %}"
+        )
+
+    Jinja = JinjaUtils()
+    assert(not Jinja.stream(output_directory, 'stream.txt'))
+    Jinja.load = template_filename
+    line = "x" * 64
+    lines = 100000
+
+    tracemalloc.start()
+    try:
+        assert(Jinja.stream(
+            output_directory,
+            'stream.txt',
+            buffer_size=1024 * 1024,
+            line=line,
+            lines=lines
+        ))
+        current_size, peak_size = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    output_filename = os.path.join(output_directory, 'stream.txt')
+    output_size = os.path.getsize(output_filename)
+    assert(output_size > 6 * 1024 * 1024)
+    assert(peak_size < output_size // 4)
+    with open(output_filename) as output:
+        assert(output.readline() == "{} 0\n".format(line))
+    assert(Jinja.rendered == "No template has been rendered!")
+
+    # Streaming again backs up the existing file.
+    assert(Jinja.stream(
+        output_directory, 'stream.txt', buffer_size=0, line='y', lines=1
+    ))
+    with open(output_filename) as output:
+        assert(output.read() == "y 0\n")
+    backup_files = [
+        name for name in os.listdir(output_directory)
+        if name.endswith('.bak')
+    ]
+    assert(len(backup_files) == 1)
+    assert(
+        os.path.getsize(os.path.join(output_directory, backup_files[0])) ==
+        output_size
+    )
+
+    out, err = capsys.readouterr()
+    assert "ERROR   CLS->JinjaUtils.stream: \
+-> No template loaded, Aborting stream!" in err
+
+
+def test_render_batch(tmp_path, capsys):
+    """ JinjaUtils Class Jinja Batch Render Method Test
+
+    This test will batch render the loaded template for several contexts,
+    including an existing output file, an in memory result, an invalid
+    output path and an invalid item.
+
+    Expected Result:
+      Valid items are rendered and written, failed items are reported in
+      the results without aborting the batch, and existing files are backed
+      up.
+    """
+    output_directory = str(tmp_path)
+    template_filename = os.path.join(output_directory, 'batch.j2')
+    with open(template_filename, "w") as tpl:
+        tpl.write("hello {{ name }}")
+    existing_filename = os.path.join(output_directory, 'b.txt')
+    with open(existing_filename, "w") as existing:
+        existing.write("existing")
+
+    Jinja = JinjaUtils()
+    assert(not Jinja.render_batch([]))
+    Jinja.load = template_filename
+
+    summary = Jinja.render_batch([
+        ({'name': 'a'}, os.path.join(output_directory, 'a.txt')),
+        ({'name': 'b'}, existing_filename),
+        ({'name': 'c'}, None),
+        ({'name': 'd'}, os.path.join(output_directory, 'missing', 'd.txt')),
+        'invalid item',
+    ])
+    assert(summary['rendered'] == 3)
+    assert(summary['failed'] == 2)
+    assert(summary['items_per_second'] > 0)
+    results = summary['results']
+    assert([result['success'] for result in results] == [
+        True, True, True, False, False
+    ])
+    assert(results[2]['rendered'] == "hello c")
+    assert(results[3]['error'].startswith('FileNotFoundError'))
+    assert(results[4]['output'] is None)
+
+    with open(os.path.join(output_directory, 'a.txt')) as output:
+        assert(output.read() == "hello a")
+    with open(existing_filename) as output:
+        assert(output.read() == "hello b")
+    backup_files = [
+        name for name in os.listdir(output_directory)
+        if name.endswith('.bak')
+    ]
+    assert(len(backup_files) == 1 and backup_files[0].startswith('b_'))
+
+    out, err = capsys.readouterr()
+    assert "ERROR   CLS->JinjaUtils.render_batch: \
+-> No template loaded, Aborting batch render!" in err
+    assert "ERROR   CLS->JinjaUtils.render_batch: \
+-> Batch item 3 failed with: FileNotFoundError" in err
+
+
+def test_render_parallel(tmp_path, capsys):
+    """ JinjaUtils Class Jinja Parallel Render Method Test
+
+    This test will render directory and file path templates across a pool of
+    worker processes, with small chunks, ordered and unordered results and
+    a failing item.
+
+    Expected Result:
+      Items are rendered by the workers with the instance Jinja settings,
+      ordered results are returned in input order and failures are reported
+      without aborting the batch.
+    """
+    template_directory = os.path.join(str(tmp_path), 'templates')
+    output_directory = os.path.join(str(tmp_path), 'output')
+    os.mkdir(template_directory)
+    os.mkdir(output_directory)
+    with open(os.path.join(template_directory, 'par.j2'), "w") as tpl:
+        tpl.write("{% if true %}\n{{ name }}{{ data | to_json }}\n{% endif %}")
+
+    Jinja = JinjaUtils()
+    assert(not Jinja.render_parallel([]))
+    Jinja.template_directory = template_directory
+    Jinja.load = 'par.j2'
+
+    items = [({'name': index, 'data': [index]}, None) for index in range(20)]
+    items.append((
+        {'name': 'missing', 'data': []},
+        os.path.join(output_directory, 'missing', 'missing.txt')
+    ))
+    items.append((
+        {'name': 'file', 'data': []},
+        os.path.join(output_directory, 'file.txt')
+    ))
+    summary = Jinja.render_parallel(items, jobs=2, chunk_size=3)
+    assert(summary['jobs'] == 2)
+    assert(summary['rendered'] == 21 and summary['failed'] == 1)
+    results = summary['results']
+    assert([result['index'] for result in results] == list(range(22)))
+    assert(results[7]['rendered'] == "7[7]\n")
+    assert(results[20]['error'].startswith('FileNotFoundError'))
+    with open(os.path.join(output_directory, 'file.txt')) as output:
+        assert(output.read() == "file[]\n")
+
+    # File path templates are rendered with the file path Environment.
+    Jinja.trim_blocks = False
+    Jinja.load = os.path.join(template_directory, 'par.j2')
+    summary = Jinja.render_parallel(
+        iter(items[:4]), jobs=2, ordered=False
+    )
+    assert(summary['rendered'] == 4)
+    assert(sorted(
+        result['rendered'] for result in summary['results']
+    ) == ["\n{}[{}]\n".format(index, index) for index in range(4)])
+
+    # A chunk that can't be sent to a worker fails its items only.
+    unpicklable = list(items[:4])
+    unpicklable[1] = ({'name': lambda: None, 'data': []}, None)
+    summary = Jinja.render_parallel(unpicklable, jobs=2, chunk_size=2)
+    assert(summary['rendered'] == 2 and summary['failed'] == 2)
+    results = summary['results']
+    assert([result['success'] for result in results] == [
+        False, False, True, True
+    ])
+    assert("Can't pickle" in results[0]['error'])
+    assert(results[3]['rendered'] == "\n3[3]\n")
+
+    # Items of a broken pool are failed instead of aborting the batch.
+    class ExitWorker(object):
+        """Exit the worker process unpickling the item"""
+
+        def __reduce__(self):
+            return (os._exit, (1,))
+
+    unpicklable[1] = ({'name': ExitWorker(), 'data': []}, None)
+    summary = Jinja.render_parallel(unpicklable, jobs=1, chunk_size=1)
+    assert(summary['failed'] >= 3 and len(summary['results']) == 4)
+    assert(summary['results'][1]['error'].startswith('BrokenProcessPool'))
+
+    out, err = capsys.readouterr()
+    assert "ERROR   CLS->JinjaUtils.render_parallel: \
+-> No template loaded, Aborting parallel render!" in err
+    assert "ERROR   CLS->JinjaUtils.render_parallel: \
+-> Batch item 20 failed with: FileNotFoundError" in err
+
+
+def test_reentrant_methods(tmp_path, capsys):
+    """ JinjaUtils Class Re-entrant Methods Test
+
+    This test will render and write directory and file path templates from
+    a pool of threads sharing one JinjaUtils object, then call the
+    re-entrant methods with invalid values.
+
+    Expected Result:
+      Every thread gets its own RenderResult and WriteResult, and the
+      loaded template, rendered output and output path attributes of the
+      shared object are never updated.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from cloudmage.jinjautils import RenderResult, WriteResult
+
+    template_directory = os.path.join(str(tmp_path), 'templates')
+    output_directory = os.path.join(str(tmp_path), 'output')
+    os.mkdir(template_directory)
+    os.mkdir(output_directory)
+    template_filename = os.path.join(template_directory, 'thread.j2')
+    with open(template_filename, "w") as tpl:
+        tpl.write("{{ index }} {{ data | to_json }}")
+
+    Jinja = JinjaUtils()
+    Jinja.template_directory = template_directory
+    file_template = Jinja.get_template(template_filename)
+
+    def render_and_write(index):
+        template = 'thread.j2' if index % 2 else file_template
+        render_result = Jinja.render_template(
+            template, {'index': index}, data=1
+        )
+        write_result = Jinja.write_template(
+            render_result,
+            output_directory,
+            "{}.txt".format(index)
+        )
+        return render_result, write_result
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(render_and_write, range(200)))
+
+    for index, (render_result, write_result) in enumerate(results):
+        assert(isinstance(render_result, RenderResult) and render_result)
+        assert(render_result.template == 'thread.j2')
+        assert(render_result.output == "{} 1".format(index))
+        assert(isinstance(write_result, WriteResult) and write_result)
+        assert(write_result.backup_path is None)
+        with open(write_result.path) as output:
+            assert(output.read() == "{} 1".format(index))
+    assert(Jinja._loaded_template is None)
+    assert(Jinja._rendered_template is None)
+    assert(Jinja._output_directory is None and Jinja._output_file is None)
+
+    # Writing an existing file again returns the backup path.
+    write_result = Jinja.write_template("again", output_directory, '0.txt')
+    assert(write_result and os.path.isfile(write_result.backup_path))
+
+    # Invalid values are returned as failed results.
+    missing_result = Jinja.render_template('missing.j2')
+    assert(not missing_result)
+    assert(missing_result.error == "Template not found: missing.j2")
+    assert(not Jinja.write_template(missing_result, output_directory, 'x'))
+    assert(not Jinja.write_template(42, output_directory, 'x'))
+    assert(not Jinja.write_template("x", '/invalid/directory', 'x'))
+    error_result = Jinja.render_template(Jinja.get_template('thread.j2'), [1])
+    assert(error_result.error.startswith('TypeError'))
+
+    out, err = capsys.readouterr()
+    assert "ERROR   CLS->JinjaUtils.write_template: \
+-> Rendered template expected str but received: <class 'int'>" in err
+
+
+def test_write_skip_unchanged(tmp_path, capsys):
+    """ JinjaUtils Class Jinja Write Skip Unchanged Test
+
+    This test will write the same rendered template several times with
+    skip_unchanged enabled, with and without a manifest, then batch render
+    unchanged and changed outputs.
+
+    Expected Result:
+      Unchanged outputs are neither written nor backed up, and the write
+      status reports written, unchanged or skipped.
+    """
+    output_directory = str(tmp_path)
+    template_filename = os.path.join(output_directory, 'skip.j2')
+    with open(template_filename, "w") as tpl:
+        tpl.write("hello {{ name }}")
+    output_filename = os.path.join(output_directory, 'skip.txt')
+
+    def backup_count():
+        return len([
+            name for name in os.listdir(output_directory)
+            if name.endswith('.bak')
+        ])
+
+    Jinja = JinjaUtils()
+    assert(Jinja.write_status is None)
+    Jinja.load = template_filename
+    Jinja.render(name="a")
+    assert(Jinja.write(output_directory, 'skip.txt', skip_unchanged=True))
+    assert(Jinja.write_status == 'written')
+    output_mtime = os.stat(output_filename).st_mtime_ns
+
+    assert(Jinja.write(output_directory, 'skip.txt', skip_unchanged=True))
+    assert(Jinja.write_status == 'unchanged')
+    assert(os.stat(output_filename).st_mtime_ns == output_mtime)
+    assert(backup_count() == 0)
+
+    # With a manifest, untouched outputs are skipped without being read.
+    Jinja.manifest = os.path.join(output_directory, 'manifest.json')
+    assert(Jinja.write(output_directory, 'skip.txt', skip_unchanged=True))
+    assert(Jinja.write_status == 'unchanged')
+    write_result = Jinja.write_template(
+        "hello a", output_directory, 'skip.txt', skip_unchanged=True
+    )
+    assert(write_result and write_result.status == 'skipped')
+
+    # Changed output is backed up and written.
+    Jinja.render(name="b")
+    assert(Jinja.write(output_directory, 'skip.txt', skip_unchanged=True))
+    assert(Jinja.write_status == 'written')
+    assert(backup_count() == 1)
+
+    summary = Jinja.render_batch([
+        ({'name': 'b'}, output_filename),
+        ({'name': 'c'}, os.path.join(output_directory, 'new.txt')),
+    ], skip_unchanged=True)
+    assert(summary['skipped'] == 1 and summary['written'] == 1)
+    assert(os.path.isfile(os.path.join(output_directory, 'manifest.json')))
+
+    Jinja.manifest = 42
+    out, err = capsys.readouterr()
+    assert "ERROR   CLS->JinjaUtils.manifest: \
+-> manifest expected str path or DigestManifest" in err
+
+
+def test_atomic_write(tmp_path, capsys):
+    """ JinjaUtils Class Jinja Atomic Write Test
+
+    This test will enable atomic writes with batched fsyncs, write and
+    stream templates, and stream a template that fails part way through.
+
+    Expected Result:
+      Outputs are written atomically, a failed stream leaves the previous
+      output untouched, and invalid settings are ignored.
+    """
+    output_directory = str(tmp_path)
+    template_filename = os.path.join(output_directory, 'atomic.j2')
+    with open(template_filename, "w") as tpl:
+        tpl.write("{{ name }}{% if fail %}{{ fail() }}{% endif %}")
+
+    def fail():
+        raise RuntimeError("render failed")
+
+    Jinja = JinjaUtils()
+    assert(not Jinja.atomic_write and Jinja.fsync == 'none')
+    Jinja.atomic_write = "yes"
+    Jinja.fsync = "sometimes"
+    assert(not Jinja.atomic_write and Jinja.fsync == 'none')
+    Jinja.atomic_write = True
+    Jinja.fsync = 'batch'
+
+    Jinja.load = template_filename
+    Jinja.render(name="written")
+    assert(Jinja.write(output_directory, 'atomic.txt', backup=False))
+    assert(Jinja.sync() == 1)
+    assert(not Jinja.stream(
+        output_directory, 'atomic.txt', backup=False, name="x", fail=fail
+    ))
+    with open(os.path.join(output_directory, 'atomic.txt')) as output:
+        assert(output.read() == "written")
+    assert(Jinja.stream(
+        output_directory, 'atomic.txt', backup=False, name="s"
+    ))
+    with open(os.path.join(output_directory, 'atomic.txt')) as output:
+        assert(output.read() == "s")
+    assert(sorted(os.listdir(output_directory)) == [
+        'atomic.j2', 'atomic.txt'
+    ])
+    Jinja.fsync = 'none'
+    assert(Jinja.sync() == 0)
+
+    out, err = capsys.readouterr()
+    assert "ERROR   CLS->JinjaUtils.atomic_write: \
+-> atomic_write argument expected bool but received type: <class 'str'>" in err
+    assert "ERROR   CLS->JinjaUtils.fsync: \
+-> fsync expected one of ('none', 'always', 'batch') but received: \
+sometimes" in err
+
+
+def test_backup_policy(tmp_path, capsys):
+    """ JinjaUtils Class Jinja Backup Policy Test
+
+    This test will write a template output several times within the same
+    second with the hardlink backup strategy and a keep limit.
+
+    Expected Result:
+      Backups hold the previous outputs, use unique names, and only the
+      newest backups are kept. Invalid policies are ignored.
+    """
+    output_directory = str(tmp_path)
+    Jinja = JinjaUtils()
+    assert(Jinja.backup_policy.strategy == 'copy')
+    Jinja.backup_policy = "move"
+    Jinja.backup_policy = 42
+    assert(Jinja.backup_policy.strategy == 'copy')
+    Jinja.backup_policy = BackupPolicy('hardlink', keep=2)
+
+    backup_paths = []
+    for index in range(4):
+        result = Jinja.write_template(
+            "v{}".format(index),
+            output_directory,
+            'report.yaml'
+        )
+        assert(result)
+        backup_paths.append(result.backup_path)
+    assert(backup_paths[0] is None)
+    assert(len(set(backup_paths[1:])) == 3)
+    assert(Jinja.backup_policy.backups(
+        os.path.join(output_directory, 'report.yaml')
+    ) == backup_paths[2:])
+    with open(backup_paths[-1]) as backup_file:
+        assert(backup_file.read() == "v2")
+
+    Jinja.backup_policy = None
+    assert(Jinja.backup_policy.strategy == 'copy')
+    out, err = capsys.readouterr()
+    assert "ERROR   CLS->JinjaUtils.backup_policy: \
+-> backup_policy expected one of ('copy', 'rename', 'hardlink') but \
+received: move" in err
+    assert "ERROR   CLS->JinjaUtils.backup_policy: \
+-> backup_policy expected BackupPolicy or str strategy but received \
+type: <class 'int'>" in err
+
+
+def test_backup_policy_rename(tmp_path, capsys):
+    """ JinjaUtils Class Jinja Rename Backup Policy Test
+
+    This test will write an output without a rendered template, and stream
+    a template that fails part way, over an existing output file with the
+    rename backup strategy, then write a template output successfully.
+
+    Expected Result:
+      Failed writes and streams leave the existing output file in place
+      without a backup, and a successful write moves the previous output
+      to a backup.
+    """
+    output_directory = str(tmp_path)
+    output_path = os.path.join(output_directory, 'report.yaml')
+    template_filename = os.path.join(output_directory, 'report.j2')
+    with open(template_filename, "w") as tpl:
+        tpl.write("{% for i in range(3) %}{{ 1 // i }}\n{% endfor %}")
+    with open(output_path, "w") as output:
+        output.write("old")
+
+    def backups():
+        return sorted(
+            name for name in os.listdir(output_directory)
+            if name != 'report.j2' and name != 'report.yaml'
+        )
+
+    Jinja = JinjaUtils()
+    Jinja.backup_policy = 'rename'
+    assert(not Jinja.write(output_directory, 'report.yaml'))
+    Jinja.load = template_filename
+    assert(not Jinja.stream(output_directory, 'report.yaml'))
+    with open(output_path) as output:
+        assert(output.read() == "old")
+    assert(backups() == [])
+
+    assert(Jinja.write_template("new", output_directory, 'report.yaml'))
+    assert(len(backups()) == 1)
+    with open(os.path.join(output_directory, backups()[0])) as backup:
+        assert(backup.read() == "old")
+    with open(output_path) as output:
+        assert(output.read() == "new")
+    out, err = capsys.readouterr()
+    assert "ERROR   CLS->JinjaUtils.stream: -> EXCEPTION occurred in: \
+CLS->JinjaUtils.stream" in err
+
+
+def test_render_cache(tmp_path, capsys):
+    """ JinjaUtils Class Jinja Render Cache Test
+
+    This test will render a template file twice with the same context and
+    once with a different context, with a render cache enabled.
+
+    Expected Result:
+      The second render with the same context is served from the cache.
+    """
+    template_filename = os.path.join(str(tmp_path), 'cached.j2')
+    with open(template_filename, "w") as tpl:
+        tpl.write("{{ name }}")
+
+    Jinja = JinjaUtils()
+    Jinja.render_cache = 42
+    assert(Jinja.render_cache is None)
+    Jinja.render_cache = True
+    Jinja.load = template_filename
+    Jinja.render(name="cached")
+    Jinja.render(name="cached")
+    assert(Jinja.rendered == "cached")
+    assert(Jinja.render_template(
+        template_filename, {'name': 'other'}
+    ).output == "other")
+    assert(Jinja.render_template(
+        template_filename, name='cached'
+    ).output == "cached")
+    assert(Jinja.render_cache.stats()['hits'] == 2)
+
+    Jinja.render_cache = None
+    assert(Jinja.render_cache is None)
+    out, err = capsys.readouterr()
+    assert "ERROR   CLS->JinjaUtils.render_cache: \
+-> render_cache expected RenderCache, True or str path but received \
+type: <class 'int'>" in err
+
+
+def test_render_cache_file_path(tmp_path, monkeypatch):
+    """ JinjaUtils Class Jinja Render Cache File Path Test
+
+    This test will render a template file with a render cache enabled from a
+    working directory holding another file of the same name, then change
+    the template file.
+
+    Expected Result:
+      The cache key follows the template file, not the working directory
+      file, so the changed template is rendered.
+    """
+    template_directory = os.path.join(str(tmp_path), 'tpl')
+    os.mkdir(template_directory)
+    template_filename = os.path.join(template_directory, 't.j2')
+    with open(template_filename, "w") as tpl:
+        tpl.write("v1 {{ x }}")
+    with open(os.path.join(str(tmp_path), 't.j2'), "w") as tpl:
+        tpl.write("working directory {{ x }}")
+    monkeypatch.chdir(str(tmp_path))
+
+    Jinja = JinjaUtils()
+    Jinja.render_cache = True
+    Jinja.load = template_filename
+    Jinja.render(x=1)
+    assert(Jinja.rendered == "v1 1")
+    with open(template_filename, "w") as tpl:
+        tpl.write("version2 {{ x }}")
+    Jinja.load = template_filename
+    Jinja.render(x=1)
+    assert(Jinja.rendered == "version2 1")
+
+
+def test_json_serializer(tmp_path, capsys):
+    """ JinjaUtils Class Jinja JSON Serializer Test
+
+    This test will render a directory template using the to_json filter with
+    the default serializer, then with sort_keys enabled.
+
+    Expected Result:
+      The to_json filter uses the configured serializer, also with a render
+      cache enabled, and invalid serializers are ignored.
+    """
+    template_directory = str(tmp_path)
+    with open(os.path.join(template_directory, 'json.j2'), "w") as tpl:
+        tpl.write("{{ data|to_json }}")
+
+    Jinja = JinjaUtils()
+    Jinja.template_directory = template_directory
+    Jinja.load = 'json.j2'
+    Jinja.render(data={'b': 1, 'a': 2})
+    assert(Jinja.rendered == '{"b": 1, "a": 2}')
+
+    Jinja.json_serializer = "yaml"
+    Jinja.json_serializer = 42
+    assert(Jinja.json_serializer.backend == 'json')
+    Jinja.json_serializer = JsonSerializer(sort_keys=True)
+    Jinja.render(data={'b': 1, 'a': 2})
+    assert(Jinja.rendered == '{"a": 2, "b": 1}')
+    Jinja.json_serializer = None
+    assert(not Jinja.json_serializer.sort_keys)
+
+    # Cached outputs aren't reused after the serializer is replaced.
+    Jinja.render_cache = True
+    Jinja.render(data={'b': 1, 'a': 2})
+    assert(Jinja.rendered == '{"b": 1, "a": 2}')
+    Jinja.json_serializer = JsonSerializer(sort_keys=True)
+    Jinja.render(data={'b': 1, 'a': 2})
+    assert(Jinja.rendered == '{"a": 2, "b": 1}')
+    Jinja.json_serializer = JsonSerializer(indent=1)
+    Jinja.render(data={'b': 1})
+    assert(Jinja.rendered == '{\n "b": 1\n}')
+    assert(Jinja.render_cache.stats()['hits'] == 0)
+
+    out, err = capsys.readouterr()
+    assert "ERROR   CLS->JinjaUtils.json_serializer: \
+-> backend expected one of" in err
+    assert "ERROR   CLS->JinjaUtils.json_serializer: \
+-> json_serializer expected JsonSerializer or str backend but received \
+type: <class 'int'>" in err
+
+
+def test_environment_options(tmp_path):
+    """ JinjaUtils Class Jinja Environment Options Test
+
+    This test will change the trim_blocks and lstrip_blocks settings after
+    loading a directory template and a template file.
+
+    Expected Result:
+      The loaded templates are rendered with the new settings, and switching
+      back reuses the templates compiled with the previous settings.
+    """
+    template_directory = str(tmp_path)
+    template_filename = os.path.join(template_directory, 'blocks.j2')
+    with open(template_filename, "w") as tpl:
+        tpl.write("  {% if true %}\nyes\n  {% endif %}\n")
+
+    Jinja = JinjaUtils()
+    Jinja.template_directory = template_directory
+    Jinja.load = 'blocks.j2'
+    trimmed_template = Jinja.get_template('blocks.j2')
+    Jinja.render()
+    assert(Jinja.rendered == "yes\n")
+
+    Jinja.trim_blocks = False
+    Jinja.lstrip_blocks = False
+    Jinja.render()
+    assert(Jinja.rendered == "  \nyes\n  ")
+    Jinja.lstrip_blocks = True
+    Jinja.trim_blocks = True
+    assert(Jinja.get_template('blocks.j2') is trimmed_template)
+    Jinja.render()
+    assert(Jinja.rendered == "yes\n")
+
+    # Re-setting the same directory keeps the compiled templates.
+    Jinja.template_directory = template_directory
+    assert(Jinja.get_template('blocks.j2') is trimmed_template)
+
+    Jinja.load = template_filename
+    Jinja.trim_blocks = False
+    Jinja.lstrip_blocks = False
+    Jinja.render()
+    assert(Jinja.rendered == "  \nyes\n  ")
+    assert(Jinja.load == 'blocks.j2')
+
+
+def test_affected_templates(tmp_path, capsys):
+    """ JinjaUtils Class Affected Templates Test
+
+    This test will list the templates affected by changes to a template
+    directory, using a dependency graph saved by a previous build.
+
+    Expected Result:
+      Every template is affected by the first build, then only the changed
+      templates and the templates that extend or include them.
+    """
+    template_directory = os.path.join(str(tmp_path), 'templates')
+    os.makedirs(os.path.join(template_directory, 'partials'))
+    templates = {
+        'base.j2': "{% block body %}{% endblock %}",
+        'partials/row.j2': "{{ row }}",
+        'page.j2': "{% extends 'base.j2' %}{% block body %}"
+                   "{% include 'partials/row.j2' %}{% endblock %}",
+        'plain.j2': "plain"
+    }
+    for name, source in templates.items():
+        with open(os.path.join(template_directory, name), "w") as tpl:
+            tpl.write(source)
+    graph_path = os.path.join(str(tmp_path), 'graph.json')
+
+    Jinja = JinjaUtils()
+    assert(Jinja.dependency_graph is None)
+    assert(Jinja.affected_templates() == [])
+    Jinja.template_directory = template_directory
+    assert(Jinja.affected_templates() == sorted(templates))
+    assert(Jinja.affected_templates() == [])
+    Jinja.dependency_graph.save(graph_path)
+
+    with open(os.path.join(template_directory, 'base.j2'), "w") as tpl:
+        tpl.write("<{% block body %}{% endblock %}>")
+    Jinja = JinjaUtils()
+    Jinja.template_directory = template_directory
+    assert(Jinja.dependency_graph.load(graph_path))
+    assert(Jinja.affected_templates() == ['base.j2', 'page.j2'])
+    assert(Jinja.affected_templates('partials/row.j2') == [
+        'page.j2', 'partials/row.j2'
+    ])
+
+    out, err = capsys.readouterr()
+    assert "ERROR   CLS->JinjaUtils.dependency_graph: \
+-> No template directory configured, no graph available!" in err
+
+
+def test_watch(tmp_path, capsys):
+    """ JinjaUtils Class Watch Template Directory Test
+
+    This test will watch a template directory, then edit a partial template
+    and add a new template.
+
+    Expected Result:
+      The template index is updated, only the templates affected by the
+      change are compiled again, and the callback receives their names.
+    """
+    template_directory = str(tmp_path)
+    templates = {
+        'row.j2': "{{ row }}",
+        'page.j2': "[{% include 'row.j2' %}]",
+        'plain.j2': "plain"
+    }
+    for name, source in templates.items():
+        with open(os.path.join(template_directory, name), "w") as tpl:
+            tpl.write(source)
+
+    Jinja = JinjaUtils()
+    assert(not Jinja.watch())
+    Jinja.template_directory = template_directory
+    assert(not Jinja.watch(callback=42))
+    Jinja.load = 'page.j2'
+    plain_template = Jinja.get_template('plain.j2')
+    page_template = Jinja.get_template('page.j2')
+
+    changes = queue.Queue()
+    assert(Jinja.watch(changes.put, debounce=0.05, interval=0.05))
+    with open(os.path.join(template_directory, 'row.j2'), "w") as tpl:
+        tpl.write("<{{ row }}>")
+    assert(changes.get(timeout=5) == ['page.j2', 'row.j2'])
+    assert(Jinja.get_template('plain.j2') is plain_template)
+    assert(Jinja.get_template('page.j2') is not page_template)
+    Jinja.render(row=1)
+    assert(Jinja.rendered == "[<1>]")
+
+    with open(os.path.join(template_directory, 'new.j2'), "w") as tpl:
+        tpl.write("new")
+    assert(changes.get(timeout=5) == ['new.j2'])
+    assert('new.j2' in Jinja.available_templates)
+    assert(Jinja.unwatch() and not Jinja.unwatch())
+
+    out, err = capsys.readouterr()
+    assert "ERROR   CLS->JinjaUtils.watch: \
+-> No template directory configured, Aborting watch!" in err
+    assert "ERROR   CLS->JinjaUtils.watch: \
+-> callback expected callable but received type: <class 'int'>" in err
+
+
+def test_template_roots(tmp_path, capsys):
+    """ JinjaUtils Class Multiple Template Directories Test
+
+    This test will set an override directory, a base directory and a
+    prefixed directory as the template directory, then load and render
+    templates in the current process and in a worker process.
+
+    Expected Result:
+      available_templates lists the merged template names, and templates
+      are loaded from the first directory holding them.
+    """
+    templates = {
+        os.path.join('override', 'row.j2'): "team",
+        os.path.join('base', 'row.j2'): "base",
+        os.path.join('base', 'page.j2'):
+            "{% include 'row.j2' %}/{% include 'mail/footer.j2' %}",
+        os.path.join('mail', 'footer.j2'): "{{ name }}"
+    }
+    for name, source in templates.items():
+        template_path = os.path.join(str(tmp_path), name)
+        if not os.path.isdir(os.path.dirname(template_path)):
+            os.makedirs(os.path.dirname(template_path))
+        with open(template_path, "w") as tpl:
+            tpl.write(source)
+    template_directory = [
+        os.path.join(str(tmp_path), 'override'),
+        os.path.join(str(tmp_path), 'base'),
+        ('mail', os.path.join(str(tmp_path), 'mail'))
+    ]
+
+    Jinja = JinjaUtils()
+    Jinja.template_directory = [template_directory[0], 42]
+    Jinja.template_directory = template_directory + [
+        os.path.join(str(tmp_path), 'missing')
+    ]
+    assert(Jinja._template_directory is None)
+    Jinja.template_directory = template_directory
+    assert(Jinja.template_directory == template_directory)
+    assert(Jinja.available_templates == [
+        'mail/footer.j2', 'page.j2', 'row.j2'
+    ])
+    Jinja.load = 'page.j2'
+    Jinja.render(name="mail")
+    assert(Jinja.rendered == "team/mail")
+    assert(Jinja.render_template('mail/footer.j2', name="x").output == "x")
+
+    summary = Jinja.render_parallel([({'name': "worker"}, None)], jobs=1)
+    assert(summary['results'][0]['rendered'] == "team/worker")
+
+    out, err = capsys.readouterr()
+    assert "ERROR   CLS->JinjaUtils.template_directory: \
+-> template_directory expected path or (prefix, path) entries but \
+received: 42" in err
+    assert "ERROR   CLS->JinjaUtils.template_directory: \
+-> Provided directory path doesn't exit." in err
+
+
+def test_bundle_templates(tmp_path, capsys):
+    """ JinjaUtils Class Template Bundle Test
+
+    This test will bundle a template directory, then use the bundle as the
+    template directory, alone and in front of an override directory.
+
+    Expected Result:
+      Templates are loaded and rendered from the bundle, and files that
+      aren't bundles or archives are rejected.
+    """
+    template_directory = os.path.join(str(tmp_path), 'templates')
+    override_directory = os.path.join(str(tmp_path), 'override')
+    bundle_path = os.path.join(str(tmp_path), 'templates.jtb')
+    os.makedirs(template_directory)
+    os.makedirs(override_directory)
+    with open(os.path.join(template_directory, 'page.j2'), "w") as tpl:
+        tpl.write("{% if true %}\n[{% include 'row.j2' %}]\n{% endif %}")
+    with open(os.path.join(template_directory, 'row.j2'), "w") as tpl:
+        tpl.write("{{ row }}")
+    with open(os.path.join(override_directory, 'row.j2'), "w") as tpl:
+        tpl.write("<{{ row }}>")
+
+    Jinja = JinjaUtils()
+    assert(Jinja.bundle_templates(bundle_path) is None)
+    Jinja.template_directory = template_directory
+    assert(Jinja.bundle_templates(bundle_path) == 2)
+
+    Jinja = JinjaUtils()
+    Jinja.template_directory = bundle_path
+    assert(Jinja.available_templates == ['page.j2', 'row.j2'])
+    Jinja.load = 'page.j2'
+    Jinja.render(row=1)
+    assert(Jinja.rendered == "[1]\n")
+    Jinja.template_directory = [override_directory, bundle_path]
+    assert(Jinja.render_template('page.j2', row=2).output == "[<2>]\n")
+
+    Jinja.template_directory = os.path.join(override_directory, 'row.j2')
+    out, err = capsys.readouterr()
+    assert "ERROR   CLS->JinjaUtils.bundle_templates: \
+-> No template directory configured, Aborting bundle!" in err
+    assert "isn't a template bundle, zip or tar file" in err
+
+
+def test_metrics(tmp_path, capsys):
+    """ JinjaUtils Class Operation Metrics Test
+
+    This test will enable metrics with a callback, then discover, load,
+    render, write and backup a template, and disable the metrics again.
+
+    Expected Result:
+      Each operation is recorded in its histogram, the bytes written are
+      counted, the stats are exported in the Prometheus format, and nothing
+      is recorded once metrics are disabled.
+    """
+    template_directory = os.path.join(str(tmp_path), 'templates')
+    os.makedirs(template_directory)
+    with open(os.path.join(template_directory, 'page.j2'), "w") as tpl:
+        tpl.write("{{ data|to_json }}")
+
+    updates = []
+    Jinja = JinjaUtils()
+    assert(Jinja.metrics is None and not Jinja.stats()['enabled'])
+    Jinja.metrics = 'metrics'
+    Jinja.metrics = lambda *update: updates.append(update)
+    Jinja.template_directory = template_directory
+    Jinja.load = 'page.j2'
+    Jinja.render(data=[1, 2])
+    Jinja.write(str(tmp_path), 'page.json')
+    Jinja.write(str(tmp_path), 'page.json', skip_unchanged=True)
+    Jinja.write(str(tmp_path), 'page.json')
+
+    stats = Jinja.stats()
+    assert(stats['enabled'] and stats['counters']['bytes_written'] == 12)
+    histograms = stats['histograms']
+    for name in ('discover', 'load', 'compile', 'render', 'to_json'):
+        assert(histograms[name]['count'] == 1)
+    assert(histograms['write']['count'] == 2)
+    assert(histograms['backup']['count'] == 1)
+    assert('template_cache' in stats['caches'])
+    assert(('histogram', 'render', histograms['render']['sum']) in updates)
+    assert("jinjautils_render_seconds_count 1" in Jinja.prometheus_metrics())
+
+    Jinja.render_cache = True
+    Jinja.render_template('page.j2', data=[3])
+    Jinja.render_template('page.j2', data=[3])
+    assert(Jinja.stats()['caches']['render_cache']['hit_rate'] == 0.5)
+
+    Jinja.metrics = None
+    Jinja.render(data=[3])
+    assert(Jinja.stats()['histograms'] == {})
+
+    out, err = capsys.readouterr()
+    assert "ERROR   CLS->JinjaUtils.metrics: \
+-> metrics expected Metrics, True or callable but received type: \
+<class 'str'>" in err
+
+
+def test_profiler(tmp_path, capsys):
+    """ JinjaUtils Class Render Profiler Test
+
+    This test will enable the profiler, then render a template with the
+    render and render_template methods, with a render cache configured.
+
+    Expected Result:
+      Both renders are profiled, bypassing the render cache, and nothing is
+      profiled once the profiler is disabled.
+    """
+    template_directory = os.path.join(str(tmp_path), 'templates')
+    os.makedirs(template_directory)
+    with open(os.path.join(template_directory, 'page.j2'), "w") as tpl:
+        tpl.write("{% for item in items %}\n{{ item }}\n{% endfor %}")
+
+    Jinja = JinjaUtils()
+    assert(Jinja.profiler is None)
+    Jinja.profiler = 'profiler'
+    Jinja.profiler = True
+    Jinja.render_cache = True
+    Jinja.template_directory = template_directory
+    Jinja.load = 'page.j2'
+    Jinja.render(items=[1, 2])
+    assert(Jinja.rendered == "1\n2\n")
+    assert(Jinja.render_template(
+        'page.j2', {'items': [1, 2]}
+    ).output == "1\n2\n")
+    Profiler = Jinja.profiler
+    assert(Profiler.renders == 2)
+    assert(Jinja.render_cache.stats()['hits'] == 0)
+    lines = dict((line['line'], line) for line in Profiler.stats())
+    assert(lines[2]['bytes'] == 8 and lines[2]['source'] == "{{ item }}")
+
+    Jinja.profiler = None
+    Jinja.render(items=[3])
+    assert(Profiler.renders == 2)
+
+    out, err = capsys.readouterr()
+    assert "ERROR   CLS->JinjaUtils.profiler: \
+-> profiler expected TemplateProfiler or True but received type: \
+<class 'str'>" in err
@@ -0,0 +1,101 @@
+# Run PyTest:
+# `poetry run pytest tests -v`
+# Run single test file instead of entire test suite:
+# `poetry run pytest tests/test_loaders.py -v`
+################
+# Imports:     #
+################
+
+# Pip Installed Imports:
+from cloudmage.jinjautils.loaders import (
+    LayeredLoader,
+    create_loader,
+    parse_roots
+)
+from jinja2 import Environment, FileSystemLoader, TemplateNotFound
+
+# Base Python Module Imports:
+import pytest
+import os
+
+
+def _write(path, content):
+    if not os.path.isdir(os.path.dirname(path)):
+        os.makedirs(os.path.dirname(path))
+    with open(path, "w") as output:
+        output.write(content)
+
+
+######################################
+# Test Template Roots:               #
+######################################
+def test_parse_roots():
+    """ Template Roots Parser Test
+
+    This test will parse a directory path, a list of paths and prefixed
+    paths, a dict of prefixes and invalid values.
+
+    Expected Result:
+      Ordered (prefix, path) roots, and TypeError for invalid values.
+    """
+    assert(parse_roots('/templates') == [('', '/templates')])
+    assert(parse_roots(['/team', ('/shared/', '/shared'), '/base']) == [
+        ('', '/team'), ('shared', '/shared'), ('', '/base')
+    ])
+    assert(parse_roots({'': ['/team', '/base'], 'mail': '/mail'}) == [
+        ('', '/team'), ('', '/base'), ('mail', '/mail')
+    ])
+    for invalid in (42, [], ['/base', 42], [('mail',)], {'mail': 42}):
+        with pytest.raises(TypeError):
+            parse_roots(invalid)
+
+
+def test_layered_loader(tmp_path):
+    """ LayeredLoader Template Loading Test
+
+    This test will load templates from an override directory, a base
+    directory and a prefixed directory, then remove an override.
+
+    Expected Result:
+      Overrides are loaded from the first directory, templates include
+      templates of any directory, and a removed override falls back to the
+      base directory.
+    """
+    override_directory = os.path.join(str(tmp_path), 'override')
+    base_directory = os.path.join(str(tmp_path), 'base')
+    mail_directory = os.path.join(str(tmp_path), 'mail')
+    _write(os.path.join(override_directory, 'row.j2'), "override")
+    _write(os.path.join(base_directory, 'row.j2'), "base")
+    _write(
+        os.path.join(base_directory, 'page.j2'),
+        "{% include 'row.j2' %}/{% include 'mail/footer.j2' %}"
+    )
+    _write(os.path.join(mail_directory, 'footer.j2'), "footer")
+    roots = parse_roots([
+        override_directory,
+        base_directory,
+        ('mail', mail_directory)
+    ])
+
+    assert(isinstance(create_loader(parse_roots(base_directory)),
+                      FileSystemLoader))
+    Loader = create_loader(roots)
+    assert(isinstance(Loader, LayeredLoader))
+    assert(create_loader(roots, Loader.index).index is Loader.index)
+    environment = Environment(loader=Loader)
+    assert(environment.get_template('page.j2').render() ==
+           "override/footer")
+    assert(environment.list_templates() == [
+        'mail/footer.j2', 'page.j2', 'row.j2'
+    ])
+    source, filename, uptodate = Loader.get_source(environment, 'row.j2')
+    assert(filename == os.path.join(override_directory, 'row.j2'))
+    assert(uptodate())
+
+    os.remove(os.path.join(override_directory, 'row.j2'))
+    assert(not uptodate())
+    assert(environment.get_template('row.j2').render() == "base")
+    with pytest.raises(TemplateNotFound):
+        environment.get_template('footer.j2')
+    with pytest.raises(TemplateNotFound):
+        environment.get_template('../base/row.j2')
@@ -0,0 +1,86 @@
+# Run PyTest:
+# `poetry run pytest tests -v`
+# Run single test file instead of entire test suite:
+# `poetry run pytest tests/test_manifest.py -v`
+################
+# Imports:     #
+################
+
+# Pip Installed Imports:
+from cloudmage.jinjautils.manifest import (
+    DigestManifest,
+    SKIPPED,
+    UNCHANGED,
+    encode_output,
+    file_matches,
+    output_status,
+    write_output
+)
+import cloudmage.jinjautils.manifest as manifest_module
+
+# Base Python Module Imports:
+import os
+
+
+######################################
+# Test Output Comparison:            #
+######################################
+def test_file_matches(tmp_path, monkeypatch):
+    """ Output File Comparison Test
+
+    This test will compare encoded output with a missing file, a file of a
+    different size, and files of the same size using small compare blocks.
+
+    Expected Result:
+      Only a file holding exactly the encoded output matches.
+    """
+    monkeypatch.setattr(manifest_module, 'COMPARE_BLOCK_SIZE', 4)
+    output_path = os.path.join(str(tmp_path), 'output.txt')
+    encoded = encode_output("hello world\n")
+    assert(not file_matches(output_path, encoded))
+
+    write_output(output_path, encoded)
+    assert(file_matches(output_path, encoded))
+    assert(not file_matches(output_path, encode_output("hello\n")))
+    assert(not file_matches(output_path, encode_output("hello worle\n")))
+
+
+def test_digest_manifest(tmp_path):
+    """ DigestManifest Persistence Test
+
+    This test will record an output file in a manifest, save and reload the
+    manifest, then modify the file behind the manifest's back.
+
+    Expected Result:
+      A recorded, untouched file is skipped without comparing its contents,
+      a modified file is compared again, and the manifest is only saved when
+      it changed.
+    """
+    manifest_path = os.path.join(str(tmp_path), 'manifest.json')
+    output_path = os.path.join(str(tmp_path), 'output.txt')
+    encoded = encode_output("content")
+
+    Manifest = DigestManifest(manifest_path)
+    assert(len(Manifest) == 0 and not Manifest.save())
+    assert(output_status(output_path, encoded, Manifest) is None)
+    write_output(output_path, encoded, Manifest)
+    assert(Manifest.save())
+    assert(not Manifest.save())
+
+    Reloaded = DigestManifest(manifest_path)
+    assert(len(Reloaded) == 1)
+    assert(output_status(output_path, encoded, Reloaded) == SKIPPED)
+    assert(
+        output_status(output_path, encode_output("other"), Reloaded) is None
+    )
+
+    # A touched file with the same content is compared and recorded again.
+    output_stat = os.stat(output_path)
+    os.utime(output_path, (output_stat.st_atime, output_stat.st_mtime + 10))
+    assert(output_status(output_path, encoded, Reloaded) == UNCHANGED)
+    assert(output_status(output_path, encoded, Reloaded) == SKIPPED)
+
+    # Corrupt manifest files are ignored.
+    with open(manifest_path, "w") as manifest_file:
+        manifest_file.write("not json")
+    assert(len(DigestManifest(manifest_path)) == 0)
@@ -0,0 +1,131 @@
+# Run PyTest:
+# `poetry run pytest tests -v`
+# Run single test file instead of entire test suite:
+# `poetry run pytest tests/test_metrics.py -v`
+################
+# Imports:     #
+################
+import pytest
+
+# Pip Installed Imports:
+from cloudmage.jinjautils.metrics import Metrics, prometheus_text
+from cloudmage.jinjautils.environments import EnvironmentPool
+from cloudmage.jinjautils.serializers import JsonSerializer
+from jinja2 import DictLoader
+
+
+######################################
+# Test Metrics:                      #
+######################################
+def test_metrics():
+    """ Metrics Counter and Histogram Test
+
+    This test will increment counters and observe durations, with a
+    callback that fails on counter updates.
+
+    Expected Result:
+      The stats snapshot reports the counters and the histogram count, sum,
+      min, max and cumulative buckets, every update is passed to the
+      callback, and the failed callback calls are counted.
+    """
+    updates = []
+
+    def callback(metric_type, name, value):
+        updates.append((metric_type, name, value))
+        if metric_type == 'counter':
+            raise RuntimeError('unreachable')
+
+    Metrics_Object = Metrics(callback, buckets=(0.5, 0.1, 1))
+    assert(Metrics_Object.buckets == (0.1, 0.5, 1))
+    Metrics_Object.increment('bytes_written', 10)
+    Metrics_Object.increment('bytes_written', 5)
+    for seconds in (0.05, 0.3, 2.0):
+        Metrics_Object.observe('render', seconds)
+    with Metrics_Object.timer('write'):
+        pass
+
+    stats = Metrics_Object.stats()
+    assert(stats['counters'] == {'bytes_written': 15, 'callback_errors': 2})
+    render = stats['histograms']['render']
+    assert(render['count'] == 3 and render['min'] == 0.05)
+    assert(render['max'] == 2.0 and render['sum'] == pytest.approx(2.35))
+    assert(render['buckets'] == [(0.1, 1), (0.5, 2), (1, 2), (None, 3)])
+    assert(stats['histograms']['write']['count'] == 1)
+    assert(updates[0] == ('counter', 'bytes_written', 10))
+    assert(('histogram', 'render', 0.3) in updates)
+
+    Metrics_Object.reset()
+    assert(Metrics_Object.stats() == {'counters': {}, 'histograms': {}})
+
+    with pytest.raises(TypeError):
+        Metrics('callback')
+    with pytest.raises(ValueError):
+        Metrics(buckets=(0.1, -1))
+
+
+def test_prometheus_text():
+    """ Prometheus Text Format Test
+
+    This test will format a snapshot with a histogram, a counter and cache
+    statistics.
+
+    Expected Result:
+      Histograms have cumulative le buckets ending with +Inf, a sum and a
+      count, counters and cache hits have the _total suffix, and the other
+      cache statistics are gauges.
+    """
+    Metrics_Object = Metrics(buckets=(0.1,))
+    Metrics_Object.observe('render', 0.05)
+    Metrics_Object.observe('render', 0.2)
+    Metrics_Object.increment('bytes_written', 3)
+    stats = Metrics_Object.stats()
+    stats['caches'] = {
+        'render_cache': {'hits': 1, 'misses': 1, 'hit_rate': 0.5,
+                         'max_size': None}
+    }
+    text = prometheus_text(stats, 'app')
+    assert(text.splitlines() == [
+        '# TYPE app_render_seconds histogram',
+        'app_render_seconds_bucket{le="0.1"} 1',
+        'app_render_seconds_bucket{le="+Inf"} 2',
+        'app_render_seconds_sum 0.25',
+        'app_render_seconds_count 2',
+        '# TYPE app_bytes_written_total counter',
+        'app_bytes_written_total 3',
+        '# TYPE app_render_cache_hit_rate gauge',
+        'app_render_cache_hit_rate 0.5',
+        '# TYPE app_render_cache_hits_total counter',
+        'app_render_cache_hits_total 1',
+        '# TYPE app_render_cache_misses_total counter',
+        'app_render_cache_misses_total 1'
+    ])
+    assert(Metrics(buckets=(0.1,)).prometheus() == '')
+
+
+def test_metered_environment():
+    """ Metered Environment Compile Test
+
+    This test will compile templates and encode to_json values with
+    Environments of a pool, before and after setting the pool metrics.
+
+    Expected Result:
+      Only the compilations and to_json calls made while metrics are set
+      are recorded.
+    """
+    loader = DictLoader({
+        'a.j2': "{{ data|to_json }}",
+        'b.j2': "{{ data }}"
+    })
+    serializer = JsonSerializer()
+    Pool = EnvironmentPool(loader, json_serializer=serializer)
+    environment = Pool.get()
+    environment.get_template('a.j2').render(data=[1])
+
+    Metrics_Object = Metrics()
+    Pool.set_metrics(Metrics_Object)
+    serializer.metrics = Metrics_Object
+    assert(environment.get_template('a.j2').render(data=[1]) == "[1]")
+    Pool.get(trim_blocks=True).get_template('b.j2')
+    histograms = Metrics_Object.stats()['histograms']
+    assert(histograms['compile']['count'] == 1)
+    assert(histograms['to_json']['count'] == 1)
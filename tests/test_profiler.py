@@ -0,0 +1,90 @@
+# Run PyTest:
+# `poetry run pytest tests -v`
+# Run single test file instead of entire test suite:
+# `poetry run pytest tests/test_profiler.py -v`
+################
+# Imports:     #
+################
+
+# Pip Installed Imports:
+from cloudmage.jinjautils.profiler import TemplateProfiler
+from jinja2 import Environment, DictLoader
+
+# Base Python Module Imports:
+import sys
+
+
+######################################
+# Test TemplateProfiler:             #
+######################################
+def test_template_profiler(tmp_path):
+    """ TemplateProfiler Line and Block Attribution Test
+
+    This test will profile a template with a macro, a block and a loop
+    including another template.
+
+    Expected Result:
+      Every rendered byte is attributed once to a template line, hits and
+      time are recorded for the loop lines, blocks and included templates
+      are reported with their total time, the folded stacks end with the
+      template line, and the previous trace function is restored.
+    """
+    environment = Environment(loader=DictLoader({
+        'page.j2': (
+            "{% macro cell(x) -%}\n"
+            "<td>{{ x }}</td>\n"
+            "{%- endmacro %}\n"
+            "{% block body %}\n"
+            "{% for i in items %}\n"
+            "{{ cell(i) }}\n"
+            "{% include 'row.j2' %}\n"
+            "{% endfor %}\n"
+            "{% endblock %}\n"
+        ),
+        'row.j2': "row {{ i }}\n"
+    }))
+    template = environment.get_template('page.j2')
+    previous_trace = sys.gettrace()
+    Profiler = TemplateProfiler()
+    output = Profiler.render(template, {'items': list(range(20))})
+    assert(output == template.render(items=list(range(20))))
+    assert(sys.gettrace() is previous_trace)
+    assert(Profiler.renders == 1)
+
+    stats = Profiler.stats()
+    assert(sum(line['bytes'] for line in stats) == len(output))
+    lines = dict(((line['template'], line['line']), line) for line in stats)
+    assert(lines[('row.j2', 1)]['bytes'] == sum(
+        len("row {}".format(i)) for i in range(20)
+    ))
+    assert(lines[('page.j2', 6)]['source'] == "{{ cell(i) }}")
+    assert(lines[('page.j2', 6)]['hits'] >= 20)
+    assert(stats == sorted(stats, key=lambda line: -line['seconds']))
+
+    functions = dict((block['function'], block) for block in Profiler.blocks())
+    assert(set(functions) == set([
+        'page.j2:root', 'page.j2:block_body', 'page.j2:macro@1',
+        'row.j2:root'
+    ]))
+    assert(
+        functions['page.j2:root']['total_seconds'] >=
+        functions['page.j2:block_body']['total_seconds'] >=
+        functions['row.j2:root']['total_seconds']
+    )
+    folded = Profiler.folded().splitlines()
+    row_stack = "page.j2:root;page.j2:block_body;row.j2:root;row.j2:1 "
+    assert(any(line.startswith(row_stack) for line in folded))
+    assert("page.j2:6  {{ cell(i) }}" in Profiler.report())
+
+    folded_path = str(tmp_path / 'profile.folded')
+    Profiler.write_folded(folded_path)
+    with open(folded_path) as folded_file:
+        assert(folded_file.read().splitlines() == folded)
+
+    with Profiler.profile():
+        template.render(items=[1])
+        with Profiler.profile():
+            template.render(items=[2])
+    assert(Profiler.renders == 2)
+    Profiler.reset()
+    assert(Profiler.stats() == [] and Profiler.folded() == '')
@@ -0,0 +1,129 @@
+# Run PyTest:
+# `poetry run pytest tests -v`
+# Run single test file instead of entire test suite:
+# `poetry run pytest tests/test_serializers.py -v`
+################
+# Imports:     #
+################
+
+# Pip Installed Imports:
+from cloudmage.jinjautils.serializers import (
+    JsonSerializer,
+    available_backends,
+    default_json_serializer
+)
+from jinja2 import Environment
+
+# Base Python Module Imports:
+import pickle
+import pytest
+import json
+
+
+######################################
+# Test JsonSerializer:               #
+######################################
+def test_json_serializer_stdlib():
+    """ JsonSerializer Standard Library Backend Test
+
+    This test will encode values with the default serializer, with the
+    sort_keys and indent options, and with filter keyword arguments.
+
+    Expected Result:
+      Output matches json.dumps with the same options.
+    """
+    value = {'b': [1, "/x"], 'a': (1.5, None, True)}
+    assert(JsonSerializer().dumps(value) == json.dumps(value))
+    assert(JsonSerializer(sort_keys=True, indent=2).dumps(value) ==
+           json.dumps(value, sort_keys=True, indent=2))
+    assert(JsonSerializer().dumps(value, separators=(',', ':')) ==
+           json.dumps(value, separators=(',', ':')))
+    assert('json' in available_backends())
+
+    with pytest.raises(ValueError):
+        JsonSerializer('yaml')
+    with pytest.raises(ValueError):
+        JsonSerializer(indent=-1)
+    Copy = pickle.loads(pickle.dumps(JsonSerializer(sort_keys=True)))
+    assert(Copy.backend == 'json' and Copy.sort_keys)
+
+
+def test_json_serializer_memoize():
+    """ JsonSerializer Memoize Test
+
+    This test will render a template encoding the same object in a loop,
+    with memoize enabled and disabled, across two renders.
+
+    Expected Result:
+      With memoize, the object is encoded once per render, and a changed
+      object is encoded again by the next render.
+    """
+    encoded = []
+
+    class CountingSerializer(JsonSerializer):
+        def _encode_json(self, value):
+            encoded.append(value)
+            return super(CountingSerializer, self)._encode_json(value)
+
+    environment = CountingSerializer(memoize=True).install(Environment())
+    template = environment.from_string(
+        "{% for i in range(5) %}{{ data|to_json }}{{ i|to_json }}{% endfor %}"
+    )
+    data = {'items': list(range(3))}
+
+    assert(template.render(data=data) == ''.join(
+        json.dumps(data) + str(i) for i in range(5)
+    ))
+    assert(len(encoded) == 6)
+    data['items'].append(3)
+    assert(template.render(data=data).startswith(json.dumps(data)))
+    assert(len(encoded) == 12)
+
+    CountingSerializer().install(environment)
+    template = environment.from_string(
+        "{% for i in range(5) %}{{ data|to_json }}{% endfor %}"
+    )
+    template.render(data=data)
+    assert(len(encoded) == 17)
+
+
+def test_json_serializer_mutated_object():
+    """ JsonSerializer Mutated Object Test
+
+    This test will render a template that appends to a list between
+    encodings of it, with the default serializer and filter.
+
+    Expected Result:
+      Every encoding reflects the current content of the list.
+    """
+    expected = "[0];[0, 1];[0, 1, 2];"
+    source = (
+        "{% for i in range(1, 3) %}{{ l|to_json }};{% do l.append(i) %}"
+        "{% endfor %}{{ l|to_json }};"
+    )
+    environment = Environment(extensions=['jinja2.ext.do'])
+    default_json_serializer.install(environment)
+    assert(environment.from_string(source).render(l=[0]) == expected)
+    JsonSerializer().install(environment)
+    assert(environment.from_string(source).render(l=[0]) == expected)
+    assert(not JsonSerializer().memoize)
+
+
+def test_json_serializer_orjson():
+    """ JsonSerializer orjson Backend Test
+
+    This test will encode values with the orjson backend, including a value
+    orjson can't encode, and select the backend automatically.
+
+    Expected Result:
+      Compact JSON output, with the standard library encoding unsupported
+      values.
+    """
+    pytest.importorskip('orjson')
+    Serializer = JsonSerializer('orjson', sort_keys=True)
+    assert(Serializer.dumps({'b': 1, 'a': [1, 2]}) == '{"a":[1,2],"b":1}')
+    assert(Serializer.dumps({'big': 2 ** 70}) == json.dumps({'big': 2 ** 70}))
+    assert(JsonSerializer('auto').backend == 'orjson')
+    assert(JsonSerializer('auto', indent=4).backend != 'orjson')
+    with pytest.raises(ValueError):
+        JsonSerializer('orjson', indent=4)
@@ -0,0 +1,156 @@
+# Run PyTest:
+# `poetry run pytest tests -v`
+# Run single test file instead of entire test suite:
+# `poetry run pytest tests/test_server.py -v`
+################
+# Imports:     #
+################
+import pytest
+import socket
+import os
+
+# Pip Installed Imports:
+from cloudmage.jinjautils import JinjaUtils
+from cloudmage.jinjautils.server import TemplateServer, main
+from cloudmage.jinjautils.client import TemplateClient
+
+
+@pytest.fixture
+def template_directory(tmp_path):
+    """ Template directory with a single template """
+    directory = os.path.join(str(tmp_path), 'templates')
+    os.makedirs(directory)
+    with open(os.path.join(directory, 'hello.j2'), 'w') as template_file:
+        template_file.write("Hello {{ name }}")
+    return directory
+
+
+######################################
+# Test Template Server:               #
+######################################
+def test_template_server(tmp_path, template_directory, monkeypatch):
+    """ Template Server Request Test
+
+    This test will serve a JinjaUtils object on a Unix domain socket and
+    send render, write, stats and invalid requests with the client.
+
+    Expected Result:
+      Renders and writes return RenderResult and WriteResult objects,
+      pipelined requests are answered in order, failed and invalid requests
+      are answered with an error, and closing the server removes the
+      socket file.
+    """
+    Jinja = JinjaUtils()
+    Jinja.template_directory = template_directory
+    socket_path = os.path.join(str(tmp_path), 'jinja.sock')
+    output_directory = os.path.join(str(tmp_path), 'output')
+    os.makedirs(output_directory)
+
+    with TemplateServer(Jinja, socket_path) as Server:
+        assert(os.stat(socket_path).st_mode & 0o777 == 0o600)
+        assert(sorted(os.listdir(str(tmp_path))) == [
+            'jinja.sock', 'output', 'templates'
+        ])
+        with TemplateClient(socket_path, timeout=10) as Client:
+            assert(Client.ping())
+            rendered = Client.render('hello.j2', {'name': 'Rich'})
+            assert(rendered.success and rendered.output == "Hello Rich")
+            assert(Client.render('hello.j2', name='Jinja').output == (
+                "Hello Jinja"
+            ))
+            missing = Client.render('missing.j2')
+            assert(not missing and 'missing.j2' in missing.error)
+
+            written = Client.write(
+                'hello.j2', output_directory, 'hello.txt', {'name': 'File'}
+            )
+            assert(written.success and written.status == 'written')
+            with open(written.path) as output_file:
+                assert(output_file.read() == "Hello File")
+            results = Client.write_many([
+                ('hello.j2', {'name': 'File'}, written.path),
+                ('missing.j2', {}, written.path)
+            ], backup=False, skip_unchanged=True)
+            assert(results[0].status == 'unchanged' and not results[1])
+
+            # Relative output paths are resolved in the client directory.
+            monkeypatch.chdir(output_directory)
+            results = Client.write_many([
+                ('hello.j2', {'name': 'Relative'}, 'relative.txt')
+            ], backup=False)
+            assert(results[0].path == os.path.join(
+                output_directory, 'relative.txt'
+            ))
+            written = Client.write('hello.j2', '.', 'dot.txt', backup=False)
+            assert(written.path == os.path.join(output_directory, 'dot.txt'))
+
+            # Pipelines larger than the socket buffers are answered in order.
+            names = ['x' * 100 + str(index) for index in range(5000)]
+            results = Client.render_many(
+                [('hello.j2', {'name': name}) for name in names]
+            )
+            assert([result.output for result in results] == [
+                "Hello " + name for name in names
+            ])
+
+            stats = Client.stats()
+            assert(stats['caches']['template_cache']['size'] >= 0)
+            response = Client.request('unknown')
+            assert(not response['ok'] and 'op expected' in response['error'])
+            response = Client.request('render', template=1)
+            assert(response['error'].startswith('TypeError'))
+
+        # Invalid request lines are answered, the connection is kept open.
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.settimeout(10)
+        connection.connect(socket_path)
+        connection.sendall(b'not json\n[1]\n{"op": "ping", "id": 7}\n')
+        reader = connection.makefile('rb')
+        assert(b'Invalid request' in reader.readline())
+        assert(b'Invalid request' in reader.readline())
+        assert(reader.readline() == b'{"id":7,"ok":true}\n')
+        reader.close()
+        connection.close()
+        assert(repr(Server) == "TemplateServer(socket_path={!r})".format(
+            socket_path
+        ))
+    assert(not os.path.exists(socket_path))
+
+
+def test_template_server_socket(tmp_path, template_directory):
+    """ Template Server Socket Test
+
+    This test will bind servers to a stale socket file, a socket in use and
+    a regular file.
+
+    Expected Result:
+      Stale socket files are replaced, sockets in use and other files raise
+      OSError, and the server command exits with 2 when it can't start.
+    """
+    socket_path = os.path.join(str(tmp_path), 'jinja.sock')
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(socket_path)
+    stale.close()
+    assert(os.path.exists(socket_path))
+
+    Server = TemplateServer(JinjaUtils(), socket_path).start()
+    try:
+        with pytest.raises(OSError):
+            TemplateServer(JinjaUtils(), socket_path).bind()
+        with TemplateClient(socket_path) as Client:
+            assert(Client.ping())
+    finally:
+        Server.close()
+    Server.close()
+
+    file_path = os.path.join(str(tmp_path), 'file.sock')
+    with open(file_path, 'w') as socket_file:
+        socket_file.write('')
+    with pytest.raises(OSError):
+        TemplateServer(JinjaUtils(), file_path).bind()
+    assert(os.path.exists(file_path))
+    with pytest.raises(OSError):
+        TemplateClient(socket_path).ping()
+
+    assert(main([file_path]) == 2)
+    assert(main([socket_path, '-t', os.path.join(str(tmp_path), 'none')]) == 2)
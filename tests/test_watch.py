@@ -0,0 +1,109 @@
+# Run PyTest:
+# `poetry run pytest tests -v`
+# Run single test file instead of entire test suite:
+# `poetry run pytest tests/test_watch.py -v`
+################
+# Imports:     #
+################
+
+# Pip Installed Imports:
+from cloudmage.jinjautils.watch import TemplateWatcher, inotify_available
+
+# Base Python Module Imports:
+import pytest
+import queue
+import os
+
+
+def _write(path, content):
+    with open(path, "w") as output:
+        output.write(content)
+
+
+def _watch_changes(directory, backend):
+    """ Apply a series of changes to a watched directory """
+    changes = queue.Queue()
+    Watcher = TemplateWatcher(
+        directory,
+        changes.put,
+        debounce=0.05,
+        interval=0.05,
+        backend=backend
+    ).start()
+    try:
+        assert(Watcher.running and Watcher.backend == backend)
+
+        # A burst of writes is reported once.
+        for index in range(3):
+            _write(os.path.join(directory, 'page.j2'), str(index))
+        _write(os.path.join(directory, 'base.j2'), "base")
+        assert(changes.get(timeout=5) == {'page.j2', 'base.j2'})
+
+        os.makedirs(os.path.join(directory, 'partials'))
+        _write(os.path.join(directory, 'partials', 'row.j2'), "row")
+        assert(changes.get(timeout=5) == {'partials/row.j2'})
+
+        os.rename(
+            os.path.join(directory, 'base.j2'),
+            os.path.join(directory, 'partials', 'base.j2')
+        )
+        assert(changes.get(timeout=5) == {'base.j2', 'partials/base.j2'})
+
+        os.remove(os.path.join(directory, 'page.j2'))
+        assert(changes.get(timeout=5) == {'page.j2'})
+        assert(changes.empty() and Watcher.last_error is None)
+    finally:
+        Watcher.stop()
+    assert(not Watcher.running)
+
+
+######################################
+# Test TemplateWatcher:              #
+######################################
+def test_template_watcher_poll(tmp_path):
+    """ TemplateWatcher Polling Backend Test
+
+    This test will write, move and remove files in a directory watched by
+    polling.
+
+    Expected Result:
+      Each burst of changes is reported once, with the changed names.
+    """
+    _watch_changes(str(tmp_path), 'poll')
+
+    with pytest.raises(ValueError):
+        TemplateWatcher(os.path.join(str(tmp_path), 'missing'), print)
+    with pytest.raises(ValueError):
+        TemplateWatcher(str(tmp_path), None)
+    with pytest.raises(ValueError):
+        TemplateWatcher(str(tmp_path), print, debounce=-1)
+    with pytest.raises(ValueError):
+        TemplateWatcher(str(tmp_path), print, backend='kqueue')
+
+
+def test_template_watcher_inotify(tmp_path):
+    """ TemplateWatcher inotify Backend Test
+
+    This test will write, move and remove files in a directory watched with
+    inotify, then move a sub directory out of the watched directory.
+
+    Expected Result:
+      Each burst of changes is reported once, with the changed names, and a
+      directory moved out requests a rescan.
+    """
+    if not inotify_available():
+        pytest.skip("inotify isn't available on this platform")
+    directory = os.path.join(str(tmp_path), 'templates')
+    os.makedirs(directory)
+    _watch_changes(directory, 'inotify')
+
+    changes = queue.Queue()
+    Watcher = TemplateWatcher(directory, changes.put, 0.05, 0.05).start()
+    try:
+        os.rename(
+            os.path.join(directory, 'partials'),
+            os.path.join(str(tmp_path), 'partials')
+        )
+        assert(changes.get(timeout=5) is None)
+    finally:
+        Watcher.stop()
@@ -0,0 +1,112 @@
+# Run PyTest:
+# `poetry run pytest tests -v`
+# Run single test file instead of entire test suite:
+# `poetry run pytest tests/test_writer.py -v`
+################
+# Imports:     #
+################
+
+# Pip Installed Imports:
+from cloudmage.jinjautils.writer import OutputWriter
+import cloudmage.jinjautils.writer as writer_module
+
+# Base Python Module Imports:
+import pickle
+import pytest
+import os
+
+
+######################################
+# Test OutputWriter:                 #
+######################################
+def test_output_writer_atomic(tmp_path):
+    """ OutputWriter Atomic Write Test
+
+    This test will atomically replace an existing output file, then fail
+    part way through a second atomic write.
+
+    Expected Result:
+      The output file keeps its permissions, a failed write leaves the
+      previous file untouched, and no temporary files are left behind.
+    """
+    output_path = os.path.join(str(tmp_path), 'atomic.txt')
+    with open(output_path, "w") as output:
+        output.write("previous")
+    os.chmod(output_path, 0o640)
+
+    Writer = OutputWriter(atomic=True)
+    Writer.write(output_path, "new")
+    with open(output_path) as output:
+        assert(output.read() == "new")
+    assert(os.stat(output_path).st_mode & 0o777 == 0o640)
+
+    with pytest.raises(RuntimeError):
+        with Writer.open(output_path) as output:
+            output.write("partial")
+            raise RuntimeError("render failed")
+    with open(output_path) as output:
+        assert(output.read() == "new")
+    assert(os.listdir(str(tmp_path)) == ['atomic.txt'])
+
+    # New files get the permissions of the current umask.
+    new_path = os.path.join(str(tmp_path), 'new.txt')
+    umask = os.umask(0o027)
+    try:
+        assert(writer_module.get_umask() == 0o027)
+        Writer.write(new_path, "new")
+    finally:
+        os.umask(umask)
+    assert(os.stat(new_path).st_mode & 0o777 == 0o640)
+    assert(writer_module.get_umask() == umask)
+    os.remove(new_path)
+
+    # Bytes are written in binary mode.
+    Writer.write(output_path, b"bytes")
+    with open(output_path, 'rb') as output:
+        assert(output.read() == b"bytes")
+
+
+def test_output_writer_fsync_modes(tmp_path, monkeypatch):
+    """ OutputWriter Fsync Modes Test
+
+    This test will write several files into two directories with the always
+    and batch fsync modes, counting the file and directory fsyncs.
+
+    Expected Result:
+      Every file is fsynced, directories are fsynced per file in always
+      mode, and once per directory on sync in batch mode.
+    """
+    file_syncs = []
+    directory_syncs = []
+    monkeypatch.setattr(
+        writer_module.os, 'fsync', lambda fd: file_syncs.append(fd)
+    )
+    monkeypatch.setattr(
+        writer_module,
+        'fsync_directory',
+        lambda directory: directory_syncs.append(directory) or True
+    )
+    directories = [os.path.join(str(tmp_path), name) for name in 'ab']
+    for directory in directories:
+        os.mkdir(directory)
+
+    Writer = OutputWriter(fsync='always')
+    for index in range(3):
+        Writer.write(os.path.join(directories[0], str(index)), "x")
+    assert(len(file_syncs) == 3 and len(directory_syncs) == 3)
+
+    file_syncs[:] = []
+    directory_syncs[:] = []
+    Writer = OutputWriter(atomic=True, fsync='batch')
+    for index in range(4):
+        Writer.write(os.path.join(directories[index % 2], str(index)), "x")
+    assert(len(file_syncs) == 4 and directory_syncs == [])
+    assert(Writer.pending == 2)
+    assert(Writer.sync() == 2)
+    assert(sorted(directory_syncs) == directories)
+    assert(Writer.sync() == 0)
+
+    # Invalid modes fall back to none, settings survive pickling.
+    assert(OutputWriter(fsync='sometimes').fsync == 'none')
+    Copy = pickle.loads(pickle.dumps(Writer))
+    assert(Copy.atomic and Copy.fsync == 'batch' and Copy.pending == 0)